@@ -25,6 +25,7 @@ from paddle.base.data_feeder import (
     _PADDLE_DTYPE_2_NUMPY_DTYPE,
     convert_uint16_to_float,
 )
+from paddle.profiler.timer import benchmark, in_telemetry_mode
 from paddle.profiler.utils import in_profiler_mode
 from paddle.utils import deprecated
 
@@ -315,6 +316,8 @@ def monkey_patch_tensor():
                     "Gradient Backward", profiler.TracerEventType.Backward
                 )
                 record_event.begin()
+            if in_telemetry_mode():
+                benchmark().before_phase('backward')
             if grad_tensor is not None:
                 assert isinstance(
                     grad_tensor, core.eager.Tensor
@@ -336,6 +339,8 @@ def monkey_patch_tensor():
 
             if in_profiler_mode():
                 record_event.end()
+            if in_telemetry_mode():
+                benchmark().after_phase('backward')
         else:
             raise ValueError(
                 "Variable.backward() is only available in DyGraph mode"
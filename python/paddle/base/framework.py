@@ -173,7 +173,10 @@ class GlobalThreadLocal(threading.local):
     def __setattr__(self, name, val):
         if name == "_dygraph_tracer_":
             global _dygraph_tracer_
-            _dygraph_tracer_ = val
+            # NOTE: threads started later inherit the tracer, unless it is
+            # set in a thread keeping its tracer private
+            if not self.__dict__.get("_private_tracer_", False):
+                _dygraph_tracer_ = val
             core._switch_tracer(val)
         self.__dict__[name] = val
 
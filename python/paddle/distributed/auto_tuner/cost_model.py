@@ -69,6 +69,47 @@ def get_mem(total_cards, parallel_cfg, l, h, a, V, s, gbs):
     return peak_mem
 
 
+def get_step_cost(cfg, tuner_cfg):
+    """
+    Estimate the relative step time of a parallel strategy, which counts the
+    flops per card of a transformer model, scaled by the pipeline bubble and
+    the extra forward of recompute. The result is only comparable among
+    strategies of the same model, None is returned if the model is unknown.
+    """
+    model_cfg = tuner_cfg.get("model_cfg", {})
+    l = model_cfg.get("num_layers", None)
+    h = model_cfg.get("hidden_size", None)
+    gbs = model_cfg.get("global_batch_size", None)
+    if not l or not h or not gbs:
+        return None
+    s = model_cfg.get("seq_length", None) or model_cfg.get(
+        "max_sequence_length", 1
+    )
+    V = model_cfg.get("vocab_size", None) or 0
+    num_gpus = (
+        cfg["mp_degree"]
+        * cfg["pp_degree"]
+        * cfg["sharding_degree"]
+        * cfg["dp_degree"]
+    )
+
+    flops = 72 * gbs * s * l * h**2 * (1 + s / (6 * h) + V / (12 * h * l))
+    if cfg.get("use_recompute", False):
+        # recompute runs the forward once more, which is 1/3 of the flops
+        flops = flops * 4 / 3
+
+    pp = cfg["pp_degree"]
+    vpp = cfg.get("vpp_degree", 1) or 1
+    acc_steps = max(
+        gbs
+        // (cfg["dp_degree"] * cfg["sharding_degree"])
+        // cfg["micro_batch_size"],
+        1,
+    )
+    bubble_ratio = (pp - 1) / (vpp * acc_steps)
+    return flops / num_gpus * (1 + bubble_ratio)
+
+
 def divisor(num, reverse=False):
     """Get the divisor of a given number."""
     results = set()
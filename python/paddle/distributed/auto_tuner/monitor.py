@@ -0,0 +1,284 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import math
+import os
+import re
+import statistics
+import time
+
+logger = logging.getLogger('auto_tuner')
+
+# The directory of metric files of a trial, set by the tuner for trials.
+METRIC_DIR_ENV_NAME = "PADDLE_AUTO_TUNER_METRIC_DIR"
+METRIC_FILE_SUFFIX = ".metrics.jsonl"
+
+
+def report_metrics(**metrics):
+    """
+    Report the metrics of a step to the auto tuner, which is a no-op if the
+    process is not launched by the auto tuner. The metrics are appended as a
+    json line to the metric file of current rank.
+
+    Args:
+        metrics: The metrics of the step, e.g. the metric named by
+            metric_cfg of the tuner and max_memory_allocated in MB.
+
+    Examples:
+        .. code-block:: python
+
+            >>> from paddle.distributed.auto_tuner.monitor import report_metrics
+            >>> report_metrics(interval_runtime=0.52, max_memory_allocated=61440)
+
+    """
+    metric_dir = os.getenv(METRIC_DIR_ENV_NAME)
+    if not metric_dir:
+        return
+    rank = int(os.getenv("PADDLE_TRAINER_ID", "0"))
+    os.makedirs(metric_dir, exist_ok=True)
+    with open(
+        os.path.join(metric_dir, f"{rank}{METRIC_FILE_SUFFIX}"), "a"
+    ) as f:
+        f.write(json.dumps(metrics) + "\n")
+
+
+def _t_quantile(p, df):
+    """The quantile of student's t distribution by Cornish-Fisher expansion."""
+    z = statistics.NormalDist().inv_cdf(p)
+    return (
+        z
+        + (z**3 + z) / (4 * df)
+        + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+    )
+
+
+class _FileTail:
+    """Read the complete lines appended to a file since the last read."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.partial = ""
+
+    def read_lines(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", errors="ignore") as f:
+            f.seek(self.offset)
+            data = f.read()
+            self.offset = f.tell()
+        lines = (self.partial + data).split("\n")
+        self.partial = lines.pop()
+        return lines
+
+
+class TrialMonitor:
+    """
+    Monitor a running trial of the auto tuner by the metric samples streamed
+    from its metric files reported by :func:`report_metrics`, or from its
+    log, and decide to stop the trial early once the confidence interval of
+    the metric is worse than the best trial, or the allocated memory
+    exceeds the limit.
+
+    The options in tuner_cfg["early_stop"]:
+        warmup_steps(int): Samples to skip at the beginning. Default 10.
+        min_samples(int): Samples to collect before stopping. Default 5.
+        confidence(float): Confidence level of the interval. Default 0.95.
+        tolerance(float): Relative tolerance of the metric to the best.
+            Default 0.0.
+        max_memory(int|None): Limit of the allocated memory in MB.
+            Default None.
+
+    Args:
+        tuner_cfg(dict): The configuration of auto tuner.
+        log_dir(str): The log directory of the trial.
+        history_cfgs(list): The configs of finished trials.
+        metric_file(str): The log file to read the metric if no metric is
+            reported. Default "workerlog.0".
+        client(ETCDClient|None): The client of the kv store shared by the
+            nodes of the trial, through which the stop decision of any node
+            is published to all. Default None.
+        stop_key(str|None): The key of the stop decision in the kv store.
+            Default None.
+    """
+
+    def __init__(
+        self,
+        tuner_cfg,
+        log_dir,
+        history_cfgs,
+        metric_file="workerlog.0",
+        client=None,
+        stop_key=None,
+    ):
+        early_stop_cfg = tuner_cfg.get("early_stop", {})
+        self.warmup_steps = early_stop_cfg.get("warmup_steps", 10)
+        self.min_samples = max(early_stop_cfg.get("min_samples", 5), 2)
+        self.confidence = early_stop_cfg.get("confidence", 0.95)
+        self.tolerance = early_stop_cfg.get("tolerance", 0.0)
+        self.max_memory = early_stop_cfg.get("max_memory", None)
+
+        self.metric_name = tuner_cfg["metric_cfg"]["name"]
+        self.maximize = (
+            tuner_cfg["metric_cfg"].get("OptimizationDirection") == "Maximize"
+        )
+        self.incumbent = self._get_incumbent(history_cfgs)
+        self.metric_dir = os.path.join(log_dir, "metrics")
+        self._metric_pattern = re.compile(
+            self.metric_name
+            + r":* *(\d+(\.\d*)?)|(\d+(\.\d*)?) *"
+            + self.metric_name
+        )
+        self._log_tail = _FileTail(os.path.join(log_dir, metric_file))
+        self._metric_tails = {}
+        self.log_samples = []
+        self.reported_samples = []
+        self.peak_memory = None
+        self.stop_reason = None
+        self.client = client
+        self.stop_key = stop_key
+
+    def _get_incumbent(self, history_cfgs):
+        metrics = [
+            cfg.get(self.metric_name)
+            for cfg in history_cfgs
+            if cfg.get("time", -1) != -1
+            and not isinstance(cfg.get("max_mem_usage"), str)
+        ]
+        metrics = [
+            metric
+            for metric in metrics
+            if isinstance(metric, (int, float)) and metric > 0
+        ]
+        if not metrics:
+            return None
+        return max(metrics) if self.maximize else min(metrics)
+
+    def envs(self):
+        """The environment variables to set for the trial."""
+        return {METRIC_DIR_ENV_NAME: self.metric_dir}
+
+    @property
+    def samples(self):
+        samples = self.reported_samples or self.log_samples
+        return samples[self.warmup_steps :]
+
+    @property
+    def mean(self):
+        samples = self.samples
+        return statistics.fmean(samples) if samples else None
+
+    def confidence_interval(self):
+        """Return the confidence interval of the mean of the metric."""
+        samples = self.samples
+        if len(samples) < self.min_samples:
+            return None
+        mean = statistics.fmean(samples)
+        half_width = (
+            _t_quantile((1 + self.confidence) / 2, len(samples) - 1)
+            * statistics.stdev(samples)
+            / math.sqrt(len(samples))
+        )
+        return mean - half_width, mean + half_width
+
+    def _update_memory(self, memory):
+        if isinstance(memory, (int, float)):
+            self.peak_memory = max(self.peak_memory or 0, memory)
+
+    def poll(self):
+        """Read the samples appended since the last poll."""
+        for line in self._log_tail.read_lines():
+            metric = self._metric_pattern.search(line)
+            if metric:
+                for item in metric.groups():
+                    try:
+                        self.log_samples.append(float(item))
+                        break
+                    except (TypeError, ValueError):
+                        continue
+
+        if os.path.isdir(self.metric_dir):
+            for file in sorted(os.listdir(self.metric_dir)):
+                if not file.endswith(METRIC_FILE_SUFFIX):
+                    continue
+                if file not in self._metric_tails:
+                    self._metric_tails[file] = _FileTail(
+                        os.path.join(self.metric_dir, file)
+                    )
+        # the metric of the first rank, the peak memory of all ranks
+        for i, file in enumerate(sorted(self._metric_tails)):
+            for line in self._metric_tails[file].read_lines():
+                try:
+                    metrics = json.loads(line)
+                except ValueError:
+                    continue
+                self._update_memory(metrics.get("max_memory_allocated"))
+                metric = metrics.get(self.metric_name)
+                if i == 0 and isinstance(metric, (int, float)):
+                    self.reported_samples.append(float(metric))
+
+    def _stop(self, reason):
+        self.stop_reason = reason
+        if self.client is not None:
+            while not self.client.put(self.stop_key, reason.encode('latin-1')):
+                time.sleep(1)
+            logger.info(f"Put {reason} to {self.stop_key}")
+        return True
+
+    def _published_stop_reason(self):
+        if self.client is None:
+            return None
+        reason = self.client.get(self.stop_key)[0]
+        return reason.decode() if reason else None
+
+    def should_stop(self):
+        """
+        Poll the samples and return whether to stop the trial, which is
+        decided by this node or published by another node of the trial.
+        """
+        if self.stop_reason is not None:
+            return True
+        reason = self._published_stop_reason()
+        if reason is not None:
+            self.stop_reason = reason
+            logger.info(f"Receive {reason} from {self.stop_key}")
+            return True
+        self.poll()
+
+        if (
+            self.max_memory is not None
+            and self.peak_memory is not None
+            and self.peak_memory > self.max_memory
+        ):
+            logger.info(
+                f"Peak memory {self.peak_memory} MB exceeds {self.max_memory} MB."
+            )
+            return self._stop("memory")
+
+        interval = self.confidence_interval()
+        if self.incumbent is None or interval is None:
+            return False
+        lower, upper = interval
+        if self.maximize:
+            worse = upper < self.incumbent * (1 - self.tolerance)
+        else:
+            worse = lower > self.incumbent * (1 + self.tolerance)
+        if not worse:
+            return False
+        logger.info(
+            f"The {self.metric_name} interval [{lower:.5f}, {upper:.5f}] of {len(self.samples)} samples is worse than the best {self.incumbent}."
+        )
+        return self._stop("metric")
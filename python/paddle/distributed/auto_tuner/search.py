@@ -14,9 +14,13 @@
 
 
 import logging
+import math
 import os
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+from .cost_model import get_step_cost
 from .prune import _PRUNE_HISTORY_FUNC
 from .utils import (
     gbs_search_all,
@@ -141,6 +145,181 @@ class GBSSearch(SearchAlgo):
         return new_cfg
 
 
+class CostModelSearch(SearchAlgo):
+    """
+    Search the candidates of grid search in the order of a step time model,
+    which is a bayesian linear regression on the history and takes the
+    analytic cost of cost_model as prior, so the first trials follow the
+    analytic cost and later ones are chosen by the lower confidence bound of
+    the learned model. The search stops when no remaining candidate is
+    expected to beat the best trial by stop_threshold.
+
+    The options in tuner_cfg["search_algo"]:
+        exploration(float): Weight of the standard deviation in the lower
+            confidence bound. Default 1.0.
+        noise(float): Relative noise of the measured step time. Default 0.05.
+        min_trials(int): Successful trials before stopping early. Default 3.
+        stop_threshold(float): Minimum expected relative improvement to
+            continue searching. Default 0.02.
+    """
+
+    _FEATURE_KEYS = [
+        "mp_degree",
+        "pp_degree",
+        "sharding_degree",
+        "dp_degree",
+        "micro_batch_size",
+        "vpp_degree",
+    ]
+    _RECOMPUTE_GRANULARITY = ["full", "full_attn", "core_attn"]
+
+    def __init__(self, tuner_cfg):
+        super().__init__(tuner_cfg)
+        self.idx = 0
+        self.all_tasks = search_all(tuner_cfg)
+        algo_cfg = tuner_cfg.get("search_algo", {})
+        self.exploration = algo_cfg.get("exploration", 1.0)
+        self.noise = algo_cfg.get("noise", 0.05)
+        self.min_trials = algo_cfg.get("min_trials", 3)
+        self.stop_threshold = algo_cfg.get("stop_threshold", 0.02)
+        self.maximize = (
+            tuner_cfg.get("metric_cfg", {}).get("OptimizationDirection")
+            == "Maximize"
+        )
+        self.remaining = list(self.all_tasks)
+
+    def _prior(self, cfg):
+        cost = get_step_cost(cfg, self.tuner_cfg)
+        return math.log(cost) if cost else 0.0
+
+    def _features(self, cfg):
+        features = [1.0]
+        features.extend(
+            math.log2(max(cfg.get(key, 1) or 1, 1))
+            for key in self._FEATURE_KEYS
+        )
+        features.append(float(cfg.get("sharding_stage", 1) or 1))
+        use_recompute = bool(cfg.get("use_recompute", False))
+        features.extend(
+            float(
+                use_recompute
+                and cfg.get("recompute_granularity") == granularity
+            )
+            for granularity in self._RECOMPUTE_GRANULARITY
+        )
+        return features
+
+    def _objective(self, cfg):
+        # the log step time to minimize, None if the trial failed
+        metric = cfg.get("time", -1)
+        if metric is None or isinstance(metric, str) or metric <= 0:
+            return None
+        return -math.log(metric) if self.maximize else math.log(metric)
+
+    def _fit(self, history_cfgs):
+        """Return the posterior mean and covariance of the weights."""
+        xs, ys = [], []
+        for cfg in history_cfgs:
+            y = self._objective(cfg)
+            if y is None:
+                continue
+            xs.append(self._features(cfg))
+            # learn the residual of the analytic cost
+            ys.append(y - self._prior(cfg))
+        dim = len(self._features({}))
+        # unit prior on the weights but a flat one on the intercept, which
+        # is the unknown scale between the analytic cost and the step time
+        prior_precision = np.eye(dim)
+        prior_precision[0, 0] = 1e-6
+        if not xs:
+            return np.zeros(dim), np.linalg.inv(prior_precision)
+        beta = 1.0 / self.noise**2
+        x = np.array(xs)
+        cov = np.linalg.inv(prior_precision + beta * x.T @ x)
+        mean = beta * cov @ x.T @ np.array(ys)
+        return mean, cov
+
+    def _oom_dominated(self, cfg, history_cfgs):
+        """
+        Whether an OOM trial needs no more memory than cfg, which splits the
+        model into no fewer parts, with no larger micro batch and no less
+        recompute.
+        """
+        for oom_cfg in history_cfgs:
+            if oom_cfg.get("max_mem_usage") != "OOM":
+                continue
+            if any(
+                oom_cfg.get(key, 1) < cfg.get(key, 1)
+                for key in [
+                    "mp_degree",
+                    "pp_degree",
+                    "sharding_degree",
+                    "sharding_stage",
+                ]
+            ):
+                continue
+            if oom_cfg.get("micro_batch_size", 1) > cfg.get(
+                "micro_batch_size", 1
+            ):
+                continue
+            if cfg.get("use_recompute", False) and not (
+                oom_cfg.get("use_recompute", False)
+                and oom_cfg.get("recompute_granularity")
+                == cfg.get("recompute_granularity")
+            ):
+                continue
+            return True
+        return False
+
+    def _best_objective(self, history_cfgs):
+        objectives = [self._objective(cfg) for cfg in history_cfgs]
+        objectives = [y for y in objectives if y is not None]
+        return min(objectives) if objectives else None
+
+    def predict(self, cfgs, history_cfgs):
+        """Return the predicted log step time and its standard deviation."""
+        mean, cov = self._fit(history_cfgs)
+        x = np.array([self._features(cfg) for cfg in cfgs])
+        prior = np.array([self._prior(cfg) for cfg in cfgs])
+        pred = prior + x @ mean
+        std = np.sqrt(self.noise**2 + np.einsum("ij,jk,ik->i", x, cov, x))
+        return pred, std
+
+    def search_once(self, history_cfgs):
+        while self.remaining:
+            pred, std = self.predict(self.remaining, history_cfgs)
+            lcb = pred - self.exploration * std
+            best = self._best_objective(history_cfgs)
+            num_success = sum(
+                self._objective(cfg) is not None for cfg in history_cfgs
+            )
+            if (
+                best is not None
+                and num_success >= self.min_trials
+                and best - lcb.min() < math.log(1 + self.stop_threshold)
+            ):
+                logger.info(
+                    f"Stop searching, {len(self.remaining)} tasks are not expected to be faster than the best by {self.stop_threshold}."
+                )
+                self.idx = len(self.all_tasks)
+                self.remaining = []
+                return None
+
+            best_idx = int(np.argmin(lcb))
+            new_cfg = self.remaining.pop(best_idx)
+            self.idx += 1
+            pruned = self._oom_dominated(new_cfg, history_cfgs) or self.prune(
+                self.tuner_cfg, new_cfg, history_cfgs, self.pruned_cfgs
+            )
+            self.pruned_cfgs.append(new_cfg)
+            if not pruned:
+                logger.info(
+                    f"Predicted log step time of {new_cfg}: {pred[best_idx]:.4f}"
+                )
+                return new_cfg
+        return None
+
+
 class CustomizeSearch(SearchAlgo):
     def __init__(self, tuner_cfg):
         super().__init__(tuner_cfg)
@@ -48,6 +48,11 @@ class AutoTuner:
 
             tuner_cfg["candidates"] = gbs_default_candidates(tuner_cfg)
             self.algo = GBSSearch(tuner_cfg)
+        elif search_algo == "cost_model":
+            from .search import CostModelSearch
+
+            tuner_cfg["candidates"] = default_candidates(tuner_cfg)
+            self.algo = CostModelSearch(tuner_cfg)
         elif search_algo == "customize":
             from .search import CustomizeSearch
 
@@ -1342,7 +1342,7 @@ def gen_new_args(raw_args, cfg, tuner_cfg, run_best=False):
                 yaml.dump(cmd_cfg, open(cmd[arg][0], "w"))
 
     # sharding overlap args
-    if tuner_cfg["search_algo"]["name"] == "grid":
+    if tuner_cfg["search_algo"]["name"] in ["grid", "cost_model"]:
         gen_sharding_overlap_args_of_grid_search(res_args, cfg, tuner_cfg)
     else:
         gen_sharding_overlap_args(res_args, cfg, tuner_cfg)
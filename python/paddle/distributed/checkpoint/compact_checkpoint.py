@@ -0,0 +1,106 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import collections
+import os
+
+import paddle
+from paddle.distributed.fleet.utils.log_util import logger
+
+from .load_state_dict import get_checkpoint_files
+from .save_state_dict import get_file_name, write_file
+from .storage_reader import CheckpointFileReader
+
+
+def compact_checkpoint(path, output_path):
+    """
+    Compact an incremental checkpoint saved by save_state_dict with
+    base_path into a full checkpoint, which does not reference files of
+    earlier checkpoints. The tensors of each referenced file are read and
+    written to a new file of output_path one file at a time, fingerprints
+    are kept so the output can be the base_path of later checkpoints.
+
+    Args:
+        path(str): The directory of the incremental checkpoint.
+        output_path(str): The directory to save the full checkpoint.
+
+    Examples:
+        .. code-block:: python
+
+            >>> # doctest: +SKIP('depends on checkpoint files')
+            >>> from paddle.distributed.checkpoint.compact_checkpoint import compact_checkpoint
+            >>> compact_checkpoint("./checkpoint_2", "./checkpoint_2_full")
+            >>> # doctest: -SKIP
+
+    """
+    assert os.path.abspath(path) != os.path.abspath(
+        output_path
+    ), "The output_path should be different from path."
+    os.makedirs(output_path, exist_ok=True)
+    metadata_files, _ = get_checkpoint_files(path, use_cache=False)
+    reader = CheckpointFileReader(path)
+    try:
+        for metadata_file in metadata_files:
+            metadata = paddle.load(os.path.join(path, metadata_file))
+            unique_id = metadata_file.split(".")[0]
+            file_to_keys = collections.defaultdict(list)
+            for index, file_name in metadata.storage_metadata.items():
+                file_to_keys[file_name].append(index.tensor_key)
+
+            rank_to_file_num = collections.Counter()
+            file_to_new_file = {}
+            for file_name, keys in sorted(file_to_keys.items()):
+                rank = int(os.path.basename(file_name).split("_")[0])
+                new_file_name = get_file_name(
+                    rank, unique_id, rank_to_file_num[rank]
+                )
+                rank_to_file_num[rank] += 1
+                file_to_new_file[file_name] = new_file_name
+                logger.debug(f"compact {file_name} to {new_file_name}")
+                # tensors keep their names in the original file, which are
+                # saved in the StructuredToParameterName@@ mapping
+                names = reader.get_file(file_name).get(
+                    "StructuredToParameterName@@", {}
+                )
+                state_dict = {}
+                for key in keys:
+                    tensor = paddle.to_tensor(
+                        reader.read(file_name, key, (), ()),
+                        place=paddle.CPUPlace(),
+                    )
+                    if key in names:
+                        tensor.name = names[key]
+                    state_dict[key] = tensor
+                write_file(state_dict, os.path.join(output_path, new_file_name))
+                # release the mapped file after written
+                reader.close()
+
+            metadata.storage_metadata = {
+                index: file_to_new_file[file_name]
+                for index, file_name in metadata.storage_metadata.items()
+            }
+            write_file(metadata, os.path.join(output_path, metadata_file))
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compact an incremental distributed checkpoint."
+    )
+    parser.add_argument("path", help="the incremental checkpoint directory")
+    parser.add_argument("output_path", help="the output checkpoint directory")
+    args = parser.parse_args()
+    compact_checkpoint(args.path, args.output_path)
@@ -22,6 +22,7 @@ from paddle.distributed.communication.group import is_initialized
 from paddle.distributed.fleet.utils.log_util import logger
 
 from .metadata import LocalTensorIndex, LocalTensorMetadata
+from .storage_reader import CheckpointFileReader
 from .utils import (
     compute_local_shape_and_global_offset,
     flatten_state_dict,
@@ -87,6 +88,13 @@ def get_rank_to_files(path, state_dict, process_group, use_dist):
         missing_keys = set(state_dict.keys())
         return {}, missing_keys
 
+    # files of earlier checkpoints referenced by incremental checkpoint
+    local_data_files = local_data_files + [
+        file
+        for file in necessary_data_files_set
+        if file not in local_data_files
+        and os.path.exists(os.path.join(path, file))
+    ]
     # allgather all accessible files
     global_data_files = []
     if use_dist:
@@ -453,7 +461,6 @@ def load_state_dict(
         read_items = get_read_items(
             path, flat_state_dict, process_group, use_dist
         )
-        storage_file_to_state_dict = {}
         logger.debug(
             f"before load, state_dict:{flat_state_dict},\n load_infos:{load_infos},\n read_items:{read_items}"
         )
@@ -466,92 +473,96 @@ def load_state_dict(
             assert (
                 item.local_tensor_index in load_infos
             ), f"item:{item}, load_infos:{load_infos}"
-            src_rank, file_name = load_infos[item.local_tensor_index]
-            storage_chunk_tensor = None
-            cur_chunk_tensor = None
-            # The src rank need to load the state_dict.
-            if src_rank == paddle.distributed.get_rank():
-                if file_name not in storage_file_to_state_dict:
-                    # The value in state_dict is not distributed tensor but a normal tensor.
-                    storage_file_to_state_dict[file_name] = paddle.load(
-                        os.path.join(path, file_name)
-                    )
-                storage_state_dict = storage_file_to_state_dict[file_name]
-                assert item.local_tensor_index.tensor_key in storage_state_dict
-                storage_local_tensor = storage_state_dict[
-                    item.local_tensor_index.tensor_key
-                ]
-                storage_offsets = item.storage_offset
-                storage_lengths = item.lengths
-                storage_ends = [
-                    storage_offset + storage_length
-                    for storage_offset, storage_length in zip(
-                        storage_offsets, storage_lengths
-                    )
-                ]
-                # The storage_chunk_tensor and storage_local_tensor share the same memory.
-                if len(storage_lengths) > 0:
-                    storage_chunk_tensor = paddle.slice(
-                        storage_local_tensor,
-                        list(range(len(storage_lengths))),
-                        storage_offsets,
-                        storage_ends,
-                    )
-                else:
-                    storage_chunk_tensor = storage_local_tensor
-            # The read item rank need to be assigned
-            if item.rank == paddle.distributed.get_rank():
-                assert (
-                    item.local_tensor_index.tensor_key in flat_state_dict
-                ), f"item:{item}, state_dict:{flat_state_dict}"
-                cur_local_tensor = (
-                    flat_state_dict[
-                        item.local_tensor_index.tensor_key
-                    ]._local_value()
-                    if use_dist
-                    and flat_state_dict[
-                        item.local_tensor_index.tensor_key
-                    ].is_dist()
-                    else flat_state_dict[item.local_tensor_index.tensor_key]
-                )
-                cur_offsets = item.cur_offset
-                cur_lengths = item.lengths
-                cur_ends = [
-                    cur_offset + cur_length
-                    for cur_offset, cur_length in zip(cur_offsets, cur_lengths)
-                ]
-                # The cur_chunk_tensor and cur_local_tensor share the same memory.
-                if len(cur_lengths) > 0:
-                    cur_chunk_tensor = paddle.slice(
-                        cur_local_tensor,
-                        list(range(len(cur_lengths))),
-                        cur_offsets,
-                        cur_ends,
-                    )
-                else:
-                    cur_chunk_tensor = cur_local_tensor
-            else:
-                cur_chunk_tensor = paddle.zeros(
+        # The storage chunks read by current rank are read by byte ranges in
+        # parallel, and are yielded in the order of read_items.
+        reader = CheckpointFileReader(path)
+        try:
+            storage_chunks = reader.read_items(
+                (
+                    load_infos[item.local_tensor_index][1],
+                    item.local_tensor_index.tensor_key,
+                    item.storage_offset,
                     item.lengths,
-                    dtype=flat_state_dict[
-                        item.local_tensor_index.tensor_key
-                    ].dtype,
                 )
-
-            if src_rank == item.rank:
-                # assign value locally
-                paddle.assign(storage_chunk_tensor, cur_chunk_tensor)
-            else:
-                # assign value remotely
+                for item in read_items
+                if load_infos[item.local_tensor_index][0]
+                == paddle.distributed.get_rank()
+            )
+            for item in read_items:
+                src_rank = load_infos[item.local_tensor_index][0]
+                storage_chunk = None
+                cur_chunk_tensor = None
+                # The src rank need to load the state_dict.
                 if src_rank == paddle.distributed.get_rank():
-                    paddle.distributed.broadcast(
-                        storage_chunk_tensor, src=src_rank, group=process_group
+                    storage_chunk = next(storage_chunks)
+                # The read item rank need to be assigned
+                if item.rank == paddle.distributed.get_rank():
+                    assert (
+                        item.local_tensor_index.tensor_key in flat_state_dict
+                    ), f"item:{item}, state_dict:{flat_state_dict}"
+                    cur_local_tensor = (
+                        flat_state_dict[
+                            item.local_tensor_index.tensor_key
+                        ]._local_value()
+                        if use_dist
+                        and flat_state_dict[
+                            item.local_tensor_index.tensor_key
+                        ].is_dist()
+                        else flat_state_dict[item.local_tensor_index.tensor_key]
                     )
+                    cur_offsets = item.cur_offset
+                    cur_lengths = item.lengths
+                    cur_ends = [
+                        cur_offset + cur_length
+                        for cur_offset, cur_length in zip(
+                            cur_offsets, cur_lengths
+                        )
+                    ]
+                    # The cur_chunk_tensor and cur_local_tensor share the same memory.
+                    if len(cur_lengths) > 0 and list(cur_lengths) != list(
+                        cur_local_tensor.shape
+                    ):
+                        cur_chunk_tensor = paddle.slice(
+                            cur_local_tensor,
+                            list(range(len(cur_lengths))),
+                            cur_offsets,
+                            cur_ends,
+                        )
+                    else:
+                        cur_chunk_tensor = cur_local_tensor
                 else:
-                    paddle.distributed.broadcast(
-                        cur_chunk_tensor, src=src_rank, group=process_group
+                    cur_chunk_tensor = paddle.zeros(
+                        item.lengths,
+                        dtype=flat_state_dict[
+                            item.local_tensor_index.tensor_key
+                        ].dtype,
                     )
 
+                if src_rank == item.rank:
+                    # assign value locally, the chunk covering the whole
+                    # local tensor is copied into it without a temporary
+                    # tensor
+                    if cur_chunk_tensor is cur_local_tensor:
+                        cur_local_tensor.set_value(storage_chunk)
+                    else:
+                        paddle.assign(
+                            paddle.to_tensor(storage_chunk), cur_chunk_tensor
+                        )
+                else:
+                    # assign value remotely
+                    if src_rank == paddle.distributed.get_rank():
+                        paddle.distributed.broadcast(
+                            paddle.to_tensor(storage_chunk),
+                            src=src_rank,
+                            group=process_group,
+                        )
+                    else:
+                        paddle.distributed.broadcast(
+                            cur_chunk_tensor, src=src_rank, group=process_group
+                        )
+        finally:
+            reader.close()
+
         for k, v in flat_state_dict.items():
             if k in state_dict_in_cpu:
                 state_dict[k] = v.cpu()
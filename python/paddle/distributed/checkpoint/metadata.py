@@ -41,3 +41,5 @@ class Metadata:
     state_dict_metadata: Dict[str, List[LocalTensorMetadata]] = None
     storage_metadata: Dict[LocalTensorIndex, str] = None
     flat_mapping: Dict[str, Tuple[str]] = None
+    # fingerprints of tensors of incremental checkpoint
+    fingerprints: Dict[LocalTensorIndex, str] = None
@@ -12,18 +12,39 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import heapq
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 import paddle
 from paddle.distributed.communication.group import is_initialized
 from paddle.distributed.fleet.utils.log_util import logger
+from paddle.framework import io as paddle_io
 
+from .load_state_dict import get_checkpoint_files
 from .metadata import LocalTensorIndex, LocalTensorMetadata, Metadata
 from .utils import (
+    compute_fingerprint,
     compute_local_shape_and_global_offset,
+    fingerprint_seed,
     flatten_state_dict,
 )
 
+# thread number to write checkpoint files
+NUM_WRITE_THREADS = 8
+# local tensors of a rank are split into files of about this size, which
+# are written in parallel
+MAX_FILE_BYTES = 1024 * 1024 * 1024
+
+# executor to run async save tasks in submitting order
+_async_executor = None
+# first files of the checkpoints being saved, whose unique_id is reserved
+_reserved_files = set()
+_reserved_files_lock = threading.Lock()
+
 
 def check_state_dict(state_dict, process_group):
     local_keys = list(state_dict.keys())
@@ -93,12 +114,170 @@ def dedup_tensor(
     """
 
     for tensor_index, file_name in global_storage_metadata.items():
+        file_name = os.path.basename(file_name)
         rank = int(file_name.split(".")[0].split("_")[0])
         if (
             tensor_index in local_storage_metadata
             and rank != paddle.distributed.get_rank()
         ):
-            local_state_dict.pop(tensor_index.tensor_key)
+            # tensors referenced in earlier checkpoints are not in local_state_dict
+            local_state_dict.pop(tensor_index.tensor_key, None)
+
+
+def tensor_nbytes(tensor):
+    return int(np.prod(tensor.shape)) * tensor.element_size()
+
+
+def split_state_dict(state_dict, max_file_bytes=None):
+    """
+    Split the keys of local state_dict into groups of balanced bytes, the
+    group number is decided by max_file_bytes.
+
+    Args:
+        state_dict(Dict[str, paddle.Tensor]): The local state_dict.
+        max_file_bytes(int|None): The expected max bytes of a group, MAX_FILE_BYTES is used if None.
+
+    Returns:
+        List[List[str]]: The groups of keys, there is at least one group.
+
+    Examples:
+        state_dict:{"w1": 600MB, "w2": 500MB, "w3": 400MB, "w4": 100MB}, max_file_bytes:1GB,
+        there are 2 groups: [["w1", "w4"], ["w2", "w3"]].
+    """
+    if max_file_bytes is None:
+        max_file_bytes = MAX_FILE_BYTES
+    nbytes = {k: tensor_nbytes(v) for k, v in state_dict.items()}
+    num_groups = max(1, -(-sum(nbytes.values()) // max(1, max_file_bytes)))
+    num_groups = min(num_groups, max(1, len(state_dict)))
+    # put the largest tensor to the smallest group
+    heap = [(0, i) for i in range(num_groups)]
+    key_to_group = {}
+    for key in sorted(nbytes, key=lambda k: -nbytes[k]):
+        size, i = heapq.heappop(heap)
+        key_to_group[key] = i
+        heapq.heappush(heap, (size + nbytes[key], i))
+    groups = [[] for _ in range(num_groups)]
+    for key in state_dict:
+        groups[key_to_group[key]].append(key)
+    return groups
+
+
+def get_file_name(rank, unique_id, file_idx):
+    # the first file keeps the name of single file checkpoint
+    if file_idx == 0:
+        return f"{rank}_{unique_id}.distcp"
+    return f"{rank}_{unique_id}_{file_idx}.distcp"
+
+
+def write_file(obj, file_path):
+    # write to a temporary file and rename, so a partially written file is
+    # never found by load_state_dict
+    tmp_path = f"{file_path}.tmp.{os.getpid()}"
+    try:
+        if isinstance(obj, dict):
+            # tensors are copied to host and written one by one
+            paddle_io._async_save_write(obj, tmp_path, protocol=4)
+        else:
+            paddle.save(obj, tmp_path)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_checkpoint(path, file_to_state_dict, metadata_file, metadata):
+    """
+    Write the local files in parallel, and then the metadata file if
+    metadata is not None.
+    """
+    num_threads = min(NUM_WRITE_THREADS, len(file_to_state_dict))
+    if num_threads <= 1:
+        for file_name, local_state_dict in file_to_state_dict.items():
+            write_file(local_state_dict, os.path.join(path, file_name))
+    else:
+        with ThreadPoolExecutor(
+            max_workers=num_threads, thread_name_prefix="dist_ckpt_writer"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    write_file, local_state_dict, os.path.join(path, file_name)
+                )
+                for file_name, local_state_dict in file_to_state_dict.items()
+            ]
+            for future in futures:
+                future.result()
+    if metadata is not None:
+        write_file(metadata, os.path.join(path, metadata_file))
+
+
+def load_base_metadata(base_path):
+    """
+    Load the storage metadata and fingerprints of the checkpoint in
+    base_path, file names in storage metadata are relative to base_path.
+
+    Metadata files are resolved in the order of their unique_id, so a
+    tensor saved again in base_path takes the latest entry. Tensors whose
+    files, which may be in earlier checkpoints referenced by base_path,
+    do not exist any more are left out to be written again.
+    """
+    storage_metadata = {}
+    fingerprints = {}
+    metadata_files, _ = get_checkpoint_files(base_path, use_cache=False)
+    for metadata_file in sorted(
+        metadata_files, key=lambda name: int(name.split(".")[0])
+    ):
+        metadata = paddle.load(os.path.join(base_path, metadata_file))
+        file_fingerprints = metadata.fingerprints or {}
+        for index, file_name in metadata.storage_metadata.items():
+            file_name = os.path.normpath(file_name)
+            if index not in file_fingerprints or not os.path.exists(
+                os.path.join(base_path, file_name)
+            ):
+                storage_metadata.pop(index, None)
+                fingerprints.pop(index, None)
+                continue
+            storage_metadata[index] = file_name
+            fingerprints[index] = file_fingerprints[index]
+    return storage_metadata, fingerprints
+
+
+def reserve_unique_id(path, rank):
+    """
+    Find the first unique_id that is neither saved nor being saved in path
+    and reserve it, the reservation is released by release_unique_id after
+    the files are written.
+    """
+    with _reserved_files_lock:
+        unique_id = 0
+        while True:
+            file_path = os.path.abspath(
+                os.path.join(path, get_file_name(rank, unique_id, 0))
+            )
+            if (
+                not os.path.exists(file_path)
+                and file_path not in _reserved_files
+            ):
+                break
+            unique_id += 1
+        _reserved_files.add(file_path)
+    return unique_id
+
+
+def release_unique_id(path, rank, unique_id):
+    file_path = os.path.abspath(
+        os.path.join(path, get_file_name(rank, unique_id, 0))
+    )
+    with _reserved_files_lock:
+        _reserved_files.discard(file_path)
+
+
+def get_async_executor():
+    global _async_executor
+    if _async_executor is None:
+        _async_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="dist_ckpt_async_save"
+        )
+    return _async_executor
 
 
 def save_state_dict(
@@ -106,7 +285,10 @@ def save_state_dict(
     path,
     process_group=None,
     coordinator_rank=0,
-) -> None:
+    async_save=False,
+    incremental=False,
+    base_path=None,
+):
     """
     Save the state_dict of model to path.
 
@@ -115,6 +297,15 @@ def save_state_dict(
         path(str): The directory to save state_dict.
         process_group(paddle.distributed.collective.Group): ProcessGroup to be used for cross-rank synchronization. Use the default process group which contains all cards.
         coordinator_rank(int): The rank used to save non distributed values. Rank0 is used by default.
+        async_save(bool): Whether to return before the files are written. If True, tensors are copied to host buffers before returning, and files are written in background. Default: False.
+        incremental(bool): Whether to record the fingerprints of tensors in metadata, so checkpoints can be saved incrementally based on this checkpoint. Default: False.
+        base_path(str|None): The directory of an earlier checkpoint saved with incremental=True. If not None, tensors with the same fingerprints as in base_path are not written but referenced by relative paths in metadata, and fingerprints are recorded as incremental=True. The referenced files should be kept until the checkpoint is compacted by ``compact_checkpoint`` in ``paddle.distributed.checkpoint.compact_checkpoint``. Default: None.
+
+    Returns:
+        concurrent.futures.Future|None: The future of writing files if async_save is True, which can be waited by ``result()`` or ``paddle.clear_async_save_task_queue()``, otherwise None.
+
+    Note:
+        The local tensors of a rank are split into files of about MAX_FILE_BYTES, which are written by a thread pool. Each file, including the metadata file, is written to a temporary file and renamed when finished. The metadata file is written after the local files of the coordinator rank.
 
     Examples:
         .. code-block:: python
@@ -127,6 +318,11 @@ def save_state_dict(
             >>> sharded_w1 = dist.shard_tensor(w1, mesh, [dist.Shard(0), dist.Replicate()])
             >>> state_dict = {"w1": sharded_w1}
             >>> dist.save_state_dict(state_dict, "./checkpoint")
+            >>> task = dist.save_state_dict(state_dict, "./checkpoint", async_save=True)
+            >>> # do some calculations here
+            >>> task.result()
+            >>> # only save the tensors changed since ./checkpoint
+            >>> dist.save_state_dict(state_dict, "./checkpoint_1", base_path="./checkpoint")
             >>> # doctest: -SKIP
 
     """
@@ -150,92 +346,207 @@ def save_state_dict(
             # Init the default global process group
             paddle.distributed.init_parallel_env()
 
-        unique_id = 0
-        file_name = ""
-        while True:
-            file_name = f"{paddle.distributed.get_rank()}_{unique_id}.distcp"
-            if not os.path.exists(os.path.join(path, file_name)):
-                break
-            unique_id += 1
-        logger.debug(f"file_name:{file_name}")
-        if use_dist:
-            check_file_name(file_name, process_group)
-            # the parameter_name and order in state_dict should be the same
-            check_state_dict(flat_state_dict, process_group)
-        metadata = Metadata()
-        local_state_dict = {}
-        local_state_dict_metadata = {}
-        local_storage_metadata = {}
-        for key, val in flat_state_dict.items():
-            if isinstance(val, paddle.Tensor):
-                # Case1: not initialized means this tensor is placed in another mesh which do not contain this rank
-                if not val._is_initialized():
-                    continue
-                if val.is_dist():
-                    # when val is scalar, the shape is []
-                    (
-                        local_shape,
-                        global_offset,
-                    ) = (
-                        compute_local_shape_and_global_offset(
-                            val.shape,
-                            val.process_mesh,
-                            val.placements,
-                        )
-                        if len(val.shape) > 0
-                        else ((), ())
-                    )
-                    if local_shape is None or global_offset is None:
-                        continue
-                    local_tensor = val._local_value()
-                    # Note: The local_tensor must keep the same name with the original tensor. Otherwise, the StructuredToParameterName@@ mapping will be wrong.
-                    local_tensor.name = val.name
-                else:
-                    local_shape = tuple(val.shape)
-                    global_offset = (
-                        tuple([0] * len(val.shape))
-                        if len(val.shape) > 0
-                        else ()
+        rank = paddle.distributed.get_rank()
+        # NOTE: the unique_id is reserved until the files are written, so
+        # that a save issued before an async save finishes does not reuse it
+        unique_id = reserve_unique_id(path, rank)
+        try:
+            task = _save_state_dict_impl(
+                flat_state_dict,
+                mapping,
+                path,
+                process_group,
+                coordinator_rank,
+                async_save,
+                incremental,
+                base_path,
+                use_dist,
+                rank,
+                unique_id,
+            )
+        except:
+            release_unique_id(path, rank, unique_id)
+            raise
+        if task is None:
+            release_unique_id(path, rank, unique_id)
+        return task
+
+
+def _save_state_dict_impl(
+    flat_state_dict,
+    mapping,
+    path,
+    process_group,
+    coordinator_rank,
+    async_save,
+    incremental,
+    base_path,
+    use_dist,
+    rank,
+    unique_id,
+):
+    # the reservation of unique_id is released by the async writer if a
+    # task is returned, otherwise by the caller
+    file_name = get_file_name(rank, unique_id, 0)
+    logger.debug(f"file_name:{file_name}")
+    if use_dist:
+        check_file_name(file_name, process_group)
+        # the parameter_name and order in state_dict should be the same
+        check_state_dict(flat_state_dict, process_group)
+    metadata = Metadata()
+    local_state_dict = {}
+    local_state_dict_metadata = {}
+    local_storage_metadata = {}
+    for key, val in flat_state_dict.items():
+        if isinstance(val, paddle.Tensor):
+            # Case1: not initialized means this tensor is placed in another mesh which do not contain this rank
+            if not val._is_initialized():
+                continue
+            if val.is_dist():
+                # when val is scalar, the shape is []
+                (
+                    local_shape,
+                    global_offset,
+                ) = (
+                    compute_local_shape_and_global_offset(
+                        val.shape,
+                        val.process_mesh,
+                        val.placements,
                     )
-                    local_tensor = val
-                local_state_dict[key] = local_tensor
-                local_state_dict_metadata[key] = LocalTensorMetadata(
-                    global_offset, local_shape
+                    if len(val.shape) > 0
+                    else ((), ())
                 )
-                local_storage_metadata[
-                    LocalTensorIndex(key, tuple(global_offset))
-                ] = file_name
-
-        global_state_dict_metadata = []
-        global_storage_metadata = []
-        global_flatten_mapping = []
-        if use_dist:
-            paddle.distributed.all_gather_object(
-                global_state_dict_metadata,
-                local_state_dict_metadata,
-                process_group,
+                if local_shape is None or global_offset is None:
+                    continue
+                local_tensor = val._local_value()
+                # Note: The local_tensor must keep the same name with the original tensor. Otherwise, the StructuredToParameterName@@ mapping will be wrong.
+                local_tensor.name = val.name
+            else:
+                local_shape = tuple(val.shape)
+                global_offset = (
+                    tuple([0] * len(val.shape)) if len(val.shape) > 0 else ()
+                )
+                local_tensor = val
+            local_state_dict[key] = local_tensor
+            local_state_dict_metadata[key] = LocalTensorMetadata(
+                global_offset, local_shape
             )
-            paddle.distributed.all_gather_object(
-                global_storage_metadata, local_storage_metadata, process_group
+
+    incremental = incremental or base_path is not None
+    local_fingerprints = {}
+    if incremental:
+        base_storage_metadata, base_fingerprints = (
+            load_base_metadata(base_path) if base_path is not None else ({}, {})
+        )
+        for key in list(local_state_dict.keys()):
+            index = LocalTensorIndex(
+                key, tuple(local_state_dict_metadata[key].global_offset)
             )
-            paddle.distributed.all_gather_object(
-                global_flatten_mapping, mapping, process_group
+            # hashed by the seed of the base to be compared
+            fingerprint = compute_fingerprint(
+                local_state_dict[key],
+                fingerprint_seed(base_fingerprints.get(index)),
             )
-        else:
-            global_state_dict_metadata.append(local_state_dict_metadata)
-            global_storage_metadata.append(local_storage_metadata)
-            global_flatten_mapping.append(mapping)
+            local_fingerprints[index] = fingerprint
+            if base_fingerprints.get(index) != fingerprint:
+                continue
+            # unchanged tensor is referenced instead of written, the
+            # reference is relative to path so that the checkpoints
+            # can be moved together
+            local_storage_metadata[index] = os.path.relpath(
+                os.path.join(base_path, base_storage_metadata[index]),
+                path,
+            )
+            local_state_dict.pop(key)
+
+    file_names = []
+    for file_idx, keys in enumerate(split_state_dict(local_state_dict)):
+        file_names.append(get_file_name(rank, unique_id, file_idx))
+        for key in keys:
+            global_offset = local_state_dict_metadata[key].global_offset
+            local_storage_metadata[
+                LocalTensorIndex(key, tuple(global_offset))
+            ] = file_names[-1]
+
+    global_state_dict_metadata = []
+    global_storage_metadata = []
+    global_flatten_mapping = []
+    if use_dist:
+        paddle.distributed.all_gather_object(
+            global_state_dict_metadata,
+            local_state_dict_metadata,
+            process_group,
+        )
+        paddle.distributed.all_gather_object(
+            global_storage_metadata, local_storage_metadata, process_group
+        )
+        paddle.distributed.all_gather_object(
+            global_flatten_mapping, mapping, process_group
+        )
+    else:
+        global_state_dict_metadata.append(local_state_dict_metadata)
+        global_storage_metadata.append(local_storage_metadata)
+        global_flatten_mapping.append(mapping)
 
-        metadata.state_dict_metadata = merge_state_dict_metadata(
-            global_state_dict_metadata
+    global_fingerprints = []
+    if incremental and use_dist:
+        paddle.distributed.all_gather_object(
+            global_fingerprints, local_fingerprints, process_group
         )
-        metadata.storage_metadata = dedup_key_in_dict(global_storage_metadata)
-        metadata.flat_mapping = dedup_key_in_dict(global_flatten_mapping)
-        if coordinator_rank == paddle.distributed.get_rank():
-            logger.debug(f"metadata:{metadata}")
-            paddle.save(metadata, os.path.join(path, f"{unique_id}.metadata"))
-        logger.debug(f"local_state_dict:{local_state_dict}")
-        dedup_tensor(
-            local_state_dict, local_storage_metadata, metadata.storage_metadata
+    elif incremental:
+        global_fingerprints.append(local_fingerprints)
+
+    metadata.state_dict_metadata = merge_state_dict_metadata(
+        global_state_dict_metadata
+    )
+    metadata.storage_metadata = dedup_key_in_dict(global_storage_metadata)
+    metadata.flat_mapping = dedup_key_in_dict(global_flatten_mapping)
+    if incremental:
+        metadata.fingerprints = dedup_key_in_dict(global_fingerprints)
+    logger.debug(f"local_state_dict:{local_state_dict}")
+    dedup_tensor(
+        local_state_dict, local_storage_metadata, metadata.storage_metadata
+    )
+
+    if async_save:
+        # snapshot tensors before returning
+        engine = paddle_io._async_save_engine
+        local_state_dict, buffers, nbytes, event = engine._stage(
+            local_state_dict
         )
-        paddle.save(local_state_dict, os.path.join(path, file_name))
+
+    index_to_file = {
+        index.tensor_key: name for index, name in local_storage_metadata.items()
+    }
+    # the first file is always written even if empty, which occupies
+    # the unique_id of this checkpoint after it is written, before that
+    # the unique_id is held by reserve_unique_id
+    file_to_state_dict = {file_names[0]: {}}
+    for key, val in local_state_dict.items():
+        file_to_state_dict.setdefault(index_to_file[key], {})[key] = val
+
+    if coordinator_rank == rank:
+        logger.debug(f"metadata:{metadata}")
+    else:
+        metadata = None
+    metadata_file = f"{unique_id}.metadata"
+    if not async_save:
+        write_checkpoint(path, file_to_state_dict, metadata_file, metadata)
+        return
+
+    def write_async():
+        try:
+            if event is not None:
+                event.synchronize()
+            write_checkpoint(path, file_to_state_dict, metadata_file, metadata)
+        finally:
+            engine._pool.release(buffers, nbytes)
+            release_unique_id(path, rank, unique_id)
+
+    try:
+        task = get_async_executor().submit(write_async)
+    except:
+        engine._pool.release(buffers, nbytes)
+        raise
+    paddle_io.async_save_queue.append(task)
+    return task
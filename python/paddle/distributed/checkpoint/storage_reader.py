@@ -0,0 +1,251 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import io
+import itertools
+import mmap
+import os
+import pickle
+import struct
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import paddle
+from paddle.distributed.fleet.utils.log_util import logger
+
+# thread number to read checkpoint files
+NUM_READ_THREADS = 8
+# bytes objects smaller than this are read into memory in indexing
+MIN_LAZY_BYTES = 64 * 1024
+
+# NOTE: indexing relies on the frames of the pure Python unpickler, which
+# are internals of pickle module, files are loaded by paddle.load on
+# python versions out of this range
+_INDEX_PYTHON_VERSIONS = ((3, 8), (3, 13))
+
+_NUMPY_RECONSTRUCT = {
+    ('numpy.core.multiarray', '_reconstruct'),
+    ('numpy._core.multiarray', '_reconstruct'),
+}
+
+
+class _FileRange:
+    def __init__(self, offset, nbytes):
+        self.offset = offset
+        self.nbytes = nbytes
+
+
+class _LazyArray:
+    """
+    A numpy array pickled in a checkpoint file, which records the byte
+    range of its data instead of reading it.
+    """
+
+    def __init__(self, *args):
+        self.shape = None
+        self.dtype = None
+        self.order = 'C'
+        self.data = None
+
+    def __setstate__(self, state):
+        # the state of numpy.ndarray.__reduce__
+        _, shape, dtype, is_fortran, data = state
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.order = 'F' if is_fortran else 'C'
+        self.data = data
+
+
+class _IndexUnpickler(pickle._Unpickler):
+    """
+    Unpickler to index a file saved by paddle.save, numpy arrays are
+    unpickled as :class:`_LazyArray` and their data outside pickle frames
+    are skipped by seeking instead of reading.
+    """
+
+    dispatch = pickle._Unpickler.dispatch.copy()
+
+    def __init__(self, file):
+        super().__init__(file)
+        self._file = file
+
+    def find_class(self, module, name):
+        if (module, name) in _NUMPY_RECONSTRUCT:
+            return _LazyArray
+        return super().find_class(module, name)
+
+    def _load_bytes(self, nbytes):
+        # NOTE: large bytes are written outside pickle frames, which is
+        # the case that current frame is exhausted
+        unframer = getattr(self, '_unframer', None)
+        if not hasattr(unframer, 'current_frame'):
+            raise pickle.UnpicklingError("pickle frames are not accessible")
+        frame = unframer.current_frame
+        if frame is not None:
+            pos = frame.tell()
+            end = frame.seek(0, io.SEEK_END)
+            frame.seek(pos)
+            if pos < end:
+                self.append(self.read(nbytes))
+                return
+            unframer.current_frame = None
+        if nbytes < MIN_LAZY_BYTES:
+            self.append(self.read(nbytes))
+            return
+        offset = self._file.tell()
+        self._file.seek(nbytes, io.SEEK_CUR)
+        self.append(_FileRange(offset, nbytes))
+
+    def load_binbytes(self):
+        (nbytes,) = struct.unpack('<I', self.read(4))
+        self._load_bytes(nbytes)
+
+    def load_binbytes8(self):
+        (nbytes,) = struct.unpack('<Q', self.read(8))
+        self._load_bytes(nbytes)
+
+    dispatch[pickle.BINBYTES[0]] = load_binbytes
+    dispatch[pickle.BINBYTES8[0]] = load_binbytes8
+
+
+class CheckpointFileReader:
+    """
+    Reader of checkpoint files saved by save_state_dict, which reads the
+    byte ranges of tensor slices only instead of loading whole files.
+
+    A file is indexed once by unpickling it without reading the data of
+    numpy arrays, and then memory-mapped, tensor slices are copied out of
+    the mapped file so only the pages of the slices are read. Files can
+    not be indexed are loaded by paddle.load.
+
+    Args:
+        path(str): The directory of checkpoint files.
+        num_threads(int): Thread number to read slices in parallel.
+    """
+
+    def __init__(self, path, num_threads=NUM_READ_THREADS):
+        self.path = path
+        self.num_threads = num_threads
+        self._lock = threading.Lock()
+        self._file_locks = collections.defaultdict(threading.Lock)
+        self._files = {}
+        self._mmaps = []
+
+    def _load_file(self, file_path):
+        return {
+            k: v.numpy() if isinstance(v, paddle.Tensor) else v
+            for k, v in paddle.load(file_path, keep_name_table=True).items()
+        }
+
+    def _index_file(self, file_name):
+        file_path = os.path.join(self.path, file_name)
+        low, high = _INDEX_PYTHON_VERSIONS
+        if not low <= sys.version_info[:2] < high:
+            return self._load_file(file_path)
+        try:
+            with open(file_path, 'rb') as f:
+                obj = _IndexUnpickler(f).load()
+            if not isinstance(obj, dict) or 'UnpackBigParamInfor@@' in obj:
+                raise ValueError(f"unsupported checkpoint file {file_name}")
+        except Exception as e:
+            logger.debug(f"load {file_name} by paddle.load for {e}")
+            return self._load_file(file_path)
+
+        buffer = None
+        if any(
+            isinstance(v, _LazyArray) and isinstance(v.data, _FileRange)
+            for v in obj.values()
+        ):
+            with open(file_path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            with self._lock:
+                self._mmaps.append(buffer)
+        for key, value in obj.items():
+            if not isinstance(value, _LazyArray):
+                continue
+            if isinstance(value.data, _FileRange):
+                obj[key] = np.ndarray(
+                    value.shape,
+                    dtype=value.dtype,
+                    buffer=buffer,
+                    offset=value.data.offset,
+                    order=value.order,
+                )
+            else:
+                obj[key] = np.frombuffer(value.data, dtype=value.dtype).reshape(
+                    value.shape, order=value.order
+                )
+        return obj
+
+    def get_file(self, file_name):
+        # index each file once among threads
+        with self._file_locks[file_name]:
+            if file_name not in self._files:
+                self._files[file_name] = self._index_file(file_name)
+            return self._files[file_name]
+
+    def read(self, file_name, tensor_key, offsets, lengths):
+        """
+        Read the slice of tensor in (offsets, lengths) into a numpy array.
+        """
+        storage = self.get_file(file_name)
+        assert tensor_key in storage, f"{tensor_key} not in {file_name}"
+        array = storage[tensor_key]
+        if len(lengths) > 0:
+            array = array[
+                tuple(
+                    slice(offset, offset + length)
+                    for offset, length in zip(offsets, lengths)
+                )
+            ]
+        return np.array(array, copy=True, order='C')
+
+    def read_items(self, items):
+        """
+        Read items in parallel and yield the numpy arrays in order, at most
+        2 * num_threads items are read ahead.
+
+        Args:
+            items(list): list of (file_name, tensor_key, offsets, lengths).
+        """
+        window = 2 * self.num_threads
+        items = iter(items)
+        with ThreadPoolExecutor(
+            max_workers=self.num_threads,
+            thread_name_prefix="dist_ckpt_reader",
+        ) as executor:
+            futures = collections.deque(
+                executor.submit(self.read, *item)
+                for item in itertools.islice(items, window)
+            )
+            while futures:
+                array = futures.popleft().result()
+                item = next(items, None)
+                if item is not None:
+                    futures.append(executor.submit(self.read, *item))
+                yield array
+
+    def close(self):
+        self._files = {}
+        for buffer in self._mmaps:
+            try:
+                buffer.close()
+            except BufferError:
+                # still referenced by arrays out of reader
+                pass
+        self._mmaps = []
@@ -14,6 +14,9 @@
 
 
 import copy
+import functools
+import hashlib
+import random
 from typing import List, Tuple, Union
 
 import numpy as np
@@ -107,3 +110,111 @@ def unflatten_state_dict(flat_state_dict, mapping):
         tmp[key_tuple[-1]] = value
 
     return state_dict
+
+
+# bytes of a tensor reduced at a time in computing fingerprint on device
+FINGERPRINT_CHUNK_BYTES = 4 * 1024 * 1024
+# bytes of a row of a chunk, the columns and rows are hashed by different
+# multipliers
+_FINGERPRINT_ROW_BYTES = 4096
+# primes below 2**31, the polynomial hash over each is computed in int64
+_FINGERPRINT_MODULI = (2147483647, 2147483629, 2147483587, 2147483579)
+# seed of the multipliers of fingerprints computed by this process
+_FINGERPRINT_SEED = random.SystemRandom().getrandbits(63)
+
+
+@functools.lru_cache(maxsize=4)
+def _fingerprint_powers(seed):
+    """
+    Return the multipliers of chunks drawn from seed, and the powers of the
+    multipliers of the columns and rows of a chunk.
+    """
+    rng = random.Random(seed)
+    rows = FINGERPRINT_CHUNK_BYTES // _FINGERPRINT_ROW_BYTES
+    chunk_multipliers = []
+    col_powers = np.zeros(
+        [len(_FINGERPRINT_MODULI), _FINGERPRINT_ROW_BYTES], dtype='int64'
+    )
+    row_powers = np.zeros([len(_FINGERPRINT_MODULI), rows], dtype='int64')
+    for i, p in enumerate(_FINGERPRINT_MODULI):
+        col_r, row_r, chunk_r = (rng.randrange(256, p - 1) for _ in range(3))
+        chunk_multipliers.append(chunk_r)
+        for j in range(_FINGERPRINT_ROW_BYTES):
+            col_powers[i, j] = pow(col_r, j, p)
+        for j in range(rows):
+            row_powers[i, j] = pow(row_r, j, p)
+    return chunk_multipliers, col_powers, row_powers
+
+
+def _device_checksum(tensor, seed):
+    # NOTE: the byte b of column x, row y and chunk z is hashed to the sum
+    # of b * u**x * v**y * w**z mod p for random multipliers u, v, w of each
+    # modulus p, so the data is reduced on device and only the hashes are
+    # copied to host. Two different byte strings of the same length collide
+    # with probability at most (4096 + 1024 + chunks) / p for each modulus.
+    chunk_multipliers, col_powers, row_powers = _fingerprint_powers(seed)
+    col_powers = paddle.to_tensor(col_powers, place=tensor.place)
+    row_powers = paddle.to_tensor(row_powers, place=tensor.place)
+    data = paddle.view(tensor.reshape([-1]), paddle.uint8)
+    hashes = []
+    for z, start in enumerate(range(0, data.shape[0], FINGERPRINT_CHUNK_BYTES)):
+        chunk = data[start : start + FINGERPRINT_CHUNK_BYTES].astype('int64')
+        size = chunk.shape[0]
+        rows = -(-size // _FINGERPRINT_ROW_BYTES)
+        if rows * _FINGERPRINT_ROW_BYTES > size:
+            chunk = paddle.concat(
+                [
+                    chunk,
+                    paddle.zeros(
+                        [rows * _FINGERPRINT_ROW_BYTES - size], dtype='int64'
+                    ),
+                ]
+            )
+        chunk = chunk.reshape([rows, _FINGERPRINT_ROW_BYTES])
+        chunk_hashes = []
+        for i, p in enumerate(_FINGERPRINT_MODULI):
+            row_hash = (chunk * col_powers[i]).sum(axis=1) % p
+            chunk_hash = ((row_hash * row_powers[i, :rows]) % p).sum() % p
+            chunk_hashes.append(
+                chunk_hash * pow(chunk_multipliers[i], z, p) % p
+            )
+        hashes.append(paddle.stack(chunk_hashes))
+    if len(hashes) == 0:
+        return np.zeros([len(_FINGERPRINT_MODULI)], dtype='int64')
+    return paddle.add_n(hashes).numpy() % np.array(_FINGERPRINT_MODULI)
+
+
+def fingerprint_seed(fingerprint):
+    """
+    Return the seed a fingerprint of a tensor on device is computed with,
+    or None if the fingerprint is computed on CPU.
+    """
+    if fingerprint is None or ":" not in fingerprint:
+        return None
+    return int(fingerprint.split(":")[0], 16)
+
+
+def compute_fingerprint(tensor, seed=None):
+    """
+    Compute the fingerprint of the shape, dtype and data of a tensor.
+
+    The data of a tensor on device is hashed on the device with the
+    multipliers drawn from seed, so that only the hashes are copied to
+    host, the data of a tensor on CPU is hashed directly.
+
+    Args:
+        tensor(paddle.Tensor): The tensor to compute the fingerprint.
+        seed(int|None): The seed of the fingerprint on device, which should
+            be the seed of the fingerprint to compare with, given by
+            ``fingerprint_seed``. If None, the seed of this process is used.
+            Default: None.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{tuple(tensor.shape)}{tensor.dtype}".encode())
+    if tensor.place.is_cpu_place():
+        array = np.ascontiguousarray(tensor.numpy())
+        hasher.update(array.reshape(-1).view(np.uint8).data)
+        return hasher.hexdigest()
+    seed = _FINGERPRINT_SEED if seed is None else seed
+    hasher.update(_device_checksum(tensor, seed).tobytes())
+    return f"{seed:x}:{hasher.hexdigest()}"
@@ -17,6 +17,7 @@ import warnings
 import paddle
 import paddle.distributed as dist
 from paddle import framework
+from paddle.profiler.timer import benchmark, in_telemetry_mode
 
 
 class Group:
@@ -284,11 +285,17 @@ def wait(tensor, group=None, use_calc_stream=True):
     if group is not None and not group.is_member():
         return
 
-    if use_calc_stream:
-        _sync_calc_stream(tensor)
-    else:
-        ring_id = 0 if group is None else group.id
-        _sync_comm_stream(tensor, ring_id)
+    if in_telemetry_mode():
+        benchmark().before_phase('communication')
+    try:
+        if use_calc_stream:
+            _sync_calc_stream(tensor)
+        else:
+            ring_id = 0 if group is None else group.id
+            _sync_comm_stream(tensor, ring_id)
+    finally:
+        if in_telemetry_mode():
+            benchmark().after_phase('communication')
 
 
 def barrier(group=None):
@@ -324,7 +331,13 @@ def barrier(group=None):
         else:
             device_id = place.get_device_id()
             task = group.process_group.barrier(device_id)
-        task.wait()
+        if in_telemetry_mode():
+            benchmark().before_phase('communication')
+        try:
+            task.wait()
+        finally:
+            if in_telemetry_mode():
+                benchmark().after_phase('communication')
         return
 
     ring_id = 0 if group is None else group.id
@@ -14,12 +14,15 @@
 
 import abc
 import functools
-import multiprocessing
+import hashlib
+import json
 import os
 import re
 import shutil
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # (TODO: GhostScreaming) It will be removed later.
 from paddle.base import core
@@ -443,6 +446,315 @@ def _handle_errors(max_time_out=None):
     return decorator
 
 
+class _FSMetaCache:
+    """
+    Cache of the metadata of remote paths, entries expire after ttl seconds
+    and are invalidated by the changes made by the client itself. The
+    listing of a directory also caches the types of its children.
+
+    Args:
+        ttl(float): Seconds to keep an entry, the cache is disabled if ttl
+            is not positive.
+    """
+
+    def __init__(self, ttl=0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # path -> (expire_time, (exists, is_dir)), is_dir may be None if
+        # the path exists but the type is unknown
+        self._stats = {}
+        # path -> (expire_time, (dirs, files))
+        self._listings = {}
+
+    @property
+    def enabled(self):
+        return self.ttl is not None and self.ttl > 0
+
+    @staticmethod
+    def _norm(fs_path):
+        return fs_path.rstrip("/") or "/"
+
+    def _get(self, entries, fs_path):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = entries.get(self._norm(fs_path))
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del entries[self._norm(fs_path)]
+                return None
+            return entry
+
+    def get_stat(self, fs_path):
+        """Return (exists, is_dir) if cached, otherwise None."""
+        entry = self._get(self._stats, fs_path)
+        return None if entry is None else entry[1]
+
+    def set_stat(self, fs_path, exists, is_dir=None):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._stats[self._norm(fs_path)] = (
+                time.time() + self.ttl,
+                (exists, is_dir),
+            )
+
+    def get_listing(self, fs_path):
+        entry = self._get(self._listings, fs_path)
+        return None if entry is None else entry[1]
+
+    def set_listing(self, fs_path, dirs, files):
+        if not self.enabled:
+            return
+        fs_path = self._norm(fs_path)
+        expire_time = time.time() + self.ttl
+        with self._lock:
+            self._listings[fs_path] = (expire_time, (list(dirs), list(files)))
+            self._stats[fs_path] = (expire_time, (True, True))
+            for name in dirs:
+                self._stats[f"{fs_path}/{name}"] = (expire_time, (True, True))
+            for name in files:
+                self._stats[f"{fs_path}/{name}"] = (expire_time, (True, False))
+
+    def invalidate(self, fs_path):
+        """
+        Invalidate the path, its children, the listing of its parent and the
+        ancestors cached as not exist.
+        """
+        if not self.enabled:
+            return
+        fs_path = self._norm(fs_path)
+        prefix = fs_path + "/"
+        with self._lock:
+            for entries in [self._stats, self._listings]:
+                for path in list(entries.keys()):
+                    if path == fs_path or path.startswith(prefix):
+                        del entries[path]
+            parent = os.path.dirname(fs_path)
+            self._listings.pop(parent, None)
+            while parent and parent != fs_path:
+                entry = self._stats.get(parent)
+                if entry is not None and not entry[1][0]:
+                    del self._stats[parent]
+                fs_path, parent = parent, os.path.dirname(parent)
+
+
+# files smaller than this are transferred in batches by one command
+SMALL_FILE_BYTES = 64 * 1024 * 1024
+# max number of files transferred by one command
+MAX_BATCH_FILES = 32
+
+
+def _local_md5(path, chunk_size=4 * 1024 * 1024):
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def _local_files(local_path):
+    """Return [(relative_path, path)] of the files under local_path."""
+    if not os.path.isdir(local_path):
+        return [(os.path.basename(local_path), local_path)]
+    files = []
+    for root, _, names in os.walk(local_path):
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, local_path).replace(os.sep, "/")
+            files.append((rel_path, path))
+    return files
+
+
+class _TransferManifest:
+    """
+    Manifest of the files finished by transfers, appended as json lines, so
+    an interrupted transfer skips the finished files when restarted.
+
+    Args:
+        path(str|None): The local manifest file, nothing is saved if None.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        if path is None or not os.path.exists(path):
+            return
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # the last line is partial if interrupted when writing
+                    continue
+                if entry.get("removed"):
+                    self._entries.pop(entry["key"], None)
+                else:
+                    self._entries[entry["key"]] = entry
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def is_done(self, key, local_file, size=None):
+        """
+        Whether the file is finished and the local file is not modified
+        since, size is the remote size of the file if known.
+        """
+        entry = self._entries.get(key)
+        if entry is None or not os.path.isfile(local_file):
+            return False
+        stat = os.stat(local_file)
+        return (
+            entry["size"] == stat.st_size
+            and entry["mtime"] == stat.st_mtime
+            and (size is None or size == stat.st_size)
+        )
+
+    def _append(self, entry):
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def add(self, key, local_file, md5=None):
+        stat = os.stat(local_file)
+        entry = {
+            "key": key,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "md5": md5,
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._append(entry)
+
+    def remove(self, key):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._append({"key": key, "removed": True})
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            if self.path is not None and os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class _ParallelTransfer:
+    """
+    Transfer files by a pool of threads, the larger tasks first so that the
+    threads finish at about the same time. A failed task is retried alone
+    and the files of finished tasks are recorded to the manifest.
+
+    If checksum is enabled, the md5 of local files are computed by another
+    thread, which overlaps with the uploading of the files, and a downloaded
+    file is verified by the md5 recorded in the manifest if the size of the
+    file is not changed.
+
+    Args:
+        transfer(callable): transfer(srcs, dst) transfers the files, and
+            raises ExecuteError on failure.
+        upload(bool): Whether the sources are local files.
+        manifest(_TransferManifest): The manifest to record the files.
+        num_threads(int): Number of tasks transferred at the same time.
+        retry_times(int): Times to retry a failed task.
+        retry_interval(float): Seconds to wait before a retry.
+        checksum(bool): Whether to compute the md5 of files.
+    """
+
+    def __init__(
+        self,
+        transfer,
+        upload,
+        manifest,
+        num_threads=1,
+        retry_times=3,
+        retry_interval=1.0,
+        checksum=False,
+    ):
+        self.transfer = transfer
+        self.upload = upload
+        self.manifest = manifest
+        self.num_threads = max(num_threads, 1)
+        self.retry_times = retry_times
+        self.retry_interval = retry_interval
+        self.checksum = checksum
+
+    def run(self, tasks):
+        """
+        Run the tasks and raise the first error after all tasks are done.
+
+        Args:
+            tasks(list): list of (files, dst), files is a list of
+                (key, src, local_file, size), the size of a remote file may
+                be None if unknown.
+        """
+        tasks = sorted(tasks, key=lambda task: -sum(f[3] or 0 for f in task[0]))
+        with ThreadPoolExecutor(
+            max_workers=self.num_threads, thread_name_prefix="fs_transfer"
+        ) as executor, ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="fs_checksum"
+        ) as checksum_executor:
+            futures = [
+                executor.submit(self._run_task, task, checksum_executor)
+                for task in tasks
+            ]
+            errors = [future.exception() for future in futures]
+        errors = [e for e in errors if e is not None]
+        if errors:
+            raise errors[0]
+
+    def _verify(self, files, checksum_executor):
+        """Verify the downloaded files and return their md5."""
+        for key, _, local_file, size in files:
+            if not os.path.isfile(local_file) or (
+                size is not None and os.path.getsize(local_file) != size
+            ):
+                raise ExecuteError(f"size of {local_file} mismatches")
+        if not self.checksum:
+            return {}
+        md5s = {f[0]: checksum_executor.submit(_local_md5, f[2]) for f in files}
+        md5s = {key: md5.result() for key, md5 in md5s.items()}
+        for key, _, local_file, _ in files:
+            entry = self.manifest.get(key)
+            if (
+                entry is not None
+                and entry.get("md5") is not None
+                and entry["size"] == os.path.getsize(local_file)
+                and entry["md5"] != md5s[key]
+            ):
+                raise ExecuteError(f"md5 of {local_file} mismatches")
+        return md5s
+
+    def _run_task(self, task, checksum_executor):
+        files, dst = task
+        srcs = [f[1] for f in files]
+        md5s = {}
+        if self.upload and self.checksum:
+            md5s = {
+                f[0]: checksum_executor.submit(_local_md5, f[2]) for f in files
+            }
+        for i in range(self.retry_times + 1):
+            try:
+                self.transfer(srcs, dst)
+                if not self.upload:
+                    md5s = self._verify(files, checksum_executor)
+                break
+            except ExecuteError as e:
+                if i == self.retry_times:
+                    raise
+                logger.warning(f"retry to transfer {srcs} to {dst}: {e}")
+                time.sleep(self.retry_interval)
+        for key, _, local_file, _ in files:
+            md5 = md5s.get(key)
+            if md5 is not None and not isinstance(md5, str):
+                md5 = md5.result()
+            self.manifest.add(key, local_file, md5)
+
+
 class HDFSClient(FS):
     """
     A tool of HDFS.
@@ -451,6 +763,9 @@ class HDFSClient(FS):
         hadoop_home(str): Hadoop home.
         configs(dict): Hadoop config. It is a dictionary and needs to contain the
             keys: "fs.default.name" and "hadoop.job.ugi".
+        cache_ttl(float): Seconds to cache the existence, types and listings
+            of remote paths, changes made by other clients may be invisible
+            within it. Default is 0, which disables the cache.
 
     Examples:
 
@@ -476,8 +791,9 @@ class HDFSClient(FS):
         hadoop_home,
         configs,
         time_out=5 * 60 * 1000,  # ms
-        sleep_inter=1000,
-    ):  # ms
+        sleep_inter=1000,  # ms
+        cache_ttl=0,  # s
+    ):
         self.pre_commands = []
         hadoop_bin = '%s/bin/hadoop' % hadoop_home
         self.pre_commands.append(hadoop_bin)
@@ -495,6 +811,7 @@ class HDFSClient(FS):
         self._bd_err_re = re.compile(
             r'\s?responseErrorMsg\s?\:.*, errorCode\:\s?[0-9]+, path\:'
         )
+        self._cache = _FSMetaCache(cache_ttl)
 
     def _run_cmd(self, cmd, redirect_stderr=False, retry_times=5):
         exe_cmd = f"{self._base_cmd} -{cmd}"
@@ -506,14 +823,17 @@ class HDFSClient(FS):
             ret = int(ret)
             if ret == 0:
                 break
-            time.sleep(retry_sleep_second)
+            if x < retry_times:
+                time.sleep(retry_sleep_second)
         if ret == 134:
             raise FSShellCmdAborted(cmd)
 
         return ret, output.splitlines()
 
     def _run_safe_cmd(self, cmd, redirect_stderr=False, retry_times=5):
-        exe_cmd = [self._base_cmd] + cmd.split()
+        if isinstance(cmd, str):
+            cmd = cmd.split()
+        exe_cmd = self.pre_commands + cmd
         ret = 0
         output = ""
         retry_sleep_second = 3
@@ -533,13 +853,18 @@ class HDFSClient(FS):
             except subprocess.CalledProcessError as e:
                 ret = e.returncode
                 output = e.output
-                time.sleep(retry_sleep_second)
+                if x < retry_times:
+                    time.sleep(retry_sleep_second)
             except Exception as e:
+                ret = -1
+                output = str(e)
                 break
 
         if ret == 134:
             raise FSShellCmdAborted(cmd)
 
+        return ret, output.splitlines()
+
     @_handle_errors()
     def list_dirs(self, fs_path):
         """
@@ -609,6 +934,10 @@ class HDFSClient(FS):
         return self._ls_dir(fs_path)
 
     def _ls_dir(self, fs_path):
+        listing = self._cache.get_listing(fs_path)
+        if listing is not None:
+            return listing
+
         cmd = ["-ls", fs_path]
         ret, lines = self._run_safe_cmd(cmd)
 
@@ -628,6 +957,7 @@ class HDFSClient(FS):
             else:
                 files.append(p)
 
+        self._cache.set_listing(fs_path, dirs, files)
         return dirs, files
 
     def _test_match(self, lines):
@@ -672,6 +1002,10 @@ class HDFSClient(FS):
         return self._is_dir(fs_path)
 
     def _is_dir(self, fs_path):
+        stat = self._cache.get_stat(fs_path)
+        if stat is not None and stat[1] is not None:
+            return stat[1]
+
         cmd = f"test -d {fs_path}"
         ret, lines = self._run_cmd(cmd, redirect_stderr=True, retry_times=1)
         if ret:
@@ -681,8 +1015,10 @@ class HDFSClient(FS):
                 print('\n'.join(lines))
                 raise ExecuteError(cmd)
 
+            self._cache.set_stat(fs_path, True, False)
             return False
 
+        self._cache.set_stat(fs_path, True, True)
         return True
 
     def is_file(self, fs_path):
@@ -746,13 +1082,82 @@ class HDFSClient(FS):
                 >>> ret = client.is_exist("hdfs:/test_hdfs_client")
 
         """
+        stat = self._cache.get_stat(fs_path)
+        if stat is not None:
+            return stat[0]
+
         cmd = f"test -e {fs_path} "
         ret, out = self._run_cmd(cmd, redirect_stderr=True, retry_times=1)
         if ret != 0:
+            self._cache.set_stat(fs_path, False)
             return False
 
+        self._cache.set_stat(fs_path, True)
         return True
 
+    @staticmethod
+    def _strip_scheme(fs_path):
+        # the listed path may be qualified by the scheme and authority
+        fs_path = re.sub(r'^[a-zA-Z]+:(//[^/]*)?', '', fs_path)
+        return fs_path.rstrip("/") or "/"
+
+    @_handle_errors()
+    def batch_is_exist(self, fs_paths):
+        """
+        Whether the remote HDFS paths exist, which are tested by one command
+        and the types of them are cached.
+
+        Args:
+            fs_paths(list): The HDFS file paths.
+
+        Returns:
+            List: Whether each path exists.
+
+        Examples:
+
+            .. code-block:: python
+
+                >>> # doctest: +REQUIRES(env:DISTRIBUTED)
+                >>> from paddle.distributed.fleet.utils import HDFSClient
+
+                >>> hadoop_home = "/home/client/hadoop-client/hadoop/"
+                >>> configs = {
+                ...     "fs.default.name": "hdfs://xxx.hadoop.com:54310",
+                ...     "hadoop.job.ugi": "hello,hello123"
+                ... }
+
+                >>> client = HDFSClient(hadoop_home, configs)
+                >>> ret = client.batch_is_exist(["hdfs:/a", "hdfs:/b"])
+
+        """
+        exists = {}
+        uncached = []
+        for fs_path in fs_paths:
+            stat = self._cache.get_stat(fs_path)
+            if stat is not None:
+                exists[fs_path] = stat[0]
+            else:
+                uncached.append(fs_path)
+
+        if uncached:
+            cmd = "ls -d " + " ".join(uncached)
+            # not exist paths make the return code non-zero
+            ret, lines = self._run_cmd(cmd, retry_times=0)
+            if ret != 0 and self._test_match(lines):
+                raise ExecuteError(cmd)
+            listed = {}
+            for line in lines:
+                arr = line.split()
+                if len(arr) != 8:
+                    continue
+                listed[self._strip_scheme(arr[7])] = arr[0][0] == 'd'
+            for fs_path in uncached:
+                is_dir = listed.get(self._strip_scheme(fs_path))
+                exists[fs_path] = is_dir is not None
+                self._cache.set_stat(fs_path, exists[fs_path], is_dir)
+
+        return [exists[fs_path] for fs_path in fs_paths]
+
     def upload_dir(self, local_dir, dest_dir, overwrite=False):
         """
         upload dir to hdfs
@@ -771,17 +1176,110 @@ class HDFSClient(FS):
         if not self.is_exist(dest_dir):
             self.mkdirs(dest_dir)
         self._try_upload(local_dir, dest_dir)
+        self._cache.invalidate(dest_dir + "/" + local_basename)
+
+    def _ls_files(self, fs_path):
+        """
+        List the files under fs_path recursively, returns the directories
+        and {path: size} of the files, the paths are without the scheme.
+        """
+        cmd = f"ls -R {fs_path}"
+        ret, lines = self._run_cmd(cmd)
+        if ret != 0:
+            raise ExecuteError(cmd)
+        dirs = []
+        sizes = {}
+        for line in lines:
+            arr = line.split()
+            if len(arr) != 8:
+                continue
+            if arr[0][0] == 'd':
+                dirs.append(self._strip_scheme(arr[7]))
+            else:
+                sizes[self._strip_scheme(arr[7])] = int(arr[4])
+        return dirs, sizes
 
-    # can't retry
-    def upload(self, local_path, fs_path, multi_processes=5, overwrite=False):
+    @staticmethod
+    def _batch_tasks(files):
+        """
+        Group the small files of the same directory into tasks of one
+        command, files is a list of (key, src, local_file, size, dst).
         """
-        Upload the local path to remote HDFS.
+        tasks = []
+        batches = {}
+        for file in files:
+            size, dst = file[3], file[4]
+            if size is None or size >= SMALL_FILE_BYTES:
+                batches[dst] = [file]
+                continue
+            batch = batches.setdefault(os.path.dirname(dst), [])
+            batch.append(file)
+            if len(batch) == MAX_BATCH_FILES:
+                tasks.append(([f[:4] for f in batch], os.path.dirname(dst)))
+                del batches[os.path.dirname(dst)]
+        for dst_dir, batch in batches.items():
+            # a single file keeps its destination name
+            dst = batch[0][4] if len(batch) == 1 else dst_dir
+            tasks.append(([f[:4] for f in batch], dst))
+        return tasks
+
+    # NOTE: the transfer commands are run by threads, which are run by
+    # subprocess instead of core.shell_execute_cmd holding the GIL
+    def _put(self, srcs, dst):
+        cmd = ["-put", *srcs, dst]
+        ret, _ = self._run_safe_cmd(cmd, retry_times=0)
+        if ret != 0:
+            if len(srcs) == 1:
+                targets = [dst]
+            else:
+                targets = [f"{dst}/{os.path.basename(src)}" for src in srcs]
+            # remove the partial files, failures of not existed are ignored
+            self._run_safe_cmd(["-rm", *targets], retry_times=0)
+            raise ExecuteError(" ".join(cmd))
+
+    def _get(self, srcs, dst):
+        if len(srcs) == 1:
+            targets = [dst]
+        else:
+            targets = [os.path.join(dst, os.path.basename(src)) for src in srcs]
+        local_fs = LocalFS()
+        for target in targets:
+            local_fs.delete(target)
+        cmd = ["-get", *srcs, dst]
+        ret, _ = self._run_safe_cmd(cmd, retry_times=0)
+        if ret != 0:
+            for target in targets:
+                local_fs.delete(target)
+            raise ExecuteError(" ".join(cmd))
+
+    def upload(
+        self,
+        local_path,
+        fs_path,
+        multi_processes=5,
+        overwrite=False,
+        manifest_path=None,
+        checksum=False,
+    ):
+        """
+        Upload the local path to remote HDFS, the files under a local
+        directory are uploaded to the directory `fs_path` .
+
+        The files are uploaded by multiple threads, the small files of a
+        directory are uploaded by one command, and a failed command is
+        retried alone. The sizes of the uploaded files are verified after
+        the upload. If manifest_path is set, the uploaded files are recorded
+        to it, so the upload interrupted skips them when it is called again.
 
         Args:
             local_path(str): The local path.
             fs_path(str): The HDFS path.
-            multi_processes(int|1): the upload data process at the same time, default=5
+            multi_processes(int|5): The number of upload commands run at the same time, default=5
             overwrite(bool|False): will overwrite file on HDFS or not
+            manifest_path(str|None): The local file to record the uploaded
+                files to resume the upload. Default is None.
+            checksum(bool|False): Whether to record the md5 of the uploaded
+                files to the manifest, which is computed along the upload.
 
         Examples:
 
@@ -798,64 +1296,104 @@ class HDFSClient(FS):
 
                 >>> client = HDFSClient(hadoop_home, configs)
                 >>> client.upload("test_hdfs_client", "hdfs:/test_hdfs_client")
+                >>> client.upload(
+                ...     "checkpoint",
+                ...     "hdfs:/checkpoint",
+                ...     manifest_path="checkpoint.manifest",
+                ... )
 
         """
-
-        def __subprocess_upload(hdfs_path_single, datas):
-            for data in datas:
-                self._try_upload(data, hdfs_path_single)
-
-        def get_local_files(path):
-            """
-            get local files
-            Args:
-                path(str): local path
-            Returns:
-                list of local files
-            """
-            rlist = []
-
-            if not os.path.exists(path):
-                return rlist
-
-            if os.path.isdir(path):
-                for file in os.listdir(path):
-                    t = os.path.join(path, file)
-                    rlist.append(t)
-            else:
-                rlist.append(path)
-            return rlist
-
         local = LocalFS()
         if not local.is_exist(local_path):
             raise FSFileNotExistsError(f"{local_path} not exists")
 
-        all_files = get_local_files(local_path)
-        if not all_files:
+        manifest = _TransferManifest(manifest_path)
+        fs_exists = self.is_exist(fs_path)
+        if fs_exists and overwrite:
+            self.delete(fs_path)
+            self.mkdirs(fs_path)
+            manifest.clear()
+
+        local_files = _local_files(local_path)
+        if not local_files:
             print("there are nothing need to upload, function exit")
             return
 
-        if self.is_exist(fs_path) and overwrite:
-            self.delete(fs_path)
-            self.mkdirs(fs_path)
+        fs_path = fs_path.rstrip("/") or "/"
+        if os.path.isdir(local_path):
+            dst_dir = fs_path
+            remote_files = [f"{fs_path}/{key}" for key, _ in local_files]
+        elif fs_exists and self._is_dir(fs_path):
+            dst_dir = fs_path
+            remote_files = [f"{fs_path}/{local_files[0][0]}"]
+        else:
+            dst_dir = os.path.dirname(fs_path) or "/"
+            remote_files = [fs_path]
 
-        procs = []
-        for i in range(multi_processes):
-            process_datas = self._split_files(all_files, i, multi_processes)
-            p = multiprocessing.Process(
-                target=__subprocess_upload, args=(fs_path, process_datas)
-            )
-            procs.append(p)
-            p.start()
+        remote_sizes = {}
+        if fs_exists:
+            _, remote_sizes = self._ls_files(fs_path)
+        files = []
+        stale_files = []
+        for (key, local_file), remote_file in zip(local_files, remote_files):
+            remote_size = remote_sizes.get(self._strip_scheme(remote_file))
+            if manifest.is_done(
+                key, local_file, -1 if remote_size is None else remote_size
+            ):
+                continue
+            if remote_size is not None:
+                stale_files.append(remote_file)
+            size = os.path.getsize(local_file)
+            files.append((key, local_file, local_file, size, remote_file))
+        logger.info(
+            f"upload {len(files)} files to {fs_path}, skip {len(local_files) - len(files)} uploaded files"
+        )
+        if not files:
+            return
 
-        # complete the processes
-        for proc in procs:
-            proc.join()
+        # the stale files are not recorded by the manifest
+        for i in range(0, len(stale_files), MAX_BATCH_FILES):
+            cmd = "rm " + " ".join(stale_files[i : i + MAX_BATCH_FILES])
+            ret, _ = self._run_cmd(cmd)
+            if ret != 0:
+                raise ExecuteError(cmd)
+        remote_dirs = {os.path.dirname(f[4]) for f in files} | {dst_dir}
+        remote_dirs = sorted(
+            d for d in remote_dirs if self._strip_scheme(d) != "/"
+        )
+        for i in range(0, len(remote_dirs), MAX_BATCH_FILES):
+            cmd = "mkdir -p " + " ".join(remote_dirs[i : i + MAX_BATCH_FILES])
+            ret, _ = self._run_cmd(cmd)
+            if ret != 0:
+                raise ExecuteError(cmd)
+
+        transfer = _ParallelTransfer(
+            self._put,
+            upload=True,
+            manifest=manifest,
+            num_threads=multi_processes,
+            retry_interval=self._sleep_inter / 1000.0,
+            checksum=checksum,
+        )
+        try:
+            transfer.run(self._batch_tasks(files))
+        finally:
+            self._cache.invalidate(fs_path)
+
+        _, remote_sizes = self._ls_files(fs_path)
+        mismatched = []
+        for key, _, _, size, remote_file in files:
+            if remote_sizes.get(self._strip_scheme(remote_file)) != size:
+                mismatched.append(remote_file)
+                manifest.remove(key)
+        if mismatched:
+            raise ExecuteError(f"size of uploaded files mismatch: {mismatched}")
 
     @_handle_errors()
     def _try_upload(self, local_path, fs_path):
         cmd = f"put {local_path} {fs_path}"
         ret = 0
+        self._cache.invalidate(fs_path)
         try:
             ret, _ = self._run_cmd(cmd)
             if ret != 0:
@@ -864,16 +1402,36 @@ class HDFSClient(FS):
             self.delete(fs_path)
             raise e
 
-    # can't retry
-    def download(self, fs_path, local_path, multi_processes=5, overwrite=False):
-        """
-        Download remote HDFS path to the local.
+    def download(
+        self,
+        fs_path,
+        local_path,
+        multi_processes=5,
+        overwrite=False,
+        manifest_path=None,
+        checksum=False,
+    ):
+        """
+        Download remote HDFS path to the local, the files under a remote
+        directory are downloaded to the directory `local_path` .
+
+        The files are downloaded by multiple threads, the small files of a
+        directory are downloaded by one command, and a failed command is
+        retried alone. The sizes of the downloaded files are verified. If
+        manifest_path is set, the downloaded files are recorded to it, so
+        the download interrupted skips them when it is called again.
 
         Args:
             fs_path(str):  The HDFS path.
             local_path(str): The local path.
-            multi_processes(int|1): the download data process at the same time, default=1
+            multi_processes(int|5): The number of download commands run at the same time, default=5
             overwrite(bool): is overwrite
+            manifest_path(str|None): The local file to record the downloaded
+                files to resume the download. Default is None.
+            checksum(bool|False): Whether to record the md5 of the
+                downloaded files to the manifest, a file is verified by the
+                md5 already recorded if its size is not changed, e.g. by the
+                manifest of the upload.
 
         Examples:
 
@@ -892,38 +1450,59 @@ class HDFSClient(FS):
                 >>> client.download("hdfs:/test_hdfs_client", "./")
 
         """
-
-        def __subprocess_download(local_path, datas):
-            """
-            download file from HDFS
-            Args:
-                local_path(str): the local file path
-                datas(str): the hdfs file path list
-            """
-            for data in datas:
-                self._try_download(data, local_path)
-
         if not self.is_exist(fs_path):
             raise FSFileNotExistsError(f"{fs_path} not exits")
-        # download file
-        if self.is_file(fs_path):
-            return self._try_download(fs_path, local_path)
-        # download dir
-        dirs, all_filenames = self.ls_dir(fs_path)
-        all_files = [fs_path + "/" + i for i in all_filenames]
-        all_files.extend([fs_path + "/" + i for i in dirs])
-        procs = []
-        for i in range(multi_processes):
-            process_datas = self._split_files(all_files, i, multi_processes)
-            p = multiprocessing.Process(
-                target=__subprocess_download, args=(local_path, process_datas)
-            )
-            procs.append(p)
-            p.start()
 
-        # complete the processes
-        for proc in procs:
-            proc.join()
+        manifest = _TransferManifest(manifest_path)
+        fs_path = fs_path.rstrip("/") or "/"
+        remote_dirs, remote_sizes = self._ls_files(fs_path)
+        remote_files = []
+        # a file is listed as itself
+        is_file = not remote_dirs and list(remote_sizes) == [
+            self._strip_scheme(fs_path)
+        ]
+        if is_file:
+            size = next(iter(remote_sizes.values()), None)
+            key = os.path.basename(fs_path)
+            if os.path.isdir(local_path):
+                remote_files.append((key, os.path.join(local_path, key), size))
+            else:
+                remote_files.append((key, local_path, size))
+        else:
+            root = self._strip_scheme(fs_path)
+            prefix = "" if root == "/" else root
+            for path, size in sorted(remote_sizes.items()):
+                key = path[len(prefix) + 1 :]
+                remote_files.append((key, os.path.join(local_path, key), size))
+            # keep the empty directories
+            for path in remote_dirs:
+                os.makedirs(
+                    os.path.join(local_path, path[len(prefix) + 1 :]),
+                    exist_ok=True,
+                )
+
+        files = []
+        for key, local_file, size in remote_files:
+            if manifest.is_done(key, local_file, size):
+                continue
+            src = fs_path if is_file else f"{fs_path}/{key}"
+            files.append((key, src, local_file, size, local_file))
+        logger.info(
+            f"download {len(files)} files from {fs_path}, skip {len(remote_files) - len(files)} downloaded files"
+        )
+        for local_dir in {os.path.dirname(f[4]) for f in files}:
+            if local_dir:
+                os.makedirs(local_dir, exist_ok=True)
+
+        transfer = _ParallelTransfer(
+            self._get,
+            upload=False,
+            manifest=manifest,
+            num_threads=multi_processes,
+            retry_interval=self._sleep_inter / 1000.0,
+            checksum=checksum,
+        )
+        transfer.run(self._batch_tasks(files))
 
     @_handle_errors()
     def _try_download(self, fs_path, local_path):
@@ -967,6 +1546,7 @@ class HDFSClient(FS):
             return
 
         out_hdfs = False
+        self._cache.invalidate(fs_path)
 
         cmd = f"mkdir {fs_path} "
         ret, out = self._run_cmd(cmd, redirect_stderr=True)
@@ -980,6 +1560,7 @@ class HDFSClient(FS):
 
         if out_hdfs and not self.is_exist(fs_path):
             cmd = f"mkdir -p {fs_path}"
+            self._cache.invalidate(fs_path)
             ret, _ = self._run_cmd(cmd)
             if ret != 0:
                 raise ExecuteError(cmd)
@@ -1027,6 +1608,8 @@ class HDFSClient(FS):
     def _try_mv(self, fs_src_path, fs_dst_path):
         cmd = f"mv {fs_src_path} {fs_dst_path}"
         ret = 0
+        self._cache.invalidate(fs_src_path)
+        self._cache.invalidate(fs_dst_path)
         try:
             ret, _ = self._run_cmd(cmd, retry_times=1)
             if ret != 0:
@@ -1038,12 +1621,14 @@ class HDFSClient(FS):
 
     def _rmr(self, fs_path):
         cmd = f"rmr {fs_path}"
+        self._cache.invalidate(fs_path)
         ret, _ = self._run_cmd(cmd)
         if ret != 0:
             raise ExecuteError(cmd)
 
     def _rm(self, fs_path):
         cmd = f"rm {fs_path}"
+        self._cache.invalidate(fs_path)
         ret, _ = self._run_cmd(cmd)
         if ret != 0:
             raise ExecuteError(cmd)
@@ -1118,6 +1703,7 @@ class HDFSClient(FS):
     @_handle_errors()
     def _touchz(self, fs_path):
         cmd = f"touchz {fs_path}"
+        self._cache.invalidate(fs_path)
         ret, _ = self._run_cmd(cmd)
         if ret != 0:
             raise ExecuteError(cmd)
@@ -1417,16 +2003,43 @@ class AFSClient(FS):
             self.mkdirs(dest_dir)
         self._fs.upload(local_dir, dest_dir)
 
-    # can't retry
-    def upload(self, local_path, fs_path, multi_processes=1, overwrite=False):
-        """
-        Upload the local path to remote HDFS.
+    def _upload_file(self, srcs, dst):
+        if self._fs.upload(srcs[0], dst) != 0:
+            raise ExecuteError(f"upload {srcs[0]} {dst}")
+
+    def _download_file(self, srcs, dst):
+        LocalFS().delete(dst)
+        if self._fs.download(dst, srcs[0]) != 0:
+            LocalFS().delete(dst)
+            raise ExecuteError(f"download {srcs[0]} {dst}")
+
+    def upload(
+        self,
+        local_path,
+        fs_path,
+        multi_processes=1,
+        overwrite=False,
+        manifest_path=None,
+        checksum=False,
+    ):
+        """
+        Upload the local path to remote HDFS, the files under a local
+        directory are uploaded to the directory `fs_path` .
+
+        The files are uploaded by multiple threads and a failed file is
+        retried alone. If manifest_path is set, the uploaded files are
+        recorded to it, so the upload interrupted skips them when it is
+        called again.
 
         Args:
             local_path(str): The local path.
             fs_path(str): The HDFS path.
-            multi_processes(int|1): the upload data process at the same time, default=5
+            multi_processes(int|1): The number of files uploaded at the same time, default=1
             overwrite(bool|False): will overwrite file on HDFS or not
+            manifest_path(str|None): The local file to record the uploaded
+                files to resume the upload. Default is None.
+            checksum(bool|False): Whether to record the md5 of the uploaded
+                files to the manifest, which is computed along the upload.
 
         Examples:
 
@@ -1445,17 +2058,67 @@ class AFSClient(FS):
         if not local.is_exist(local_path):
             raise FSFileNotExistsError(f"{local_path} not exists")
 
-        self._fs.upload(local_path, fs_path)
+        manifest = _TransferManifest(manifest_path)
+        if overwrite:
+            manifest.clear()
 
-    def download(self, fs_path, local_path, multi_processes=1, overwrite=False):
-        """
-        Download remote HDFS path to the local.
+        fs_path = fs_path.rstrip("/") or "/"
+        files = []
+        remote_dirs = set()
+        for key, local_file in _local_files(local_path):
+            if os.path.isdir(local_path):
+                remote_file = f"{fs_path}/{key}"
+                remote_dirs.add(os.path.dirname(remote_file))
+            else:
+                remote_file = fs_path
+            # the remote size is unknown, only the existence is checked
+            if manifest.is_done(key, local_file) and self._fs.exist(
+                remote_file
+            ):
+                continue
+            size = os.path.getsize(local_file)
+            files.append(([(key, local_file, local_file, size)], remote_file))
+        for remote_dir in sorted(remote_dirs):
+            if not self.is_exist(remote_dir):
+                self.mkdirs(remote_dir)
+
+        transfer = _ParallelTransfer(
+            self._upload_file,
+            upload=True,
+            manifest=manifest,
+            num_threads=multi_processes,
+            checksum=checksum,
+        )
+        transfer.run(files)
+
+    def download(
+        self,
+        fs_path,
+        local_path,
+        multi_processes=1,
+        overwrite=False,
+        manifest_path=None,
+        checksum=False,
+    ):
+        """
+        Download remote HDFS path to the local, the files under a remote
+        directory are downloaded to the directory `local_path` .
+
+        The files are downloaded by multiple threads and a failed file is
+        retried alone. If manifest_path is set, the downloaded files are
+        recorded to it, so the download interrupted skips them when it is
+        called again.
 
         Args:
             fs_path(str):  The HDFS path.
             local_path(str): The local path.
-            multi_processes(int|1): the download data process at the same time, default=1
+            multi_processes(int|1): The number of files downloaded at the same time, default=1
             overwrite(bool): is overwrite
+            manifest_path(str|None): The local file to record the downloaded
+                files to resume the download. Default is None.
+            checksum(bool|False): Whether to record the md5 of the
+                downloaded files to the manifest, a file is verified by the
+                md5 already recorded if its size is not changed.
 
         Examples:
 
@@ -1469,37 +2132,40 @@ class AFSClient(FS):
                 >>> client.download("hdfs:/test_hdfs_client", "./")
 
         """
-
-        def __subprocess_download(local_path, datas):
-            """
-            download file from HDFS
-            Args:
-                local_path(str): the local file path
-                datas(str): the hdfs file path list
-            """
-            for data in datas:
-                self._fs.download(local_path, data)
-
         if not self.is_exist(fs_path):
             raise FSFileNotExistsError(f"{fs_path} not exits")
-        # download file
+
+        manifest = _TransferManifest(manifest_path)
+        fs_path = fs_path.rstrip("/") or "/"
         if self.is_file(fs_path):
-            return self._fs.download(local_path, fs_path)
-        # download dir
-        _, all_filenames = self.ls_dir(fs_path)
-        all_files = [fs_path + i for i in all_filenames]
-        procs = []
-        for i in range(multi_processes):
-            process_datas = self._split_files(all_files, i, multi_processes)
-            p = multiprocessing.Process(
-                target=__subprocess_download, args=(local_path, process_datas)
-            )
-            procs.append(p)
-            p.start()
+            key = os.path.basename(fs_path)
+            if os.path.isdir(local_path):
+                remote_files = [(key, fs_path, os.path.join(local_path, key))]
+            else:
+                remote_files = [(key, fs_path, local_path)]
+        else:
+            os.makedirs(local_path, exist_ok=True)
+            _, all_filenames = self.ls_dir(fs_path)
+            remote_files = []
+            for name in all_filenames:
+                key = os.path.basename(name)
+                remote_files.append(
+                    (key, f"{fs_path}/{key}", os.path.join(local_path, key))
+                )
 
-        # complete the processes
-        for proc in procs:
-            proc.join()
+        files = [
+            ([(key, remote_file, local_file, None)], local_file)
+            for key, remote_file, local_file in remote_files
+            if not manifest.is_done(key, local_file)
+        ]
+        transfer = _ParallelTransfer(
+            self._download_file,
+            upload=False,
+            manifest=manifest,
+            num_threads=multi_processes,
+            checksum=checksum,
+        )
+        transfer.run(files)
 
     def mkdirs(self, fs_path):
         """
@@ -40,6 +40,8 @@ class Context:
             self._enable_plugin()
         self.max_time_per_task = -1
         self.run_best = False
+        # monitor of the running task in auto tuner mode
+        self.trial_monitor = None
 
     def print(self):
         self.logger.info("-----------  Configuration  ----------------------")
@@ -99,6 +99,19 @@ class ControllerBase:
             # default to print log
             self.pod.logs()
 
+            if (
+                self.ctx.trial_monitor is not None
+                and self.ctx.trial_monitor.should_stop()
+            ):
+                self.ctx.logger.info(
+                    f"Stop the task early for {self.ctx.trial_monitor.stop_reason}"
+                )
+                # decided by any node of the trial, stop as the task timeout
+                # and the metric is read from its log
+                signal.alarm(0)
+                self.not_exit_signal_handler(signal.SIGALRM, None)
+                return True
+
             # completed
             if status == self.ctx.status.COMPLETED:
                 self.ctx.status.complete()
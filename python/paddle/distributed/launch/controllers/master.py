@@ -160,7 +160,8 @@ class HTTPMaster(Master):
                 time.sleep(0.1)
                 continue
 
-            rjson = self.client.get_prefix(prefix)
+            # one round trip after the last peer arrives
+            rjson = self.client.wait_prefix(prefix, size, timeout=5)
             self.ctx.logger.debug(f"sync peers {rjson}")
             if rjson and len(rjson) == size:
                 if self.ctx.args.sort_ip:
@@ -303,6 +303,7 @@ def launch():
         import sys
         import time
 
+        from paddle.distributed.auto_tuner.monitor import TrialMonitor
         from paddle.distributed.auto_tuner.recorder import HistoryRecorder
         from paddle.distributed.auto_tuner.tuner import AutoTuner
         from paddle.distributed.auto_tuner.utils import (
@@ -848,7 +849,7 @@ def launch():
                     continue
 
             # for single dp estimation and not run sharding overlap
-            if tuner_cfg["search_algo"]["name"] != "grid":
+            if tuner_cfg["search_algo"]["name"] not in ["grid", "cost_model"]:
                 # estimated_num_gpus means need single dp estimation
                 bypass_optimizer_flag = "0"
                 if (
@@ -861,6 +862,18 @@ def launch():
                         "FLAGS_shard_bypass_dygraph_optimizer": bypass_optimizer_flag
                     }
                 )
+            trial_monitor = None
+            if "early_stop" in tuner_cfg:
+                # the stop decision of any node is published to all nodes
+                trial_monitor = TrialMonitor(
+                    tuner_cfg,
+                    ctx.args.log_dir,
+                    recorder.history,
+                    client=client if actual_nnodes > 1 else None,
+                    stop_key=f"auto_tuner/stop/{job_id}",
+                )
+                ctx.set_envs(trial_monitor.envs())
+                ctx.trial_monitor = trial_monitor
             c = controllers.init(ctx)
             c.run()
 
@@ -884,6 +897,14 @@ def launch():
                 target_metric=tuner_cfg["metric_cfg"]["name"],
                 memory_file=f"{ctx.args.job_id}.gpu.log",
             )
+            if trial_monitor is not None:
+                if trial_monitor.stop_reason == "memory":
+                    # treat as out of memory
+                    err = err | (1 << 1)
+                elif err & 1 and trial_monitor.mean is not None:
+                    # only reported by metric files
+                    metric = round(trial_monitor.mean, 5)
+                    err = err & ~1
             # sync sigint
             timeout_flag = True
             OOM_flag = err & (1 << 1)
@@ -16,6 +16,8 @@ import time
 
 import httpx
 
+from .kv_server import MAX_WAIT_TIMEOUT, decode_kv
+
 
 class KVClient:
     def __init__(self, endpoint='localhost:2379'):
@@ -58,6 +60,63 @@ class KVClient:
         except:
             return ""
 
+    def wait_prefix(self, key, size, timeout=MAX_WAIT_TIMEOUT):
+        """
+        Long-poll until at least size keys are under the prefix key, return
+        the dict of the prefix, or None if it is timeout.
+        """
+        key = key if key.startswith('/') else f"/{key}"
+        u = f"{self.endpoint}{key}"
+        params = {"wait": size, "timeout": timeout, "format": "binary"}
+        try:
+            r = httpx.get(
+                u,
+                params=params,
+                timeout=timeout + 10,
+                follow_redirects=True,
+            )
+            if r.status_code == 200:
+                if r.headers.get("Content-Type") == "application/octet-stream":
+                    return decode_kv(r.content)
+                return r.json()
+            if r.status_code == 404:
+                # the server does not support long-poll
+                ret = self.get_prefix(key)
+                return ret if ret and len(ret) >= size else None
+            return None
+        except:
+            return None
+
+    def add(self, key, delta=1):
+        """Add delta to the integer value of key, return the sum or None."""
+        key = key if key.startswith('/') else f"/{key}"
+        u = f"{self.endpoint}{key}"
+        try:
+            r = httpx.post(
+                u, params={"add": delta}, timeout=None, follow_redirects=True
+            )
+            if r.status_code == 200:
+                return int(r.content)
+            return None
+        except:
+            return None
+
+    def barrier(self, key, size, timeout=MAX_WAIT_TIMEOUT):
+        """
+        Wait until size participants arrive at the barrier key, which
+        should be unique for each barrier.
+        """
+        key = key if key.startswith('/') else f"/{key}"
+        u = f"{self.endpoint}{key}"
+        params = {"barrier": size, "timeout": timeout}
+        try:
+            r = httpx.post(
+                u, params=params, timeout=timeout + 10, follow_redirects=True
+            )
+            return r.status_code == 200
+        except:
+            return False
+
     def delete(self, key):
         key = key if key.startswith('/') else f"/{key}"
         u = f"{self.endpoint}{key}"
@@ -12,24 +12,91 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bisect
 import http.server as SimpleHTTPServer
 import json
+import struct
 import threading
-from http.server import HTTPServer
+from http.server import ThreadingHTTPServer
 from multiprocessing import Process
+from urllib.parse import parse_qs, urlsplit
+
+# the max seconds a long-poll request waits
+MAX_WAIT_TIMEOUT = 60
+
+
+def encode_kv(kv):
+    """
+    Encode dict of str keys and bytes values as the count of items followed
+    by the length-prefixed key and value of each item.
+    """
+    items = [struct.pack('<I', len(kv))]
+    for k, v in kv.items():
+        k = k.encode("utf-8")
+        items.append(struct.pack('<I', len(k)))
+        items.append(k)
+        items.append(struct.pack('<I', len(v)))
+        items.append(v)
+    return b''.join(items)
+
+
+def decode_kv(data):
+    """Decode the result of encode_kv into dict of str keys and values."""
+    (count,) = struct.unpack_from('<I', data, 0)
+    offset = 4
+    ret = {}
+    for _ in range(count):
+        (size,) = struct.unpack_from('<I', data, offset)
+        k = data[offset + 4 : offset + 4 + size].decode("utf-8")
+        offset += 4 + size
+        (size,) = struct.unpack_from('<I', data, offset)
+        v = data[offset + 4 : offset + 4 + size].decode("utf-8")
+        offset += 4 + size
+        ret[k] = v
+    return ret
 
 
 class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
+    """
+    Handler of the kv store. Besides the plain get/put/delete, the query
+    parameters of requests are:
+
+        GET  /prefix?wait=N&timeout=T: long-poll until at least N keys are
+             under prefix, 408 is returned if it is timeout.
+        GET  /prefix?format=binary: response in the format of encode_kv.
+        POST /key?add=D: add D to the integer value of key, returns the sum.
+        POST /key?barrier=N&timeout=T: add 1 to key and wait until the value
+             reaches N, a barrier key should not be reused.
+    """
+
+    def _parse(self):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        timeout = min(
+            float(query.get('timeout', MAX_WAIT_TIMEOUT)), MAX_WAIT_TIMEOUT
+        )
+        return url.path, query, timeout
+
     def do_GET(self):
-        with self.server.kv_lock:
-            ret = {}
-            for k, v in self.server.kv.items():
-                if k.startswith(self.path):
-                    ret[k] = v.decode(encoding="utf-8")
-            if ret:
-                self.output(200, json.dumps(ret).encode("utf-8"))
-            else:
-                self.output(404)
+        path, query, timeout = self._parse()
+        binary = query.get('format') == 'binary'
+        server = self.server
+        code, value = 200, None
+        with server.kv_cond:
+            if 'wait' in query:
+                size = int(query['wait'])
+                if not server.kv_cond.wait_for(
+                    lambda: server.count_prefix(path) >= size, timeout
+                ):
+                    code = 408
+            if code == 200 and server.count_prefix(path) == 0:
+                code = 404
+            if code == 200:
+                value = server.get_prefix_payload(path, binary)
+        if value is None:
+            self.output(code)
+        else:
+            self.output(code, value, binary)
 
     def do_PUT(self):
         self.do_POST()
@@ -37,26 +104,44 @@ class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
     def do_POST(self):
         content_length = int(self.headers['Content-Length'] or 0)
         try:
+            path, query, timeout = self._parse()
             value = self.rfile.read(content_length)
-            with self.server.kv_lock:
-                self.server.kv[self.path] = value
-                self.output(200)
-                return
+            server = self.server
+            with server.kv_cond:
+                if 'add' not in query and 'barrier' not in query:
+                    server.put(path, value)
+                    value = ''
+                else:
+                    value = server.add(path, int(query.get('add', 1)))
+                    if 'barrier' in query:
+                        size = int(query['barrier'])
+                        if not server.kv_cond.wait_for(
+                            lambda: int(server.kv.get(path, b'0')) >= size,
+                            timeout,
+                        ):
+                            value = None
         except:
             self.output(500)
+            return
+        if value is None:
+            self.output(408)
+        else:
+            self.output(200, value)
 
     def do_DELETE(self):
-        with self.server.kv_lock:
-            if self.path in self.server.kv:
-                del self.server.kv[self.path]
+        with self.server.kv_cond:
+            if self.server.delete(self.path):
                 self.output(200)
             else:
                 self.output(404)
 
-    def output(self, code, value=''):
+    def output(self, code, value='', binary=False):
         self.send_response(code)
         self.send_header("Content-Length", len(value))
-        self.send_header("Content-Type", "application/json; charset=utf8")
+        if binary:
+            self.send_header("Content-Type", "application/octet-stream")
+        else:
+            self.send_header("Content-Type", "application/json; charset=utf8")
         self.end_headers()
         if value:
             self.wfile.write(value)
@@ -65,15 +150,75 @@ class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
         return
 
 
-class KVServer(HTTPServer):
+class KVServer(ThreadingHTTPServer):
+    # long-poll requests hold their threads
+    daemon_threads = True
+
     def __init__(self, port):
         super().__init__(('', port), KVHandler)
         self.kv_lock = threading.Lock()
+        # notified on every change of kv
+        self.kv_cond = threading.Condition(self.kv_lock)
         self.kv = {'/healthy': b'ok'}
+        # sorted keys to find the keys of a prefix by bisect
+        self.keys = ['/healthy']
+        self.revision = 0
+        self.payload_cache = {}
         self.port = port
         self.stopped = False
         self.started = False
 
+    def _prefix_range(self, prefix):
+        # all keys start with prefix are in [prefix, prefix + max char)
+        return (
+            bisect.bisect_left(self.keys, prefix),
+            bisect.bisect_left(self.keys, prefix + chr(0x10FFFF)),
+        )
+
+    def count_prefix(self, prefix):
+        begin, end = self._prefix_range(prefix)
+        return end - begin
+
+    def get_prefix_payload(self, prefix, binary=False):
+        # the same prefix is read by all peers, encode once per revision
+        cached = self.payload_cache.get((prefix, binary))
+        if cached is not None and cached[0] == self.revision:
+            return cached[1]
+        begin, end = self._prefix_range(prefix)
+        ret = {k: self.kv[k] for k in self.keys[begin:end]}
+        if binary:
+            payload = encode_kv(ret)
+        else:
+            payload = json.dumps(
+                {k: v.decode(encoding="utf-8") for k, v in ret.items()}
+            ).encode("utf-8")
+        self.payload_cache[(prefix, binary)] = (self.revision, payload)
+        return payload
+
+    def _changed(self):
+        self.revision += 1
+        self.payload_cache.clear()
+        self.kv_cond.notify_all()
+
+    def put(self, key, value):
+        if key not in self.kv:
+            bisect.insort(self.keys, key)
+        self.kv[key] = value
+        self._changed()
+
+    def add(self, key, delta):
+        value = str(int(self.kv.get(key, b'0')) + delta).encode("utf-8")
+        self.put(key, value)
+        return value
+
+    def delete(self, key):
+        if key not in self.kv:
+            return False
+        del self.kv[key]
+        del self.keys[bisect.bisect_left(self.keys, key)]
+        self._changed()
+        return True
+
     def start(self):
         self.listen_thread = threading.Thread(target=self.serve_forever)
         self.listen_thread.start()
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import collections
+import copy
 import copyreg
 import os
 import pickle
@@ -51,6 +52,246 @@ from .io_utils import (
 __all__ = []
 async_save_queue = []
 
+# NOTE: bytes of pinned staging buffers cached for async_save, 0 means
+# only caching buffers of the last save, and a save waits for all
+# buffers of former saves to be released, see _StagingPool
+_ASYNC_SAVE_STAGING_SIZE = int(
+    os.environ.get('FLAGS_async_save_staging_size', 0)
+)
+# buffer size of file writing of async_save
+_ASYNC_SAVE_WRITE_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+class _StagingPool:
+    """
+    A bounded pool of host buffers to stage Tensors for async_save.
+
+    Dense Tensors are copied to pinned buffers(CPU buffers if not compiled
+    with CUDA) asynchronously, buffers are released to the pool after the
+    staged object is written, and reused by Tensors with the same shape
+    and dtype in following saves. A save waits until buffers in use and
+    the buffers it needs are less than :attr:`capacity`, or no buffer is
+    in use, so overlapping saves do not grow host memory unboundedly.
+
+    Args:
+        capacity(int): bytes of buffers in use and cached.
+    """
+
+    def __init__(self, capacity=0):
+        self.capacity = capacity
+        self._cond = threading.Condition()
+        self._free = collections.defaultdict(list)
+        self._used_bytes = 0
+        self._cached_bytes = 0
+        self._last_save_bytes = 0
+
+    @staticmethod
+    def _key(tensor):
+        return (tuple(tensor.shape), tensor.dtype)
+
+    @staticmethod
+    def _nbytes(tensor):
+        return int(np.prod(tensor.shape)) * tensor.element_size()
+
+    def acquire(self, tensors):
+        need = sum(self._nbytes(t) for t in tensors)
+        with self._cond:
+            while self._used_bytes > 0 and (
+                self._used_bytes + need > self.capacity
+            ):
+                self._cond.wait()
+            self._used_bytes += need
+            self._last_save_bytes = need
+            buffers = []
+            for t in tensors:
+                free = self._free.get(self._key(t))
+                if free:
+                    buf = free.pop()
+                    self._cached_bytes -= self._nbytes(buf)
+                else:
+                    buf = None
+                buffers.append(buf)
+            return buffers, need
+
+    def release(self, buffers, nbytes):
+        with self._cond:
+            self._used_bytes -= nbytes
+            limit = max(self.capacity, self._last_save_bytes)
+            for buf in buffers:
+                buf_bytes = self._nbytes(buf)
+                if self._used_bytes + self._cached_bytes + buf_bytes > limit:
+                    continue
+                self._free[self._key(buf)].append(buf)
+                self._cached_bytes += buf_bytes
+            self._cond.notify_all()
+
+    def clear(self):
+        with self._cond:
+            self._free.clear()
+            self._cached_bytes = 0
+
+
+class _AsyncSaveEngine:
+    """
+    Engine of async_save. Tensors are staged to host buffers of
+    :class:`_StagingPool` on caller's thread by non-blocking copies,
+    and a single writer thread waits the copies done and writes staged
+    objects in submitting order, files are written as temporary files
+    and renamed when finished.
+    """
+
+    def __init__(self):
+        self._pool = _StagingPool(_ASYNC_SAVE_STAGING_SIZE)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="paddle_async_save"
+                )
+            return self._executor
+
+    def _stage(self, obj):
+        # collect dense Tensors in obj, other values are kept as is
+        tensors = {}
+
+        def collect(o):
+            if isinstance(o, dict):
+                for v in o.values():
+                    collect(v)
+            elif isinstance(o, core.eager.Tensor) and o.is_dense():
+                if not o._is_initialized():
+                    raise ValueError(
+                        "The saved tensor is not initialized. If you used group sharded, please use save_group_sharded_model."
+                    )
+                tensors[id(o)] = o
+
+        collect(obj)
+        tensors = list(tensors.values())
+        buffers, nbytes = self._pool.acquire(tensors)
+
+        use_pinned = core.is_compiled_with_cuda()
+        place = core.CUDAPinnedPlace() if use_pinned else core.CPUPlace()
+        staged = {}
+        try:
+            for t, buf in zip(tensors, buffers):
+                src = t
+                if src.place.is_custom_place():
+                    src = paddle._C_ops.npu_identity(src, -1)
+                # copies from GPU are non-blocking, waited by writer
+                blocking = not (use_pinned and src.place.is_gpu_place())
+                if buf is None:
+                    buf = src._copy_to(place, blocking)
+                else:
+                    buf.copy_(src, blocking)
+                buf.name = t.name
+                staged[id(t)] = buf
+        except:
+            self._pool.release(list(staged.values()), nbytes)
+            raise
+
+        event = None
+        if use_pinned and any(t.place.is_gpu_place() for t in tensors):
+            event = paddle.device.cuda.Event()
+            event.record()
+
+        def replace(o):
+            if isinstance(o, dict):
+                new_o = copy.copy(o)
+                for k, v in o.items():
+                    new_o[k] = replace(v)
+                return new_o
+            return staged.get(id(o), o)
+
+        return replace(obj), list(staged.values()), nbytes, event
+
+    def submit(self, obj, path, protocol):
+        staged_obj, buffers, nbytes, event = self._stage(obj)
+        try:
+            return self._get_executor().submit(
+                self._write, staged_obj, path, protocol, buffers, nbytes, event
+            )
+        except:
+            self._pool.release(buffers, nbytes)
+            raise
+
+    def _write(self, obj, path, protocol, buffers, nbytes, event):
+        try:
+            if event is not None:
+                event.synchronize()
+            if not _is_file_path(path):
+                _async_save_write(obj, path, protocol)
+                return
+            dirname = os.path.dirname(path)
+            if dirname and not os.path.exists(dirname):
+                os.makedirs(dirname, exist_ok=True)
+            # a partially written file is never left at path
+            tmp_path = f"{path}.tmp.{os.getpid()}"
+            try:
+                _async_save_write(obj, tmp_path, protocol)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        finally:
+            self._pool.release(buffers, nbytes)
+
+
+def _async_save_write(obj, path, protocol):
+    # same file format as paddle.save
+    if (
+        _is_state_dict(obj)
+        and protocol == 4
+        and not (sys.platform == 'darwin' and sys.version_info.major == 3)
+        and all(
+            v.is_dense()
+            for v in obj.values()
+            if isinstance(v, core.eager.Tensor)
+        )
+    ):
+        if _is_file_path(path):
+            with open(path, 'wb', buffering=_ASYNC_SAVE_WRITE_CHUNK_SIZE) as f:
+                _stream_save_state_dict(obj, f, protocol)
+        else:
+            with _open_file_buffer(path, 'wb') as f:
+                _stream_save_state_dict(obj, f, protocol)
+    elif _is_state_dict(obj):
+        _legacy_save(obj, path, protocol)
+    else:
+        with _open_file_buffer(path, 'wb') as f:
+            _pickle_save(obj, f, protocol)
+
+
+def _stream_save_state_dict(state_dict, f, protocol):
+    # NOTE: the same format as _legacy_save, but Tensors are converted to
+    # numpy one by one while pickling instead of all before pickling, and
+    # pickler runs in fast mode without memo, so the numpy copy of each
+    # Tensor is released after written
+    def reduce_tensor(self):
+        return self.numpy().__reduce__()
+
+    saved_obj = {}
+    name_table = {}
+    for key, value in state_dict.items():
+        if isinstance(value, core.eager.Tensor):
+            name_table[key] = value.name
+        saved_obj[key] = value
+    saved_obj["StructuredToParameterName@@"] = name_table
+
+    pickler = pickle.Pickler(f, protocol)
+    pickler.fast = True
+    pickler.dispatch_table = copyreg.dispatch_table.copy()
+    pickler.dispatch_table[core.eager.Tensor] = reduce_tensor
+    pickler.dispatch_table[EagerParamBase] = reduce_tensor
+    pickler.dump(saved_obj)
+
+
+_async_save_engine = _AsyncSaveEngine()
+
 
 def clear_async_save_task_queue():
     '''
@@ -58,8 +299,8 @@ def clear_async_save_task_queue():
     '''
     while len(async_save_queue) > 0:
         task = async_save_queue.pop()
-        if task and task.is_alive():
-            task.join()
+        if task:
+            task.result()
 
 
 def async_save(obj, path, protocol=4, sync_other_task=False, **configs):
@@ -69,6 +310,12 @@ def async_save(obj, path, protocol=4, sync_other_task=False, **configs):
         currently only support dygraph mode.
     Note:
         any argument passed through configs will be overridden by default setting.
+    Note:
+        Tensors are copied to reused host staging buffers without blocking,
+        and written by a background writer thread in submitting order. A
+        save waits for former saves to release staging buffers unless
+        environment variable ``FLAGS_async_save_staging_size`` (in bytes)
+        is large enough for the buffers of them all.
     Args:
         obj(Object) : The object to be saved.
         path(str|BytesIO) : The path/buffer of the object to be saved.
@@ -77,6 +324,9 @@ def async_save(obj, path, protocol=4, sync_other_task=False, **configs):
                                  Default: 4
         sync_other_task(bool) : Determine whether to wait other async save task to be finished before this one be put in queue.
         **configs(dict, optional): compatible argument to paddle.save, but will be overridden by default setting.
+    Returns:
+        concurrent.futures.Future: future of the save task, which can be polled by ``done()``
+        or waited by ``result()``.
     Examples:
         .. code-block:: python
             :name: code-example-1
@@ -86,11 +336,13 @@ def async_save(obj, path, protocol=4, sync_other_task=False, **configs):
             layer_state_dict = emb.state_dict()
 
             # call paddle.async_save with the same style of paddle.save
-            paddle.async_save(layer_state_dict, "emb.pdparams")
+            task = paddle.async_save(layer_state_dict, "emb.pdparams")
             for i in range(10):
                 # do some calculations here
+                if task.done():
+                    break
             # wait if any async_save task has not been done
-            paddle.clear_async_task_queue()
+            paddle.clear_async_save_task_queue()
     '''
     if not in_dygraph_mode():
         raise ValueError(
@@ -101,28 +353,16 @@ def async_save(obj, path, protocol=4, sync_other_task=False, **configs):
             "configs are not supported in async mode, will be overridden by default settings."
         )
 
-    # TODO: make this part async
-    def move_state_dict_to_cpu(sd):
-        for k, v in sd.items():
-            if isinstance(v, dict):
-                move_state_dict_to_cpu(v)
-            elif isinstance(v, core.eager.Tensor):
-                sd[k] = v.pin_memory() if core.is_compiled_with_cuda() else v
-
-    if isinstance(obj, dict):
-        move_state_dict_to_cpu(obj)
-    elif isinstance(obj, core.eager.Tensor):
-        obj = obj.pin_memory() if core.is_compiled_with_cuda() else obj
-    else:
+    if not isinstance(obj, (dict, core.eager.Tensor)):
         # other types are currently not supported
         raise TypeError(
             f"currently async_save does not support this type: {type(obj)}"
         )
     if sync_other_task:
         clear_async_save_task_queue()
-    t = threading.Thread(target=save, args=(obj, path, protocol))
-    t.start()
-    async_save_queue.append(t)
+    task = _async_save_engine.submit(obj, path, protocol)
+    async_save_queue.append(task)
+    return task
 
 
 def _build_saved_state_dict(state_dict):
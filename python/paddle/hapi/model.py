@@ -860,14 +860,23 @@ class DynamicGraphAdapter:
         metrics = []
         for metric in self.model._metrics:
             metric_outs = metric.compute(*(to_list(outputs) + labels))
-            m = metric.update(*[to_numpy(m) for m in to_list(metric_outs)])
+            m = metric.update(*self._metric_inputs(metric_outs))
             metrics.append(m)
 
-        return (
-            ([to_numpy(l) for l in losses], metrics)
-            if len(metrics) > 0
-            else [to_numpy(l) for l in losses]
-        )
+        losses = self._loss_outputs(losses)
+        return (losses, metrics) if len(metrics) > 0 else losses
+
+    def _metric_inputs(self, metric_outs):
+        # with lazy logs, metrics are updated by Tensors on device
+        if self.model._lazy_logs:
+            return to_list(metric_outs)
+        return [to_numpy(m) for m in to_list(metric_outs)]
+
+    def _loss_outputs(self, losses):
+        # with lazy logs, losses are copied to host at logging steps only
+        if self.model._lazy_logs:
+            return [l.detach() for l in losses]
+        return [to_numpy(l) for l in losses]
 
     def eval_batch(self, inputs, labels=None):
         self.model.network.eval()
@@ -921,13 +930,13 @@ class DynamicGraphAdapter:
         for metric in self.model._metrics:
             # cut off padding value.
             metric_outs = metric.compute(*(to_list(outputs) + labels))
-            m = metric.update(*[to_numpy(m) for m in to_list(metric_outs)])
+            m = metric.update(*self._metric_inputs(metric_outs))
             metrics.append(m)
 
         if self.model._loss and len(metrics):
-            return [to_numpy(l) for l in losses], metrics
+            return self._loss_outputs(losses), metrics
         elif self.model._loss:
-            return [to_numpy(l) for l in losses]
+            return self._loss_outputs(losses)
         else:
             return metrics
 
@@ -1173,6 +1182,7 @@ class Model:
         self._is_shape_inferred = False
         self._test_dataloader = None
         self.stop_training = False
+        self._lazy_logs = False
 
         if not in_dynamic_mode():
             if not isinstance(inputs, (list, tuple, dict, Input)):
@@ -1764,6 +1774,7 @@ class Model:
         callbacks=None,
         accumulate_grad_batches=1,
         num_iters=None,
+        lazy_logs=False,
     ):
         """
 
@@ -1812,6 +1823,12 @@ class Model:
             num_iters (int|None, optional): The number of iterations to evaluate the model.
                 If None, evaluate on whole input dataset, otherwise, evaluate `num_iters` times.
                 Default: None.
+            lazy_logs (bool, optional): Whether to keep losses and metric states on device,
+                and copy losses and accumulate metrics into the logs of callbacks only every
+                `log_freq` steps and at the last step, so that steps do not wait for device
+                computation. Values in logs of other steps are the ones of the last logging
+                step. Metrics' `update` receives Tensors instead of numpy arrays. Only
+                works in dynamic mode. Default: False.
 
         Returns:
             None
@@ -1974,24 +1991,32 @@ class Model:
         if any(isinstance(k, EarlyStopping) for k in cbks) and not do_eval:
             warnings.warn("EarlyStopping needs validation data.")
 
+        self._lazy_logs = lazy_logs and in_dynamic_mode()
         cbks.on_begin('train')
-        for epoch in range(epochs):
-            cbks.on_epoch_begin(epoch)
-            logs = self._run_one_epoch(train_loader, cbks, 'train')
-            cbks.on_epoch_end(epoch, logs)
-
-            if do_eval and epoch % eval_freq == 0:
-                eval_steps = self._len_data_loader(eval_loader)
-                cbks.on_begin(
-                    'eval',
-                    {'steps': eval_steps, 'metrics': self._metrics_name()},
+        try:
+            for epoch in range(epochs):
+                cbks.on_epoch_begin(epoch)
+                logs = self._run_one_epoch(
+                    train_loader, cbks, 'train', log_freq=log_freq
                 )
+                cbks.on_epoch_end(epoch, logs)
+
+                if do_eval and epoch % eval_freq == 0:
+                    eval_steps = self._len_data_loader(eval_loader)
+                    cbks.on_begin(
+                        'eval',
+                        {'steps': eval_steps, 'metrics': self._metrics_name()},
+                    )
 
-                eval_logs = self._run_one_epoch(eval_loader, cbks, 'eval')
+                    eval_logs = self._run_one_epoch(
+                        eval_loader, cbks, 'eval', log_freq=log_freq
+                    )
 
-                cbks.on_end('eval', eval_logs)
-            if self.stop_training:
-                break
+                    cbks.on_end('eval', eval_logs)
+                if self.stop_training:
+                    break
+        finally:
+            self._lazy_logs = False
 
         cbks.on_end('train', logs)
         self._test_dataloader = None
@@ -2005,6 +2030,7 @@ class Model:
         num_workers=0,
         callbacks=None,
         num_iters=None,
+        lazy_logs=False,
     ):
         """
         Evaluate the loss and metrics of the model on input dataset.
@@ -2030,6 +2056,9 @@ class Model:
             num_iters (int|None, optional): The number of iterations to evaluate the model.
                 If None, evaluate on whole input dataset, otherwise, evaluate `num_iters` times.
                 Default: None.
+            lazy_logs (bool, optional): Whether to update the logs of callbacks only every
+                `log_freq` steps and at the last step, the same as `lazy_logs` of
+                :code:`fit`. Default: False.
         Returns:
             dict: Result of metric. The key is the names of Metric,
                 value is a scalar or numpy.array.
@@ -2095,7 +2124,13 @@ class Model:
             'eval', {'steps': eval_steps, 'metrics': self._metrics_name()}
         )
 
-        logs = self._run_one_epoch(eval_loader, cbks, 'eval')
+        self._lazy_logs = lazy_logs and in_dynamic_mode()
+        try:
+            logs = self._run_one_epoch(
+                eval_loader, cbks, 'eval', log_freq=log_freq
+            )
+        finally:
+            self._lazy_logs = False
 
         cbks.on_end('eval', logs)
 
@@ -2289,9 +2324,16 @@ class Model:
         data_loader,
         callbacks,
         mode,
-        logs={},
+        logs=None,
+        log_freq=None,
     ):
+        # a new dict for each epoch, lazy logs keep the values of last
+        # logging step which should not leak into other epochs
+        logs = {} if logs is None else logs
         outputs = []
+        num_steps = self._len_data_loader(data_loader)
+        # outputs of the last step not updated to logs with lazy logs
+        lazy_outs = None
         for step, data in enumerate(data_loader):
             # Data might come from different types of data_loader and have
             # different format, as following:
@@ -2326,21 +2368,19 @@ class Model:
 
                 outs = getattr(self, mode + '_batch')(*_inputs)
 
-                if self._metrics and self._loss:
-                    metrics = [[float(l) for l in outs[0]]]
-                elif self._loss:
-                    metrics = [[float(l) for l in outs]]
+                is_last_step = step + 1 == num_steps or (
+                    getattr(self, 'num_iters', None) == 1
+                )
+                if (
+                    not self._lazy_logs
+                    or not log_freq
+                    or (step + 1) % log_freq == 0
+                    or is_last_step
+                ):
+                    self._update_batch_logs(outs, logs)
+                    lazy_outs = None
                 else:
-                    metrics = []
-
-                # metrics
-                for metric in self._metrics:
-                    res = metric.accumulate()
-                    metrics.extend(to_list(res))
-
-                assert len(self._metrics_name()) == len(metrics)
-                for k, v in zip(self._metrics_name(), metrics):
-                    logs[k] = v
+                    lazy_outs = outs
             else:
                 if self._inputs is not None:
                     outs = self.predict_batch(data[: len(self._inputs)])
@@ -2367,12 +2407,37 @@ class Model:
                     self.stop_training = True
                     del self.num_iters
                     break
+        if lazy_outs is not None:
+            self._update_batch_logs(lazy_outs, logs)
         self._reset_metrics()
 
         if mode == 'predict':
             return logs, outputs
         return logs
 
+    def _update_batch_logs(self, outs, logs):
+        if self._metrics and self._loss:
+            losses = outs[0]
+        elif self._loss:
+            losses = outs
+        else:
+            losses = []
+        if len(losses) > 0 and isinstance(losses[0], core.eager.Tensor):
+            # copy all losses of lazy logs to host at once
+            losses = paddle.concat(
+                [paddle.reshape(l, [-1]) for l in losses]
+            ).numpy()
+        metrics = [[float(l) for l in losses]] if self._loss else []
+
+        # metrics
+        for metric in self._metrics:
+            res = metric.accumulate()
+            metrics.extend(to_list(res))
+
+        assert len(self._metrics_name()) == len(metrics)
+        for k, v in zip(self._metrics_name(), metrics):
+            logs[k] = v
+
     def summary(self, input_size=None, dtype=None):
         """Prints a string summary of the network.
 
@@ -44,6 +44,9 @@ def set_config(config=None):
     the origin dataloader setting. Tuning parameters are as follows:
 
     - enable(bool): Whether to enable dataloader tuning.
+    - online(bool): Whether to tune num_workers and prefetch_factor of multi-process
+      DataLoader while iterating, instead of tuning num_workers once before iterating.
+      Only map-style dataset is supported. Default: False.
 
     Args:
         config (dict|str|None, optional): Configuration for auto-tuning. If it is a
@@ -156,3 +159,13 @@ def set_config(config=None):
                     "The `tuning_steps` should be int. Use default parameter instead."
                 )
                 paddle.io.reader.set_autotune_config(use_autotune)
+        if "online" in dataloader_config:
+            if isinstance(dataloader_config['online'], bool):
+                paddle.io.reader.set_online_autotune_config(
+                    use_autotune and dataloader_config['online']
+                )
+            else:
+                warnings.warn(
+                    "The auto-tuning configuration of the dataloader is incorrect."
+                    "The `online` should be bool. Use default parameter instead."
+                )
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
 import math
 
 import numpy as np
@@ -34,6 +35,10 @@ class BatchSampler(Sampler):
 
     :code:`__len__`: get mini-batch number in an epoch.
 
+    BatchSampler implements :code:`state_dict` and :code:`load_state_dict`
+    to resume iteration from a mini-batch offset, subclasses overriding
+    :code:`__iter__` should also override them to be resumable.
+
 
     Args:
         dataset(Dataset, optional): this should be an instance of a subclass of :ref:`api_paddle_io_Dataset` or
@@ -137,15 +142,32 @@ class BatchSampler(Sampler):
             drop_last, bool
         ), f"drop_last should be a boolean value, but got {type(drop_last)}"
         self.drop_last = drop_last
+        self._num_yielded = 0
+        self._resume_state = None
 
     def __iter__(self):
+        # NOTE: subclasses may not call __init__ of base class
+        resume_state = getattr(self, '_resume_state', None)
+        self._resume_state = None
+        sampler_iter = iter(self.sampler)
+        self._num_yielded = 0
+        if resume_state:
+            # skip indices of yielded batches, only the last batch may be
+            # incomplete, so yielded sample number is num_yielded * batch_size
+            self._num_yielded = resume_state['num_yielded']
+            if resume_state.get('sampler_state') is None:
+                sampler_iter = itertools.islice(
+                    sampler_iter, self._num_yielded * self.batch_size, None
+                )
         batch_indices = []
-        for idx in self.sampler:
+        for idx in sampler_iter:
             batch_indices.append(idx)
             if len(batch_indices) == self.batch_size:
+                self._num_yielded += 1
                 yield batch_indices
                 batch_indices = []
         if not self.drop_last and len(batch_indices) > 0:
+            self._num_yielded += 1
             yield batch_indices
 
     def __len__(self):
@@ -153,6 +175,45 @@ class BatchSampler(Sampler):
         num_samples += int(not self.drop_last) * (self.batch_size - 1)
         return num_samples // self.batch_size
 
+    def state_dict(self):
+        """
+        Get the state of current iteration, which contains the number of
+        yielded mini-batches and the state of :attr:`sampler` if it
+        implements :code:`state_dict`.
+
+        Returns:
+            dict: state of current iteration.
+        """
+        state = {'num_yielded': getattr(self, '_num_yielded', 0)}
+        if hasattr(self.sampler, 'state_dict'):
+            state['sampler_state'] = self.sampler.state_dict()
+        return state
+
+    def load_state_dict(self, state_dict):
+        """
+        Load a state got by :code:`state_dict`, the next iteration yields
+        the same mini-batches as the saved iteration after the yielded
+        ones, indices of the yielded mini-batches are skipped without
+        being yielded.
+
+        Args:
+            state_dict(dict): state got by :code:`state_dict`.
+        """
+        state_dict = dict(state_dict)
+        sampler_state = state_dict.get('sampler_state')
+        if sampler_state is not None:
+            if hasattr(self.sampler, 'load_state_dict'):
+                # sampler skips indices of yielded mini-batches itself
+                self.sampler.load_state_dict(
+                    dict(
+                        sampler_state,
+                        num_yielded=state_dict['num_yielded'] * self.batch_size,
+                    )
+                )
+            else:
+                state_dict['sampler_state'] = None
+        self._resume_state = state_dict
+
 
 class _InfiniteIterableSampler:
     def __init__(self, dataset, batch_size=1):
@@ -266,6 +327,9 @@ class DistributedBatchSampler(BatchSampler):
 
         self.drop_last = drop_last
         self.epoch = 0
+        self._iter_epoch = 0
+        self._num_yielded = 0
+        self._resume_state = None
         self.num_samples = int(math.ceil(len(self.dataset) * 1.0 / self.nranks))
         self.total_size = self.num_samples * self.nranks
 
@@ -282,6 +346,14 @@ class DistributedBatchSampler(BatchSampler):
             ]
 
         assert len(indices) == self.total_size
+        # NOTE: subclasses may not call __init__ of base class
+        resume_state = getattr(self, '_resume_state', None)
+        self._resume_state = None
+        self._num_yielded = resume_state['num_yielded'] if resume_state else 0
+        if resume_state:
+            self.epoch = resume_state['epoch']
+        # epoch used to shuffle indices of current iteration
+        self._iter_epoch = self.epoch
         if self.shuffle:
             np.random.RandomState(self.epoch).shuffle(indices)
             self.epoch += 1
@@ -314,15 +386,18 @@ class DistributedBatchSampler(BatchSampler):
             indices = _get_indices_by_batch_size(indices)
 
         assert len(indices) == self.num_samples
-        _sample_iter = iter(indices)
+        # skip indices of yielded batches in resuming
+        _sample_iter = iter(indices[self._num_yielded * self.batch_size :])
 
         batch_indices = []
         for idx in _sample_iter:
             batch_indices.append(idx)
             if len(batch_indices) == self.batch_size:
+                self._num_yielded += 1
                 yield batch_indices
                 batch_indices = []
         if not self.drop_last and len(batch_indices) > 0:
+            self._num_yielded += 1
             yield batch_indices
 
     def __len__(self):
@@ -330,6 +405,31 @@ class DistributedBatchSampler(BatchSampler):
         num_samples += int(not self.drop_last) * (self.batch_size - 1)
         return num_samples // self.batch_size
 
+    def state_dict(self):
+        """
+        Get the state of current iteration, which contains the epoch
+        number used to shuffle indices and the number of yielded
+        mini-batches.
+
+        Returns:
+            dict: state of current iteration.
+        """
+        return {
+            'num_yielded': getattr(self, '_num_yielded', 0),
+            'epoch': getattr(self, '_iter_epoch', self.epoch),
+        }
+
+    def load_state_dict(self, state_dict):
+        """
+        Load a state got by :code:`state_dict`, the next iteration yields
+        the same mini-batches as the saved iteration after the yielded
+        ones.
+
+        Args:
+            state_dict(dict): state got by :code:`state_dict`.
+        """
+        self._resume_state = dict(state_dict)
+
     def set_epoch(self, epoch):
         """
         Sets the epoch number. When :attr:`shuffle=True`, this number is used
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import numbers
+import os
 from collections.abc import Mapping, Sequence
 
 import numpy as np
@@ -109,3 +110,181 @@ def default_convert_fn(batch):
         return [default_convert_fn(d) for d in batch]
     else:
         return batch
+
+
+def _use_buffered_collate():
+    return os.environ.get('FLAGS_use_buffered_collate', False) in [
+        1,
+        '1',
+        True,
+        'True',
+        'true',
+    ]
+
+
+# schema node kinds of BufferedCollateFn
+_ARRAY = 0
+_NUMBER = 1
+_TENSOR = 2
+_STRING = 3
+_MAPPING = 4
+_SEQUENCE = 5
+
+
+class BufferedCollateFn:
+    """
+    Batch collating function with the same output as :code:`default_collate_fn`
+    for fixed-shape fields, which infers the batch schema from the first batch,
+    preallocates output buffer for each numpy array field and writes samples
+    into the buffer directly, instead of walking each sample recursively and
+    allocating a new array by :code:`np.stack` for each field in each batch.
+
+    Fields with the same shape among samples are written into buffers directly,
+    fields with variable shape are padded to the max shape in the batch with
+    :attr:`pad_value`. Number fields are converted by one :code:`np.array` call,
+    paddle.Tensor fields are stacked by :code:`paddle.stack`.
+
+    .. note::
+        If :attr:`reuse_buffers` is True, the output arrays are overwritten by the
+        next batch, the caller should copy the output before collating the next
+        batch, e.g. DataLoader copies batches into Tensors in single-process mode
+        and multi-process mode with :attr:`use_shared_memory`.
+
+    Args:
+        pad_value(number|None, optional): value to pad variable shape fields,
+            None for raising error on variable shape fields as
+            :code:`default_collate_fn`. Default None.
+        reuse_buffers(bool, optional): whether to reuse output buffers among
+            batches. Default False.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from paddle.io.dataloader.collate import BufferedCollateFn
+
+            >>> collate_fn = BufferedCollateFn(pad_value=0)
+            >>> batch = collate_fn([
+            ...     {'ids': np.array([1, 2, 3]), 'label': 1},
+            ...     {'ids': np.array([4, 5]), 'label': 0},
+            ... ])
+            >>> print(batch['ids'])
+            [[1 2 3]
+             [4 5 0]]
+            >>> print(batch['label'])
+            [1 0]
+    """
+
+    def __init__(self, pad_value=None, reuse_buffers=False):
+        self.pad_value = pad_value
+        self.reuse_buffers = reuse_buffers
+        self._schema = None
+        self._buffers = {}
+
+    def __getstate__(self):
+        # buffers are not sent to workers, each process allocates its own
+        state = self.__dict__.copy()
+        state['_buffers'] = {}
+        return state
+
+    def _infer_schema(self, sample):
+        if isinstance(sample, np.ndarray) and not sample.dtype.hasobject:
+            return (_ARRAY,)
+        elif isinstance(sample, (paddle.Tensor, core.eager.Tensor)):
+            return (_TENSOR,)
+        elif isinstance(sample, numbers.Number):
+            return (_NUMBER,)
+        elif isinstance(sample, (str, bytes)):
+            return (_STRING,)
+        elif isinstance(sample, Mapping):
+            return (
+                _MAPPING,
+                [(key, self._infer_schema(sample[key])) for key in sample],
+            )
+        elif isinstance(sample, Sequence):
+            return (_SEQUENCE, [self._infer_schema(field) for field in sample])
+        raise TypeError(
+            "batch data con only contains: tensor, numpy.ndarray, "
+            f"dict, list, number, but got {type(sample)}"
+        )
+
+    def _get_buffer(self, path, shape, dtype):
+        if not self.reuse_buffers:
+            return np.empty(shape, dtype=dtype)
+        buffer = self._buffers.get(path)
+        # a buffer can be reused for smaller batch size, e.g. the last batch
+        if (
+            buffer is None
+            or buffer.dtype != dtype
+            or buffer.shape[1:] != shape[1:]
+            or buffer.shape[0] < shape[0]
+        ):
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[path] = buffer
+        return buffer[: shape[0]]
+
+    def _collate_array(self, fields, path):
+        first = fields[0]
+        shape = first.shape
+        fixed_shape = True
+        for field in fields:
+            if field.shape != shape:
+                fixed_shape = False
+                break
+
+        if fixed_shape:
+            out = self._get_buffer(path, (len(fields),) + shape, first.dtype)
+            for i, field in enumerate(fields):
+                out[i] = field
+            return out
+
+        if self.pad_value is None or any(
+            field.ndim != first.ndim for field in fields
+        ):
+            # raise error the same as default_collate_fn
+            return np.stack(fields, axis=0)
+
+        max_shape = tuple(np.max([field.shape for field in fields], axis=0))
+        out = self._get_buffer(path, (len(fields),) + max_shape, first.dtype)
+        out.fill(self.pad_value)
+        for i, field in enumerate(fields):
+            out[(i,) + tuple(slice(0, d) for d in field.shape)] = field
+        return out
+
+    def _collate(self, schema, fields, path):
+        kind = schema[0]
+        if kind == _ARRAY:
+            if not all(isinstance(field, np.ndarray) for field in fields):
+                return default_collate_fn(fields)
+            return self._collate_array(fields, path)
+        elif kind == _NUMBER:
+            return np.array(fields)
+        elif kind == _TENSOR:
+            return paddle.stack(fields, axis=0)
+        elif kind == _STRING:
+            return fields
+        elif kind == _MAPPING:
+            return {
+                key: self._collate(
+                    sub_schema, [d[key] for d in fields], path + (key,)
+                )
+                for key, sub_schema in schema[1]
+            }
+        else:
+            sub_schemas = schema[1]
+            if not all(len(field) == len(sub_schemas) for field in fields):
+                raise RuntimeError(
+                    "fields number not same among samples in a batch"
+                )
+            return [
+                self._collate(sub_schema, sub_fields, path + (i,))
+                for i, (sub_schema, sub_fields) in enumerate(
+                    zip(sub_schemas, zip(*fields))
+                )
+            ]
+
+    def __call__(self, batch):
+        if self._schema is None:
+            self._schema = self._infer_schema(batch[0])
+        return self._collate(self._schema, batch, ())
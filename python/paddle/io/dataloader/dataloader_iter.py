@@ -36,15 +36,30 @@ from ..multiprocess_utils import (
     _set_SIGCHLD_handler,
 )
 from .batch_sampler import _InfiniteIterableSampler
-from .collate import default_collate_fn, default_convert_fn
+from .collate import (
+    BufferedCollateFn,
+    _use_buffered_collate,
+    default_collate_fn,
+    default_convert_fn,
+)
 from .flat import _flatten_batch, _restore_batch
+from .online_tuner import MAX_PREFETCH_FACTOR, _OnlineAutoTuner
+from .shm_ring import (
+    _estimate_slot_size,
+    _SharedMemoryRing,
+    _shm_ring_slot_size,
+    _ShmRingSlot,
+    _use_shm_ring,
+)
 from .worker import (
     _DatasetKind,
     _IterableDatasetStopIteration,
     _ResumeIteration,
+    _RetireWorker,
     _worker_loop,
     _WorkerException,
 )
+from .worker_pool import _release_worker_pool, _retain_worker_pool
 
 # NOTE: fix `terminate called without an active exception`
 # if for loop break and program exit immediately(with no model
@@ -105,9 +120,27 @@ class _DataLoaderIterBase:
         self._dataset_kind = loader.dataset_kind
         self._pin_memory = loader.pin_memory
 
-        self._sampler_iter = iter(self._index_sampler)
+        # NOTE: iterator state loaded by DataLoader.load_state_dict, see
+        # state_dict for details
+        self._loaded_state = getattr(loader, '_iterator_state', None)
+        loader._iterator_state = None
+        self._num_yielded = 0
+        self._sampler_iter = self._resume_sampler_iter(self._loaded_state)
         if self._auto_collate_batch:
             self._collate_fn = loader.collate_fn or default_collate_fn
+            if loader.collate_fn is None and _use_buffered_collate():
+                # NOTE: collate output buffers can be reused only if batches
+                # are copied into Tensors before collating next batch, which
+                # is true except putting numpy arrays into inter-process queue
+                worker_pool = getattr(loader, '_worker_pool', None)
+                use_shared_memory = (
+                    worker_pool.use_shared_memory
+                    if worker_pool is not None
+                    else self._use_shared_memory
+                )
+                self._collate_fn = BufferedCollateFn(
+                    reuse_buffers=self._num_workers == 0 or use_shared_memory
+                )
         else:
             self._collate_fn = loader.collate_fn or default_convert_fn
 
@@ -136,6 +169,49 @@ class _DataLoaderIterBase:
     def __len__(self):
         return len(self._batch_sampler)
 
+    def _resume_sampler_iter(self, state):
+        self._num_yielded = 0
+        if not state:
+            return iter(self._index_sampler)
+
+        self._num_yielded = state['num_yielded']
+        index_sampler = self._index_sampler
+        sampler_state = state.get('sampler_state')
+        if sampler_state is not None and hasattr(
+            index_sampler, 'load_state_dict'
+        ):
+            # sampler skips the consumed batches itself
+            index_sampler.load_state_dict(
+                dict(sampler_state, num_yielded=self._num_yielded)
+            )
+            return iter(index_sampler)
+        # skip indices of the consumed batches, data is not read
+        return itertools.islice(iter(index_sampler), self._num_yielded, None)
+
+    def state_dict(self):
+        """
+        Get the state of this iterator for resuming in the middle of an
+        epoch, which contains the number of batches consumed and the
+        state of batch sampler if it implements :code:`state_dict`.
+
+        Batches prefetched but not consumed are not counted, resuming
+        by :code:`DataLoader.load_state_dict` starts from the next batch
+        of the last consumed one, without reading the consumed batches.
+
+        Returns:
+            dict: state of this iterator.
+        """
+        if self._dataset_kind != _DatasetKind.MAP:
+            raise RuntimeError(
+                "DataLoader iterator state_dict is only supported for "
+                "map-style dataset"
+            )
+        state = {'num_yielded': self._num_yielded}
+        index_sampler = self._index_sampler
+        if hasattr(index_sampler, 'state_dict'):
+            state['sampler_state'] = index_sampler.state_dict()
+        return state
+
     def _exit_thread_expectedly(self):
         self._thread_done_event.set()
         if self._blocking_queue:
@@ -309,6 +385,7 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
                         data = data[0]
                 else:
                     data = self._reader.read_next()
+            self._num_yielded += len(self._places)
             benchmark().after_reader()
 
             return data
@@ -362,6 +439,13 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._persistent_workers = loader._persistent_workers
         self._resume_worker_cnt = 0
 
+        # NOTE: DataLoader with worker_pool uses workers of the shared
+        # worker pool instead of starting its own workers, see _WorkerPool
+        self._worker_pool = getattr(loader, '_worker_pool', None)
+        if self._worker_pool is not None:
+            self._worker_pool_key = loader._worker_pool_key
+            self._num_workers = self._worker_pool.num_workers
+
         assert self._num_workers > 0, (
             "Multi-process DataLoader "
             f"invalid num_workers({self._num_workers})"
@@ -392,7 +476,12 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         # see _try_put_indices
         self._thread_lock = threading.Lock()
 
-        self._base_seed = np.random.randint(low=0, high=sys.maxsize)
+        # NOTE: workers are seeded by _base_seed and worker id, restore
+        # _base_seed in resuming to reproduce worker seeds
+        if self._loaded_state and 'base_seed' in self._loaded_state:
+            self._base_seed = self._loaded_state['base_seed']
+        else:
+            self._base_seed = np.random.randint(low=0, high=sys.maxsize)
 
         # Note(zhangbo): shm_buffer_size is used for MemoryMapAllocationPool.
         # MemoryMapAllocationPool is used to cache and reuse shm, thus reducing munmap in dataloader.
@@ -417,14 +506,89 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             (self._worker_shm_buffer_size) * 2 * self._num_workers
         )
 
+        # NOTE: shm ring is an opt-in transport for worker output, each
+        # worker writes batches into a preallocated shared memory ring in
+        # place and only sends slot descriptor through _data_queue, which
+        # saves pickling and memory map allocation for each tensor. Batches
+        # can not fit in a slot fall back to _data_queue transport.
+        self._shm_ring_slot_size = 0
+        if (
+            self._use_shared_memory
+            and _use_shm_ring()
+            and self._worker_pool is None
+        ):
+            self._shm_ring_slot_size = _shm_ring_slot_size()
+            if (
+                self._shm_ring_slot_size <= 0
+                and self._dataset_kind == _DatasetKind.MAP
+            ):
+                try:
+                    self._shm_ring_slot_size = _estimate_slot_size(
+                        self._dataset, getattr(loader, 'batch_size', None) or 1
+                    )
+                except:
+                    self._shm_ring_slot_size = 0
+            if self._shm_ring_slot_size <= 0:
+                warnings.warn(
+                    "Cannot infer shm ring slot size, please set "
+                    "FLAGS_shm_ring_slot_size, shm ring transport is disabled."
+                )
+        self._shm_rings = []
+
+        # NOTE: online auto tuning adds or retires workers and changes
+        # prefetch_factor between batches, only supported for map-style
+        # dataset, for iterable dataset is split by num_workers in workers
+        self._autotuner = None
+        self._retired_workers = set()
+        self._last_output_time = None
+        if (
+            getattr(loader, '_online_autotune', False)
+            and self._dataset_kind == _DatasetKind.MAP
+            and self._worker_pool is None
+        ):
+            # NOTE: shm rings of running workers are sized for the initial
+            # prefetch_factor and cannot be resized, only num_workers is
+            # tuned if shm rings are used
+            max_prefetch_factor = MAX_PREFETCH_FACTOR
+            if self._shm_ring_slot_size > 0:
+                max_prefetch_factor = self._prefetch_factor
+            self._autotuner = _OnlineAutoTuner(
+                self._num_workers,
+                self._prefetch_factor,
+                max_prefetch_factor=max_prefetch_factor,
+            )
+            self._fetch_stats_snapshot = None
+
         # init workers and indices queues and put 2 indices in each indices queue
-        self._init_workers()
+        if self._worker_pool is not None:
+            self._attach_worker_pool()
+        else:
+            self._init_workers()
         for _ in range(self._outstanding_capacity):
             self._try_put_indices()
 
         self._init_thread()
         self._shutdown = False
 
+    def _attach_worker_pool(self):
+        # open a session of worker pool, indices are put to pool workers
+        # with session id, and output of this session is routed to
+        # _data_queue by the worker pool
+        pool = self._worker_pool
+        # the iterator holds a reference of the pool, which may be used
+        # after the DataLoader is deleted
+        _retain_worker_pool(pool, self._worker_pool_key)
+        self._pool_retained = True
+        self._pool_session, self._data_queue = pool.open_session(
+            self, self._worker_pool_key, self._collate_fn
+        )
+        self._workers = pool.workers
+        self._worker_status = [True] * self._num_workers
+        self._indices_queues = pool.indices_queues
+        self._shm_rings = pool.shm_rings
+        self._workers_idx_cycle = itertools.cycle(range(self._num_workers))
+        self._thread_done_event = threading.Event()
+
     def _init_workers(self):
         from paddle.incubate import multiprocessing
 
@@ -437,41 +601,95 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         # create data_queue for workers
         self._data_queue = multiprocessing.Queue()
 
+        self._shm_rings = []
+
+        # shared (fetch cost, fetch count) of each worker for online
+        # auto tuning, allocated for the upper bound of worker number
+        self._fetch_stats = None
+        if self._autotuner is not None:
+            self._fetch_stats = multiprocessing.Array(
+                'd', 2 * self._autotuner.max_num_workers, lock=False
+            )
+
         # event for workers and thread, thread event is only need
         # in multi-processing mode
         self._workers_done_event = multiprocessing.Event()
         self._thread_done_event = threading.Event()
 
         for i in range(self._num_workers):
-            indices_queue = multiprocessing.Queue()
-            indices_queue.cancel_join_thread()
+            self._start_worker(i)
+
+        core._set_process_pids(id(self), tuple(w.pid for w in self._workers))
+        _set_SIGCHLD_handler()
+
+    def _start_worker(self, worker_id, num_workers=None):
+        from paddle.incubate import multiprocessing
+
+        # num_workers seen by the worker in get_worker_info, workers
+        # started by online auto tuning get the worker number after tuning
+        if num_workers is None:
+            num_workers = self._num_workers
+
+        # NOTE: worker_id less than started worker number means restarting
+        # a retired worker, reuse its shared memory ring for there may be
+        # slots still held by its batches
+        restart = worker_id < len(self._workers)
+
+        # create shared memory ring for worker, a slot is held from worker
+        # writing to thread copying out, "_prefetch_factor" slots for batches
+        # cached and 1 slot for the batch being written
+        shm_ring = None
+        if self._shm_ring_slot_size > 0:
+            if restart:
+                shm_ring = self._shm_rings[worker_id]
+            else:
+                shm_ring = _SharedMemoryRing(
+                    self._prefetch_factor + 1, self._shm_ring_slot_size
+                )
+                self._shm_rings.append(shm_ring)
+
+        indices_queue = multiprocessing.Queue()
+        indices_queue.cancel_join_thread()
+        worker = multiprocessing.Process(
+            target=_worker_loop,
+            args=(
+                self._dataset,
+                self._dataset_kind,
+                indices_queue,
+                self._data_queue,
+                self._workers_done_event,
+                self._auto_collate_batch,
+                self._collate_fn,
+                self._drop_last,
+                self._worker_init_fn,
+                worker_id,
+                num_workers,
+                self._use_shared_memory,
+                self._base_seed,
+                self._worker_shm_buffer_size,
+                shm_ring,
+                self._fetch_stats,
+            ),
+        )
+        worker.daemon = True
+        worker.start()
+        if restart:
+            self._indices_queues[worker_id].close()
+            self._indices_queues[worker_id] = indices_queue
+            self._workers[worker_id] = worker
+            self._worker_status[worker_id] = True
+            self._retired_workers.discard(worker_id)
+        else:
             self._indices_queues.append(indices_queue)
-            worker = multiprocessing.Process(
-                target=_worker_loop,
-                args=(
-                    self._dataset,
-                    self._dataset_kind,
-                    indices_queue,
-                    self._data_queue,
-                    self._workers_done_event,
-                    self._auto_collate_batch,
-                    self._collate_fn,
-                    self._drop_last,
-                    self._worker_init_fn,
-                    i,
-                    self._num_workers,
-                    self._use_shared_memory,
-                    self._base_seed,
-                    self._worker_shm_buffer_size,
-                ),
-            )
-            worker.daemon = True
-            worker.start()
             self._workers.append(worker)
             self._worker_status.append(True)
 
-        core._set_process_pids(id(self), tuple(w.pid for w in self._workers))
-        _set_SIGCHLD_handler()
+    def _active_workers(self):
+        return [
+            i
+            for i in range(self._num_workers)
+            if i not in self._retired_workers
+        ]
 
     def _clear_and_remove_data_queue(self):
         if self._data_queue is not None:
@@ -517,13 +735,20 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._thread.daemon = True
         self._thread.start()
 
-    def _reset(self):
+    def state_dict(self):
+        state = super().state_dict()
+        if self._worker_pool is None:
+            state['base_seed'] = self._base_seed
+        return state
+
+    def _reset(self, state=None):
         # resume iteration in following steps
         # 1. Resume workers, clear worker caches
         # put _ResumeIteration to all worker as resume iteration flag
         with self._thread_lock:
-            self._resume_worker_cnt = self._num_workers
-            for worker_id in range(self._num_workers):
+            active_workers = self._active_workers()
+            self._resume_worker_cnt = len(active_workers)
+            for worker_id in active_workers:
                 self._indices_queues[worker_id].put(_ResumeIteration())
                 self._batches_outstanding += 1
         # all flag will be check in _thread_loop, simply wait here
@@ -545,18 +770,27 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     data = self._reader.read_next()
 
         # 3. reset all states
+        # release ring slots held by cached out-of-order batches
+        for info in self._task_infos.values():
+            if len(info) == 3:
+                self._release_shm_slot(info[1])
         self._send_idx = 0
         self._rcvd_idx = 0
         self._batches_outstanding = 0
         self._task_infos = {}
         self._structure_infos = []
 
-        # set all worker status available
-        self._worker_status = [True] * self._num_workers
+        # set all worker status available except retired workers
+        self._worker_status = [
+            i not in self._retired_workers for i in range(self._num_workers)
+        ]
+        self._last_output_time = None
 
         # 4. reset _sampler_iter and put prefetch indices to start next epoch
         # init workers and indices queues and put 2 indices in each indices queue
-        self._sampler_iter = iter(self._index_sampler)
+        # NOTE: persistent workers are not restarted, _base_seed in state
+        # is not restored
+        self._sampler_iter = self._resume_sampler_iter(state)
         for _ in range(self._outstanding_capacity):
             self._try_put_indices()
 
@@ -568,6 +802,23 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             self._worker_status[worker_id] = False
 
     def _try_shutdown_all(self, timeout=None):
+        if not self._shutdown and self._worker_pool is not None:
+            # only close the session, workers are kept in worker pool
+            try:
+                self._exit_thread_expectedly()
+                for info in self._task_infos.values():
+                    if len(info) == 3:
+                        self._release_shm_slot(info[1])
+                self._task_infos = {}
+                self._worker_pool.close_session(self._pool_session)
+            finally:
+                self._shutdown = True
+                if getattr(self, '_pool_retained', False):
+                    self._pool_retained = False
+                    _release_worker_pool(
+                        self._worker_pool, self._worker_pool_key
+                    )
+
         if not self._shutdown:
             try:
                 self._exit_thread_expectedly()
@@ -586,6 +837,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     for q in self._indices_queues:
                         q.cancel_join_thread()
                         q.close()
+                for ring in self._shm_rings:
+                    ring.close()
             finally:
                 core._erase_process_pids(id(self))
                 self._shutdown = True
@@ -612,7 +865,18 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     try:
                         # pack as LoDTensorArray
                         array = core.LoDTensorArray()
-                        if self._use_shared_memory:
+                        if isinstance(batch, _ShmRingSlot):
+                            # copy out of the ring slot and release it
+                            # for worker writing next batch
+                            ring = self._shm_rings[batch.worker_id]
+                            try:
+                                for arr in ring.read(batch):
+                                    tmp = core.LoDTensor()
+                                    tmp.set(arr, core.CPUPlace())
+                                    array.append(tmp)
+                            finally:
+                                ring.release(batch.slot)
+                        elif self._use_shared_memory:
                             for tensor in batch:
                                 array.append(tensor)
                         else:
@@ -760,6 +1024,71 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._task_infos[idx] += (batch, structure)
                     continue
 
+    def _read_fetch_stats(self):
+        # mean fetch cost of a batch in workers since last reading
+        stats = list(self._fetch_stats)
+        last = self._fetch_stats_snapshot or [0.0] * len(stats)
+        self._fetch_stats_snapshot = stats
+        cost = sum(stats[0::2]) - sum(last[0::2])
+        count = sum(stats[1::2]) - sum(last[1::2])
+        return cost / count if count > 0 else None
+
+    def _autotune(self, wait_cost):
+        now = time.time()
+        if self._last_output_time is not None:
+            self._autotuner.record(wait_cost, now - self._last_output_time)
+        self._last_output_time = now
+        if not self._autotuner.ready():
+            return
+
+        ret = self._autotuner.tune(self._read_fetch_stats())
+        if ret is None:
+            return
+        num_workers, prefetch_factor = ret
+        with self._thread_lock:
+            active_workers = self._active_workers()
+            if num_workers > len(active_workers):
+                # restart exited retired workers first, then start new
+                # workers until worker ids reach the upper bound
+                worker_ids = [
+                    i
+                    for i in sorted(self._retired_workers)
+                    if not self._workers[i].is_alive()
+                ]
+                worker_ids += range(
+                    len(self._workers), self._autotuner.max_num_workers
+                )
+                for worker_id in worker_ids[
+                    : num_workers - len(active_workers)
+                ]:
+                    self._start_worker(worker_id, num_workers)
+                self._num_workers = len(self._workers)
+                core._set_process_pids(
+                    id(self),
+                    tuple(self._workers[i].pid for i in self._active_workers()),
+                )
+            else:
+                # retire workers started latest, indices put to the
+                # retired worker before are still fetched
+                for worker_id in active_workers[num_workers:]:
+                    self._worker_status[worker_id] = False
+                    self._retired_workers.add(worker_id)
+                    self._indices_queues[worker_id].put(_RetireWorker())
+            active_workers = self._active_workers()
+            self._autotuner.num_workers = len(active_workers)
+            self._workers_idx_cycle = itertools.cycle(active_workers)
+            self._prefetch_factor = prefetch_factor
+            self._outstanding_capacity = self._prefetch_factor * max(
+                len(active_workers), len(self._places)
+            )
+        # put more indices if outstanding capacity increased
+        for _ in range(self._outstanding_capacity - self._batches_outstanding):
+            self._try_put_indices()
+
+    def _release_shm_slot(self, batch):
+        if isinstance(batch, _ShmRingSlot):
+            self._shm_rings[batch.worker_id].release(batch.slot)
+
     def _try_put_indices(self):
         assert (
             self._batches_outstanding <= self._outstanding_capacity
@@ -786,7 +1115,16 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             else:
                 return
 
-            self._indices_queues[worker_idx].put((self._send_idx, indices))
+            if self._worker_pool is not None:
+                self._indices_queues[worker_idx].put(
+                    (
+                        (self._pool_session, self._send_idx),
+                        indices,
+                        self._worker_pool_key,
+                    )
+                )
+            else:
+                self._indices_queues[worker_idx].put((self._send_idx, indices))
             self._task_infos[self._send_idx] = (worker_idx,)
             self._batches_outstanding += 1
             self._send_idx += 1
@@ -821,6 +1159,7 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._thread_done_event.set()
                     self._blocking_queue.close()
 
+            read_start = time.time()
             if in_dynamic_mode():
                 data = core.eager.read_next_tensor_list(
                     self._reader.read_next_list()[0]
@@ -843,7 +1182,10 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                         data = data[0]
                 else:
                     data = self._reader.read_next()
+            self._num_yielded += len(self._places)
             self._on_output_batch()
+            if self._autotuner is not None:
+                self._autotune(time.time() - read_start)
             benchmark().after_reader()
             return data
         except StopIteration:
@@ -858,4 +1200,7 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
     def _on_output_batch(self):
         for _ in range(len(self._places)):
             self._batches_outstanding -= 1
-            self._try_put_indices()
+            # outstanding batches may exceed capacity after online auto
+            # tuning decreasing it, put indices after draining
+            if self._batches_outstanding < self._outstanding_capacity:
+                self._try_put_indices()
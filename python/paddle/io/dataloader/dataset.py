@@ -36,6 +36,14 @@ class Dataset:
     :code:`__len__`: return dataset sample number. This method is required
     by some implements of :code:`paddle.io.BatchSampler`
 
+    Subclasses can optionally implement following method:
+
+    :code:`__getitems__`: get a list of samples from dataset with a list of
+    indices. If implemented, :code:`paddle.io.DataLoader` reads each batch
+    by one calling of this method instead of calling :code:`__getitem__` for
+    each index, which is useful for datasets supporting vectorized reading,
+    e.g. columnar files or memory-mapped arrays.
+
     see :code:`paddle.io.DataLoader`.
 
     Examples:
@@ -311,10 +319,34 @@ class TensorDataset(Dataset):
     def __getitem__(self, index):
         return tuple(tensor[index] for tensor in self.tensors)
 
+    def __getitems__(self, indices):
+        if len(indices) == 0:
+            return []
+        # gather a batch by one indexing for each tensor and split it
+        # into samples, instead of indexing each sample from tensors
+        fields = []
+        for tensor in self.tensors:
+            if isinstance(tensor, paddle.Tensor):
+                index = paddle.to_tensor(indices, dtype='int64')
+                fields.append(paddle.gather(tensor, index).unbind(0))
+            else:
+                fields.append(list(tensor[indices]))
+        return list(zip(*fields))
+
     def __len__(self):
         return self.tensors[0].shape[0]
 
 
+def _getitems(dataset, indices):
+    """
+    Get a list of samples from :attr:`dataset` by :code:`__getitems__` if
+    implemented, otherwise by :code:`__getitem__` for each index.
+    """
+    if hasattr(dataset, '__getitems__'):
+        return dataset.__getitems__(indices)
+    return [dataset[idx] for idx in indices]
+
+
 def to_list(value):
     if value is None:
         return value
@@ -388,6 +420,13 @@ class ComposeDataset(Dataset):
             sample.extend(to_list(dataset[idx]))
         return tuple(sample)
 
+    def __getitems__(self, indices):
+        samples = [[] for _ in indices]
+        for dataset in self.datasets:
+            for sample, fields in zip(samples, _getitems(dataset, indices)):
+                sample.extend(to_list(fields))
+        return [tuple(sample) for sample in samples]
+
 
 class ChainDataset(IterableDataset):
     """
@@ -478,6 +517,9 @@ class Subset(Dataset):
     def __getitem__(self, idx):
         return self.dataset[self.indices[idx]]
 
+    def __getitems__(self, indices):
+        return _getitems(self.dataset, [self.indices[idx] for idx in indices])
+
     def __len__(self):
         return len(self.indices)
 
@@ -671,3 +713,29 @@ class ConcatDataset(Dataset):
         else:
             sample_idx = idx - self.cumulative_sizes[dataset_idx - 1]
         return self.datasets[dataset_idx][sample_idx]
+
+    def __getitems__(self, indices):
+        # group indices by datasets, read each dataset once and put
+        # samples back in the order of indices
+        groups = {}
+        for i, idx in enumerate(indices):
+            if idx < 0:
+                if -idx > len(self):
+                    raise ValueError(
+                        "absolute value of index should not exceed dataset length"
+                    )
+                idx = len(self) + idx
+            dataset_idx = bisect.bisect_right(self.cumulative_sizes, idx)
+            if dataset_idx > 0:
+                idx = idx - self.cumulative_sizes[dataset_idx - 1]
+            groups.setdefault(dataset_idx, ([], []))
+            groups[dataset_idx][0].append(i)
+            groups[dataset_idx][1].append(idx)
+
+        samples = [None] * len(indices)
+        for dataset_idx, (positions, sample_indices) in groups.items():
+            for i, sample in zip(
+                positions, _getitems(self.datasets[dataset_idx], sample_indices)
+            ):
+                samples[i] = sample
+        return samples
@@ -13,6 +13,9 @@
 # limitations under the License.
 
 
+from .dataset import _getitems
+
+
 class _DatasetFetcher:
     def __init__(self, dataset, auto_collate_batch, collate_fn, drop_last):
         self.dataset = dataset
@@ -71,12 +74,18 @@ class _MapDatasetFetcher(_DatasetFetcher):
 
     def fetch(self, batch_indices, done_event=None):
         if self.auto_collate_batch:
-            data = []
-            for idx in batch_indices:
-                if done_event is None or not done_event.is_set():
-                    data.append(self.dataset[idx])
-                else:
+            if hasattr(self.dataset, '__getitems__'):
+                # read the whole batch by one calling of __getitems__
+                if done_event is not None and done_event.is_set():
                     return None
+                data = _getitems(self.dataset, batch_indices)
+            else:
+                data = []
+                for idx in batch_indices:
+                    if done_event is None or not done_event.is_set():
+                        data.append(self.dataset[idx])
+                    else:
+                        return None
 
         else:
             data = self.dataset[batch_indices]
@@ -0,0 +1,165 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import math
+import multiprocessing
+
+# batch number of each tuning window
+TUNING_WINDOW = 50
+# consumer waiting ratio to add workers or prefetch
+HIGH_WAIT_RATIO = 0.1
+# consumer waiting ratio to retire workers or prefetch
+LOW_WAIT_RATIO = 0.01
+# redundancy of workers over the estimated needed number
+WORKER_REDUNDANCY = 1.2
+MAX_PREFETCH_FACTOR = 8
+
+
+class _OnlineAutoTuner:
+    """
+    Controller of DataLoader online auto tuning, tune num_workers and
+    prefetch_factor of a running multi-process DataLoader iterator by
+    windows of batches.
+
+    In each window, consumer wait cost (blocking in reading a batch) and
+    step cost (interval between two output batches) are recorded by the
+    iterator, and producer cost (mean fetch cost of a batch in workers)
+    is given at the window end. Workers needed to keep up with consumer
+    is estimated as ``producer_cost / (step_cost - wait_cost)``:
+
+    1. consumer waits more than :attr:`HIGH_WAIT_RATIO` of step cost,
+       add workers to the estimated number, or increase prefetch_factor
+       if num_workers reaches upper bound.
+    2. consumer waits less than :attr:`LOW_WAIT_RATIO` of step cost,
+       decrease prefetch_factor to the initial value first, then retire
+       one worker per window if more workers than estimated are running.
+
+    The window after a change is skipped for the transient costs.
+
+    Args:
+        num_workers(int): initial worker number.
+        prefetch_factor(int): initial prefetch factor.
+        max_num_workers(int, optional): upper bound of worker number,
+            None for half of cpu count. Default None.
+        min_num_workers(int, optional): lower bound of worker number.
+            Default 1.
+        window(int, optional): batch number of a tuning window.
+            Default :attr:`TUNING_WINDOW`.
+        max_prefetch_factor(int, optional): upper bound of prefetch
+            factor. Default :attr:`MAX_PREFETCH_FACTOR`.
+    """
+
+    def __init__(
+        self,
+        num_workers,
+        prefetch_factor,
+        max_num_workers=None,
+        min_num_workers=1,
+        window=TUNING_WINDOW,
+        max_prefetch_factor=MAX_PREFETCH_FACTOR,
+    ):
+        if max_num_workers is None:
+            max_num_workers = max(multiprocessing.cpu_count() // 2, 1)
+        self.max_num_workers = max(max_num_workers, num_workers)
+        self.min_num_workers = max(min(min_num_workers, num_workers), 1)
+        self.num_workers = num_workers
+        self.init_prefetch_factor = prefetch_factor
+        self.prefetch_factor = prefetch_factor
+        self.max_prefetch_factor = max(max_prefetch_factor, prefetch_factor)
+        self.window = window
+
+        self._skip_window = True
+        self._wait_cost = 0.0
+        self._step_cost = 0.0
+        self._steps = 0
+
+    def record(self, wait_cost, step_cost):
+        self._wait_cost += wait_cost
+        self._step_cost += step_cost
+        self._steps += 1
+
+    def ready(self):
+        return self._steps >= self.window
+
+    def _reset_window(self):
+        self._wait_cost = 0.0
+        self._step_cost = 0.0
+        self._steps = 0
+
+    def tune(self, producer_cost):
+        """
+        Decide num_workers and prefetch_factor at the window end.
+
+        Args:
+            producer_cost(float|None): mean fetch cost of a batch in
+                workers in this window, None if no batch fetched.
+
+        Returns:
+            tuple|None: new (num_workers, prefetch_factor), None if
+                nothing changes.
+        """
+        steps = self._steps
+        wait_cost, step_cost = self._wait_cost, self._step_cost
+        self._reset_window()
+
+        # costs of the window after a change are transient
+        if self._skip_window:
+            self._skip_window = False
+            return None
+        if steps == 0 or step_cost <= 0 or not producer_cost:
+            return None
+
+        wait_ratio = wait_cost / step_cost
+        consume_cost = max((step_cost - wait_cost) / steps, 1e-6)
+        needed = math.ceil(producer_cost / consume_cost * WORKER_REDUNDANCY)
+        needed = min(max(needed, self.min_num_workers), self.max_num_workers)
+
+        num_workers = self.num_workers
+        prefetch_factor = self.prefetch_factor
+        if wait_ratio > HIGH_WAIT_RATIO:
+            if needed > num_workers:
+                num_workers = needed
+            elif num_workers < self.max_num_workers:
+                num_workers += 1
+            elif prefetch_factor < self.max_prefetch_factor:
+                prefetch_factor += 1
+        elif wait_ratio < LOW_WAIT_RATIO:
+            if prefetch_factor > self.init_prefetch_factor:
+                prefetch_factor -= 1
+            elif needed < num_workers:
+                num_workers -= 1
+
+        if (
+            num_workers == self.num_workers
+            and prefetch_factor == self.prefetch_factor
+        ):
+            return None
+
+        logging.info(
+            "DataLoader online auto tune: wait ratio %.3f, producer cost "
+            "%.4fs, consumer cost %.4fs, num_workers %d -> %d, "
+            "prefetch_factor %d -> %d",
+            wait_ratio,
+            producer_cost,
+            consume_cost,
+            self.num_workers,
+            num_workers,
+            self.prefetch_factor,
+            prefetch_factor,
+        )
+        self.num_workers = num_workers
+        self.prefetch_factor = prefetch_factor
+        self._skip_window = True
+        return num_workers, prefetch_factor
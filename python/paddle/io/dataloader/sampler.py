@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
+
 import numpy as np
 
 from ...framework import core
@@ -31,6 +33,16 @@ class Sampler:
 
     :code:`__len__`: the number of sample in :attr:`data_source`
 
+    Samplers can optionally implement :code:`state_dict` and
+    :code:`load_state_dict` to save and restore the sampling position
+    and random state of current iteration, which is used to resume
+    :code:`paddle.io.DataLoader` in the middle of an epoch without
+    reading the consumed samples. The state dict should contain the
+    number of indices yielded in current iteration as
+    :code:`num_yielded`, and after :code:`load_state_dict`, the next
+    iteration should reproduce the saved iteration and skip the first
+    :code:`num_yielded` indices.
+
 
     Args:
         data_source(Dataset, optional): this could be an instance of
@@ -90,6 +102,13 @@ class Sampler:
     def __iter__(self):
         raise NotImplementedError
 
+    def _yield_from(self, indices, start=0):
+        # yield indices from start and count yielded number for state_dict
+        self._num_yielded = start
+        for index in itertools.islice(indices, start, None):
+            self._num_yielded += 1
+            yield index
+
     # Not define __len__ method in this base class here for __len__
     # is not needed in same sence, e.g. paddle.io.IterableDataset
 
@@ -140,13 +159,23 @@ class SequenceSampler(Sampler):
 
     def __init__(self, data_source):
         self.data_source = data_source
+        self._num_yielded = 0
+        self._resume_state = None
 
     def __iter__(self):
-        return iter(range(len(self.data_source)))
+        resume_state, self._resume_state = self._resume_state, None
+        start = resume_state['num_yielded'] if resume_state else 0
+        return self._yield_from(range(len(self.data_source)), start)
 
     def __len__(self):
         return len(self.data_source)
 
+    def state_dict(self):
+        return {'num_yielded': self._num_yielded}
+
+    def load_state_dict(self, state_dict):
+        self._resume_state = dict(state_dict)
+
 
 class RandomSampler(Sampler):
     """
@@ -223,6 +252,10 @@ class RandomSampler(Sampler):
                 f"but got num_samples={self.num_samples}"
             )
 
+        self._num_yielded = 0
+        self._rng_state = None
+        self._resume_state = None
+
     @property
     def num_samples(self):
         if self._num_samples is None:
@@ -231,30 +264,53 @@ class RandomSampler(Sampler):
 
     def __iter__(self):
         n = len(self.data_source)
+        resume_state, self._resume_state = self._resume_state, None
+        start = resume_state['num_yielded'] if resume_state else 0
         if self.generator:
-            for i in range(self.num_samples):
-                try:
-                    index = next(self.generator)
-                except StopIteration:
-                    return
-                yield index
+            indices = itertools.islice(self.generator, self.num_samples)
         else:
-            if self.replacement:
-                for index in np.random.choice(
-                    np.arange(n), self.num_samples, replace=True
-                ).tolist():
-                    yield index
-            else:
-                for index in np.random.choice(
-                    np.arange(n), self.num_samples, replace=False
-                ).tolist():
-                    yield index
+            # NOTE: record random state before sampling to reproduce the
+            # same indices in resuming, resuming samples with a private
+            # RandomState instead of setting the global random state
+            rng = np.random
+            if resume_state and resume_state.get('rng_state') is not None:
+                rng = np.random.RandomState()
+                rng.set_state(resume_state['rng_state'])
+            self._rng_state = rng.get_state()
+            indices = rng.choice(
+                np.arange(n), self.num_samples, replace=self.replacement
+            ).tolist()
+        yield from self._yield_from(indices, start)
 
     def __len__(self):
         return self.num_samples
 
+    def state_dict(self):
+        """
+        Get the state of current iteration, which contains the random
+        state before sampling and the number of yielded indices.
+
+        Returns:
+            dict: state of current iteration.
+        """
+        return {
+            'num_yielded': self._num_yielded,
+            'rng_state': self._rng_state,
+        }
+
+    def load_state_dict(self, state_dict):
+        """
+        Load a state got by :code:`state_dict`, the next iteration yields
+        the same indices as the saved iteration after the yielded ones.
+        Indices from :attr:`generator` is skipped by drawing.
 
-def _weighted_sample(weights, num_samples, replacement=True):
+        Args:
+            state_dict(dict): state got by :code:`state_dict`.
+        """
+        self._resume_state = dict(state_dict)
+
+
+def _weighted_sample(weights, num_samples, replacement=True, rng=np.random):
     if isinstance(weights, core.LoDTensor):
         weights = weights.numpy()
     if isinstance(weights, (list, tuple)):
@@ -279,9 +335,7 @@ def _weighted_sample(weights, num_samples, replacement=True):
     weights = weights / weights.sum(axis=1)
     rets = []
     for i in range(weights.shape[0]):
-        ret = np.random.choice(
-            weights.shape[1], num_samples, replacement, weights[i]
-        )
+        ret = rng.choice(weights.shape[1], num_samples, replacement, weights[i])
         rets.append(ret)
     return np.array(rets)
 
@@ -331,17 +385,36 @@ class WeightedRandomSampler(Sampler):
         self.weights = weights
         self.num_samples = num_samples
         self.replacement = replacement
+        self._num_yielded = 0
+        self._rng_state = None
+        self._resume_state = None
 
     def __iter__(self):
+        resume_state, self._resume_state = self._resume_state, None
+        start = resume_state['num_yielded'] if resume_state else 0
+        rng = np.random
+        if resume_state and resume_state.get('rng_state') is not None:
+            rng = np.random.RandomState()
+            rng.set_state(resume_state['rng_state'])
+        self._rng_state = rng.get_state()
         idxs = _weighted_sample(
-            self.weights, self.num_samples, self.replacement
+            self.weights, self.num_samples, self.replacement, rng
         )
-        return iter(idxs.reshape(-1).tolist())
+        return self._yield_from(idxs.reshape(-1).tolist(), start)
 
     def __len__(self):
         mul = np.prod(self.weights.shape) // self.weights.shape[-1]
         return self.num_samples * mul
 
+    def state_dict(self):
+        return {
+            'num_yielded': self._num_yielded,
+            'rng_state': self._rng_state,
+        }
+
+    def load_state_dict(self, state_dict):
+        self._resume_state = dict(state_dict)
+
 
 class SubsetRandomSampler(Sampler):
     r"""
@@ -376,10 +449,27 @@ class SubsetRandomSampler(Sampler):
                 "The length of `indices` in SubsetRandomSampler should be greater than 0."
             )
         self.indices = indices
+        self._num_yielded = 0
+        self._perm = None
+        self._resume_state = None
 
     def __iter__(self):
-        for i in randperm(len(self.indices)):
+        resume_state, self._resume_state = self._resume_state, None
+        start = resume_state['num_yielded'] if resume_state else 0
+        # NOTE: permutation is generated by paddle random generator, which
+        # is saved in state instead of random state for resuming
+        if resume_state and resume_state.get('perm') is not None:
+            self._perm = list(resume_state['perm'])
+        else:
+            self._perm = randperm(len(self.indices)).tolist()
+        for i in self._yield_from(self._perm, start):
             yield self.indices[i]
 
     def __len__(self) -> int:
         return len(self.indices)
+
+    def state_dict(self):
+        return {'num_yielded': self._num_yielded, 'perm': self._perm}
+
+    def load_state_dict(self, state_dict):
+        self._resume_state = dict(state_dict)
@@ -0,0 +1,245 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+
+import numpy as np
+
+# NOTE: each slot payload is aligned to cache line size so that
+# arrays written into a slot can be viewed without unaligned access
+_SLOT_ALIGN = 64
+
+_SLOT_FREE = 0
+_SLOT_BUSY = 1
+
+
+def _align(size, align=_SLOT_ALIGN):
+    return (size + align - 1) // align * align
+
+
+def _use_shm_ring():
+    if sys.platform == 'darwin' or sys.platform == 'win32':
+        return False
+    return os.environ.get('FLAGS_use_shm_ring', False) in [
+        1,
+        '1',
+        True,
+        'True',
+        'true',
+    ]
+
+
+def _shm_ring_slot_size():
+    return int(os.environ.get('FLAGS_shm_ring_slot_size', 0))
+
+
+class _ShmRingSlot:
+    """
+    Descriptor of a batch written into a worker's shared memory ring,
+    only this small object is sent through the worker output queue.
+
+    Args:
+        worker_id(int): id of the worker owns the ring.
+        slot(int): slot index in the ring.
+        metas(list): (offset, dtype, shape) of each flattened array.
+    """
+
+    __slots__ = ['worker_id', 'slot', 'metas']
+
+    def __init__(self, worker_id, slot, metas):
+        self.worker_id = worker_id
+        self.slot = slot
+        self.metas = metas
+
+    def __getstate__(self):
+        return (self.worker_id, self.slot, self.metas)
+
+    def __setstate__(self, state):
+        self.worker_id, self.slot, self.metas = state
+
+
+class _SharedMemoryRing:
+    """
+    A preallocated, fixed-slot shared memory ring owned by one
+    DataLoader worker. The main process creates the ring and unlinks it
+    on shutdown, the worker writes flattened batch arrays into a free
+    slot in place and sends a :code:`_ShmRingSlot` descriptor instead of
+    the arrays, the main process copies the arrays out and releases the
+    slot.
+
+    Memory layout: ``num_slots`` bytes of slot states as header, followed
+    by ``num_slots`` payload slots of ``slot_size`` bytes each.
+
+    Args:
+        num_slots(int): slot number of the ring.
+        slot_size(int): payload bytes of each slot.
+    """
+
+    def __init__(self, num_slots, slot_size):
+        from multiprocessing import shared_memory
+
+        from paddle.incubate import multiprocessing
+
+        assert num_slots > 0, "num_slots should be a positive value"
+        assert slot_size > 0, "slot_size should be a positive value"
+        self.num_slots = num_slots
+        self.slot_size = _align(slot_size)
+        self._header_size = _align(num_slots)
+        self._shm = shared_memory.SharedMemory(
+            create=True,
+            size=self._header_size + self.num_slots * self.slot_size,
+        )
+        # NOTE: workers are forked with the ring, so the owner is recorded
+        # by pid instead of a flag to avoid unlinking in workers
+        self._owner_pid = os.getpid()
+        self._free_slots = multiprocessing.Semaphore(num_slots)
+        self._states = np.ndarray(
+            (num_slots,), dtype=np.uint8, buffer=self._shm.buf
+        )
+        self._states[:] = _SLOT_FREE
+
+    def __getstate__(self):
+        return {
+            'name': self._shm.name,
+            'num_slots': self.num_slots,
+            'slot_size': self.slot_size,
+            'free_slots': self._free_slots,
+        }
+
+    def __setstate__(self, state):
+        from multiprocessing import resource_tracker, shared_memory
+
+        self.num_slots = state['num_slots']
+        self.slot_size = state['slot_size']
+        self._header_size = _align(self.num_slots)
+        self._free_slots = state['free_slots']
+        self._shm = shared_memory.SharedMemory(name=state['name'])
+        # NOTE: only the creator should unlink the shared memory, an
+        # attached process should not let resource tracker unlink it
+        # on exit
+        try:
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        except Exception:
+            pass
+        self._owner_pid = None
+        self._states = np.ndarray(
+            (self.num_slots,), dtype=np.uint8, buffer=self._shm.buf
+        )
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def _slot_offset(self, slot):
+        return self._header_size + slot * self.slot_size
+
+    def fits(self, arrays):
+        """
+        Whether all arrays can be written into one slot, only numpy
+        arrays with non-object dtype can be written into shared memory.
+        """
+        size = 0
+        for arr in arrays:
+            if not isinstance(arr, np.ndarray) or arr.dtype.hasobject:
+                return False
+            size += _align(arr.nbytes)
+        return size <= self.slot_size
+
+    def acquire(self, timeout=None):
+        """
+        Acquire a free slot for writing, return slot index, or None if
+        no slot is freed in :attr:`timeout` seconds.
+        """
+        if not self._free_slots.acquire(timeout=timeout):
+            return None
+        for slot in range(self.num_slots):
+            if self._states[slot] == _SLOT_FREE:
+                self._states[slot] = _SLOT_BUSY
+                return slot
+        # semaphore counts free slots, so this should never happen
+        self._free_slots.release()
+        raise RuntimeError("shared memory ring has no free slot")
+
+    def write(self, worker_id, slot, arrays):
+        """
+        Write arrays into an acquired slot in place and return the slot
+        descriptor to be sent to main process.
+        """
+        metas = []
+        offset = self._slot_offset(slot)
+        for arr in arrays:
+            view = np.ndarray(
+                arr.shape, dtype=arr.dtype, buffer=self._shm.buf, offset=offset
+            )
+            view[...] = arr
+            metas.append((offset, arr.dtype.str, arr.shape))
+            offset += _align(arr.nbytes)
+        return _ShmRingSlot(worker_id, slot, metas)
+
+    def read(self, desc):
+        """
+        Return numpy views of the arrays in the slot described by
+        :attr:`desc`, views are only valid before :code:`release`.
+        """
+        return [
+            np.ndarray(
+                shape,
+                dtype=np.dtype(dtype),
+                buffer=self._shm.buf,
+                offset=offset,
+            )
+            for offset, dtype, shape in desc.metas
+        ]
+
+    def release(self, slot):
+        self._states[slot] = _SLOT_FREE
+        self._free_slots.release()
+
+    def close(self):
+        if self._shm is None:
+            return
+        # views on shm.buf must be released before closing it
+        self._states = None
+        try:
+            if self._owner_pid == os.getpid():
+                self._shm.unlink()
+            self._shm.close()
+        except Exception:
+            pass
+        finally:
+            self._shm = None
+
+    def __del__(self):
+        self.close()
+
+
+def _estimate_slot_size(dataset, batch_size):
+    """
+    Estimate ring slot size from the first sample of a map-style dataset,
+    batches exceeding slot size fall back to the queue transport.
+    """
+    from .flat import _flatten_batch
+
+    sample = dataset[0]
+    arrays, _ = _flatten_batch(sample)
+    sample_size = 0
+    for arr in arrays:
+        if not isinstance(arr, np.ndarray):
+            arr = np.asarray(arr)
+        sample_size += arr.nbytes
+    # reserve 50% for variable length samples and alignment padding
+    size = int(sample_size * batch_size * 1.5) + _SLOT_ALIGN * len(arrays)
+    # round up to 1MB
+    return _align(size, 1 << 20)
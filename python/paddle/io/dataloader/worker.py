@@ -13,8 +13,10 @@
 # limitations under the License.
 
 import os
+import pickle
 import queue
 import sys
+import time
 import traceback
 
 import numpy as np
@@ -40,6 +42,22 @@ class _ResumeIteration:
     pass
 
 
+class _RetireWorker:
+    pass
+
+
+class _PoolFetcher:
+    """
+    Register fetcher of a DataLoader to workers of a shared worker pool,
+    or unregister it if :attr:`payload` is None. Fetcher arguments are
+    pickled in main process to raise pickling error in place.
+    """
+
+    def __init__(self, key, payload=None):
+        self.key = key
+        self.payload = payload
+
+
 class _DatasetKind:
     MAP = 0
     ITER = 1
@@ -283,6 +301,9 @@ def _worker_loop(
     use_shared_memory,
     base_seed,
     shm_cache_size=0,
+    shm_ring=None,
+    fetch_stats=None,
+    pool_key=None,
 ):
     try:
         # NOTE: [ mmap files clear ] When the child process exits unexpectedly,
@@ -327,6 +348,14 @@ def _worker_loop(
         except:
             init_exception = _WorkerException(worker_id)
 
+        # NOTE: workers of a shared worker pool fetch data for several
+        # DataLoaders, fetchers are registered by _PoolFetcher and selected
+        # by the key in indices
+        pool_fetchers = {}
+        pool_fetcher_key = pool_key
+        if pool_key is not None and init_exception is None:
+            pool_fetchers[pool_key] = fetcher
+
         iterator_drained = False
         parent_watch_dog = ParentWatchDog()
 
@@ -344,6 +373,23 @@ def _worker_loop(
                 )
                 continue
 
+            if isinstance(data, _PoolFetcher):
+                if data.payload is None:
+                    pool_fetchers.pop(data.key, None)
+                else:
+                    try:
+                        pool_fetchers[data.key] = _DatasetKind.create_fetcher(
+                            *pickle.loads(data.payload)
+                        )
+                    except:
+                        pool_fetchers[data.key] = _WorkerException(worker_id)
+                continue
+
+            # worker is retired by online auto tuning, indices put
+            # before have been fetched, simply exit
+            if isinstance(data, _RetireWorker):
+                break
+
             # None as poison piil, so worker event should be set
             if data is None:
                 assert (
@@ -355,7 +401,21 @@ def _worker_loop(
             if done_event.is_set() or iterator_drained:
                 continue
 
-            idx, indices = data
+            if len(data) == 3:
+                idx, indices, key = data
+                fetcher = pool_fetchers[key]
+                if isinstance(fetcher, _WorkerException):
+                    init_exception = fetcher
+                elif key != pool_fetcher_key:
+                    pool_fetcher_key = key
+                    _worker_info = WorkerInfo(
+                        id=worker_id,
+                        num_workers=num_workers,
+                        dataset=fetcher.dataset,
+                        seed=base_seed,
+                    )
+            else:
+                idx, indices = data
             try:
                 if init_exception is not None:
                     batch = init_exception
@@ -366,8 +426,14 @@ def _worker_loop(
                     #       may copy CPU tensor to GPU even if users want to use
                     #       CPU tensor operation, so we add CPUPlace guard here
                     #       to make sure tensor will be operated only on CPU
+                    fetch_start = time.time()
                     with paddle.base.dygraph.guard(place=paddle.CPUPlace()):
                         batch = fetcher.fetch(indices)
+                    # NOTE: fetch_stats is a shared array of (cost, count)
+                    # for each worker, only written by the owner worker
+                    if fetch_stats is not None:
+                        fetch_stats[2 * worker_id] += time.time() - fetch_start
+                        fetch_stats[2 * worker_id + 1] += 1
             except Exception as e:
                 if (
                     isinstance(e, StopIteration)
@@ -381,7 +447,26 @@ def _worker_loop(
                 if isinstance(batch, _WorkerException):
                     out_queue.put((idx, batch, None))
                 batch, structure = _flatten_batch(batch)
-                if use_shared_memory:
+                if shm_ring is not None:
+                    batch = [
+                        b.numpy() if isinstance(b, paddle.Tensor) else b
+                        for b in batch
+                    ]
+                if shm_ring is not None and shm_ring.fits(batch):
+                    # NOTE: write batch into a free slot of the shared memory
+                    # ring in place, only the slot descriptor is sent to main
+                    # process. Wait for main process to release a slot with
+                    # done event and parent process checked, avoid hanging
+                    slot = None
+                    while slot is None and parent_watch_dog.is_alive():
+                        if done_event.is_set():
+                            break
+                        slot = shm_ring.acquire(MP_STATUS_CHECK_INTERVAL)
+                    if slot is None:
+                        continue
+                    desc = shm_ring.write(worker_id, slot, batch)
+                    out_queue.put((idx, desc, structure))
+                elif use_shared_memory:
 
                     def numpy2lodtensor(arr):
                         lodtensor = core.Tensor()
@@ -405,6 +490,8 @@ def _worker_loop(
     finally:
         if use_shared_memory:
             _cleanup_mmap()
+        if shm_ring is not None:
+            shm_ring.close()
     if done_event.is_set():
         out_queue.cancel_join_thread()
         out_queue.close()
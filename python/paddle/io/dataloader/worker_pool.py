@@ -0,0 +1,364 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import logging
+import queue
+import sys
+import threading
+
+import numpy as np
+
+from ...framework import core
+from ..multiprocess_utils import (
+    MP_STATUS_CHECK_INTERVAL,
+    CleanupFuncRegistrar,
+    _set_SIGCHLD_handler,
+)
+from .shm_ring import (
+    _estimate_slot_size,
+    _SharedMemoryRing,
+    _shm_ring_slot_size,
+    _ShmRingSlot,
+    _use_shm_ring,
+)
+from .worker import _DatasetKind, _PoolFetcher, _worker_loop
+
+# name -> _WorkerPool of all alive worker pools
+_worker_pools = {}
+_worker_pools_lock = threading.Lock()
+
+
+class _WorkerPool:
+    """
+    A named, reference-counted pool of DataLoader worker processes
+    shared by DataLoaders created with the same :attr:`worker_pool`
+    name, which saves forking workers for each DataLoader, e.g. train
+    and eval DataLoaders, or DataLoaders rebuilt in each epoch.
+
+    Workers are forked with the dataset of the first iterated DataLoader,
+    datasets and collate_fn of other DataLoaders are pickled to workers
+    once on first iteration. Each iteration of a DataLoader opens a
+    session of the pool, workers' output is routed to the session by a
+    router thread, so DataLoaders can iterate at the same time.
+
+    Only map-style dataset is supported. DataLoaders of a pool should have
+    the same worker settings, the random seed of workers is drawn when the
+    pool is started, and the shared memory slots are sized by the first
+    iterated DataLoader, batches of other DataLoaders not fitting in a slot
+    are sent by queue.
+
+    The pool is referenced by each DataLoader and each alive iterator of
+    them, so an iterator keeps using the pool after its DataLoader is
+    deleted.
+
+    Args:
+        name(str): name of the worker pool.
+        num_workers(int): worker process number.
+        use_shared_memory(bool): whether to use shared memory for worker
+            output.
+        worker_init_fn(callable|None): init function called in workers.
+        prefetch_factor(int): batches prefetched by each worker.
+    """
+
+    def __init__(
+        self,
+        name,
+        num_workers,
+        use_shared_memory,
+        worker_init_fn,
+        prefetch_factor,
+    ):
+        self.name = name
+        self.num_workers = num_workers
+        self.use_shared_memory = use_shared_memory
+        self.worker_init_fn = worker_init_fn
+        self.prefetch_factor = prefetch_factor
+
+        self._ref_count = 0
+        # loader key -> references of the DataLoader and its iterators
+        self._key_refs = {}
+        self._lock = threading.Lock()
+        self._started = False
+        self._shutdown = False
+        self._loader_keys = itertools.count()
+        self._registered_keys = set()
+        self._session_ids = itertools.count()
+        self._sessions = {}
+
+        self.workers = []
+        self.indices_queues = []
+        self.shm_rings = []
+        self._data_queue = None
+        self._done_event = None
+        self._router = None
+
+    def new_loader_key(self):
+        return next(self._loader_keys)
+
+    def _start(self, loader, key, collate_fn):
+        from paddle.incubate import multiprocessing
+
+        self._data_queue = multiprocessing.Queue()
+        self._done_event = multiprocessing.Event()
+        base_seed = np.random.randint(low=0, high=sys.maxsize)
+
+        slot_size = 0
+        if self.use_shared_memory and _use_shm_ring():
+            slot_size = _shm_ring_slot_size()
+            if slot_size <= 0:
+                try:
+                    slot_size = _estimate_slot_size(
+                        loader.dataset, loader.batch_size or 1
+                    )
+                except:
+                    slot_size = 0
+
+        for i in range(self.num_workers):
+            shm_ring = None
+            if slot_size > 0:
+                shm_ring = _SharedMemoryRing(
+                    self.prefetch_factor + 1, slot_size
+                )
+                self.shm_rings.append(shm_ring)
+            indices_queue = multiprocessing.Queue()
+            indices_queue.cancel_join_thread()
+            self.indices_queues.append(indices_queue)
+            worker = multiprocessing.Process(
+                target=_worker_loop,
+                args=(
+                    loader.dataset,
+                    loader.dataset_kind,
+                    indices_queue,
+                    self._data_queue,
+                    self._done_event,
+                    loader.auto_collate_batch,
+                    collate_fn,
+                    loader.drop_last,
+                    self.worker_init_fn,
+                    i,
+                    self.num_workers,
+                    self.use_shared_memory,
+                    base_seed,
+                ),
+                kwargs={'shm_ring': shm_ring, 'pool_key': key},
+            )
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+
+        core._set_process_pids(id(self), tuple(w.pid for w in self.workers))
+        _set_SIGCHLD_handler()
+
+        self._router = threading.Thread(target=self._route_loop)
+        self._router.daemon = True
+        self._router.start()
+
+        self._registered_keys.add(key)
+        self._started = True
+
+    def _register(self, loader, key, collate_fn):
+        from multiprocessing.reduction import ForkingPickler
+
+        payload = bytes(
+            ForkingPickler.dumps(
+                (
+                    loader.dataset_kind,
+                    loader.dataset,
+                    loader.auto_collate_batch,
+                    collate_fn,
+                    loader.drop_last,
+                )
+            )
+        )
+        for q in self.indices_queues:
+            q.put(_PoolFetcher(key, payload))
+        self._registered_keys.add(key)
+
+    def unregister(self, key):
+        with self._lock:
+            if key in self._registered_keys and not self._shutdown:
+                for q in self.indices_queues:
+                    q.put(_PoolFetcher(key))
+            self._registered_keys.discard(key)
+
+    def open_session(self, loader, key, collate_fn):
+        """
+        Open a session for an iteration of :attr:`loader`, return session
+        id and the queue to get workers' output for this session.
+        """
+        with self._lock:
+            assert not self._shutdown, f"worker pool {self.name} is shutdown"
+            if not self._started:
+                self._start(loader, key, collate_fn)
+            elif key not in self._registered_keys:
+                self._register(loader, key, collate_fn)
+            session_id = next(self._session_ids)
+            # NOTE: session queue is a thread queue, data is put by router
+            # thread and get by the reader thread of the iterator
+            self._sessions[session_id] = queue.Queue()
+            return session_id, self._sessions[session_id]
+
+    def close_session(self, session_id):
+        with self._lock:
+            data_queue = self._sessions.pop(session_id, None)
+        if data_queue is None:
+            return
+        while True:
+            try:
+                self._release_shm_slot(data_queue.get_nowait())
+            except queue.Empty:
+                break
+
+    def _release_shm_slot(self, data):
+        if isinstance(data, tuple) and isinstance(data[1], _ShmRingSlot):
+            self.shm_rings[data[1].worker_id].release(data[1].slot)
+
+    def _route_loop(self):
+        while not self._done_event.is_set():
+            try:
+                data = self._data_queue.get(timeout=MP_STATUS_CHECK_INTERVAL)
+            except (OSError, queue.Empty):
+                continue
+            except Exception as e:
+                if self._done_event.is_set():
+                    break
+                logging.error(
+                    f"DataLoader worker pool {self.name} failed({e}) to "
+                    "read data from workers' result queue."
+                )
+                break
+
+            # workers' output is (idx, batch, structure), and idx is
+            # (session_id, send_idx) put by iterator
+            (session_id, idx), batch, structure = data
+            with self._lock:
+                session_queue = self._sessions.get(session_id)
+            if session_queue is None:
+                # session closed, drop the output
+                self._release_shm_slot(data)
+            else:
+                session_queue.put((idx, batch, structure))
+
+    def shutdown(self, timeout=None):
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            sessions = list(self._sessions)
+        for session_id in sessions:
+            self.close_session(session_id)
+        if not self._started:
+            return
+        try:
+            self._done_event.set()
+            for q in self.indices_queues:
+                q.put(None)
+            for w in self.workers:
+                w.join(timeout)
+            for q in self.indices_queues:
+                q.cancel_join_thread()
+                q.close()
+            self._data_queue.cancel_join_thread()
+            self._data_queue.close()
+            for ring in self.shm_rings:
+                ring.close()
+        finally:
+            core._erase_process_pids(id(self))
+
+
+def _worker_pool_settings(loader):
+    return {
+        'num_workers': loader.num_workers,
+        'use_shared_memory': loader.use_shared_memory,
+        'worker_init_fn': loader.worker_init_fn,
+        'prefetch_factor': loader.prefetch_factor,
+    }
+
+
+def _acquire_worker_pool(name, loader):
+    """
+    Acquire a reference of worker pool named :attr:`name` for
+    :attr:`loader`, create the worker pool by the setting of :attr:`loader`
+    if not exists. Return the worker pool and the key of :attr:`loader`.
+    """
+    if loader.dataset_kind != _DatasetKind.MAP:
+        raise ValueError("worker_pool only supports map-style dataset")
+    settings = _worker_pool_settings(loader)
+    with _worker_pools_lock:
+        pool = _worker_pools.get(name)
+        if pool is None:
+            pool = _WorkerPool(name, **settings)
+            _worker_pools[name] = pool
+        else:
+            mismatched = [
+                f"{k}({v} vs {getattr(pool, k)})"
+                for k, v in settings.items()
+                if v != getattr(pool, k)
+            ]
+            if mismatched:
+                raise ValueError(
+                    f"DataLoader mismatches the settings of worker pool "
+                    f"{name}: {', '.join(mismatched)}, use another "
+                    "worker_pool name for these settings."
+                )
+        key = pool.new_loader_key()
+        pool._ref_count += 1
+        pool._key_refs[key] = 1
+        return pool, key
+
+
+def _retain_worker_pool(pool, key):
+    """
+    Acquire another reference of :attr:`pool` for an iterator of the
+    DataLoader with :attr:`key`, which is released when the iterator is
+    shutdown.
+    """
+    with _worker_pools_lock:
+        assert pool._ref_count > 0, f"worker pool {pool.name} is released"
+        pool._ref_count += 1
+        pool._key_refs[key] += 1
+
+
+def _release_worker_pool(pool, key):
+    """
+    Release a reference of :attr:`pool` acquired for the DataLoader with
+    :attr:`key` or its iterator, the DataLoader is unregistered from
+    workers if no reference of it left, and the worker pool is shutdown if
+    no reference left.
+    """
+    with _worker_pools_lock:
+        pool._key_refs[key] -= 1
+        unregister = pool._key_refs[key] <= 0
+        if unregister:
+            del pool._key_refs[key]
+        pool._ref_count -= 1
+        shutdown = pool._ref_count <= 0
+        if shutdown and _worker_pools.get(pool.name) is pool:
+            del _worker_pools[pool.name]
+    if shutdown:
+        pool.shutdown(MP_STATUS_CHECK_INTERVAL)
+    elif unregister:
+        pool.unregister(key)
+
+
+def _shutdown_worker_pools():
+    with _worker_pools_lock:
+        pools = list(_worker_pools.values())
+        _worker_pools.clear()
+    for pool in pools:
+        pool.shutdown(1)
+
+
+CleanupFuncRegistrar.register(_shutdown_worker_pools)
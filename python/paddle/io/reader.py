@@ -18,6 +18,7 @@ import multiprocessing
 import sys
 import time
 import warnings
+import weakref
 
 import paddle
 
@@ -34,6 +35,7 @@ from .dataloader.dataloader_iter import (
     _DataLoaderIterSingleProcess,
     _DatasetKind,
 )
+from .dataloader.worker_pool import _acquire_worker_pool, _release_worker_pool
 
 # NOTE: [ avoid hanging & failed quickly ]
 # These value is used in getting data from another process
@@ -43,6 +45,7 @@ USE_PINNED_MEMORY = None
 # AutoTune Flags
 USE_AUTOTUNE = False
 TUNING_STEPS = 500
+USE_ONLINE_AUTOTUNE = False
 
 
 def set_autotune_config(use_autotune, tuning_steps=500):
@@ -52,6 +55,11 @@ def set_autotune_config(use_autotune, tuning_steps=500):
     TUNING_STEPS = tuning_steps
 
 
+def set_online_autotune_config(use_online_autotune):
+    global USE_ONLINE_AUTOTUNE
+    USE_ONLINE_AUTOTUNE = use_online_autotune
+
+
 def use_pinned_memory(*args):
     global USE_PINNED_MEMORY
     if len(args) == 0:
@@ -82,8 +90,13 @@ class AuToTune:
         self.max_num_worker = multiprocessing.cpu_count() / 2
 
     def __call__(self):
-        # use default loader
-        if (not USE_AUTOTUNE) or (not self.need_autotune()):
+        # use default loader, num_workers is tuned in iterator when
+        # online auto tuning is enabled
+        if (
+            (not USE_AUTOTUNE)
+            or USE_ONLINE_AUTOTUNE
+            or (not self.need_autotune())
+        ):
             return self.loader.num_workers
 
         # get autotune loader
@@ -311,6 +324,18 @@ class DataLoader:
         worker_init_fn(callable, optional): init function which will be called with
             worker id on each subprocess starting if not set as None. Default
             None.
+        persistent_workers(bool, optional): whether to keep subprocesses alive
+            between epochs of this DataLoader. Default False.
+        worker_pool(str, optional): name of a shared worker pool. DataLoaders
+            with the same :attr:`worker_pool` share one set of subprocesses,
+            which is started on the first iteration and shutdown when all these
+            DataLoaders are deleted, datasets and collate_fn of other DataLoaders
+            are sent to the subprocesses instead of forking new ones. Only
+            map-style dataset is supported, and DataLoaders of a pool should
+            have the same :attr:`num_workers`, :attr:`use_shared_memory`,
+            :attr:`worker_init_fn` and :attr:`prefetch_factor`, otherwise
+            ValueError is raised. None for not using worker pool.
+            Default None.
 
     Returns:
         DataLoader: an iterable object for data iterating, each element of the generated data is a Tensor.
@@ -400,6 +425,7 @@ class DataLoader:
         timeout=0,
         worker_init_fn=None,
         persistent_workers=False,
+        worker_pool=None,
     ):
         self.return_list = return_list
         self.collate_fn = collate_fn
@@ -495,8 +521,19 @@ class DataLoader:
 
         self._persistent_workers = persistent_workers
         self._iterator = None
+        # weak reference to the latest iterator for state_dict, and the
+        # state loaded by load_state_dict for the next iterator
+        self._last_iterator = None
+        self._iterator_state = None
+        self._online_autotune = USE_ONLINE_AUTOTUNE
         self.num_workers = AuToTune(self).__call__()
 
+        self._worker_pool = None
+        if worker_pool is not None and self.num_workers > 0:
+            self._worker_pool, self._worker_pool_key = _acquire_worker_pool(
+                worker_pool, self
+            )
+
     def __len__(self):
         if self.dataset_kind == _DatasetKind.ITER:
             raise ValueError("length of IterableDataset not supported")
@@ -508,15 +545,84 @@ class DataLoader:
 
     def __iter__(self):
         if self.num_workers == 0:
-            return _DataLoaderIterSingleProcess(self)
+            iterator = _DataLoaderIterSingleProcess(self)
+        elif self._worker_pool is not None:
+            # workers are kept in worker pool, persistent_workers is
+            # no need for DataLoader with worker pool
+            iterator = _DataLoaderIterMultiProcess(self)
         elif self._persistent_workers:
             if self._iterator is None:
                 self._iterator = _DataLoaderIterMultiProcess(self)
             else:
-                self._iterator._reset()
-            return self._iterator
+                state, self._iterator_state = self._iterator_state, None
+                self._iterator._reset(state)
+            iterator = self._iterator
         else:
-            return _DataLoaderIterMultiProcess(self)
+            iterator = _DataLoaderIterMultiProcess(self)
+        self._last_iterator = weakref.ref(iterator)
+        return iterator
+
+    def state_dict(self):
+        """
+        Get the state of the latest iteration of DataLoader for resuming
+        in the middle of an epoch, which contains the number of consumed
+        batches, the state of batch sampler(e.g. shuffle random state)
+        and the base seed of workers. Only map-style dataset is supported.
+
+        Returns:
+            dict: state of the latest iteration, or the state loaded by
+                :code:`load_state_dict` if not iterated.
+
+        Examples:
+
+            .. code-block:: python
+
+                >>> import numpy as np
+                >>> from paddle.io import Dataset, DataLoader
+
+                >>> class RandomDataset(Dataset):
+                ...     def __getitem__(self, idx):
+                ...         return np.array([idx]).astype('int64')
+                ...
+                ...     def __len__(self):
+                ...         return 20
+
+                >>> loader = DataLoader(RandomDataset(), batch_size=2, shuffle=True)
+                >>> for i, data in enumerate(loader):
+                ...     if i == 3:
+                ...         state = loader.state_dict()
+                ...         break
+
+                >>> # resume from the 5th batch without reading the first 4 batches
+                >>> loader.load_state_dict(state)
+                >>> data = next(iter(loader))
+        """
+        iterator = self._last_iterator() if self._last_iterator else None
+        if iterator is None:
+            return copy.deepcopy(self._iterator_state or {})
+        return iterator.state_dict()
+
+    def load_state_dict(self, state_dict):
+        """
+        Load a state got by :code:`state_dict`, the next iteration of
+        DataLoader reproduces the saved iteration and starts from the
+        batch after the consumed ones, consumed batches are skipped
+        by sampler without being read from dataset.
+
+        Args:
+            state_dict(dict): state got by :code:`state_dict`.
+        """
+        if self.dataset_kind != _DatasetKind.MAP:
+            raise RuntimeError(
+                "DataLoader load_state_dict is only supported for "
+                "map-style dataset"
+            )
+        self._iterator_state = copy.deepcopy(state_dict) or None
 
     def __call__(self):
         return self.__iter__()
+
+    def __del__(self):
+        if getattr(self, '_worker_pool', None) is not None:
+            _release_worker_pool(self._worker_pool, self._worker_pool_key)
+            self._worker_pool = None
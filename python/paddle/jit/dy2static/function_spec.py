@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import collections
+import copy
 import inspect
 
 import numpy as np
@@ -101,7 +102,7 @@ class FunctionSpec:
 
         return tuple(args), kwargs
 
-    def args_to_input_spec(self, args, kwargs):
+    def args_to_input_spec(self, args, kwargs, spec_as_tensor=False):
         """
         Converts input arguments into InputSpec.
 
@@ -111,6 +112,8 @@ class FunctionSpec:
         Args:
             args(tuple): tuple of input arguments value of function containing default kwargs value.
             kwargs(dict): kwargs arguments received by **kwargs.
+            spec_as_tensor(bool): whether to name InputSpec in arguments as
+                the Tensor in same position, so they share the same program.
 
         Return:
             Same nest structure with args and kwargs by replacing value with InputSpec.
@@ -138,11 +141,11 @@ class FunctionSpec:
             args_with_spec = convert_to_input_spec(args, self._input_spec)
         else:
             args_with_spec = _replace_to_input_spec_with_new_name(
-                args, self._arg_names
+                args, self._arg_names, spec_as_tensor
             )
             kwarg_names = ["kwargs." + key for key in kwargs.keys()]
             kwargs_list_with_spec = _replace_to_input_spec_with_new_name(
-                list(kwargs.values()), kwarg_names
+                list(kwargs.values()), kwarg_names, spec_as_tensor
             )
             kwargs_with_spec = {
                 key: kwargs_list_with_spec[idx]
@@ -364,14 +367,25 @@ def _replace_value_with_input_spec(args):
     return args_with_spec
 
 
-def _replace_to_input_spec_with_new_name(args, arg_names):
+def _replace_to_input_spec_with_new_name(args, arg_names, spec_as_tensor=False):
     assert len(args) == len(arg_names)
     order_digit = len(str(len(arg_names) - 1))
     args_with_spec = []
+    tensor_types = (
+        np.ndarray,
+        core.eager.Tensor,
+        paddle.base.framework.Variable,
+    )
+    if spec_as_tensor:
+        tensor_types += (paddle.static.InputSpec,)
     for order, (arg, name_prefix) in enumerate(zip(args, arg_names)):
         index = 0
         for idx, origin_input in enumerate(paddle.utils.flatten(arg)):
-            if isinstance(origin_input, np.ndarray):
+            if spec_as_tensor and isinstance(
+                origin_input, paddle.static.InputSpec
+            ):
+                input_var = copy.copy(origin_input)
+            elif isinstance(origin_input, np.ndarray):
                 input_var = paddle.static.InputSpec.from_numpy(origin_input)
                 input_var.stop_gradient = True
             elif isinstance(origin_input, core.eager.Tensor):
@@ -387,14 +401,7 @@ def _replace_to_input_spec_with_new_name(args, arg_names):
             else:
                 input_var = origin_input
 
-            if isinstance(
-                origin_input,
-                (
-                    np.ndarray,
-                    core.eager.Tensor,
-                    paddle.base.framework.Variable,
-                ),
-            ):
+            if isinstance(origin_input, tensor_types):
                 input_var.name = f"_jst.{str(order).zfill(order_digit)}.{name_prefix}.{str(index)}"
                 index += 1
             args_with_spec.append(input_var)
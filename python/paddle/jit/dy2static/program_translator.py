@@ -16,13 +16,16 @@ from __future__ import annotations
 
 import collections
 import inspect
+import os
 import threading
 import warnings
 import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 import paddle.pir.core as ir_static
 from paddle import decomposition, get_flags
+from paddle.amp.auto_cast import _in_amp_guard, _in_pure_fp16_guard
 from paddle.base import core, framework
 from paddle.base.data_feeder import check_type
 from paddle.base.dygraph.base import (
@@ -34,7 +37,7 @@ from paddle.framework import in_dynamic_mode, use_pir_api
 from paddle.nn.layer import layers
 from paddle.pir import Value
 from paddle.pir.core import _convert_into_value, static_op_arg_cast_guard
-from paddle.utils import flatten, gast
+from paddle.utils import flatten, gast, pack_sequence_as
 
 from . import error, logging_utils
 from .function_spec import (
@@ -77,6 +80,11 @@ __all__ = []
 # Once exceeding the threshold, we will raise warning to users to make sure the conversion is as expected.
 MAX_TRACED_PROGRAM_COUNT = 10
 
+# The max number of programs cached for each traced function, 0 means unbounded.
+CACHE_SIZE_ENV_NAME = 'FLAGS_to_static_cache_size'
+# Whether to share one symbolic shape program for inputs of different shapes.
+SHAPE_BUCKETING_ENV_NAME = 'FLAGS_to_static_shape_bucketing'
+
 CONVERSION_OPTIONS = "__jst_not_to_static"
 
 
@@ -293,10 +301,79 @@ class CacheKey:
     def __neq__(self, other):
         return not self == other
 
+    def with_symbolic_shapes(self, other):
+        """
+        Returns a new key whose tensor dims differing from `other` are
+        replaced by -1, or None if the two keys differ in other fields.
+        """
+        args = _symbolic_input_specs(
+            self.input_args_with_spec, other.input_args_with_spec
+        )
+        kwargs = _symbolic_input_specs(
+            self.input_kwargs_with_spec, other.input_kwargs_with_spec
+        )
+        other_args = _symbolic_input_specs(
+            other.input_args_with_spec, self.input_args_with_spec
+        )
+        other_kwargs = _symbolic_input_specs(
+            other.input_kwargs_with_spec, self.input_kwargs_with_spec
+        )
+        if None in (args, kwargs, other_args, other_kwargs):
+            return None
+        key = CacheKey(
+            self.function_spec,
+            args,
+            kwargs,
+            self.class_instance,
+            **self.kwargs,
+        )
+        other_key = CacheKey(
+            other.function_spec,
+            other_args,
+            other_kwargs,
+            other.class_instance,
+            **other.kwargs,
+        )
+        if key != other_key:
+            return None
+        return key
+
     def __repr__(self):
         return f"id(function_spec): {id(self.function_spec)}, input_args_with_spec: {self.input_args_with_spec}, input_kwargs_with_spec: {self.input_kwargs_with_spec}, class_instance: {self.class_instance}"
 
 
+def _symbolic_input_specs(input_specs, other_input_specs):
+    """
+    Replaces the dims of InputSpec in `input_specs` differing from the
+    corresponding InputSpec in `other_input_specs` by -1. Returns None if
+    the structures or the rank, dtype of tensors are different.
+    """
+    from paddle.static import InputSpec
+
+    flat_specs = flatten(input_specs)
+    flat_other_specs = flatten(other_input_specs)
+    if len(flat_specs) != len(flat_other_specs):
+        return None
+    new_specs = []
+    for spec, other_spec in zip(flat_specs, flat_other_specs):
+        if isinstance(spec, InputSpec) != isinstance(other_spec, InputSpec):
+            return None
+        if isinstance(spec, InputSpec):
+            if (
+                len(spec.shape) != len(other_spec.shape)
+                or spec.dtype != other_spec.dtype
+                or spec.stop_gradient != other_spec.stop_gradient
+            ):
+                return None
+            shape = [
+                dim if dim == other_dim else -1
+                for dim, other_dim in zip(spec.shape, other_spec.shape)
+            ]
+            spec = InputSpec(shape, spec.dtype, spec.name, spec.stop_gradient)
+        new_specs.append(spec)
+    return pack_sequence_as(input_specs, new_specs)
+
+
 def unwrap_decorators(func):
     """
     Unwraps a decorated function and returns the decorator list and inner target.
@@ -531,6 +608,9 @@ class StaticFunction:
     def get_concrete_program_with_cache_key(self, cached_key):
         raise NotImplementedError("Not implemented yet.")
 
+    def precompile(self, input_specs, background=True):
+        raise NotImplementedError("Not implemented yet.")
+
     def get_traced_count(self):
         raise NotImplementedError("Not implemented yet.")
 
@@ -777,6 +857,31 @@ class ASTStaticFunction(StaticFunction):
         # 1. trace ops from dygraph layers and cache the generated program.
         args, kwargs = self._function_spec.unified_args_and_kwargs(args, kwargs)
 
+        if not _BACKGROUND_BUILDER.started:
+            return self._perform_static_call(args, kwargs)
+        # NOTE: the checks below do not wait for the building in background
+        cache_key = self._get_cache_key(
+            args, kwargs, is_train=self._is_train_mode()
+        )
+        if (
+            self._program_cache.is_pending(cache_key)
+            and self._class_instance is None
+        ):
+            # run in dygraph until the program is built in background
+            return self._call_dygraph_function(*args, **kwargs)
+        run_mode = (_in_amp_guard(), _in_pure_fp16_guard())
+        if self._program_cache.is_warm(cache_key, run_mode):
+            return self._perform_static_call(args, kwargs)
+        # the first run of a program creates its runnable programs under
+        # the global default programs, which waits for the building. NOTE: a
+        # Layer waits for its own program too, because the parameters and
+        # buffers of the Layer are replaced by static ones while building.
+        with _BACKGROUND_BUILDER.lock:
+            outputs = self._perform_static_call(args, kwargs)
+            self._program_cache.set_warm(cache_key, run_mode)
+            return outputs
+
+    def _perform_static_call(self, args, kwargs):
         try:
             _, partial_program_layer = self.get_concrete_program(
                 *args, **kwargs, is_train=self._is_train_mode()
@@ -833,6 +938,30 @@ class ASTStaticFunction(StaticFunction):
             kwargs.pop("with_hook")
         if "is_prim_infer" in kwargs:
             kwargs.pop("is_prim_infer")
+        cache_key = self._get_cache_key(
+            args, kwargs, with_hook=with_hook, is_train=is_train
+        )
+        if is_prim_infer:
+            (
+                concrete_program,
+                partial_program_layer,
+            ) = self._program_cache.get_program_without_cache(cache_key)
+        else:
+            # 3. check whether hit the cache or build a new program for the input arguments
+            concrete_program, partial_program_layer = self._program_cache[
+                cache_key
+            ]
+        partial_program_layer._debug_name = self._debug_name
+        return concrete_program, partial_program_layer
+
+    def _get_cache_key(
+        self,
+        args,
+        kwargs,
+        with_hook=False,
+        is_train=True,
+        spec_as_tensor=False,
+    ):
         # 1. unify args/kwargs and replace Tensor with InputSpec
         if len(args) != len(self._function_spec.args_name):
             args, kwargs = self._function_spec.unified_args_and_kwargs(
@@ -841,10 +970,10 @@ class ASTStaticFunction(StaticFunction):
         (
             input_args_with_spec,
             input_kwargs_with_spec,
-        ) = self._function_spec.args_to_input_spec(args, kwargs)
+        ) = self._function_spec.args_to_input_spec(args, kwargs, spec_as_tensor)
 
         # 2. generate cache key
-        cache_key = CacheKey(
+        return CacheKey(
             self._function_spec,
             input_args_with_spec,
             input_kwargs_with_spec,
@@ -853,18 +982,70 @@ class ASTStaticFunction(StaticFunction):
             with_hook=with_hook,
             is_train=is_train,
         )
-        if is_prim_infer:
-            (
-                concrete_program,
-                partial_program_layer,
-            ) = self._program_cache.get_program_without_cache(cache_key)
-        else:
-            # 3. check whether hit the cache or build a new program for the input arguments
-            concrete_program, partial_program_layer = self._program_cache[
-                cache_key
-            ]
-        partial_program_layer._debug_name = self._debug_name
-        return concrete_program, partial_program_layer
+
+    def precompile(self, input_specs, background=True):
+        """
+        Builds programs for the expected inputs ahead of time. While a
+        program is building in background, the calls with its inputs run
+        the dygraph function instead of waiting, except for methods of a
+        Layer, whose calls wait for the building.
+
+        Args:
+            input_specs(list): The arguments of each expected call, in which
+                Tensors are described by InputSpec. The InputSpec should be
+                the same as the one from the Tensor, including
+                `stop_gradient`. The items of `traced_input_specs()` of a
+                warm-up run can be used directly.
+            background(bool): Whether to build programs on a background
+                thread. Default is True.
+
+        Returns:
+            The list of futures of background building, None for programs
+            already cached. Empty if `background` is False.
+
+        Examples:
+            .. code-block:: python
+
+                >>> # doctest: +SKIP('`paddle.jit.to_static` can not run in xdoctest')
+                >>> import paddle
+                >>> from paddle.static import InputSpec
+
+                >>> @paddle.jit.to_static
+                ... def foo(x):
+                ...     return x + 1
+                ...
+                >>> foo.precompile(
+                ...     [[InputSpec([4, 8], stop_gradient=True)],
+                ...      [InputSpec([8, 8], stop_gradient=True)]]
+                ... )
+        """
+        self._raise_when_property()
+        futures = []
+        for args in input_specs:
+            cache_key = self._get_cache_key(
+                tuple(args),
+                {},
+                is_train=self._is_train_mode(),
+                spec_as_tensor=True,
+            )
+            if background:
+                futures.append(
+                    self._program_cache.build_in_background(cache_key)
+                )
+            else:
+                self._program_cache[cache_key]
+        return futures
+
+    def traced_input_specs(self):
+        """
+        Returns the arguments with InputSpec of traced programs, which can
+        be saved and passed to `precompile` in later runs.
+        """
+        return [
+            list(cache_key.input_args_with_spec)
+            for cache_key in self._program_cache._cache_keys.values()
+            if not cache_key.input_kwargs_with_spec
+        ]
 
     def get_concrete_program_with_cache_key(self, cached_key):
         """
@@ -1510,14 +1691,113 @@ class PirAutoRecomputeHooker(PirPartialProgramLayerHook):
         return whole_program, forward_end_idx, src_vars
 
 
+class BackgroundProgramBuilder:
+    """
+    Builds programs of ProgramCache ahead of time on a background thread.
+
+    The tracer of the building thread is private to it, but building a
+    program switches the global default programs, so programs are built
+    one by one under `lock`. While any program is building, calls of
+    `@to_static` functions do not wait for it in two cases: the inputs of
+    a program pending to build run the dygraph function, except for
+    methods of a Layer, and a program that has run before in the same mode
+    runs directly. The others, which build a program or run a program for
+    the first time, hold `lock` too.
+
+    NOTE: Other code using the global default programs, e.g. static graph
+    APIs called by users, should not run while programs are building.
+    Building a program replaces the parameters and buffers of its Layer by
+    static ones, so the Layer should not run in dygraph at the same time.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._state_lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def started(self):
+        return self._executor is not None
+
+    def submit(self, program_cache, item_id, cache_key):
+        with self._state_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="to_static_precompile"
+                )
+            return self._executor.submit(
+                self._build, program_cache, item_id, cache_key, use_pir_api()
+            )
+
+    def _build(self, program_cache, item_id, cache_key, pir_mode):
+        # the tracer switched in building is not inherited by threads
+        # started later, and programs are built in the mode of caller
+        framework.global_var._private_tracer_ = True
+        framework.global_var._use_pir_api_ = pir_mode
+        with self.lock:
+            try:
+                if program_cache._lookup(item_id) is None:
+                    program_cache._insert(item_id, cache_key)
+            except Exception as e:
+                # the program will be built again while calling and raise
+                logging_utils.warn(
+                    f"Failed to build program in background for {cache_key}: {e}"
+                )
+                raise
+            finally:
+                with program_cache._lock:
+                    program_cache._pending.pop(item_id, None)
+
+
+_BACKGROUND_BUILDER = BackgroundProgramBuilder()
+
+
 class ProgramCache:
     """
     Wrapper class for the program functions defined by dygraph function.
+
+    The cached programs are evicted in LRU order if the number of them
+    exceeds `max_size`. With `shape_bucketing`, an input whose tensor shapes
+    differ from a cached program only in some dims shares one program whose
+    differing dims are -1, instead of building a new program.
+
+    Args:
+        max_size(int|None): The max number of cached programs, 0 means
+            unbounded. Default is the value of environment variable
+            `FLAGS_to_static_cache_size` or 0.
+        shape_bucketing(bool|None): Whether to map inputs with different
+            shapes onto one symbolic shape program. Default is the value of
+            environment variable `FLAGS_to_static_shape_bucketing` or False.
     """
 
-    def __init__(self):
+    def __init__(self, max_size=None, shape_bucketing=None):
+        if max_size is None:
+            max_size = int(os.getenv(CACHE_SIZE_ENV_NAME, 0))
+        if shape_bucketing is None:
+            shape_bucketing = os.getenv(SHAPE_BUCKETING_ENV_NAME) in [
+                '1',
+                'True',
+                'true',
+            ]
+        self._max_size = max_size
+        self._shape_bucketing = shape_bucketing
         # {hash_id : (concrete_program, partial_layer)}
         self._caches = collections.OrderedDict()
+        # {hash_id : cache_key}
+        self._cache_keys = {}
+        # {hash_id : op number of main program}
+        self._cache_sizes = {}
+        # {hash_id of input : hash_id of symbolic shape program}
+        self._bucket_ids = {}
+        # {hash_id : future} of programs building in background
+        self._pending = {}
+        # {(hash_id, run mode)} of programs having run
+        self._warm = set()
+        # guards the bookkeeping above, programs are built without it
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
         # trace mostly recent used program
         self._recent_key = None
         self._recent_cache_key = None
@@ -1580,6 +1860,70 @@ class ProgramCache:
             partial_program.add_hooker(PirAutoRecomputeHooker())
         return concrete_program, partial_program
 
+    def _find_bucket(self, item):
+        """
+        Returns the id of a cached program for item with symbolic shapes,
+        the program is replaced by a more general one if needed.
+        """
+        for item_id, cache_key in reversed(self._cache_keys.items()):
+            symbolic_key = item.with_symbolic_shapes(cache_key)
+            if symbolic_key is None:
+                continue
+            symbolic_id = hash(symbolic_key)
+            if symbolic_id in self._caches:
+                self._hits += 1
+            else:
+                # build the symbolic program before evicting the replaced one
+                with self._lock:
+                    self._caches.move_to_end(item_id)
+                self._insert(symbolic_id, symbolic_key)
+                with self._lock:
+                    bucketed_ids = [item_id] + [
+                        k for k, v in self._bucket_ids.items() if v == item_id
+                    ]
+                    if item_id in self._caches:
+                        self._evict(item_id)
+                    for bucketed_id in bucketed_ids:
+                        self._bucket_ids[bucketed_id] = symbolic_id
+            return symbolic_id
+        return None
+
+    def _insert(self, item_id, cache_key):
+        with self._lock:
+            self._misses += 1
+        program = self._build_once(cache_key)
+        with self._lock:
+            self._caches[item_id] = program
+            self._cache_keys[item_id] = cache_key
+            self._cache_sizes[item_id] = len(
+                program[0].main_program.global_block().ops
+            )
+            while 0 < self._max_size < len(self._caches):
+                self._evict(next(iter(self._caches)))
+        # Note: raise warnings if number of traced program is more than `max_tracing_count`
+        current_tracing_count = len(self._caches)
+        if current_tracing_count > MAX_TRACED_PROGRAM_COUNT:
+            logging_utils.warn(
+                f"Current traced program number: {current_tracing_count} > `max_tracing_count`:{MAX_TRACED_PROGRAM_COUNT}. Too much cached programs will bring expensive overhead. "
+                "The reason may be: (1) passing tensors with different shapes, (2) passing python objects instead of tensors."
+            )
+
+    def _evict(self, item_id):
+        self._caches.pop(item_id)
+        self._cache_keys.pop(item_id)
+        self._cache_sizes.pop(item_id)
+        self._bucket_ids = {
+            k: v for k, v in self._bucket_ids.items() if v != item_id
+        }
+        self._warm = {w for w in self._warm if w[0] != item_id}
+        self._evictions += 1
+
+    def _lookup(self, item_id):
+        item_id = self._bucket_ids.get(item_id, item_id)
+        if item_id in self._caches:
+            return item_id
+        return None
+
     def __getitem__(self, item):
         if not isinstance(item, CacheKey):
             raise ValueError(
@@ -1587,31 +1931,71 @@ class ProgramCache:
                 % type_name(item)
             )
         item_id = hash(item)
-        self._recent_cache_key = item
-        self._recent_key = item_id
-        if item_id not in self._caches:
-            self._caches[item_id] = self._build_once(item)
-            # Note: raise warnings if number of traced program is more than `max_tracing_count`
-            current_tracing_count = len(self._caches)
-            if current_tracing_count > MAX_TRACED_PROGRAM_COUNT:
-                logging_utils.warn(
-                    f"Current traced program number: {current_tracing_count} > `max_tracing_count`:{MAX_TRACED_PROGRAM_COUNT}. Too much cached programs will bring expensive overhead. "
-                    "The reason may be: (1) passing tensors with different shapes, (2) passing python objects instead of tensors."
-                )
-
-        return self._caches[item_id]
+        with self._lock:
+            cache_id = self._lookup(item_id)
+            if cache_id is not None:
+                self._hits += 1
+                return self._use(item_id, cache_id)
+        if self._shape_bucketing:
+            cache_id = self._find_bucket(item)
+        if cache_id is None:
+            cache_id = item_id
+            self._insert(cache_id, item)
+        with self._lock:
+            return self._use(item_id, cache_id)
+
+    def _use(self, item_id, cache_id):
+        if cache_id != item_id:
+            self._bucket_ids[item_id] = cache_id
+        self._caches.move_to_end(cache_id)
+        self._recent_cache_key = self._cache_keys[cache_id]
+        self._recent_key = cache_id
+        return self._caches[cache_id]
 
     def get_program_without_cache(self, cache_key):
         return self._build_once(cache_key=cache_key)
 
+    def build_in_background(self, cache_key):
+        """
+        Builds the program of cache_key on a background thread, returns the
+        future of building or None if the program is cached.
+        """
+        item_id = hash(cache_key)
+        with self._lock:
+            if self._lookup(item_id) is not None:
+                return None
+            if item_id not in self._pending:
+                self._pending[item_id] = _BACKGROUND_BUILDER.submit(
+                    self, item_id, cache_key
+                )
+            return self._pending[item_id]
+
+    def is_pending(self, cache_key):
+        return hash(cache_key) in self._pending
+
+    def is_warm(self, cache_key, run_mode):
+        """
+        Whether the program of cache_key has run in run_mode, whose
+        runnable programs are created.
+        """
+        with self._lock:
+            cache_id = self._lookup(hash(cache_key))
+            return cache_id is not None and (cache_id, run_mode) in self._warm
+
+    def set_warm(self, cache_key, run_mode):
+        with self._lock:
+            cache_id = self._lookup(hash(cache_key))
+            if cache_id is not None:
+                self._warm.add((cache_id, run_mode))
+
     def get_program(self, item):
         if not isinstance(item, CacheKey):
             raise ValueError(
                 "Input item's type should be FunctionSpec, but received %s"
                 % type_name(item)
             )
-        item_id = hash(item)
-        if item_id not in self._caches:
+        item_id = self._lookup(hash(item))
+        if item_id is None:
             raise RuntimeError(
                 "Failed to find program for input item, please decorate input function by `@paddle.jit.to_static`."
             )
@@ -1624,6 +2008,21 @@ class ProgramCache:
         assert self._recent_key is not None
         return self._recent_key, self._caches[self._recent_key]
 
+    def stats(self):
+        """
+        Returns the statistics of cache, the size of a program is the op
+        number of its main program.
+        """
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'num_programs': len(self._caches),
+            'max_size': self._max_size,
+            'total_size': sum(self._cache_sizes.values()),
+            'sizes': list(self._cache_sizes.values()),
+        }
+
     def __len__(self):
         return len(self._caches)
 
@@ -1632,6 +2031,9 @@ class ProgramCache:
 
     def clear(self):
         self._caches = collections.OrderedDict()
+        self._cache_keys = {}
+        self._cache_sizes = {}
+        self._bucket_ids = {}
 
 
 class PrimHooker(PartialProgramLayerHook):
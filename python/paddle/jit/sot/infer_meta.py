@@ -40,12 +40,7 @@ class MetaInfo:
         self.stop_gradient = stop_gradient
 
     @staticmethod
-    def from_tensor(tensor):
-        if isinstance(tensor, paddle.pir.Value):
-            name = "Value@NoName"
-        else:  # For Tensor or Variable
-            name = tensor.name
-        persistable = tensor.persistable
+    def dtype_from_tensor(tensor):
         dtype = tensor.dtype
         expected_dtype_class = (
             paddle.core.DataType
@@ -63,6 +58,25 @@ class MetaInfo:
             and current_amp_state["dtype"] == "float16"
         ):
             dtype = paddle.float32
+        return dtype
+
+    @staticmethod
+    def guard_str_from_tensor(tensor):
+        """
+        Same as `MetaInfo.from_tensor(tensor).guard_str()`, but only reads
+        the attributes in guard string, which is used in the guard of Tensor.
+        """
+        dtype = MetaInfo.dtype_from_tensor(tensor)
+        return f"({list(tensor.shape)}, {dtype}, {tensor.stop_gradient})"
+
+    @staticmethod
+    def from_tensor(tensor):
+        if isinstance(tensor, paddle.pir.Value):
+            name = "Value@NoName"
+        else:  # For Tensor or Variable
+            name = tensor.name
+        persistable = tensor.persistable
+        dtype = MetaInfo.dtype_from_tensor(tensor)
         # TODO(@xiongkun) remove after pir become default state.
         return MetaInfo(
             list(tensor.shape),
@@ -17,11 +17,13 @@ from __future__ import annotations
 import gc
 import traceback
 import types
-from typing import List, Tuple
+from collections import OrderedDict
+from typing import Tuple
 
 from ...profiler import EventGuard, event_register
 from ...psdb import NO_FALLBACK_CODES
 from ...utils import (
+    ENV_SOT_GUARD_CACHE_SIZE,
     BreakGraphError,
     FallbackError,
     InnerError,
@@ -31,17 +33,96 @@ from ...utils import (
     log_do,
 )
 from ..custom_code import CustomCode
-from .guard import Guard
+from .guard import Guard, empty_guard_key_fn
 from .opcode_executor import OpcodeExecutor, OpcodeExecutorBase
 
 GuardedFunction = Tuple[CustomCode, Guard]
-GuardedFunctions = List[GuardedFunction]
 
 dummy_guard: Guard = lambda frame: True
 dummy_guard.expr = "lambda frame: True"
 dummy_guard.lambda_expr = "lambda frame: True"
 
 
+class GuardedFunctionsDispatcher:
+    """
+    The guarded functions of a code object, which dispatches a frame to the
+    guarded function whose guard is passed.
+
+    Guarded functions are grouped by the key expressions of their guards (see
+    `analyse_guard_keys`), and the guarded functions of a group are bucketed
+    by the expected values of key. For a frame, the key of each group is
+    computed once and only the guards in the bucket of the key are checked,
+    so the lookup time does not grow with the number of guarded functions.
+    Guarded functions are evicted in LRU order when the number exceeds
+    max_size, and max_size <= 0 means no limit.
+
+    Args:
+        max_size (int): The max number of guarded functions to keep.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        # key_exprs -> (key_fn, key_values -> list of entry ids)
+        self.groups = {}
+        # entry id -> (custom_code, guard_fn, key_exprs, key_values) in LRU order
+        self.entries = OrderedDict()
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        for custom_code, guard_fn, _, _ in self.entries.values():
+            yield custom_code, guard_fn
+
+    def add(self, custom_code: CustomCode, guard_fn: Guard):
+        if 0 < self.max_size <= len(self.entries):
+            self.evict()
+        key_exprs = getattr(guard_fn, "key_exprs", ())
+        key_values = getattr(guard_fn, "key_values", ())
+        if key_exprs not in self.groups:
+            key_fn = getattr(guard_fn, "key_fn", empty_guard_key_fn)
+            self.groups[key_exprs] = (key_fn, {})
+        _, buckets = self.groups[key_exprs]
+        entry_id = self._next_id
+        self._next_id += 1
+        buckets.setdefault(key_values, []).append(entry_id)
+        self.entries[entry_id] = (custom_code, guard_fn, key_exprs, key_values)
+
+    def evict(self):
+        entry_id, (_, guard_fn, key_exprs, key_values) = self.entries.popitem(
+            last=False
+        )
+        log(
+            2,
+            f"[Cache]: Exceed max cache size, evict guard \n{getattr(guard_fn, 'expr', 'None')}\n",
+        )
+        _, buckets = self.groups[key_exprs]
+        buckets[key_values].remove(entry_id)
+        if not buckets[key_values]:
+            del buckets[key_values]
+        if not buckets:
+            del self.groups[key_exprs]
+
+    def candidates(self, frame: types.FrameType):
+        """
+        Yield the ids of entries whose guard may be passed for the frame.
+        """
+        for key_fn, buckets in list(self.groups.values()):
+            try:
+                with EventGuard("try guard key"):
+                    entry_ids = buckets.get(key_fn(frame), ())
+            except Exception as e:
+                # check all guards of the group if key is not available
+                log(2, f"[Cache]: Guard key function error: {e}\n")
+                entry_ids = [i for ids in buckets.values() for i in ids]
+            yield from list(entry_ids)
+
+    def hit(self, entry_id):
+        self.entries.move_to_end(entry_id)
+        return self.entries[entry_id][0]
+
+
 @Singleton
 class OpcodeExecutorCache:
     """
@@ -49,12 +130,11 @@ class OpcodeExecutorCache:
     This cache is used to store previously translated instructions along with their corresponding guard functions.
 
     Attributes:
-        cache (dict): A dictionary that maps code objects to tuples of a cache getter function and a list of guarded functions.
+        cache (dict): A dictionary that maps code objects to the dispatchers of guarded functions.
         translate_count (int): The count of how many instructions have been translated. It is used to test whether the cache hits.
     """
 
-    MAX_CACHE_SIZE = 20
-    cache: dict[types.CodeType, GuardedFunctions]
+    cache: dict[types.CodeType, GuardedFunctionsDispatcher]
     translate_count: int
 
     def __init__(self):
@@ -73,31 +153,34 @@ class OpcodeExecutorCache:
         if code not in self.cache:
             log(2, f"[Cache]: Firstly call {code}\n")
             new_custom_code, guard_fn = self.translate(frame, **kwargs)
-            self.cache[code] = [(new_custom_code, guard_fn)]
+            self.cache[code] = GuardedFunctionsDispatcher(
+                ENV_SOT_GUARD_CACHE_SIZE.get()
+            )
+            self.cache[code].add(new_custom_code, guard_fn)
             return new_custom_code
         guarded_fns = self.cache[code]
         return self.lookup(frame, guarded_fns, **kwargs)
 
     @event_register("lookup")
     def lookup(
-        self, frame: types.FrameType, guarded_fns: GuardedFunctions, **kwargs
+        self,
+        frame: types.FrameType,
+        guarded_fns: GuardedFunctionsDispatcher,
+        **kwargs,
     ) -> CustomCode:
         """
-        Looks up the cache for a matching code object and returns a custom code object if a matching guard function is found, otherwise None.
+        Looks up the cache for a matching code object and returns a custom code object if a matching guard function is found, otherwise translates the frame and caches the result.
 
         Args:
             frame (types.FrameType): The frame whose code object needs to be looked up in the cache.
-            guarded_fns (GuardedFunctions): The list of guarded functions associated with the code object.
+            guarded_fns (GuardedFunctionsDispatcher): The guarded functions associated with the code object.
 
         Returns:
-            CustomCode | None: The custom code object if a matching guard function is found, otherwise None.
+            CustomCode: The custom code object of the matching guard function or the new translated one.
         """
 
-        if len(guarded_fns) >= self.MAX_CACHE_SIZE:
-            log(2, "[Cache]: Exceed max cache size, skip it\n")
-            return CustomCode(None, False)
-
-        for custom_code, guard_fn in guarded_fns:
+        for entry_id in guarded_fns.candidates(frame):
+            custom_code, guard_fn, _, _ = guarded_fns.entries[entry_id]
             try:
                 with EventGuard("try guard"):
                     guard_result = guard_fn(frame)
@@ -106,7 +189,7 @@ class OpcodeExecutorCache:
                         2,
                         f"[Cache]: Cache hit, Guard is \n{getattr(guard_fn, 'expr', 'None')}\n",
                     )
-                    return custom_code
+                    return guarded_fns.hit(entry_id)
                 else:
                     log_do(
                         4,
@@ -126,7 +209,7 @@ class OpcodeExecutorCache:
 
         log(2, "[Cache]: all guards missed\n")
         new_custom_code, guard_fn = self.translate(frame, **kwargs)
-        guarded_fns.append((new_custom_code, guard_fn))
+        guarded_fns.add(new_custom_code, guard_fn)
         return new_custom_code
 
     def translate(
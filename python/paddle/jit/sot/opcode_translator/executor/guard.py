@@ -14,12 +14,20 @@
 
 from __future__ import annotations
 
+import ast
+import collections
+import re
 import types
 import weakref
 from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
 from ...profiler import EventGuard
-from ...utils import current_tmp_name_records, log, log_do
+from ...utils import (
+    ENV_SOT_COMPILE_GUARD,
+    current_tmp_name_records,
+    log,
+    log_do,
+)
 
 Guard = Callable[[types.FrameType], bool]
 
@@ -61,6 +69,246 @@ def union_free_vars(*free_vars: dict[str, Any]):
     return {k: v for d in free_vars for k, v in d.items()}
 
 
+_TmpNamePattern = re.compile(r"\b_sot_tmp_\d+\b")
+
+
+def empty_guard_key_fn(frame):
+    return ()
+
+
+def analyse_guard_keys(stringify_exprs, tmp_names):
+    """
+    Find the guard terms like `<expr> == <literal>` whose literal is hashable,
+    such as the guard of tensor meta, type id and constants. These terms are
+    used as the key of guard to dispatch frames by hash.
+
+    Returns:
+        A tuple of the source of key function, the key expressions with tmp
+        names expanded (which identify the same key among guards) and the
+        expected values of key.
+    """
+    name_to_expr = {name: expr for expr, name in tmp_names.items()}
+
+    def expand(expr):
+        return _TmpNamePattern.sub(
+            lambda m: (
+                f"({expand(name_to_expr[m.group(0)])})"
+                if m.group(0) in name_to_expr
+                else m.group(0)
+            ),
+            expr,
+        )
+
+    keys = {}
+    for str_expr in stringify_exprs:
+        expr = name_to_expr.get(str_expr.expr)
+        if expr is None:
+            continue
+        try:
+            node = ast.parse(expr, mode="eval").body
+            if not (
+                isinstance(node, ast.Compare)
+                and len(node.ops) == 1
+                and isinstance(node.ops[0], ast.Eq)
+            ):
+                continue
+            value = ast.literal_eval(node.comparators[0])
+            hash(value)
+        except (SyntaxError, ValueError, TypeError):
+            continue
+        left = ast.get_source_segment(expr, node.left)
+        keys.setdefault(expand(left), (left, value))
+
+    if not keys:
+        return None, (), ()
+    key_exprs = tuple(sorted(keys))
+
+    # only compute the tmp names used by the key
+    used_names = set()
+    pending = [keys[key_expr][0] for key_expr in key_exprs]
+    while pending:
+        for name in _TmpNamePattern.findall(pending.pop()):
+            if name not in used_names and name in name_to_expr:
+                used_names.add(name)
+                pending.append(name_to_expr[name])
+
+    func_string = "def built_guard_key_fn(frame):\n"
+    for expr, name in tmp_names.items():
+        if name in used_names:
+            func_string += f"    {name} = {expr}\n"
+    func_string += (
+        "    return ("
+        + "".join(f"{keys[key_expr][0]}, " for key_expr in key_exprs)
+        + ")"
+    )
+    key_values = tuple(keys[key_expr][1] for key_expr in key_exprs)
+    return func_string, key_exprs, key_values
+
+
+# NOTE: `frame.f_locals` and `frame.f_globals` are read once in compiled
+# guard, `frame.f_locals` syncs fast locals into a dict on each access.
+_HOISTED_FRAME_ATTRS = {
+    "f_locals": "_sot_f_locals",
+    "f_globals": "_sot_f_globals",
+}
+_CSE_NAME_PREFIX = "_sot_cse_"
+_CSE_EXCLUDED_NODES = (
+    ast.Lambda,
+    ast.ListComp,
+    ast.SetComp,
+    ast.DictComp,
+    ast.GeneratorExp,
+    ast.NamedExpr,
+)
+
+
+class _FrameAttrHoister(ast.NodeTransformer):
+    def __init__(self):
+        self.hoisted = []
+
+    def visit_Attribute(self, node):
+        self.generic_visit(node)
+        if (
+            isinstance(node.value, ast.Name)
+            and node.value.id == "frame"
+            and node.attr in _HOISTED_FRAME_ATTRS
+            and isinstance(node.ctx, ast.Load)
+        ):
+            if node.attr not in self.hoisted:
+                self.hoisted.append(node.attr)
+            return ast.copy_location(
+                ast.Name(id=_HOISTED_FRAME_ATTRS[node.attr], ctx=ast.Load()),
+                node,
+            )
+        return node
+
+
+class _ExprReplacer(ast.NodeTransformer):
+    def __init__(self, key, name):
+        self.key = key
+        self.name = name
+
+    def generic_visit(self, node):
+        if isinstance(node, ast.expr) and ast.dump(node) == self.key:
+            return ast.copy_location(
+                ast.Name(id=self.name, ctx=ast.Load()), node
+            )
+        return super().generic_visit(node)
+
+
+def _cse_candidates(node):
+    for child in ast.walk(node):
+        if not isinstance(child, (ast.Attribute, ast.Subscript, ast.Call)):
+            continue
+        if not isinstance(getattr(child, "ctx", ast.Load()), ast.Load):
+            continue
+        sub_nodes = list(ast.walk(child))
+        if any(isinstance(n, _CSE_EXCLUDED_NODES) for n in sub_nodes):
+            continue
+        yield ast.dump(child), child, len(sub_nodes)
+
+
+def compile_guard_source(func_string: str) -> tuple[str, types.CodeType]:
+    """
+    Compile the source of a guard function like
+
+        def built_guard_fn(frame):
+            _sot_tmp_0 = <expr>
+            ...
+            return <expr>
+
+    into a single specialized function. The duplicated terms are removed,
+    the attribute lookups of frame are hoisted to the top of function, and
+    the sub-expressions evaluated more than once across the guard terms
+    (such as attribute, item and call of the same value) are evaluated once
+    into local names.
+
+    The hoisted expressions may be evaluated even if a former term is False,
+    it's fine since guards are pure and an error in guard is a miss.
+
+    Returns:
+        The source and code object of the compiled guard function.
+    """
+    module = ast.parse(func_string)
+    func_def = module.body[0]
+    hoister = _FrameAttrHoister()
+    body = [hoister.visit(stmt) for stmt in func_def.body]
+
+    # remove the duplicated terms
+    result = body[-1].value
+    if isinstance(result, ast.BoolOp) and isinstance(result.op, ast.And):
+        terms = {}
+        for term in result.values:
+            terms.setdefault(ast.dump(term), term)
+        result.values = list(terms.values())
+
+    num_cse = 0
+    while True:
+        counter = collections.Counter()
+        sizes = {}
+        for stmt in body:
+            for key, node, size in _cse_candidates(stmt.value):
+                counter[key] += 1
+                sizes[key] = (size, node)
+        repeated = [key for key, count in counter.items() if count > 1]
+        if not repeated:
+            break
+        # hoist the largest one first, its sub-expressions are hoisted later
+        # if they are still repeated
+        key = max(repeated, key=lambda key: sizes[key][0])
+        name = f"{_CSE_NAME_PREFIX}{num_cse}"
+        num_cse += 1
+        first_index = next(
+            i
+            for i, stmt in enumerate(body)
+            if any(k == key for k, _, _ in _cse_candidates(stmt.value))
+        )
+        replacer = _ExprReplacer(key, name)
+        body = [replacer.visit(stmt) for stmt in body]
+        body.insert(
+            first_index,
+            ast.Assign(
+                targets=[ast.Name(id=name, ctx=ast.Store())],
+                value=sizes[key][1],
+            ),
+        )
+
+    func_def.body = [
+        ast.Assign(
+            targets=[ast.Name(id=_HOISTED_FRAME_ATTRS[attr], ctx=ast.Store())],
+            value=ast.Attribute(
+                value=ast.Name(id="frame", ctx=ast.Load()),
+                attr=attr,
+                ctx=ast.Load(),
+            ),
+        )
+        for attr in hoister.hoisted
+    ] + body
+    ast.fix_missing_locations(module)
+    code = compile(module, "<guard>", "exec")
+    if hasattr(ast, "unparse"):
+        func_string = ast.unparse(module)
+    return func_string, code
+
+
+def build_guard_function(
+    func_string: str, func_name: str, free_vars: dict[str, Any]
+):
+    """
+    Build the guard function from its source, the source is compiled by
+    `compile_guard_source` unless `SOT_COMPILE_GUARD` is disabled.
+
+    Returns:
+        The guard function and its final source.
+    """
+    if ENV_SOT_COMPILE_GUARD.get():
+        func_string, code = compile_guard_source(func_string)
+    else:
+        code = func_string
+    exec(code, free_vars)
+    return free_vars[func_name], func_string
+
+
 def make_guard(stringify_guards: list[StringifyExpression]) -> Guard:
     """
     Make a guard from a list of StringifyExpression.
@@ -75,6 +323,9 @@ def make_guard(stringify_guards: list[StringifyExpression]) -> Guard:
         if not num_guards:
             guard = lambda frame: True
             guard.expr = "lambda frame: True"
+            guard.key_fn = empty_guard_key_fn
+            guard.key_exprs = ()
+            guard.key_values = ()
             return guard
 
         def analyse_expressions(stringify_exprs, tmp_names):
@@ -103,17 +354,27 @@ def make_guard(stringify_guards: list[StringifyExpression]) -> Guard:
             stringify_guards, current_tmp_name_records().tmp_names_record
         )
 
-        exec(
-            func_string,
-            free_vars,
+        guard, func_string = build_guard_function(
+            func_string, 'built_guard_fn', free_vars
         )
-
-        guard = free_vars['built_guard_fn']
         log(3, f"[Guard]: {lambda_string}\n")
         guard.lambda_expr = lambda_string
         guard.expr = func_string
         assert callable(guard), "guard must be callable."
 
+        key_func_string, key_exprs, key_values = analyse_guard_keys(
+            stringify_guards, current_tmp_name_records().tmp_names_record
+        )
+        if key_func_string is None:
+            guard.key_fn = empty_guard_key_fn
+        else:
+            guard.key_fn, _ = build_guard_function(
+                key_func_string, 'built_guard_key_fn', free_vars
+            )
+            log(3, f"[Guard]: key is {key_exprs}\n")
+        guard.key_exprs = key_exprs
+        guard.key_values = key_values
+
         return guard
 
 
@@ -262,7 +262,7 @@ class TensorDtypeVariable(DataVariable):
             )
             return [
                 StringifyExpression(
-                    f"str(MetaInfo.from_tensor({{}}).dtype) == '{str(self.value)}'",
+                    f"str(MetaInfo.dtype_from_tensor({{}})) == '{str(self.value)}'",
                     [tensor_value_tracer],
                     {"MetaInfo": MetaInfo},
                 )
@@ -376,7 +376,7 @@ class TensorVariable(VariableBase):
 
         return [
             StringifyExpression(
-                f"MetaInfo.from_tensor({{}}).guard_str() == '{self.origin_meta.guard_str()}'",
+                f"MetaInfo.guard_str_from_tensor({{}}) == '{self.origin_meta.guard_str()}'",
                 [frame_value_tracer],
                 union_free_vars(
                     {"MetaInfo": MetaInfo},
@@ -18,7 +18,9 @@ from .envs import (  # noqa: F401
     ENV_COST_MODEL,
     ENV_MIN_GRAPH_SIZE,
     ENV_SHOW_TRACKERS,
+    ENV_SOT_COMPILE_GUARD,
     ENV_SOT_EXPORT,
+    ENV_SOT_GUARD_CACHE_SIZE,
     ENV_SOT_LOG_LEVEL,
     ENV_SOT_WITH_CONTROL_FLOW,
     ENV_STRICT_MODE,
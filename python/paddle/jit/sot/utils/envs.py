@@ -33,6 +33,10 @@ ENV_SOT_WITH_CONTROL_FLOW = BooleanEnvironmentVariable(
     "SOT_WITH_CONTROL_FLOW", True
 )
 ENV_SOT_EXPORT = StringEnvironmentVariable("SOT_EXPORT", "")
+ENV_SOT_GUARD_CACHE_SIZE = IntegerEnvironmentVariable(
+    "SOT_GUARD_CACHE_SIZE", 64
+)
+ENV_SOT_COMPILE_GUARD = BooleanEnvironmentVariable("SOT_COMPILE_GUARD", True)
 
 
 @contextmanager
@@ -595,7 +595,9 @@ class Auc(Metric):
     """
     The auc metric is for binary classification.
     Refer to https://en.wikipedia.org/wiki/Receiver_operating_characteristic#Area_under_the_curve.
-    Please notice that the auc metric is implemented with python, which may be a little bit slow.
+    Predictions of a batch are binned into buckets of thresholds by one
+    bincount op, the bucket statistics are kept on device if Tensors are
+    updated in dynamic mode, and copied to host in :code:`accumulate` only.
 
     The `auc` function creates four local variables, `true_positives`,
     `true_negatives`, `false_positives` and `false_negatives` that are used to
@@ -606,15 +608,15 @@ class Auc(Metric):
     computed using the height of the precision values by the recall.
 
     Args:
-        curve (str): Specifies the mode of the curve to be computed,
-            'ROC' or 'PR' for the Precision-Recall-curve. Default is 'ROC'.
+        curve (str|list[str]): Specifies the mode of the curve to be computed,
+            'ROC' or 'PR' for the Precision-Recall-curve. A list of modes
+            computes the areas of several curves from the same statistics.
+            Default is 'ROC'.
         num_thresholds (int): The number of thresholds to use when
             discretizing the roc curve. Default is 4095.
-            'ROC' or 'PR' for the Precision-Recall-curve. Default is 'ROC'.
         name (str, optional): String name of the metric instance. Default
-            is `auc`.
-
-    "NOTE: only implement the ROC curve type via Python now."
+            is `auc`. The names are `{name}_{curve}` (e.g. `auc_roc`) if
+            curve is a list.
 
     Examples:
         .. code-block:: python
@@ -676,26 +678,65 @@ class Auc(Metric):
         self, curve='ROC', num_thresholds=4095, name='auc', *args, **kwargs
     ):
         super().__init__(*args, **kwargs)
+        self._curves = [curve] if isinstance(curve, str) else list(curve)
+        for c in self._curves:
+            if c not in ('ROC', 'PR'):
+                raise ValueError(f"curve should be 'ROC' or 'PR', but got {c}")
         self._curve = curve
         self._num_thresholds = num_thresholds
+        if isinstance(curve, str):
+            self._name = name
+        else:
+            self._name = [f'{name}_{c.lower()}' for c in self._curves]
+        self.reset()
 
-        _num_pred_buckets = num_thresholds + 1
-        self._stat_pos = np.zeros(_num_pred_buckets)
-        self._stat_neg = np.zeros(_num_pred_buckets)
-        self._name = name
+    def _bucket_index(self, preds, labels):
+        # bucket index of negative samples is in [0, num_thresholds], and
+        # of positive samples in [num_thresholds + 1, 2 * num_thresholds + 1]
+        num_buckets = self._num_thresholds + 1
+        if isinstance(preds, (paddle.Tensor, paddle.base.core.eager.Tensor)):
+            bins = paddle.cast(preds[:, 1] * self._num_thresholds, 'int64')
+            bins = paddle.clip(bins, 0, self._num_thresholds)
+            positive = paddle.cast(paddle.reshape(labels, [-1]) != 0, 'int64')
+            return bins + positive * num_buckets
+        bins = (preds[:, 1] * self._num_thresholds).astype('int64')
+        assert bins.size == 0 or (
+            bins.min() >= 0 and bins.max() <= self._num_thresholds
+        )
+        positive = (np.reshape(labels, [-1]) != 0).astype('int64')
+        return bins + positive * num_buckets
 
     def update(self, preds, labels):
         """
         Update the auc curve with the given predictions and labels.
 
         Args:
-            preds (numpy.array): An numpy array in the shape of
-                (batch_size, 2), preds[i][j] denotes the probability of
+            preds (numpy.array|Tensor): An numpy array or Tensor in the shape
+                of (batch_size, 2), preds[i][j] denotes the probability of
                 classifying the instance i into the class j.
-            labels (numpy.array): an numpy array in the shape of
-                (batch_size, 1), labels[i] is either o or 1,
+            labels (numpy.array|Tensor): an numpy array or Tensor in the shape
+                of (batch_size, 1), labels[i] is either o or 1,
                 representing the label of the instance i.
-        """
+
+        Note:
+            If both preds and labels are Tensors in dynamic mode, statistics
+            are updated on the device of preds without synchronization, and
+            predictions out of [0, 1] are clipped to the first or last bucket.
+        """
+        is_tensor = isinstance(
+            preds, (paddle.Tensor, paddle.base.core.eager.Tensor)
+        ) and isinstance(labels, (paddle.Tensor, paddle.base.core.eager.Tensor))
+        if is_tensor and in_dynamic_mode():
+            counts = paddle.bincount(
+                self._bucket_index(preds, labels),
+                minlength=2 * (self._num_thresholds + 1),
+            )
+            if self._device_stat is None:
+                self._device_stat = counts
+            else:
+                self._device_stat = self._device_stat + counts
+            return
+
         if isinstance(labels, (paddle.Tensor, paddle.base.core.eager.Tensor)):
             labels = np.array(labels)
         elif not _is_numpy_(labels):
@@ -706,44 +747,84 @@ class Auc(Metric):
         elif not _is_numpy_(preds):
             raise ValueError("The 'preds' must be a numpy ndarray or Tensor.")
 
-        for i, lbl in enumerate(labels):
-            value = preds[i, 1]
-            bin_idx = int(value * self._num_thresholds)
-            assert bin_idx <= self._num_thresholds
-            if lbl:
-                self._stat_pos[bin_idx] += 1.0
-            else:
-                self._stat_neg[bin_idx] += 1.0
+        counts = np.bincount(
+            self._bucket_index(preds, labels),
+            minlength=2 * (self._num_thresholds + 1),
+        )
+        self._stat_neg += counts[: self._num_thresholds + 1]
+        self._stat_pos += counts[self._num_thresholds + 1 :]
+
+    def _sync_device_stat(self):
+        # merge statistics on device to host
+        if self._device_stat is not None:
+            counts = self._device_stat.numpy()
+            self._stat_neg += counts[: self._num_thresholds + 1]
+            self._stat_pos += counts[self._num_thresholds + 1 :]
+            self._device_stat = None
+
+    def all_reduce(self, group=None):
+        """
+        Sum the bucket statistics of all ranks in :attr:`group` by one
+        all_reduce, after which :code:`accumulate` returns the area under
+        the curve of the samples of all ranks.
+
+        Args:
+            group (Group, optional): The communication group. Default is
+                None, which means the global group.
+        """
+        self._sync_device_stat()
+        stat = paddle.to_tensor(
+            np.concatenate([self._stat_neg, self._stat_pos])
+        )
+        paddle.distributed.all_reduce(stat, group=group)
+        stat = stat.numpy()
+        self._stat_neg = stat[: self._num_thresholds + 1]
+        self._stat_pos = stat[self._num_thresholds + 1 :]
 
     @staticmethod
     def trapezoid_area(x1, x2, y1, y2):
         return abs(x1 - x2) * (y1 + y2) / 2.0
 
+    def _roc_area(self, tot_pos, tot_neg):
+        if tot_pos[-1] <= 0.0 or tot_neg[-1] <= 0.0:
+            return 0.0
+        prev_pos = np.concatenate([[0.0], tot_pos[:-1]])
+        prev_neg = np.concatenate([[0.0], tot_neg[:-1]])
+        auc = np.sum(self.trapezoid_area(tot_neg, prev_neg, tot_pos, prev_pos))
+        return float(auc / tot_pos[-1] / tot_neg[-1])
+
+    def _pr_area(self, tot_pos, tot_neg):
+        if tot_pos[-1] <= 0.0:
+            return 0.0
+        # sum of precision weighted by the increase of recall
+        tot = tot_pos + tot_neg
+        precision = np.divide(
+            tot_pos, tot, out=np.zeros_like(tot_pos), where=tot > 0
+        )
+        recall_inc = np.diff(tot_pos, prepend=0.0) / tot_pos[-1]
+        return float(np.sum(precision * recall_inc))
+
     def accumulate(self):
         """
         Return the area (a float score) under auc curve
 
         Return:
-            float: the area under auc curve
-        """
-        tot_pos = 0.0
-        tot_neg = 0.0
-        auc = 0.0
-
-        idx = self._num_thresholds
-        while idx >= 0:
-            tot_pos_prev = tot_pos
-            tot_neg_prev = tot_neg
-            tot_pos += self._stat_pos[idx]
-            tot_neg += self._stat_neg[idx]
-            auc += self.trapezoid_area(
-                tot_neg, tot_neg_prev, tot_pos, tot_pos_prev
+            float|list[float]: the area under auc curve, a list of areas if
+            curve is a list.
+        """
+        self._sync_device_stat()
+        # samples with prediction above each threshold, from high to low
+        tot_pos = np.cumsum(self._stat_pos[::-1])
+        tot_neg = np.cumsum(self._stat_neg[::-1])
+        areas = [
+            (
+                self._roc_area(tot_pos, tot_neg)
+                if c == 'ROC'
+                else self._pr_area(tot_pos, tot_neg)
             )
-            idx -= 1
-
-        return (
-            auc / tot_pos / tot_neg if tot_pos > 0.0 and tot_neg > 0.0 else 0.0
-        )
+            for c in self._curves
+        ]
+        return areas[0] if isinstance(self._curve, str) else areas
 
     def reset(self):
         """
@@ -752,6 +833,7 @@ class Auc(Metric):
         _num_pred_buckets = self._num_thresholds + 1
         self._stat_pos = np.zeros(_num_pred_buckets)
         self._stat_neg = np.zeros(_num_pred_buckets)
+        self._device_stat = None
 
     def name(self):
         """
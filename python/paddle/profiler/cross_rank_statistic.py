@@ -0,0 +1,511 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import bisect
+import collections
+import json
+import os
+import re
+
+import numpy as np
+
+from paddle.base.core import TracerEventType
+
+from .profiler_statistic import _CommunicationOpName, get_device_nodes
+from .statistic_helper import (
+    intersection_ranges_array,
+    merge_self_ranges_array,
+    sum_ranges_array,
+    to_range_array,
+)
+
+_RankPattern = re.compile(r'rank_?(\d+)')
+
+
+def _is_communication_node(hostnode):
+    return hostnode.type == TracerEventType.Communication or (
+        hostnode.type == TracerEventType.Operator
+        and any(name in hostnode.name.lower() for name in _CommunicationOpName)
+    )
+
+
+def _is_communication_kernel(devicenode):
+    kernel_name = devicenode.name.lower()
+    return devicenode.type == TracerEventType.Kernel and (
+        'nccl' in kernel_name or 'xccl' in kernel_name
+    )
+
+
+class CollectiveEvent:
+    r"""
+    A communication event on one rank. The time range is the range of its
+    communication kernels if there are, otherwise the range of host node.
+    """
+
+    def __init__(self, name, step, index, start_ns, end_ns):
+        self.name = name
+        self.step = step
+        self.index = index
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+
+    @property
+    def key(self):
+        # the same collective is called in the same order on all ranks
+        return (self.step, self.name, self.index)
+
+
+class RankProfile:
+    r"""
+    Collect steps and communication events from node trees of one rank.
+    """
+
+    def __init__(self, rank, nodetrees):
+        self.rank = rank
+        self.nodetrees = nodetrees
+        self.steps = {}  # step name -> (start_ns, end_ns)
+        self.collectives = []
+        self.communication_range = to_range_array([])
+        self._parse(nodetrees)
+
+    def _parse(self, nodetrees):
+        communication_nodes = []
+        for rootnode in nodetrees.values():
+            stack = list(rootnode.children_node)
+            while stack:
+                node = stack.pop()
+                if node.type == TracerEventType.ProfileStep:
+                    self.steps[node.name] = (node.start_ns, node.end_ns)
+                if _is_communication_node(node):
+                    # nested communication nodes are the same collective
+                    communication_nodes.append(node)
+                    continue
+                stack.extend(node.children_node)
+
+        step_names = sorted(self.steps, key=lambda name: self.steps[name][0])
+        step_starts = [self.steps[name][0] for name in step_names]
+        communication_range = []
+        counter = collections.Counter()
+        communication_nodes.sort(key=lambda node: node.start_ns)
+        for node in communication_nodes:
+            step = None
+            pos = bisect.bisect_right(step_starts, node.start_ns) - 1
+            if pos >= 0 and node.start_ns <= self.steps[step_names[pos]][1]:
+                step = step_names[pos]
+            kernels = [
+                devicenode
+                for devicenode in get_device_nodes(node)
+                if _is_communication_kernel(devicenode)
+            ]
+            if kernels:
+                start_ns = min(kernel.start_ns for kernel in kernels)
+                end_ns = max(kernel.end_ns for kernel in kernels)
+            else:
+                start_ns, end_ns = node.start_ns, node.end_ns
+            index = counter[(step, node.name)]
+            counter[(step, node.name)] += 1
+            self.collectives.append(
+                CollectiveEvent(node.name, step, index, start_ns, end_ns)
+            )
+            communication_range.extend(
+                (min(start_ns, node.start_ns), max(end_ns, node.end_ns))
+            )
+        self.communication_range = merge_self_ranges_array(communication_range)
+
+    def get_busy_time(self, step):
+        r"""
+        Get the time of step excluding the time in communication.
+        """
+        start_ns, end_ns = self.steps[step]
+        waiting = intersection_ranges_array(
+            self.communication_range, [(start_ns, end_ns)], is_sorted=True
+        )
+        return end_ns - start_ns - sum_ranges_array(waiting)
+
+
+class CrossRankSummary:
+    r"""
+    Analyse profiling results of all ranks. The clocks of ranks are aligned
+    by the end of collectives, which finish at almost the same time on all
+    ranks, then the skew of each collective and the slowest rank of each
+    step are computed on the aligned timeline.
+
+    Args:
+        pipeline_stages(list, optional): Ranks of each pipeline stage in the
+            order of stages, used to find the bottleneck of each stage.
+    """
+
+    class CollectiveItem:
+        def __init__(self, name, step, index, starts, ends):
+            self.name = name
+            self.step = step
+            self.index = index
+            self.starts = starts  # rank -> aligned start_ns
+            self.ends = ends  # rank -> aligned end_ns
+            self.begin_ns = min(starts.values())
+            self.skew = max(starts.values()) - self.begin_ns
+            # the rank all other ranks are waiting for
+            self.late_rank = max(starts, key=starts.get)
+
+    class StepItem:
+        def __init__(self, name, durations, busy_times):
+            self.name = name
+            self.durations = durations  # rank -> step time
+            # rank -> step time except communication
+            self.busy_times = busy_times
+            self.slowest_rank = max(busy_times, key=busy_times.get)
+            self.critical_path = []  # list of (stage_id, rank, busy_time)
+
+        @property
+        def critical_stage(self):
+            if not self.critical_path:
+                return None
+            return max(self.critical_path, key=lambda item: item[2])[0]
+
+    def __init__(self, pipeline_stages=None):
+        self.pipeline_stages = pipeline_stages
+        self.ranks = []
+        self.clock_offsets = {}
+        self.collective_items = []
+        self.step_items = []
+
+    def parse(self, rank_profiles):
+        r"""
+        Analyse the list of RankProfile.
+        """
+        assert len(rank_profiles) > 0, "No profiling result to analyse."
+        rank_profiles = sorted(rank_profiles, key=lambda p: p.rank)
+        self.ranks = [profile.rank for profile in rank_profiles]
+        rank_to_collectives = {
+            profile.rank: {event.key: event for event in profile.collectives}
+            for profile in rank_profiles
+        }
+        self._align_clocks(rank_profiles, rank_to_collectives)
+
+        keys = collections.Counter()
+        for collectives in rank_to_collectives.values():
+            keys.update(collectives.keys())
+        self.collective_items = []
+        for key, count in keys.items():
+            if count < 2:
+                continue
+            starts, ends = {}, {}
+            for rank, collectives in rank_to_collectives.items():
+                if key in collectives:
+                    offset = self.clock_offsets[rank]
+                    starts[rank] = collectives[key].start_ns - offset
+                    ends[rank] = collectives[key].end_ns - offset
+            step, name, index = key
+            self.collective_items.append(
+                CrossRankSummary.CollectiveItem(name, step, index, starts, ends)
+            )
+        self.collective_items.sort(key=lambda item: item.begin_ns)
+
+        step_names = set.intersection(
+            *[set(profile.steps) for profile in rank_profiles]
+        )
+        self.step_items = []
+        for step in step_names:
+            durations, busy_times = {}, {}
+            for profile in rank_profiles:
+                start_ns, end_ns = profile.steps[step]
+                durations[profile.rank] = end_ns - start_ns
+                busy_times[profile.rank] = profile.get_busy_time(step)
+            item = CrossRankSummary.StepItem(step, durations, busy_times)
+            if self.pipeline_stages:
+                for stage_id, stage_ranks in enumerate(self.pipeline_stages):
+                    stage_ranks = [r for r in stage_ranks if r in busy_times]
+                    if not stage_ranks:
+                        continue
+                    rank = max(stage_ranks, key=busy_times.get)
+                    item.critical_path.append(
+                        (stage_id, rank, busy_times[rank])
+                    )
+            self.step_items.append(item)
+        self.step_items.sort(
+            key=lambda item: rank_profiles[0].steps[item.name][0]
+        )
+
+    def _align_clocks(self, rank_profiles, rank_to_collectives):
+        reference = rank_profiles[0]
+        reference_collectives = rank_to_collectives[reference.rank]
+        self.clock_offsets = {reference.rank: 0}
+        for profile in rank_profiles[1:]:
+            collectives = rank_to_collectives[profile.rank]
+            deltas = [
+                event.end_ns - reference_collectives[key].end_ns
+                for key, event in collectives.items()
+                if key in reference_collectives
+            ]
+            if not deltas:
+                # no common collective, align by the end of steps
+                deltas = [
+                    end_ns - reference.steps[step][1]
+                    for step, (_, end_ns) in profile.steps.items()
+                    if step in reference.steps
+                ]
+            self.clock_offsets[profile.rank] = (
+                int(np.median(deltas)) if deltas else 0
+            )
+
+    def get_collective_stats(self):
+        r"""
+        Summarize the skew of collectives by name, returns a dict of name to
+        (calls, total_skew, max_skew, most frequent late rank).
+        """
+        skews = collections.defaultdict(list)
+        late_ranks = collections.defaultdict(collections.Counter)
+        for item in self.collective_items:
+            skews[item.name].append(item.skew)
+            late_ranks[item.name][item.late_rank] += 1
+        return {
+            name: (
+                len(values),
+                sum(values),
+                max(values),
+                late_ranks[name].most_common(1)[0][0],
+            )
+            for name, values in skews.items()
+        }
+
+
+def load_rank_profiles(files):
+    r"""
+    Load the profiling results exported by `export_protobuf` of all ranks.
+
+    Args:
+        files(str|list|dict): A directory of the exported files, a list of
+            files, or a dict of rank to file. The rank is parsed from the file
+            name like `rank0` or `rank_0` if it is not given, otherwise the
+            files are sorted by name and ranked in order.
+
+    Returns:
+        list of RankProfile.
+    """
+    from .utils import load_profiler_result
+
+    if isinstance(files, str) and not os.path.isdir(files):
+        files = [files]
+    elif isinstance(files, str):
+        files = sorted(
+            os.path.join(files, name)
+            for name in os.listdir(files)
+            if name.endswith('.pb')
+        )
+    if not isinstance(files, dict):
+        files = sorted(files)
+        matches = [_RankPattern.search(os.path.basename(f)) for f in files]
+        ranks = [int(m.group(1)) for m in matches if m is not None]
+        if len(ranks) != len(files) or len(set(ranks)) != len(ranks):
+            ranks = list(range(len(files)))
+        files = dict(zip(ranks, files))
+    return [
+        RankProfile(rank, load_profiler_result(path).get_data())
+        for rank, path in sorted(files.items())
+    ]
+
+
+def export_merged_chrome_tracing(rank_profiles, clock_offsets, path):
+    r"""
+    Export the node trees of all ranks to one chrome tracing file, with each
+    rank as a process on the aligned timeline.
+    """
+    events = []
+
+    def add_event(name, cat, pid, tid, start_ns, end_ns):
+        events.append(
+            {
+                'name': name,
+                'cat': cat,
+                'ph': 'X',
+                'pid': pid,
+                'tid': tid,
+                'ts': start_ns / 1e3,
+                'dur': (end_ns - start_ns) / 1e3,
+            }
+        )
+
+    for profile in rank_profiles:
+        offset = clock_offsets.get(profile.rank, 0)
+        pid = f'rank {profile.rank}'
+        for thread_id, rootnode in profile.nodetrees.items():
+            stack = list(rootnode.children_node)
+            while stack:
+                node = stack.pop()
+                stack.extend(node.children_node)
+                add_event(
+                    node.name,
+                    str(node.type).split('.')[1],
+                    pid,
+                    f'thread {thread_id}',
+                    node.start_ns - offset,
+                    node.end_ns - offset,
+                )
+                for runtimenode in node.runtime_node:
+                    for devicenode in runtimenode.device_node:
+                        add_event(
+                            devicenode.name,
+                            str(devicenode.type).split('.')[1],
+                            pid,
+                            f'device {devicenode.device_id} stream {devicenode.stream_id}',
+                            devicenode.start_ns - offset,
+                            devicenode.end_ns - offset,
+                        )
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+def _build_cross_rank_table(summary, time_unit='ms', row_limit=20):
+    r"""
+    Build the report of skew of collectives and slowest ranks of steps.
+    """
+    SPACING_SIZE = 2
+    result = []
+
+    def append(s):
+        result.append(s)
+        result.append('\n')
+
+    def format_time(time):
+        result = float(time)
+        if time_unit == 's':
+            result /= 1e9
+        elif time_unit == 'ms':
+            result /= 1e6
+        elif time_unit == 'us':
+            result /= 1e3
+        return f'{result:.2f}'
+
+    def add_table(title, headers, widths, rows):
+        row_format = ''.join(
+            '{: <' + str(width) + '}' + ' ' * SPACING_SIZE for width in widths
+        )
+        header_sep = ''.join(
+            '-' * width + ' ' * SPACING_SIZE for width in widths
+        )
+        line_length = len(header_sep) - SPACING_SIZE
+        left_length = line_length - len(title)
+        append(
+            '-' * (left_length // 2)
+            + title
+            + '-' * (left_length - left_length // 2)
+        )
+        append(f'Time unit: {time_unit}')
+        append(header_sep)
+        append(row_format.format(*headers))
+        append(header_sep)
+        for row in rows[:row_limit]:
+            append(row_format.format(*row))
+        append(header_sep)
+        append('')
+
+    rows = [
+        [str(rank), format_time(offset)]
+        for rank, offset in summary.clock_offsets.items()
+    ]
+    add_table('Clock Offset Summary', ['Rank', 'Offset'], [10, 20], rows)
+
+    rows = []
+    for name, (calls, total, max_skew, late_rank) in sorted(
+        summary.get_collective_stats().items(),
+        key=lambda item: item[1][1],
+        reverse=True,
+    ):
+        if len(name) > 40:
+            name = name[:37] + '...'
+        rows.append(
+            [
+                name,
+                calls,
+                format_time(total),
+                format_time(total / calls),
+                format_time(max_skew),
+                str(late_rank),
+            ]
+        )
+    add_table(
+        'Collective Skew Summary',
+        ['Name', 'Calls', 'Total Skew', 'Avg Skew', 'Max Skew', 'Late Rank'],
+        [40, 10, 15, 15, 15, 10],
+        rows,
+    )
+
+    headers = ['Step', 'Max Time', 'Slowest Rank', 'Busy Time', 'Median Busy']
+    widths = [25, 15, 15, 15, 15]
+    if summary.pipeline_stages:
+        headers.append('Critical Path (stage:rank)')
+        widths.append(40)
+    rows = []
+    for item in summary.step_items:
+        row = [
+            item.name,
+            format_time(max(item.durations.values())),
+            str(item.slowest_rank),
+            format_time(item.busy_times[item.slowest_rank]),
+            format_time(np.median(list(item.busy_times.values()))),
+        ]
+        if summary.pipeline_stages:
+            row.append(
+                ' -> '.join(
+                    f'{stage_id}:{rank}'
+                    + ('*' if stage_id == item.critical_stage else '')
+                    for stage_id, rank, _ in item.critical_path
+                )
+            )
+        rows.append(row)
+    add_table('Step Straggler Summary', headers, widths, rows)
+    append(
+        "Note:\nBusy time is the step time except the time in communication, "
+        "the slowest rank has the max busy time and the other ranks wait for it in collectives.\n"
+        "Critical path lists the rank with max busy time of each pipeline stage, "
+        "and the stage marked with * is the bottleneck stage.\n"
+    )
+    return ''.join(result)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Merge profiling results of all ranks and analyse stragglers."
+    )
+    parser.add_argument(
+        "files", nargs='+', help="the directory or files exported by ranks"
+    )
+    parser.add_argument(
+        "--output", default=None, help="the merged chrome tracing file"
+    )
+    parser.add_argument(
+        "--pipeline_stages",
+        default=None,
+        help="ranks of each pipeline stage, like '0,1;2,3'",
+    )
+    parser.add_argument("--time_unit", default='ms')
+    parser.add_argument("--row_limit", type=int, default=20)
+    args = parser.parse_args()
+
+    files = args.files[0] if len(args.files) == 1 else args.files
+    pipeline_stages = None
+    if args.pipeline_stages:
+        pipeline_stages = [
+            [int(rank) for rank in stage.split(',')]
+            for stage in args.pipeline_stages.split(';')
+        ]
+    rank_profiles = load_rank_profiles(files)
+    summary = CrossRankSummary(pipeline_stages)
+    summary.parse(rank_profiles)
+    print(_build_cross_rank_table(summary, args.time_unit, args.row_limit))
+    if args.output:
+        export_merged_chrome_tracing(
+            rank_profiles, summary.clock_offsets, args.output
+        )
@@ -360,6 +360,9 @@ class Profiler:
         profile_memory (bool, optional): If it is True, collect tensor memory allocation and release information. Default: False.
         custom_device_types (list, optional): If targets contain profiler.ProfilerTarget.CUSTOM_DEVICE, custom_device_types select the custom device type for profiling. The default value represents all custom devices will be selected.
         with_flops (bool, optional): If it is True, the flops of the op will be calculated. Default: False.
+        accumulate_summary (bool, optional): If it is True, the result of each profiling window returned by ``scheduler`` is analysed when it is ready and
+            accumulated into the statistic data, and ``summary`` prints the statistics of all windows instead of the last one. Only the statistics are kept
+            across windows, so the memory does not grow with the profiling steps. Default: False.
 
     Examples:
         1. profiling range [2, 5).
@@ -485,6 +488,7 @@ class Profiler:
         emit_nvtx: Optional[bool] = False,
         custom_device_types: Optional[list] = [],
         with_flops: Optional[bool] = False,
+        accumulate_summary: Optional[bool] = False,
     ):
         supported_targets = _get_supported_targets()
         if targets:
@@ -547,6 +551,8 @@ class Profiler:
         self.profile_memory = profile_memory
         self.with_flops = with_flops
         self.emit_nvtx = emit_nvtx
+        self.accumulate_summary = accumulate_summary
+        self._statistic_data = None
 
     def __enter__(self):
         self.start()
@@ -652,6 +658,7 @@ class Profiler:
             self.profiler_result = self.profiler.stop()
             if self.on_trace_ready:
                 self.on_trace_ready(self)
+            self._accumulate_result()
         utils._is_profiler_used = False
 
     def step(self, num_samples: Optional[int] = None):
@@ -815,6 +822,21 @@ class Profiler:
                 self.profiler.start()
             if self.on_trace_ready:
                 self.on_trace_ready(self)
+            self._accumulate_result()
+
+    def _accumulate_result(self):
+        if not self.accumulate_summary or not self.profiler_result:
+            return
+        if self._statistic_data is None:
+            self._statistic_data = StatisticData(
+                self.profiler_result.get_data(),
+                self.profiler_result.get_extra_info(),
+            )
+        else:
+            self._statistic_data.add(
+                self.profiler_result.get_data(),
+                self.profiler_result.get_extra_info(),
+            )
 
     def export(self, path="", format="json"):
         r"""
@@ -863,6 +885,7 @@ class Profiler:
             thread_sep(bool, optional): print op table each thread, default value is False.
             time_unit(str, optional): time unit for display, can be chosen form ['s', 'ms', 'us', 'ns'], default value is 'ms'.
             views(SummaryView|list[SummaryView], optional): summary tables to print, default to None means all views to be printed.
+                If ``accumulate_summary`` is True, the tables summarize all profiling windows.
 
         Examples:
             .. code-block:: python
@@ -885,11 +908,13 @@ class Profiler:
         if isinstance(views, SummaryView):
             views = [views]
 
-        if self.profiler_result:
+        statistic_data = self._statistic_data
+        if statistic_data is None and self.profiler_result:
             statistic_data = StatisticData(
                 self.profiler_result.get_data(),
                 self.profiler_result.get_extra_info(),
             )
+        if statistic_data is not None:
             print(
                 _build_table(
                     statistic_data,
@@ -15,14 +15,18 @@ import collections
 import re
 from enum import Enum
 
+import numpy as np
+
 from paddle.base.core import TracerEventType, TracerMemEventType
 from paddle.utils.flops import flops
 
 from .statistic_helper import (
-    intersection_ranges,
-    merge_ranges,
-    merge_self_ranges,
-    sum_ranges,
+    intersection_ranges_array,
+    merge_ranges_array,
+    merge_self_ranges_array,
+    sum_ranges_array,
+    to_range_array,
+    to_range_list,
 )
 
 _AllTracerEventType = [
@@ -336,17 +340,23 @@ def wrap_tree(nodetrees):
 class TimeRangeSummary:
     r"""
     Analyse time ranges for each TracerEventType, and summarize the time.
+
+    Time ranges are kept in int64 arrays for the last parsed result, which
+    are returned as lists of (start, end) by CPUTimeRange and GPUTimeRange,
+    and the sums of time ranges and call times are accumulated for all
+    parsed results.
     """
 
     def __init__(self):
-        self.CPUTimeRange = collections.defaultdict(list)
-        self.GPUTimeRange = collections.defaultdict(
-            lambda: collections.defaultdict(list)
-        )  # GPU events should be divided into different devices
+        self._cpu_time_ranges = {}
+        # GPU events should be divided into different devices
+        self._gpu_time_ranges = collections.defaultdict(dict)
         self.CPUTimeRangeSum = collections.defaultdict(int)
         self.GPUTimeRangeSum = collections.defaultdict(
             lambda: collections.defaultdict(int)
         )
+        # time of GPU events merged on all devices
+        self.GPUAllDevicesTimeRangeSum = collections.defaultdict(int)
         self.call_times = collections.defaultdict(int)
 
     def parse(self, nodetrees):
@@ -354,58 +364,79 @@ class TimeRangeSummary:
         Analysis node trees in profiler result, and get time range for different tracer event type.
         """
         thread2hostnodes = traverse_tree(nodetrees)
+        # flat lists of start and end of time ranges
+        CPUTimeRange = collections.defaultdict(list)
+        GPUTimeRange = collections.defaultdict(
+            lambda: collections.defaultdict(list)
+        )  # device_id/type
         for threadid, hostnodes in thread2hostnodes.items():
-            CPUTimeRange = collections.defaultdict(list)
-            GPUTimeRange = collections.defaultdict(
-                lambda: collections.defaultdict(
-                    lambda: collections.defaultdict(list)
-                )
-            )  # device_id/type/stream_id
             for hostnode in hostnodes[1:]:  # skip root node
-                CPUTimeRange[hostnode.type].append(
+                CPUTimeRange[hostnode.type].extend(
                     (hostnode.start_ns, hostnode.end_ns)
                 )
                 self.call_times[hostnode.type] += 1
                 for runtimenode in hostnode.runtime_node:
-                    CPUTimeRange[runtimenode.type].append(
+                    CPUTimeRange[runtimenode.type].extend(
                         (runtimenode.start_ns, runtimenode.end_ns)
                     )
                     self.call_times[runtimenode.type] += 1
                     for devicenode in runtimenode.device_node:
-                        GPUTimeRange[devicenode.device_id][devicenode.type][
-                            devicenode.stream_id
-                        ].append((devicenode.start_ns, devicenode.end_ns))
+                        GPUTimeRange[devicenode.device_id][
+                            devicenode.type
+                        ].extend((devicenode.start_ns, devicenode.end_ns))
                         self.call_times[devicenode.type] += 1
 
-            for event_type, time_ranges in CPUTimeRange.items():
-                time_ranges = merge_self_ranges(time_ranges, is_sorted=False)
-                self.CPUTimeRange[event_type] = merge_ranges(
-                    self.CPUTimeRange[event_type], time_ranges, is_sorted=True
-                )
-            for device_id, device_time_ranges in GPUTimeRange.items():
-                for event_type, event_time_ranges in device_time_ranges.items():
-                    for stream_id, time_ranges in event_time_ranges.items():
-                        time_ranges = merge_self_ranges(
-                            time_ranges, is_sorted=False
-                        )
-                        self.GPUTimeRange[device_id][event_type] = merge_ranges(
-                            self.GPUTimeRange[device_id][event_type],
-                            time_ranges,
-                            is_sorted=True,
-                        )
+        self._cpu_time_ranges = {}
+        for event_type, time_ranges in CPUTimeRange.items():
+            time_ranges = merge_self_ranges_array(time_ranges)
+            self._cpu_time_ranges[event_type] = time_ranges
+            self.CPUTimeRangeSum[event_type] += sum_ranges_array(time_ranges)
 
-        for event_type, time_ranges in self.CPUTimeRange.items():
-            self.CPUTimeRangeSum[event_type] = sum_ranges(time_ranges)
-        for device_id, device_time_ranges in self.GPUTimeRange.items():
+        self._gpu_time_ranges = collections.defaultdict(dict)
+        all_devices_time_range = {}
+        for device_id, device_time_ranges in GPUTimeRange.items():
             for event_type, time_ranges in device_time_ranges.items():
-                self.GPUTimeRangeSum[device_id][event_type] = sum_ranges(
+                time_ranges = merge_self_ranges_array(time_ranges)
+                self._gpu_time_ranges[device_id][event_type] = time_ranges
+                self.GPUTimeRangeSum[device_id][event_type] += sum_ranges_array(
                     time_ranges
                 )
+                all_devices_time_range[event_type] = merge_ranges_array(
+                    all_devices_time_range.get(event_type, []),
+                    time_ranges,
+                    is_sorted=True,
+                )
+        for event_type, time_ranges in all_devices_time_range.items():
+            self.GPUAllDevicesTimeRangeSum[event_type] += sum_ranges_array(
+                time_ranges
+            )
+
+    @property
+    def CPUTimeRange(self):
+        return collections.defaultdict(
+            list,
+            {
+                event_type: to_range_list(time_ranges)
+                for event_type, time_ranges in self._cpu_time_ranges.items()
+            },
+        )
+
+    @property
+    def GPUTimeRange(self):
+        GPUTimeRange = collections.defaultdict(
+            lambda: collections.defaultdict(list)
+        )
+        for device_id, device_time_ranges in self._gpu_time_ranges.items():
+            for event_type, time_ranges in device_time_ranges.items():
+                GPUTimeRange[device_id][event_type] = to_range_list(time_ranges)
+        return GPUTimeRange
 
     def get_gpu_devices(self):
-        return self.GPUTimeRange.keys()
+        return self.GPUTimeRangeSum.keys()
 
     def get_gpu_range_sum(self, device_id, event_type):
+        if device_id not in self.GPUTimeRangeSum:
+            return 0
         return self.GPUTimeRangeSum[device_id][event_type]
 
     def get_cpu_range_sum(self, event_type):
@@ -416,48 +447,53 @@ class DistributedSummary:
     r"""
     Analysis communication and computation time range, and their overlap.
     The computation time is all kernel except kernels for communication like nccl.
+
+    Time ranges are kept in int64 arrays for the last parsed result, which
+    are returned as lists of (start, end) by the `*_range` attributes, and
+    the time and calls are accumulated for all parsed results.
     """
 
     def __init__(self):
-        self.cpu_communication_range = []
-        self.gpu_communication_range = []
-        self.communication_range = []
-        self.computation_range = []
-        self.overlap_range = []
+        self._cpu_communication_range = to_range_array([])
+        self._gpu_communication_range = to_range_array([])
+        self._communication_range = to_range_array([])
+        self._computation_range = to_range_array([])
+        self._overlap_range = to_range_array([])
         self.cpu_calls = 0
         self.gpu_calls = 0
+        self.cpu_communication_time = 0
+        self.gpu_communication_time = 0
+        self.communication_time = 0
+        self.computation_time = 0
+        self.overlap_time = 0
 
     def parse(self, nodetrees):
         '''
         Collect all communication and computation time ranges.
         '''
+        # flat lists of start and end of time ranges
+        cpu_communication_range = []
+        gpu_communication_range = []
+        computation_range = []
         thread2hostnodes = traverse_tree(nodetrees)
         for threadid, hostnodes in thread2hostnodes.items():
             for hostnode in hostnodes[1:]:  # skip root node
                 # case 1: TracerEventType is Communication
-                if hostnode.type == TracerEventType.Communication:
-                    self.cpu_communication_range.append(
-                        (hostnode.start_ns, hostnode.end_ns)
-                    )
-                    device_nodes = get_device_nodes(hostnode)
-                    for device_node in device_nodes:
-                        if device_node.type == TracerEventType.Kernel:
-                            self.gpu_communication_range.append(
-                                (device_node.start_ns, device_node.end_ns)
-                            )
-
                 # case 2: TracerEventType is Operator but is communication op
-                elif hostnode.type == TracerEventType.Operator and any(
-                    name in hostnode.name.lower()
-                    for name in _CommunicationOpName
+                if hostnode.type == TracerEventType.Communication or (
+                    hostnode.type == TracerEventType.Operator
+                    and any(
+                        name in hostnode.name.lower()
+                        for name in _CommunicationOpName
+                    )
                 ):
-                    self.cpu_communication_range.append(
+                    cpu_communication_range.extend(
                         (hostnode.start_ns, hostnode.end_ns)
                     )
                     device_nodes = get_device_nodes(hostnode)
                     for device_node in device_nodes:
                         if device_node.type == TracerEventType.Kernel:
-                            self.gpu_communication_range.append(
+                            gpu_communication_range.extend(
                                 (device_node.start_ns, device_node.end_ns)
                             )
 
@@ -471,32 +507,61 @@ class DistributedSummary:
                                     'nccl' in kernel_name
                                     or 'xccl' in kernel_name
                                 ):
-                                    self.gpu_communication_range.append(
+                                    gpu_communication_range.extend(
                                         (devicenode.start_ns, devicenode.end_ns)
                                     )
                                 else:
-                                    self.computation_range.append(
+                                    computation_range.extend(
                                         (devicenode.start_ns, devicenode.end_ns)
                                     )
-        self.cpu_calls = len(set(self.cpu_communication_range))
-        self.gpu_calls = len(set(self.gpu_communication_range))
-        self.cpu_communication_range = merge_self_ranges(
-            self.cpu_communication_range, is_sorted=False
+        cpu_communication_range = to_range_array(cpu_communication_range)
+        gpu_communication_range = to_range_array(gpu_communication_range)
+        # calls of distinct time ranges
+        self.cpu_calls += len(np.unique(cpu_communication_range, axis=0))
+        self.gpu_calls += len(np.unique(gpu_communication_range, axis=0))
+        cpu_communication_range = merge_self_ranges_array(
+            cpu_communication_range
         )
-        self.gpu_communication_range = merge_self_ranges(
-            self.gpu_communication_range, is_sorted=False
+        gpu_communication_range = merge_self_ranges_array(
+            gpu_communication_range
         )
-        self.communication_range = merge_ranges(
-            self.cpu_communication_range,
-            self.gpu_communication_range,
-            is_sorted=True,
+        communication_range = merge_ranges_array(
+            cpu_communication_range, gpu_communication_range, is_sorted=True
         )
-        self.computation_range = merge_self_ranges(
-            self.computation_range, is_sorted=False
-        )
-        self.overlap_range = intersection_ranges(
-            self.communication_range, self.computation_range, is_sorted=True
+        computation_range = merge_self_ranges_array(computation_range)
+        overlap_range = intersection_ranges_array(
+            communication_range, computation_range, is_sorted=True
         )
+        self._cpu_communication_range = cpu_communication_range
+        self._gpu_communication_range = gpu_communication_range
+        self._communication_range = communication_range
+        self._computation_range = computation_range
+        self._overlap_range = overlap_range
+        self.cpu_communication_time += sum_ranges_array(cpu_communication_range)
+        self.gpu_communication_time += sum_ranges_array(gpu_communication_range)
+        self.communication_time += sum_ranges_array(communication_range)
+        self.computation_time += sum_ranges_array(computation_range)
+        self.overlap_time += sum_ranges_array(overlap_range)
+
+    @property
+    def cpu_communication_range(self):
+        return to_range_list(self._cpu_communication_range)
+
+    @property
+    def gpu_communication_range(self):
+        return to_range_list(self._gpu_communication_range)
+
+    @property
+    def communication_range(self):
+        return to_range_list(self._communication_range)
+
+    @property
+    def computation_range(self):
+        return to_range_list(self._computation_range)
+
+    @property
+    def overlap_range(self):
+        return to_range_list(self._overlap_range)
 
 
 class EventSummary:
@@ -855,6 +920,9 @@ class MemorySummary:
 class StatisticData:
     r"""
     Hold all analysed results.
+
+    Results of more profiling windows can be accumulated by :code:`add`,
+    after which only the summaries are kept but not the node trees.
     """
 
     def __init__(self, node_trees, extra_info):
@@ -864,11 +932,23 @@ class StatisticData:
         self.event_summary = EventSummary()
         self.distributed_summary = DistributedSummary()
         self.memory_summary = MemorySummary()
+        self._parse(node_trees)
+
+    def _parse(self, node_trees):
         self.time_range_summary.parse(node_trees)
         self.event_summary.parse(node_trees)
         self.distributed_summary.parse(node_trees)
         self.memory_summary.parse(node_trees)
 
+    def add(self, node_trees, extra_info):
+        r"""
+        Accumulate the result of another profiling window, extra_info is
+        replaced by the latest one.
+        """
+        self.node_trees = None
+        self.extra_info = extra_info
+        self._parse(node_trees)
+
 
 def _build_table(
     statistic_data,
@@ -1023,10 +1103,10 @@ def _build_table(
         ) in statistic_data.time_range_summary.CPUTimeRangeSum.items():
             if event_type != TracerEventType.Communication:
                 cpu_type_time[event_type] = value
-        if statistic_data.distributed_summary.cpu_communication_range:
-            cpu_type_time[TracerEventType.Communication] = sum_ranges(
-                statistic_data.distributed_summary.cpu_communication_range
-            )
+        if statistic_data.distributed_summary.cpu_calls > 0:
+            cpu_type_time[
+                TracerEventType.Communication
+            ] = statistic_data.distributed_summary.cpu_communication_time
             cpu_call_times[
                 TracerEventType.Communication
             ] = statistic_data.distributed_summary.cpu_calls
@@ -1054,21 +1134,13 @@ def _build_table(
                     event_type_name
                 ].cpu_time
 
-        gpu_time_range = collections.defaultdict(list)
-        for (
-            device_id,
-            device_time_ranges,
-        ) in statistic_data.time_range_summary.GPUTimeRange.items():
-            for event_type, time_range in device_time_ranges.items():
-                gpu_time_range[event_type] = merge_ranges(
-                    gpu_time_range[event_type], time_range, is_sorted=True
-                )
-        for event_type, time_range in gpu_time_range.items():
-            gpu_type_time[event_type] = sum_ranges(time_range)
-        if statistic_data.distributed_summary.gpu_communication_range:
-            gpu_type_time[TracerEventType.Communication] = sum_ranges(
-                statistic_data.distributed_summary.gpu_communication_range
-            )
+        gpu_type_time.update(
+            statistic_data.time_range_summary.GPUAllDevicesTimeRangeSum
+        )
+        if statistic_data.distributed_summary.gpu_calls > 0:
+            gpu_type_time[
+                TracerEventType.Communication
+            ] = statistic_data.distributed_summary.gpu_communication_time
             gpu_call_times[
                 TracerEventType.Communication
             ] = statistic_data.distributed_summary.gpu_calls
@@ -1227,7 +1299,11 @@ def _build_table(
 
     if views is None or SummaryView.DistributedView in views:
         # ----- Print Distribution Summary Report ----- #
-        if statistic_data.distributed_summary.communication_range:
+        if (
+            statistic_data.distributed_summary.cpu_calls
+            + statistic_data.distributed_summary.gpu_calls
+            > 0
+        ):
             headers = [
                 'Name',
                 'Total Time',
@@ -1251,15 +1327,13 @@ def _build_table(
             append(header_sep)
             append(row_format.format(*headers))
             append(header_sep)
-            communication_time = sum_ranges(
-                statistic_data.distributed_summary.communication_range
-            )
-            computation_time = sum_ranges(
-                statistic_data.distributed_summary.computation_range
+            communication_time = (
+                statistic_data.distributed_summary.communication_time
             )
-            overlap_time = sum_ranges(
-                statistic_data.distributed_summary.overlap_range
+            computation_time = (
+                statistic_data.distributed_summary.computation_time
             )
+            overlap_time = statistic_data.distributed_summary.overlap_time
             row_values = [
                 'ProfileStep',
                 format_time(total_time, unit=time_unit),
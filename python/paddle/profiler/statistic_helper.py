@@ -12,6 +12,119 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+
+# NOTE: time ranges are stored in int64 arrays in shape [N, 2], each row is
+# (start_ns, end_ns), and the functions with suffix `_array` operate on
+# them by vectorized numpy operations. The other functions are kept for
+# time ranges in list of tuples.
+
+
+def to_range_array(ranges):
+    """
+    Convert time ranges in list of (start, end) or array to an int64 array
+    in shape [N, 2].
+    """
+    return np.asarray(ranges, dtype=np.int64).reshape(-1, 2)
+
+
+def to_range_list(ranges):
+    return [tuple(time_range) for time_range in ranges.tolist()]
+
+
+def sum_ranges_array(ranges):
+    ranges = to_range_array(ranges)
+    return int(np.sum(ranges[:, 1] - ranges[:, 0]))
+
+
+def merge_self_ranges_array(ranges, is_sorted=False):
+    """
+    Merge overlapped or adjacent time ranges, the result is sorted.
+    """
+    ranges = to_range_array(ranges)
+    if len(ranges) == 0:
+        return ranges
+    if not is_sorted:
+        ranges = ranges[np.argsort(ranges[:, 0], kind='stable')]
+    # a range starts a merged range if it starts after all former ranges end
+    ends = np.maximum.accumulate(ranges[:, 1])
+    is_first = np.empty(len(ranges), dtype=bool)
+    is_first[0] = True
+    np.greater(ranges[1:, 0], ends[:-1], out=is_first[1:])
+    first_indices = np.flatnonzero(is_first)
+    last_indices = np.append(first_indices[1:] - 1, len(ranges) - 1)
+    return np.stack([ranges[first_indices, 0], ends[last_indices]], axis=1)
+
+
+def merge_ranges_array(ranges1, ranges2, is_sorted=False):
+    """
+    Merge two lists of time ranges, which are merged by themselves if
+    is_sorted is True.
+    """
+    ranges1 = to_range_array(ranges1)
+    ranges2 = to_range_array(ranges2)
+    if is_sorted and len(ranges1) == 0:
+        return ranges2
+    if is_sorted and len(ranges2) == 0:
+        return ranges1
+    return merge_self_ranges_array(np.concatenate([ranges1, ranges2]))
+
+
+def intersection_ranges_array(ranges1, ranges2, is_sorted=False):
+    """
+    Intersect two lists of time ranges, which are merged by themselves if
+    is_sorted is True.
+    """
+    if not is_sorted:
+        ranges1 = merge_self_ranges_array(ranges1)
+        ranges2 = merge_self_ranges_array(ranges2)
+    ranges1 = to_range_array(ranges1)
+    ranges2 = to_range_array(ranges2)
+    if len(ranges1) == 0 or len(ranges2) == 0:
+        return np.empty([0, 2], dtype=np.int64)
+    # ranges2[lo:hi] overlap with each range of ranges1, as the starts and
+    # ends of merged ranges are both increasing
+    lo = np.searchsorted(ranges2[:, 1], ranges1[:, 0], side='right')
+    hi = np.searchsorted(ranges2[:, 0], ranges1[:, 1], side='left')
+    counts = np.maximum(hi - lo, 0)
+    indices1 = np.repeat(np.arange(len(ranges1)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(
+        np.cumsum(counts) - counts, counts
+    )
+    indices2 = np.repeat(lo, counts) + offsets
+    return np.stack(
+        [
+            np.maximum(ranges1[indices1, 0], ranges2[indices2, 0]),
+            np.minimum(ranges1[indices1, 1], ranges2[indices2, 1]),
+        ],
+        axis=1,
+    )
+
+
+def subtract_ranges_array(ranges1, ranges2, is_sorted=False):
+    """
+    Subtract time ranges2 from ranges1, which are merged by themselves if
+    is_sorted is True.
+    """
+    if not is_sorted:
+        ranges1 = merge_self_ranges_array(ranges1)
+        ranges2 = merge_self_ranges_array(ranges2)
+    ranges1 = to_range_array(ranges1)
+    ranges2 = to_range_array(ranges2)
+    if len(ranges1) == 0 or len(ranges2) == 0:
+        return ranges1
+    # intersect with the gaps between ranges2
+    int64 = np.iinfo(np.int64)
+    gaps = np.stack(
+        [
+            np.concatenate([[int64.min], ranges2[:, 1]]),
+            np.concatenate([ranges2[:, 0], [int64.max]]),
+        ],
+        axis=1,
+    )
+    gaps = gaps[gaps[:, 0] < gaps[:, 1]]
+    return intersection_ranges_array(ranges1, gaps, is_sorted=True)
+
 
 def sum_ranges(ranges):
     result = 0
@@ -21,208 +134,28 @@ def sum_ranges(ranges):
 
 
 def merge_self_ranges(src_ranges, is_sorted=False):
-    merged_ranges = []
-    if len(src_ranges) > 0:
-        if not is_sorted:
-            src_ranges.sort(key=lambda x: x[0])
-        cur_indx = 0
-        merged_ranges.append((src_ranges[cur_indx][0], src_ranges[cur_indx][1]))
-        for cur_indx in range(1, len(src_ranges)):
-            if src_ranges[cur_indx][1] > merged_ranges[-1][1]:
-                if src_ranges[cur_indx][0] <= merged_ranges[-1][1]:
-                    merged_ranges[-1] = (
-                        merged_ranges[-1][0],
-                        src_ranges[cur_indx][1],
-                    )
-                else:
-                    merged_ranges.append(
-                        (src_ranges[cur_indx][0], src_ranges[cur_indx][1])
-                    )
-    return merged_ranges
+    return to_range_list(merge_self_ranges_array(src_ranges, is_sorted))
 
 
 def merge_ranges(range_list1, range_list2, is_sorted=False):
-    merged_ranges = []
-    if not is_sorted:
-        range_list1 = merge_self_ranges(range_list1)
-        range_list2 = merge_self_ranges(range_list2)
-    len1 = len(range_list1)
-    len2 = len(range_list2)
-    if len1 == 0 and len2 == 0:
-        return merged_ranges
-    elif len1 == 0:
+    if is_sorted and len(range_list1) == 0:
         return range_list2
-    elif len2 == 0:
+    if is_sorted and len(range_list2) == 0:
         return range_list1
-    else:
-        indx1 = 0
-        indx2 = 0
-        range1 = range_list1[indx1]
-        range2 = range_list2[indx2]
-        if range1[0] < range2[0]:
-            merged_ranges.append(range1)
-            indx1 += 1
-        else:
-            merged_ranges.append(range2)
-            indx2 += 1
-        while indx1 < len1 and indx2 < len2:
-            range1 = range_list1[indx1]
-            range2 = range_list2[indx2]
-            if range1[0] < range2[0]:
-                if range1[1] > merged_ranges[-1][1]:
-                    if range1[0] <= merged_ranges[-1][1]:
-                        merged_ranges[-1] = (merged_ranges[-1][0], range1[1])
-                    else:
-                        merged_ranges.append((range1[0], range1[1]))
-                    indx1 += 1
-                else:
-                    indx1 += 1
-            else:
-                if range2[1] > merged_ranges[-1][1]:
-                    if range2[0] <= merged_ranges[-1][1]:
-                        merged_ranges[-1] = (merged_ranges[-1][0], range2[1])
-                    else:
-                        merged_ranges.append((range2[0], range2[1]))
-                    indx2 += 1
-                else:
-                    indx2 += 1
-
-        while indx1 < len1:
-            range1 = range_list1[indx1]
-            if range1[1] > merged_ranges[-1][1]:
-                if range1[0] <= merged_ranges[-1][1]:
-                    merged_ranges[-1] = (merged_ranges[-1][0], range1[1])
-                else:
-                    merged_ranges.append((range1[0], range1[1]))
-                indx1 += 1
-            else:
-                indx1 += 1
-        while indx2 < len2:
-            range2 = range_list2[indx2]
-            if range2[1] > merged_ranges[-1][1]:
-                if range2[0] <= merged_ranges[-1][1]:
-                    merged_ranges[-1] = (merged_ranges[-1][0], range2[1])
-                else:
-                    merged_ranges.append((range2[0], range2[1]))
-                indx2 += 1
-            else:
-                indx2 += 1
-    return merged_ranges
+    return to_range_list(
+        merge_ranges_array(range_list1, range_list2, is_sorted)
+    )
 
 
 def intersection_ranges(range_list1, range_list2, is_sorted=False):
-    result_range = []
-    if len(range_list1) == 0 or len(range_list2) == 0:
-        return result_range
-    if not is_sorted:
-        range_list1 = merge_self_ranges(range_list1)
-        range_list2 = merge_self_ranges(range_list2)
-
-    len1 = len(range_list1)
-    len2 = len(range_list2)
-    indx1 = 0
-    indx2 = 0
-    range1 = range_list1[indx1]
-    range2 = range_list2[indx2]
-    while indx1 < len1 and indx2 < len2:
-        if range2[1] <= range1[0]:
-            indx2 += 1
-            if indx2 == len2:
-                break
-            range2 = range_list2[indx2]
-
-        elif range2[0] <= range1[0] and range2[1] < range1[1]:
-            assert range2[1] > range1[0]
-            result_range.append((range1[0], range2[1]))
-            range1 = (range2[1], range1[1])
-            indx2 += 1
-            if indx2 == len2:
-                break
-            range2 = range_list2[indx2]
-
-        elif range2[0] <= range1[0]:
-            assert range2[1] >= range1[1]
-            result_range.append(range1)
-            range2 = (range1[1], range2[1])
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-
-        elif range2[1] < range1[1]:
-            assert range2[0] > range1[0]
-            result_range.append(range2)
-            range1 = (range2[1], range1[1])
-            indx2 += 1
-            if indx2 == len2:
-                break
-            range2 = range_list2[indx2]
-
-        elif range2[0] < range1[1]:
-            assert range2[1] >= range1[1]
-            result_range.append((range2[0], range1[1]))
-            range2 = (range1[1], range2[1])
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-
-        else:
-            assert range2[0] >= range1[1]
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-    return result_range
+    return to_range_list(
+        intersection_ranges_array(range_list1, range_list2, is_sorted)
+    )
 
 
 def subtract_ranges(range_list1, range_list2, is_sorted=False):
-    result_range = []
-    if not is_sorted:
-        range_list1 = merge_self_ranges(range_list1)
-        range_list2 = merge_self_ranges(range_list2)
-    if len(range_list1) == 0:
-        return result_range
     if len(range_list2) == 0:
-        return range_list1
-
-    len1 = len(range_list1)
-    len2 = len(range_list2)
-    indx1 = 0
-    indx2 = 0
-    range1 = range_list1[indx1]
-    range2 = range_list2[indx2]
-
-    while indx1 < len(range_list1):
-        if indx2 == len(range_list2):
-            result_range.append(range1)
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-        elif range2[1] <= range1[0]:
-            indx2 += 1
-            if indx2 != len2:
-                range2 = range_list2[indx2]
-        elif range2[0] <= range1[0] and range2[1] < range1[1]:
-            range1 = (range2[1], range1[1])
-            indx2 += 1
-            if indx2 != len2:
-                range2 = range_list2[indx2]
-        elif range2[0] <= range1[0]:
-            assert range2[1] >= range1[1]
-            range2 = (range1[1], range2[1])
-            indx1 += 1
-            if indx1 != len1:
-                range1 = range_list1[indx1]
-        elif range2[0] < range1[1]:
-            assert range2[0] > range1[0]
-            result_range.append((range1[0], range2[0]))
-            range1 = (range2[0], range1[1])
-        else:
-            assert range2[0] >= range1[1]
-            result_range.append(range1)
-            indx1 += 1
-            if indx1 != len1:
-                range1 = range_list1[indx1]
-    return result_range
+        return range_list1 if is_sorted else merge_self_ranges(range_list1)
+    return to_range_list(
+        subtract_ranges_array(range_list1, range_list2, is_sorted)
+    )
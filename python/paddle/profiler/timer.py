@@ -12,8 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import timeit
 from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+# phases of a step recorded by TelemetryHook, 'batch' is the whole step
+TELEMETRY_PHASES = (
+    'reader',
+    'forward',
+    'backward',
+    'optimizer',
+    'communication',
+    'batch',
+)
 
 
 class Stack:
@@ -172,6 +186,12 @@ class Hook:
     def after_step(self, benchmark):
         pass
 
+    def before_phase(self, benchmark, name):
+        pass
+
+    def after_phase(self, benchmark, name):
+        pass
+
 
 class TimerHook(Hook):
     """
@@ -299,6 +319,179 @@ class TimerHook(Hook):
         )
 
 
+class TelemetryHook(Hook):
+    """
+    A hook for always-on step telemetry. The cost of each phase in every
+    step is kept in a fixed-size ring buffer, so the latency percentiles
+    of recent steps can be queried or exported at any time with a fixed
+    memory cost.
+
+    The reader cost is recorded by the DataLoader, the backward, optimizer
+    and communication wait costs are recorded by `Tensor.backward`,
+    `Optimizer.step` and `paddle.distributed.wait/barrier`. Collectives
+    called with `sync_op=True` are not recorded, which can be recorded by
+    wrapping them with `benchmark().phase('communication')`. The forward
+    cost is recorded by `benchmark().phase('forward')` if it is used,
+    otherwise it is the time from the end of reading data to the first
+    backward or optimizer phase of the step.
+
+    Args:
+        capacity(int): The number of recent steps to keep.
+        export_path(str|None): The file to export the telemetry in Prometheus
+            text format, which is exported every `export_interval` steps.
+        export_interval(int): The interval steps to export.
+    """
+
+    def __init__(self, capacity=1000, export_path=None, export_interval=100):
+        self.capacity = capacity
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self.buffers = {name: RingBuffer(capacity) for name in TELEMETRY_PHASES}
+        self.total_steps = 0
+        self.total_time = dict.fromkeys(TELEMETRY_PHASES, 0.0)
+        self._reset_step(timeit.default_timer())
+
+    def _reset_step(self, now):
+        self._step_start = now
+        self._compute_start = now
+        self._compute_end = None
+        self._step_costs = dict.fromkeys(TELEMETRY_PHASES, 0.0)
+        self._phase_starts = {}
+
+    def begin(self, benchmark):
+        self._reset_step(timeit.default_timer())
+
+    def before_reader(self, benchmark):
+        self._phase_starts['reader'] = timeit.default_timer()
+
+    def after_reader(self, benchmark):
+        self.after_phase(benchmark, 'reader')
+        self._compute_start = timeit.default_timer()
+
+    def before_phase(self, benchmark, name):
+        now = timeit.default_timer()
+        if self._compute_end is None and name in ('backward', 'optimizer'):
+            self._compute_end = now
+        self._phase_starts[name] = now
+
+    def after_phase(self, benchmark, name):
+        start = self._phase_starts.pop(name, None)
+        if start is not None:
+            self._step_costs[name] += timeit.default_timer() - start
+
+    def after_step(self, benchmark):
+        now = timeit.default_timer()
+        if self.total_steps == 0:
+            # the hook may be enabled by flags before paddle is imported
+            from .utils import wrap_optimizers
+
+            wrap_optimizers()
+        costs = self._step_costs
+        costs['batch'] = now - self._step_start
+        if costs['forward'] == 0 and self._compute_end is not None:
+            costs['forward'] = max(self._compute_end - self._compute_start, 0)
+        for name, cost in costs.items():
+            self.buffers[name].append(cost)
+            self.total_time[name] += cost
+        self.total_steps += 1
+        self._reset_step(now)
+        if self.export_path and self.total_steps % self.export_interval == 0:
+            self.export(self.export_path)
+
+    def end(self, benchmark):
+        if self.export_path and self.total_steps > 0:
+            self.export(self.export_path)
+
+    def summary(self):
+        """
+        Get the statistics of the recent steps as a dict, which maps each
+        phase to its 'p50', 'p99', 'avg', 'max' and 'last' cost in seconds.
+        """
+        summary = {}
+        for name, buffer in self.buffers.items():
+            values = buffer.values()
+            if len(values) == 0:
+                continue
+            p50, p99 = np.percentile(values, [50, 99])
+            summary[name] = {
+                'p50': float(p50),
+                'p99': float(p99),
+                'avg': float(values.mean()),
+                'max': float(values.max()),
+                'last': buffer.last(),
+            }
+        return summary
+
+    def to_prometheus(self):
+        """
+        Get the telemetry in Prometheus text exposition format.
+        """
+        labels = 'rank="{}"'.format(os.getenv('PADDLE_TRAINER_ID', '0'))
+        name = 'paddle_step_phase_seconds'
+        lines = [
+            f'# HELP {name} Cost of training step phases in recent steps.',
+            f'# TYPE {name} summary',
+        ]
+        summary = self.summary()
+        for phase in TELEMETRY_PHASES:
+            phase_labels = f'{labels},phase="{phase}"'
+            if phase in summary:
+                for quantile, key in (('0.5', 'p50'), ('0.99', 'p99')):
+                    lines.append(
+                        f'{name}{{{phase_labels},quantile="{quantile}"}} '
+                        f'{summary[phase][key]:.9f}'
+                    )
+            lines.append(
+                f'{name}_sum{{{phase_labels}}} {self.total_time[phase]:.9f}'
+            )
+            lines.append(f'{name}_count{{{phase_labels}}} {self.total_steps}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path):
+        """
+        Export the telemetry to file in Prometheus text format, which can be
+        collected by the textfile collector of node exporter.
+        """
+        tmp_path = f'{path}.tmp.{os.getpid()}'
+        with open(tmp_path, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+class RingBuffer:
+    """
+    A fixed-size buffer keeps the recent values, and the oldest value is
+    overwritten when it is full.
+    """
+
+    def __init__(self, capacity):
+        assert capacity > 0, "The capacity of RingBuffer should be positive."
+        self._data = np.zeros(capacity, dtype=np.float64)
+        self._index = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, value):
+        self._data[self._index] = value
+        self._index = (self._index + 1) % len(self._data)
+        self._size = min(self._size + 1, len(self._data))
+
+    def last(self):
+        if self._size == 0:
+            return None
+        return float(self._data[self._index - 1])
+
+    def values(self):
+        """
+        Get the values from the oldest to the latest.
+        """
+        if self._size < len(self._data):
+            return self._data[: self._size].copy()
+        return np.roll(self._data, -self._index)
+
+
 class TimeAverager:
     """
     Record the cost of every step and count the average.
@@ -414,6 +607,58 @@ class Benchmark:
         for hook in self.hooks.values():
             hook.end(self)
 
+    def before_phase(self, name):
+        for hook in self.hooks.values():
+            hook.before_phase(self, name)
+
+    def after_phase(self, name):
+        for hook in self.hooks.values():
+            hook.after_phase(self, name)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Record the cost of a phase in the current step, such as 'forward'.
+        """
+        self.before_phase(name)
+        try:
+            yield
+        finally:
+            self.after_phase(name)
+
+    def enable_telemetry(
+        self, capacity=1000, export_path=None, export_interval=100
+    ):
+        """
+        Enable the always-on step telemetry by adding a TelemetryHook, see
+        `TelemetryHook` for the arguments. The steps are counted by
+        `Profiler.step()` or `benchmark().step()`.
+        """
+        from .utils import wrap_optimizers
+
+        wrap_optimizers()
+        self.hooks['telemetry_hook'] = TelemetryHook(
+            capacity, export_path, export_interval
+        )
+        return self.hooks['telemetry_hook']
+
+    def disable_telemetry(self):
+        self.hooks.pop('telemetry_hook', None)
+
+    @property
+    def telemetry_enabled(self):
+        return 'telemetry_hook' in self.hooks
+
+    def telemetry_summary(self):
+        """
+        Get the p50/p99 cost of the phases in recent steps, see
+        `TelemetryHook.summary`. It returns an empty dict if the telemetry
+        is not enabled.
+        """
+        if not self.telemetry_enabled:
+            return {}
+        return self.hooks['telemetry_hook'].summary()
+
     def check_if_need_record(self, reader):
         if self.current_event is None:
             return
@@ -441,7 +686,17 @@ class Benchmark:
 
 
 _benchmark_ = Benchmark()
+if os.getenv('FLAGS_step_telemetry_file'):
+    _benchmark_.hooks['telemetry_hook'] = TelemetryHook(
+        capacity=int(os.getenv('FLAGS_step_telemetry_capacity', '1000')),
+        export_path=os.getenv('FLAGS_step_telemetry_file'),
+        export_interval=int(os.getenv('FLAGS_step_telemetry_interval', '100')),
+    )
 
 
 def benchmark():
     return _benchmark_
+
+
+def in_telemetry_mode():
+    return 'telemetry_hook' in _benchmark_.hooks
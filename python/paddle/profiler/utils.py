@@ -21,6 +21,8 @@ from warnings import warn
 from paddle.base import core
 from paddle.base.core import TracerEventType, _RecordEvent
 
+from .timer import benchmark, in_telemetry_mode
+
 _is_profiler_used = False
 _has_optimizer_wrapped = False
 
@@ -177,13 +179,20 @@ def wrap_optimizers():
     def optimizer_wrapper(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            if in_profiler_mode():
-                with RecordEvent(
-                    'Optimization Step', event_type=TracerEventType.Optimization
-                ):
+            if in_telemetry_mode():
+                benchmark().before_phase('optimizer')
+            try:
+                if in_profiler_mode():
+                    with RecordEvent(
+                        'Optimization Step',
+                        event_type=TracerEventType.Optimization,
+                    ):
+                        return func(*args, **kwargs)
+                else:
                     return func(*args, **kwargs)
-            else:
-                return func(*args, **kwargs)
+            finally:
+                if in_telemetry_mode():
+                    benchmark().after_phase('optimizer')
 
         return wrapper
 
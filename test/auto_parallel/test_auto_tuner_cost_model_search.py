@@ -0,0 +1,124 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import math
+import unittest
+
+from paddle.distributed.auto_tuner.tuner import AutoTuner
+
+
+def get_tuner_cfg():
+    return {
+        "num_gpus": 16,
+        "nodes": 2,
+        "dp_degree": "auto",
+        "mp_degree": "auto",
+        "pp_degree": "auto",
+        "micro_batch_size": "auto",
+        "sharding_degree": "auto",
+        "sharding_stage": "auto",
+        "use_recompute": "auto",
+        "recompute_granularity": "auto",
+        "task_limit": 1000,
+        "search_algo": {"name": "cost_model"},
+        "metric_cfg": {
+            "name": "step_time",
+            "OptimizationDirection": "Minimize",
+        },
+        "model_cfg": {
+            "hidden_size": 4096,
+            "global_batch_size": 32,
+            "num_layers": 32,
+            "num_attention_heads": 32,
+            "vocab_size": 32000,
+            "seq_length": 2048,
+        },
+    }
+
+
+def simulate(cfg):
+    """Return the step time of cfg, None for OOM."""
+    mp = cfg["mp_degree"]
+    step_time = 1 + 0.3 * (mp - 1) / mp * math.log2(mp + 1)
+    acc_steps = (
+        32
+        // (cfg["dp_degree"] * cfg["sharding_degree"])
+        // cfg["micro_batch_size"]
+    )
+    step_time *= 1 + (cfg["pp_degree"] - 1) / (cfg["vpp_degree"] * acc_steps)
+    step_time *= 1.33 if cfg["use_recompute"] else 1
+    step_time *= 1 + 0.1 / cfg["micro_batch_size"]
+    memory = (
+        cfg["micro_batch_size"]
+        * 32
+        / (mp * cfg["pp_degree"] * cfg["sharding_degree"])
+    )
+    if not cfg["use_recompute"] and memory > 8:
+        return None
+    return step_time
+
+
+class TestCostModelSearch(unittest.TestCase):
+    def test_search(self):
+        tuner = AutoTuner(get_tuner_cfg())
+        all_tasks = copy.deepcopy(tuner.algo.all_tasks)
+        best_time = min(
+            simulate(cfg) for cfg in all_tasks if simulate(cfg) is not None
+        )
+
+        num_trials = 0
+        found_time = float("inf")
+        cur_cfg = tuner.search_once()
+        while cur_cfg:
+            cur_cfg = copy.deepcopy(cur_cfg)
+            num_trials += 1
+            step_time = simulate(cur_cfg)
+            if step_time is None:
+                cur_cfg["time"] = -1
+                cur_cfg["max_mem_usage"] = "OOM"
+            else:
+                cur_cfg["time"] = step_time
+                cur_cfg["max_mem_usage"] = 1
+                found_time = min(found_time, step_time)
+            cur_cfg["step_time"] = step_time
+            tuner.add_cfg(cur_cfg)
+            cur_cfg = tuner.search_once()
+
+        self.assertAlmostEqual(found_time, best_time)
+        # stopped early instead of trying all tasks
+        self.assertLess(num_trials, len(all_tasks) // 4)
+        self.assertEqual(tuner.algo.idx, len(tuner.algo.all_tasks))
+
+    def test_oom_dominated(self):
+        tuner = AutoTuner(get_tuner_cfg())
+        oom_cfg = {
+            "mp_degree": 2,
+            "pp_degree": 2,
+            "sharding_degree": 2,
+            "sharding_stage": 1,
+            "micro_batch_size": 2,
+            "use_recompute": False,
+            "recompute_granularity": "full",
+            "max_mem_usage": "OOM",
+        }
+        cfg = dict(oom_cfg, mp_degree=1, micro_batch_size=4)
+        del cfg["max_mem_usage"]
+        self.assertTrue(tuner.algo._oom_dominated(cfg, [oom_cfg]))
+        cfg["use_recompute"] = True
+        self.assertFalse(tuner.algo._oom_dominated(cfg, [oom_cfg]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from paddle.distributed.auto_tuner.monitor import (
+    METRIC_DIR_ENV_NAME,
+    TrialMonitor,
+    report_metrics,
+)
+
+
+def get_tuner_cfg(direction="Minimize", **early_stop):
+    return {
+        "metric_cfg": {
+            "name": "interval_runtime",
+            "OptimizationDirection": direction,
+        },
+        "early_stop": dict({"warmup_steps": 2, "min_samples": 5}, **early_stop),
+    }
+
+
+class FakeKVClient:
+    def __init__(self):
+        self.store = {}
+
+    def put(self, key, value):
+        self.store[key] = value
+        return True
+
+    def get(self, key):
+        return self.store.get(key), None
+
+
+class TestTrialMonitor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_dir = self.temp_dir.name
+        self.history = [
+            {"time": 1.0, "interval_runtime": 1.0, "max_mem_usage": 100},
+            {"time": -1, "interval_runtime": None, "max_mem_usage": "OOM"},
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_log(self, lines):
+        with open(os.path.join(self.log_dir, "workerlog.0"), "a") as f:
+            f.write(lines)
+
+    def test_stop_by_log(self):
+        monitor = TrialMonitor(get_tuner_cfg(), self.log_dir, self.history)
+        self.assertEqual(monitor.incumbent, 1.0)
+        self.assertFalse(monitor.should_stop())
+        self.write_log("".join(f"interval_runtime: {t}\n" for t in [5, 5]))
+        # a partial line is not read until it is completed
+        self.write_log("interval_runtime: 1.5")
+        self.assertFalse(monitor.should_stop())
+        self.assertEqual(len(monitor.log_samples), 2)
+        self.write_log("1\n")
+        for t in [1.49, 1.52, 1.5, 1.48]:
+            self.assertFalse(monitor.should_stop())
+            self.write_log(f"interval_runtime: {t}\n")
+        self.assertTrue(monitor.should_stop())
+        self.assertEqual(monitor.stop_reason, "metric")
+        self.assertAlmostEqual(monitor.mean, 1.5, places=2)
+
+    def test_not_stop_if_comparable(self):
+        monitor = TrialMonitor(
+            get_tuner_cfg(direction="Maximize"), self.log_dir, self.history
+        )
+        self.write_log(
+            "".join(
+                f"interval_runtime: {t}\n"
+                for t in [0, 0, 0.5, 1.5, 0.6, 1.4, 0.9, 1.1]
+            )
+        )
+        self.assertFalse(monitor.should_stop())
+        self.assertIsNotNone(monitor.confidence_interval())
+
+    def test_stop_by_reported_memory(self):
+        monitor = TrialMonitor(
+            get_tuner_cfg(max_memory=1000), self.log_dir, self.history
+        )
+        envs = monitor.envs()
+        with mock.patch.dict(os.environ, envs):
+            report_metrics(interval_runtime=1.0, max_memory_allocated=800)
+            with mock.patch.dict(os.environ, {"PADDLE_TRAINER_ID": "1"}):
+                report_metrics(max_memory_allocated=900)
+            self.assertFalse(monitor.should_stop())
+            self.assertEqual(monitor.reported_samples, [1.0])
+            with mock.patch.dict(os.environ, {"PADDLE_TRAINER_ID": "1"}):
+                report_metrics(max_memory_allocated=1200)
+        self.assertTrue(monitor.should_stop())
+        self.assertEqual(monitor.stop_reason, "memory")
+        self.assertEqual(monitor.peak_memory, 1200)
+
+    def test_stop_published_to_all_nodes(self):
+        client = FakeKVClient()
+        monitors = [
+            TrialMonitor(
+                get_tuner_cfg(max_memory=1000),
+                os.path.join(self.log_dir, str(node)),
+                self.history,
+                client=client,
+                stop_key="auto_tuner/stop/0",
+            )
+            for node in range(2)
+        ]
+        self.assertFalse(any(monitor.should_stop() for monitor in monitors))
+        with mock.patch.dict(os.environ, monitors[0].envs()):
+            report_metrics(max_memory_allocated=1200)
+        # the node without the samples stops by the published decision
+        self.assertTrue(monitors[0].should_stop())
+        self.assertEqual(client.store["auto_tuner/stop/0"], b"memory")
+        self.assertTrue(monitors[1].should_stop())
+        self.assertEqual(monitors[1].stop_reason, "memory")
+        self.assertIsNone(monitors[1].peak_memory)
+
+    def test_report_without_tuner(self):
+        with mock.patch.dict(os.environ, {METRIC_DIR_ENV_NAME: ""}):
+            report_metrics(interval_runtime=1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import shutil
 import tempfile
 import unittest
 
@@ -20,6 +22,11 @@ import numpy as np
 
 import paddle
 import paddle.distributed as dist
+from paddle.distributed.checkpoint import storage_reader, utils
+from paddle.distributed.checkpoint.compact_checkpoint import (
+    compact_checkpoint,
+)
+from paddle.distributed.checkpoint.storage_reader import CheckpointFileReader
 from paddle.distributed.checkpoint.utils import (
     flatten_state_dict,
     unflatten_state_dict,
@@ -157,6 +164,197 @@ class TestDistCheckpointUtils(test_base.CommunicationTestDistBase):
 
         ckpt_dir_tmp.cleanup()
 
+    def test_checkpoint_file_reader(self):
+        ckpt_dir_tmp = tempfile.TemporaryDirectory()
+        ckpt_dir = ckpt_dir_tmp.name
+        w1 = np.random.random([256, 128]).astype('float32')
+        w2 = np.arange(10).astype('int64')
+        state_dict = {"w1": paddle.to_tensor(w1), "w2": paddle.to_tensor(w2)}
+        dist.save_state_dict(state_dict, ckpt_dir)
+
+        reader = CheckpointFileReader(ckpt_dir, num_threads=2)
+        items = [
+            ("0_0.distcp", "w1", (16, 32), (64, 48)),
+            ("0_0.distcp", "w2", (2,), (5,)),
+            ("0_0.distcp", "w1", (0, 0), (256, 128)),
+        ] * 4
+        for (_, key, offsets, lengths), chunk in zip(
+            items, reader.read_items(items)
+        ):
+            expected = {"w1": w1, "w2": w2}[key][
+                tuple(slice(o, o + l) for o, l in zip(offsets, lengths))
+            ]
+            np.testing.assert_equal(chunk, expected)
+        # large tensors are read from the memory mapped file
+        self.assertIsNotNone(reader.get_file("0_0.distcp")["w1"].base)
+        reader.close()
+
+        # files are loaded by paddle.load on unverified python versions
+        versions = storage_reader._INDEX_PYTHON_VERSIONS
+        storage_reader._INDEX_PYTHON_VERSIONS = ((3, 0), (3, 0))
+        try:
+            reader = CheckpointFileReader(ckpt_dir)
+            chunk = next(reader.read_items([items[0]]))
+            np.testing.assert_equal(chunk, w1[16:80, 32:80])
+            self.assertEqual(reader._mmaps, [])
+            reader.close()
+        finally:
+            storage_reader._INDEX_PYTHON_VERSIONS = versions
+
+        new_state_dict = {
+            "w1": paddle.zeros([256, 128], dtype='float32'),
+            "w2": paddle.zeros([10], dtype='int64'),
+        }
+        dist.load_state_dict(new_state_dict, ckpt_dir)
+        np.testing.assert_equal(new_state_dict["w1"].numpy(), w1)
+        np.testing.assert_equal(new_state_dict["w2"].numpy(), w2)
+        ckpt_dir_tmp.cleanup()
+
+    def test_save_state_dict_multi_files(self):
+        from paddle.distributed.checkpoint import save_state_dict as saver
+
+        ckpt_dir_tmp = tempfile.TemporaryDirectory()
+        data = {f"w{i}": np.random.random([64, 32]) for i in range(5)}
+        state_dict = {k: paddle.to_tensor(v) for k, v in data.items()}
+        sync_dir = os.path.join(ckpt_dir_tmp.name, "sync")
+        async_dir = os.path.join(ckpt_dir_tmp.name, "async")
+        max_file_bytes = saver.MAX_FILE_BYTES
+        # 5 tensors are split into 2 files
+        saver.MAX_FILE_BYTES = 3 * 64 * 32 * 8
+        try:
+            dist.save_state_dict(state_dict, sync_dir)
+            task = dist.save_state_dict(state_dict, async_dir, async_save=True)
+            # the snapshot when calling save_state_dict is saved
+            state_dict["w0"].set_value(paddle.zeros([64, 32], 'float64'))
+            task.result()
+        finally:
+            saver.MAX_FILE_BYTES = max_file_bytes
+
+        for ckpt_dir in [sync_dir, async_dir]:
+            self.assertEqual(
+                sorted(os.listdir(ckpt_dir)),
+                ["0.metadata", "0_0.distcp", "0_0_1.distcp"],
+            )
+            new_state_dict = {
+                k: paddle.zeros([64, 32], 'float64') for k in data.keys()
+            }
+            dist.load_state_dict(new_state_dict, ckpt_dir)
+            for k, v in data.items():
+                np.testing.assert_equal(new_state_dict[k].numpy(), v)
+        ckpt_dir_tmp.cleanup()
+
+    def test_async_save_twice(self):
+        ckpt_dir_tmp = tempfile.TemporaryDirectory()
+        ckpt_dir = ckpt_dir_tmp.name
+        w1 = np.random.random([64, 32])
+        state_dict = {"w1": paddle.to_tensor(w1)}
+        task1 = dist.save_state_dict(state_dict, ckpt_dir, async_save=True)
+        state_dict["w1"].set_value(paddle.to_tensor(w1 + 1))
+        # the unique_id of the unfinished save is not reused
+        task2 = dist.save_state_dict(state_dict, ckpt_dir, async_save=True)
+        task1.result()
+        task2.result()
+        self.assertEqual(
+            sorted(os.listdir(ckpt_dir)),
+            ["0.metadata", "0_0.distcp", "0_1.distcp", "1.metadata"],
+        )
+        for unique_id, expected in enumerate([w1, w1 + 1]):
+            storage = paddle.load(
+                os.path.join(ckpt_dir, f"0_{unique_id}.distcp")
+            )
+            np.testing.assert_equal(storage["w1"].numpy(), expected)
+        ckpt_dir_tmp.cleanup()
+
+    def test_incremental_checkpoint(self):
+        ckpt_dir_tmp = tempfile.TemporaryDirectory()
+        base_dir, delta_dir, full_dir = (
+            os.path.join(ckpt_dir_tmp.name, name)
+            for name in ["base", "delta", "full"]
+        )
+        data = {f"w{i}": np.random.random([8, 8]) for i in range(3)}
+        state_dict = {k: paddle.to_tensor(v) for k, v in data.items()}
+        dist.save_state_dict(state_dict, base_dir, incremental=True)
+        data["w1"] = data["w1"] + 1
+        state_dict["w1"].set_value(paddle.to_tensor(data["w1"]))
+        dist.save_state_dict(state_dict, delta_dir, base_path=base_dir)
+
+        # only changed tensor is written
+        delta = paddle.load(os.path.join(delta_dir, "0_0.distcp"))
+        self.assertEqual(
+            [k for k in delta.keys() if k != "StructuredToParameterName@@"],
+            ["w1"],
+        )
+        metadata = paddle.load(os.path.join(delta_dir, "0.metadata"))
+        self.assertEqual(
+            sorted(metadata.storage_metadata.values()),
+            ["../base/0_0.distcp", "../base/0_0.distcp", "0_0.distcp"],
+        )
+
+        def check_load(ckpt_dir):
+            new_state_dict = {
+                k: paddle.zeros([8, 8], 'float64') for k in data.keys()
+            }
+            dist.load_state_dict(new_state_dict, ckpt_dir)
+            for k, v in data.items():
+                np.testing.assert_equal(new_state_dict[k].numpy(), v)
+
+        check_load(delta_dir)
+        compact_checkpoint(delta_dir, full_dir)
+        shutil.rmtree(base_dir)
+
+        # tensors in removed files of the base are written again
+        redo_dir = os.path.join(ckpt_dir_tmp.name, "redo")
+        dist.save_state_dict(state_dict, redo_dir, base_path=delta_dir)
+        metadata = paddle.load(os.path.join(redo_dir, "0.metadata"))
+        self.assertEqual(
+            sorted(metadata.storage_metadata.values()),
+            ["../delta/0_0.distcp", "0_0.distcp", "0_0.distcp"],
+        )
+        check_load(redo_dir)
+
+        shutil.rmtree(delta_dir)
+        check_load(full_dir)
+        # the names of tensors are kept in compacting
+        names = {}
+        for file_name in os.listdir(full_dir):
+            if file_name.endswith(".distcp"):
+                storage = paddle.load(
+                    os.path.join(full_dir, file_name), keep_name_table=True
+                )
+                names.update(storage["StructuredToParameterName@@"])
+        self.assertEqual(names, {k: v.name for k, v in state_dict.items()})
+        ckpt_dir_tmp.cleanup()
+
+    def test_device_fingerprint(self):
+        data = np.full([10000], 100, dtype='uint8')
+        # a third difference of bytes keeps their low order moments
+        perturbed = data.astype('int64')
+        perturbed[4094:4098] += [10, -30, 30, -10]
+        perturbed = perturbed.astype('uint8')
+
+        def checksum(array, seed=1):
+            # computed on CPU by the same ops as on device
+            return utils._device_checksum(paddle.to_tensor(array), seed)
+
+        np.testing.assert_equal(checksum(data), checksum(data.copy()))
+        self.assertFalse(np.array_equal(checksum(data), checksum(perturbed)))
+        self.assertFalse(np.array_equal(checksum(data), checksum(data, 2)))
+
+        if paddle.is_compiled_with_cuda():
+            tensor = paddle.to_tensor(data, place=paddle.CUDAPlace(0))
+            fingerprint = utils.compute_fingerprint(tensor)
+            seed = utils.fingerprint_seed(fingerprint)
+            self.assertEqual(
+                utils.compute_fingerprint(tensor.clone(), seed), fingerprint
+            )
+            self.assertNotEqual(
+                utils.compute_fingerprint(
+                    paddle.to_tensor(perturbed, place=paddle.CUDAPlace(0)),
+                    seed,
+                ),
+                fingerprint,
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
 import unittest
 from collections import Counter
 
@@ -26,6 +27,7 @@ from test_fetch_feed import Linear, Pool2D
 
 import paddle
 from paddle.jit.dy2static import convert_to_static
+from paddle.jit.dy2static.program_translator import ProgramCache
 
 
 class TestCacheProgram(Dy2StTestBase):
@@ -179,5 +181,189 @@ class TestToOutputWithCache(Dy2StTestBase):
         self.assertEqual(ret.numpy(), 5050)
 
 
+class TestProgramCacheEviction(Dy2StTestBase):
+    def run_with_cache(self, program_cache, shapes):
+        static_func = paddle.jit.to_static(simple_func, full_graph=True)
+        static_func._program_cache = program_cache
+        for shape in shapes:
+            x = paddle.ones(shape)
+            np.testing.assert_allclose(static_func(x).numpy(), 1.0)
+        return program_cache
+
+    @test_legacy_and_pt_and_pir
+    @test_ast_only
+    def test_lru(self):
+        program_cache = self.run_with_cache(
+            ProgramCache(max_size=2), [[2, 3], [4, 3], [2, 3], [5, 3]]
+        )
+        stats = program_cache.stats()
+        self.assertEqual(len(program_cache), 2)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(len(stats['sizes']), 2)
+        # [4, 3] is least recently used
+        input_shapes = [
+            cache_key.input_args_with_spec[0].shape
+            for cache_key in program_cache._cache_keys.values()
+        ]
+        self.assertEqual(input_shapes, [(2, 3), (5, 3)])
+
+    @test_legacy_and_pt_and_pir
+    @test_ast_only
+    def test_shape_bucketing(self):
+        program_cache = self.run_with_cache(
+            ProgramCache(shape_bucketing=True),
+            [[2, 3], [4, 3], [5, 3], [2, 3], [2, 3, 1]],
+        )
+        stats = program_cache.stats()
+        self.assertEqual(len(program_cache), 2)
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 3)
+        input_shapes = [
+            cache_key.input_args_with_spec[0].shape
+            for cache_key in program_cache._cache_keys.values()
+        ]
+        self.assertEqual(input_shapes, [(-1, 3), (2, 3, 1)])
+
+
+# whether in dynamic mode in each run of record_mode
+_call_modes = []
+
+
+def record_mode(x):
+    _call_modes.append(paddle.in_dynamic_mode())
+    return x + 1
+
+
+_building, _release = threading.Event(), threading.Event()
+
+
+@paddle.jit.not_to_static
+def block_while_building():
+    if not paddle.in_dynamic_mode():
+        _building.set()
+        _release.wait()
+
+
+class BlockedBuildLayer(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.linear = paddle.nn.Linear(3, 3)
+
+    def forward(self, x):
+        block_while_building()
+        return self.linear(x)
+
+
+class TestPrecompile(Dy2StTestBase):
+    @test_legacy_and_pt_and_pir
+    @test_ast_only
+    def test_precompile(self):
+        static_func = paddle.jit.to_static(simple_func, full_graph=True)
+        futures = static_func.precompile(
+            [
+                [paddle.static.InputSpec([4, 3], stop_gradient=True)],
+                [paddle.static.InputSpec([5, 3], stop_gradient=True)],
+            ]
+        )
+        for future in futures:
+            future.result()
+        self.assertEqual(static_func.program_cache.stats()['misses'], 2)
+
+        out = static_func(paddle.ones([4, 3]))
+        np.testing.assert_allclose(out.numpy(), 1.0)
+        stats = static_func.program_cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+
+    @test_legacy_and_pt_and_pir
+    @test_ast_only
+    def test_dygraph_while_building(self):
+        static_func = paddle.jit.to_static(record_mode, full_graph=True)
+        program_cache = static_func.program_cache
+        building, release = threading.Event(), threading.Event()
+        build_once = program_cache._build_once
+
+        def blocked_build_once(cache_key):
+            building.set()
+            release.wait()
+            return build_once(cache_key)
+
+        program_cache._build_once = blocked_build_once
+        (future,) = static_func.precompile(
+            [[paddle.static.InputSpec([4, 3], stop_gradient=True)]]
+        )
+        try:
+            self.assertTrue(building.wait(timeout=60))
+            _call_modes.clear()
+            out = static_func(paddle.ones([4, 3]))
+            # the call runs in dygraph without waiting for the building
+            self.assertFalse(future.done())
+            self.assertEqual(_call_modes, [True])
+            np.testing.assert_allclose(out.numpy(), 2.0)
+        finally:
+            release.set()
+        future.result()
+
+        _call_modes.clear()
+        out = static_func(paddle.ones([4, 3]))
+        np.testing.assert_allclose(out.numpy(), 2.0)
+        # the built program runs instead of the function
+        self.assertEqual(_call_modes, [])
+        self.assertEqual(static_func.program_cache.stats()['misses'], 1)
+
+    @test_legacy_and_pt_and_pir
+    @test_ast_only
+    def test_layer_while_building(self):
+        layer = BlockedBuildLayer()
+        x = paddle.ones([4, 3])
+        expected = (
+            x.numpy() @ layer.linear.weight.numpy() + layer.linear.bias.numpy()
+        )
+        static_layer = paddle.jit.to_static(layer, full_graph=True)
+        _building.clear()
+        _release.clear()
+        (future,) = static_layer.forward.precompile(
+            [[paddle.static.InputSpec([4, 3], stop_gradient=True)]]
+        )
+        outputs = []
+        try:
+            # the parameters of the layer are static while building
+            self.assertTrue(_building.wait(timeout=60))
+            call = threading.Thread(
+                target=lambda: outputs.append(static_layer(x))
+            )
+            call.start()
+            # the call of the layer waits for the building
+            call.join(timeout=1)
+            self.assertTrue(call.is_alive())
+            self.assertEqual(outputs, [])
+        finally:
+            _release.set()
+        future.result()
+        call.join(timeout=60)
+        self.assertEqual(len(outputs), 1)
+        np.testing.assert_allclose(outputs[0].numpy(), expected, rtol=1e-5)
+        self.assertEqual(
+            static_layer.forward.program_cache.stats()['misses'], 1
+        )
+
+    @test_legacy_and_pt_and_pir
+    @test_ast_only
+    def test_traced_input_specs(self):
+        static_func = paddle.jit.to_static(simple_func, full_graph=True)
+        static_func(paddle.ones([2, 3]))
+        input_specs = static_func.traced_input_specs()
+        self.assertEqual(len(input_specs), 1)
+
+        new_static_func = paddle.jit.to_static(simple_func, full_graph=True)
+        new_static_func.precompile(input_specs, background=False)
+        new_static_func(paddle.ones([2, 3]))
+        stats = new_static_func.program_cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -20,6 +20,7 @@ import numpy as np
 from paddle.io import (
     BatchSampler,
     Dataset,
+    DistributedBatchSampler,
     RandomSampler,
     Sampler,
     SequenceSampler,
@@ -327,5 +328,64 @@ class TestWeightedRandomSampler(unittest.TestCase):
             self.assertTrue(True)
 
 
+class TestSamplerStateDict(unittest.TestCase):
+    def check_resume(self, build_sampler, consumed=3):
+        sampler = build_sampler()
+        sampler_iter = iter(sampler)
+        batches = [next(sampler_iter) for _ in range(consumed + 2)]
+        state = sampler.state_dict()
+        # prefetched batches are not consumed
+        state['num_yielded'] = consumed
+        expected = batches[consumed:] + list(sampler_iter)
+
+        resumed = build_sampler()
+        resumed.load_state_dict(state)
+        self.assertEqual(list(resumed), expected)
+        self.assertEqual(resumed.state_dict()['num_yielded'], len(resumed))
+
+    def test_batch_sampler(self):
+        dataset = RandomDataset(50, 10)
+        self.check_resume(lambda: BatchSampler(dataset, batch_size=4))
+        self.check_resume(
+            lambda: BatchSampler(dataset, batch_size=4, shuffle=True)
+        )
+
+    def test_batch_sampler_with_sampler(self):
+        self.check_resume(
+            lambda: BatchSampler(
+                sampler=RandomSampler(list(range(50)), replacement=True),
+                batch_size=4,
+            )
+        )
+        self.check_resume(
+            lambda: BatchSampler(
+                sampler=WeightedRandomSampler(np.ones(50), 50),
+                batch_size=4,
+            )
+        )
+        self.check_resume(
+            lambda: BatchSampler(
+                sampler=SubsetRandomSampler(list(range(50))), batch_size=4
+            )
+        )
+
+    def test_distributed_batch_sampler(self):
+        dataset = RandomDataset(50, 10)
+        self.check_resume(
+            lambda: DistributedBatchSampler(
+                dataset, 4, num_replicas=2, rank=1, shuffle=True
+            )
+        )
+
+    def test_random_sampler(self):
+        sampler = RandomSampler(list(range(20)))
+        indices = list(sampler)
+        state = sampler.state_dict()
+        state['num_yielded'] = 5
+        resumed = RandomSampler(list(range(20)))
+        resumed.load_state_dict(state)
+        self.assertEqual(list(resumed), indices[5:])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -16,6 +16,7 @@ import json
 import os
 import sys
 import tempfile
+import time
 import unittest
 import warnings
 
@@ -23,7 +24,8 @@ import numpy as np
 
 import paddle
 from paddle import nn
-from paddle.io import DataLoader, Dataset
+from paddle.io import DataLoader, Dataset, get_worker_info
+from paddle.io.dataloader.online_tuner import _OnlineAutoTuner
 
 
 class RandomDataset(Dataset):
@@ -98,6 +100,107 @@ class TestAutoTune(unittest.TestCase):
         )
 
 
+class TestOnlineAutoTuner(unittest.TestCase):
+    def run_window(self, tuner, wait_cost, step_cost, producer_cost):
+        for _ in range(tuner.window):
+            tuner.record(wait_cost, step_cost)
+        self.assertTrue(tuner.ready())
+        return tuner.tune(producer_cost)
+
+    def test_add_workers(self):
+        tuner = _OnlineAutoTuner(2, 2, max_num_workers=8, window=4)
+        # first window is skipped for workers starting
+        self.assertIsNone(self.run_window(tuner, 0.5, 0.6, 0.4))
+        # consume 0.1s, produce 0.4s, need ceil(0.4 / 0.1 * 1.2) workers
+        self.assertEqual(self.run_window(tuner, 0.5, 0.6, 0.4), (5, 2))
+        # window after changing is skipped
+        self.assertIsNone(self.run_window(tuner, 0.5, 0.6, 0.4))
+
+    def test_increase_prefetch_factor(self):
+        tuner = _OnlineAutoTuner(2, 2, max_num_workers=2, window=4)
+        self.run_window(tuner, 0.5, 0.6, 0.4)
+        self.assertEqual(self.run_window(tuner, 0.5, 0.6, 0.4), (2, 3))
+
+    def test_max_prefetch_factor(self):
+        tuner = _OnlineAutoTuner(
+            2, 2, max_num_workers=2, window=4, max_prefetch_factor=2
+        )
+        self.run_window(tuner, 0.5, 0.6, 0.4)
+        self.assertIsNone(self.run_window(tuner, 0.5, 0.6, 0.4))
+
+    def test_retire_workers(self):
+        tuner = _OnlineAutoTuner(8, 3, max_num_workers=8, window=4)
+        tuner.init_prefetch_factor = 2
+        self.run_window(tuner, 0.0, 1.0, 0.1)
+        # decrease prefetch_factor first, then retire one worker
+        self.assertEqual(self.run_window(tuner, 0.0, 1.0, 0.1), (8, 2))
+        self.run_window(tuner, 0.0, 1.0, 0.1)
+        self.assertEqual(self.run_window(tuner, 0.0, 1.0, 0.1), (7, 2))
+
+    def test_keep_balanced(self):
+        tuner = _OnlineAutoTuner(4, 2, max_num_workers=8, window=4)
+        self.run_window(tuner, 0.05, 1.0, 3.0)
+        self.assertIsNone(self.run_window(tuner, 0.05, 1.0, 3.0))
+        self.assertIsNone(self.run_window(tuner, 0.5, 1.0, None))
+
+
+class SlowDataset(Dataset):
+    def __init__(self, num_samples):
+        self.num_samples = num_samples
+
+    def __getitem__(self, idx):
+        time.sleep(0.01)
+        return np.array([idx]).astype('int64')
+
+    def __len__(self):
+        return self.num_samples
+
+
+class WorkerInfoDataset(SlowDataset):
+    def __getitem__(self, idx):
+        time.sleep(0.01)
+        info = get_worker_info()
+        return np.array([info.id, info.num_workers]).astype('int64')
+
+
+class TestOnlineAutoTune(unittest.TestCase):
+    def setUp(self):
+        paddle.incubate.autotune.set_config(
+            config={"dataloader": {"enable": True, "online": True}}
+        )
+
+    def tearDown(self):
+        paddle.incubate.autotune.set_config(
+            config={"dataloader": {"enable": False, "online": False}}
+        )
+
+    def test_online_autotune(self):
+        dataset = SlowDataset(400)
+        for persistent_workers in [False, True]:
+            loader = DataLoader(
+                dataset,
+                batch_size=2,
+                num_workers=1,
+                persistent_workers=persistent_workers,
+            )
+            self.assertEqual(loader.num_workers, 1)
+            for _ in range(2):
+                it = iter(loader)
+                it._autotuner.window = 10
+                outputs = [d.numpy().flatten().tolist() for d in it]
+                self.assertEqual(sum(outputs, []), list(range(400)))
+
+    def test_worker_info(self):
+        loader = DataLoader(WorkerInfoDataset(400), batch_size=2, num_workers=1)
+        it = iter(loader)
+        it._autotuner.window = 10
+        # workers started by tuning see the worker number after tuning
+        for data in it:
+            for worker_id, num_workers in data.numpy().tolist():
+                if worker_id > 0:
+                    self.assertGreater(num_workers, 1)
+
+
 class TestAutoTuneAPI(unittest.TestCase):
     def test_set_config_warnings(self):
         with warnings.catch_warnings(record=True) as w:
@@ -0,0 +1,229 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import stat
+import sys
+import tempfile
+import time
+import unittest
+
+from paddle.distributed.fleet.utils.fs import HDFSClient
+
+# A fake `hadoop fs` serving the paths under FAKE_HDFS_ROOT, every call is
+# appended to FAKE_HDFS_ROOT/../calls.
+FAKE_HADOOP = '''
+import os
+import shutil
+import sys
+import time
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "root")
+with open(os.path.join(root, "..", "calls"), "a") as f:
+    f.write(" ".join(sys.argv[1:]) + "\\n")
+
+
+def local(path):
+    if path.startswith("hdfs:"):
+        path = path[len("hdfs:"):]
+    return os.path.join(root, path.lstrip("/"))
+
+
+def ls_line(path, local_path):
+    if os.path.isdir(local_path):
+        return f"drwxr-xr-x - user group 0 2024-01-01 00:00 {path}"
+    size = os.path.getsize(local_path)
+    return f"-rw-r--r-- 3 user group {size} 2024-01-01 00:00 {path}"
+
+
+args = [a for a in sys.argv[2:] if not a.startswith("-D")]
+cmd, args = args[0][1:], args[1:]
+ret = 0
+if cmd == "test":
+    flag, path = args
+    check = os.path.isdir if flag == "-d" else os.path.exists
+    ret = 0 if check(local(path)) else 1
+elif cmd == "ls":
+    only_dir = args[:1] == ["-d"]
+    recursive = args[:1] == ["-R"]
+    for path in args[1:] if only_dir or recursive else args:
+        if not os.path.exists(local(path)):
+            print(f"ls: `{path}': No such file or directory", file=sys.stderr)
+            ret = 1
+        elif only_dir or not os.path.isdir(local(path)):
+            print(ls_line(path, local(path)))
+        elif recursive:
+            for dir_path, dirs, files in sorted(os.walk(local(path))):
+                rel = os.path.relpath(dir_path, local(path))
+                parent = path.rstrip("/") + ("" if rel == "." else "/" + rel)
+                for name in sorted(dirs + files):
+                    child = parent + "/" + name
+                    print(ls_line(child, local(child)))
+        else:
+            names = sorted(os.listdir(local(path)))
+            print(f"Found {len(names)} items")
+            for name in names:
+                child = path.rstrip("/") + "/" + name
+                print(ls_line(child, local(child)))
+elif cmd == "mkdir":
+    if args[0] == "-p":
+        for path in args[1:]:
+            os.makedirs(local(path), exist_ok=True)
+    elif os.path.isdir(os.path.dirname(local(args[0]).rstrip("/"))):
+        os.mkdir(local(args[0]))
+    else:
+        print("mkdir: No such file or directory", file=sys.stderr)
+        ret = 1
+elif cmd in ["put", "get"]:
+    srcs, dst = args[:-1], args[-1]
+    fail_path = os.path.join(root, "..", "fail_puts")
+    if cmd == "put" and os.path.exists(fail_path):
+        with open(fail_path) as f:
+            fails = int(f.read())
+        if fails > 0:
+            with open(fail_path, "w") as f:
+                f.write(str(fails - 1))
+            # leave a partial file
+            open(local(dst if len(srcs) == 1 else dst + "/part"), "w").close()
+            sys.exit(1)
+    delay_path = os.path.join(root, "..", "put_delay")
+    if cmd == "put" and os.path.exists(delay_path):
+        start = time.time()
+        with open(delay_path) as f:
+            time.sleep(float(f.read()))
+        with open(os.path.join(root, "..", "put_times"), "a") as f:
+            f.write(f"{start} {time.time()}\\n")
+    for src in srcs:
+        src_path = local(src) if cmd == "get" else src
+        dst_path = local(dst) if cmd == "put" else dst
+        if os.path.isdir(dst_path):
+            dst_path = os.path.join(dst_path, os.path.basename(src))
+        if os.path.exists(dst_path):
+            print(f"{cmd}: `{dst_path}': File exists", file=sys.stderr)
+            ret = 1
+        elif os.path.isdir(src_path):
+            shutil.copytree(src_path, dst_path)
+        else:
+            shutil.copy(src_path, dst_path)
+elif cmd == "touchz":
+    open(local(args[0]), "a").close()
+elif cmd == "rm":
+    for path in args:
+        if os.path.isfile(local(path)):
+            os.remove(local(path))
+        else:
+            ret = 1
+elif cmd == "rmr":
+    shutil.rmtree(local(args[0]))
+elif cmd == "mv":
+    os.rename(local(args[0]), local(args[1]))
+else:
+    ret = 255
+sys.exit(ret)
+'''
+
+
+class TestHDFSClientCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        hadoop_home = self.temp_dir.name
+        os.makedirs(os.path.join(hadoop_home, "bin"))
+        os.makedirs(os.path.join(hadoop_home, "root"))
+        hadoop_bin = os.path.join(hadoop_home, "bin", "hadoop")
+        with open(hadoop_bin, "w") as f:
+            f.write(f"#!{sys.executable}\n" + FAKE_HADOOP)
+        os.chmod(hadoop_bin, os.stat(hadoop_bin).st_mode | stat.S_IEXEC)
+        self.hadoop_home = hadoop_home
+        self.calls_path = os.path.join(hadoop_home, "calls")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def num_calls(self):
+        if not os.path.exists(self.calls_path):
+            return 0
+        with open(self.calls_path) as f:
+            return len(f.readlines())
+
+    def get_client(self, cache_ttl):
+        return HDFSClient(
+            self.hadoop_home,
+            {"fs.default.name": "hdfs://fake"},
+            time_out=6 * 1000,
+            sleep_inter=100,
+            cache_ttl=cache_ttl,
+        )
+
+    def test_listing_cache(self):
+        fs = self.get_client(cache_ttl=60)
+        fs.mkdirs("/ckpt")
+        fs.mkdirs("/ckpt/0")
+        fs.mkdirs("/ckpt/1")
+        fs.touch("/ckpt/meta")
+        self.assertEqual(fs.ls_dir("/ckpt"), (["0", "1"], ["meta"]))
+
+        # answered by the listing
+        num_calls = self.num_calls()
+        self.assertTrue(fs.is_dir("/ckpt/0"))
+        self.assertTrue(fs.is_file("/ckpt/meta"))
+        self.assertTrue(fs.is_exist("/ckpt/1"))
+        self.assertEqual(fs.list_dirs("/ckpt"), ["0", "1"])
+        self.assertEqual(self.num_calls(), num_calls)
+
+        # changes of the client are visible
+        fs.delete("/ckpt/0")
+        self.assertFalse(fs.is_exist("/ckpt/0"))
+        fs.mkdirs("/ckpt/2")
+        self.assertTrue(fs.is_dir("/ckpt/2"))
+        self.assertEqual(fs.ls_dir("/ckpt"), (["1", "2"], ["meta"]))
+        fs.mv("/ckpt/meta", "/ckpt/meta2")
+        self.assertFalse(fs.is_exist("/ckpt/meta"))
+        self.assertTrue(fs.is_file("/ckpt/meta2"))
+
+    def test_cache_expire(self):
+        fs = self.get_client(cache_ttl=0.5)
+        fs.mkdirs("/data")
+        self.assertTrue(fs.is_exist("/data"))
+        num_calls = self.num_calls()
+        self.assertTrue(fs.is_exist("/data"))
+        self.assertEqual(self.num_calls(), num_calls)
+        time.sleep(0.6)
+        self.assertTrue(fs.is_exist("/data"))
+        self.assertEqual(self.num_calls(), num_calls + 1)
+
+    def test_no_cache(self):
+        fs = self.get_client(cache_ttl=0)
+        fs.mkdirs("/data")
+        num_calls = self.num_calls()
+        self.assertTrue(fs.is_exist("/data"))
+        self.assertTrue(fs.is_exist("/data"))
+        self.assertEqual(self.num_calls(), num_calls + 2)
+
+    def test_batch_is_exist(self):
+        fs = self.get_client(cache_ttl=60)
+        fs.mkdirs("/data")
+        fs.mkdirs("/data/part-0")
+        fs.touch("/data/part-1")
+        paths = ["/data/part-0", "hdfs:/data/part-1", "/data/part-2"]
+        num_calls = self.num_calls()
+        self.assertEqual(fs.batch_is_exist(paths), [True, True, False])
+        self.assertEqual(self.num_calls(), num_calls + 1)
+        self.assertTrue(fs.is_dir("/data/part-0"))
+        self.assertTrue(fs.is_file("hdfs:/data/part-1"))
+        self.assertFalse(fs.is_exist("/data/part-2"))
+        self.assertEqual(self.num_calls(), num_calls + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
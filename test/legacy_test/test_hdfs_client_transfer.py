@@ -0,0 +1,184 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import stat
+import sys
+import tempfile
+import unittest
+
+from test_hdfs_client_cache import FAKE_HADOOP
+
+from paddle.distributed.fleet.utils.fs import ExecuteError, HDFSClient
+
+
+class TestHDFSClientTransfer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        hadoop_home = os.path.join(self.temp_dir.name, "hadoop")
+        os.makedirs(os.path.join(hadoop_home, "bin"))
+        os.makedirs(os.path.join(hadoop_home, "root"))
+        hadoop_bin = os.path.join(hadoop_home, "bin", "hadoop")
+        with open(hadoop_bin, "w") as f:
+            f.write(f"#!{sys.executable}\n" + FAKE_HADOOP)
+        os.chmod(hadoop_bin, os.stat(hadoop_bin).st_mode | stat.S_IEXEC)
+        self.hadoop_home = hadoop_home
+        self.remote_root = os.path.join(hadoop_home, "root")
+        self.calls_path = os.path.join(hadoop_home, "calls")
+
+        self.local_dir = os.path.join(self.temp_dir.name, "ckpt")
+        self.files = {
+            "meta": b"meta",
+            "table_0/part-0": b"0" * 100,
+            "table_0/part-1": b"1" * 200,
+            "table_1/part-0": b"2" * 300,
+        }
+        for name, data in self.files.items():
+            self.write(os.path.join(self.local_dir, name), data)
+        self.manifest_path = os.path.join(self.temp_dir.name, "manifest")
+
+        self.fs = HDFSClient(
+            hadoop_home,
+            {"fs.default.name": "hdfs://fake"},
+            time_out=6 * 1000,
+            sleep_inter=100,
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def calls(self, cmd):
+        with open(self.calls_path) as f:
+            return [l for l in f.readlines() if f" -{cmd} " in l]
+
+    def assert_remote_files(self, remote_dir, files):
+        for name, data in files.items():
+            path = os.path.join(self.remote_root, remote_dir, name)
+            self.assertEqual(self.read(path), data)
+
+    def test_upload_dir(self):
+        self.fs.upload(
+            self.local_dir, "hdfs:/ckpt", manifest_path=self.manifest_path
+        )
+        self.assert_remote_files("ckpt", self.files)
+        # the small files of a directory are uploaded by one command
+        self.assertEqual(len(self.calls("put")), 3)
+        with open(self.manifest_path) as f:
+            keys = {json.loads(line)["key"] for line in f}
+        self.assertEqual(keys, set(self.files))
+
+    def test_upload_file(self):
+        self.fs.mkdirs("/dir")
+        local_file = os.path.join(self.local_dir, "meta")
+        self.fs.upload(local_file, "/dir")
+        self.fs.upload(local_file, "/meta2")
+        self.assertEqual(self.read(f"{self.remote_root}/dir/meta"), b"meta")
+        self.assertEqual(self.read(f"{self.remote_root}/meta2"), b"meta")
+
+    def test_upload_resume(self):
+        self.fs.upload(
+            self.local_dir, "/ckpt", manifest_path=self.manifest_path
+        )
+        num_puts = len(self.calls("put"))
+
+        self.files["table_1/part-0"] = b"3" * 301
+        self.files["table_1/part-1"] = b"4" * 10
+        for name in ["table_1/part-0", "table_1/part-1"]:
+            self.write(os.path.join(self.local_dir, name), self.files[name])
+        self.fs.upload(
+            self.local_dir, "/ckpt", manifest_path=self.manifest_path
+        )
+        self.assert_remote_files("ckpt", self.files)
+        puts = self.calls("put")[num_puts:]
+        self.assertEqual(len(puts), 1)
+        self.assertIn("table_1/part-0", puts[0])
+        self.assertIn("table_1/part-1", puts[0])
+        self.assertNotIn("table_0", puts[0])
+
+    def test_upload_retry(self):
+        with open(os.path.join(self.hadoop_home, "fail_puts"), "w") as f:
+            f.write("2")
+        self.fs.upload(self.local_dir, "/ckpt", multi_processes=1)
+        self.assert_remote_files("ckpt", self.files)
+        self.assertEqual(len(self.calls("put")), 5)
+
+    def test_upload_concurrency(self):
+        with open(os.path.join(self.hadoop_home, "put_delay"), "w") as f:
+            f.write("1")
+        self.fs.upload(self.local_dir, "/ckpt", multi_processes=3)
+        self.assert_remote_files("ckpt", self.files)
+        with open(os.path.join(self.hadoop_home, "put_times")) as f:
+            times = [tuple(map(float, line.split())) for line in f]
+        self.assertEqual(len(times), 3)
+        # the puts are run at the same time
+        self.assertLess(max(t[0] for t in times), min(t[1] for t in times))
+
+    def test_download_resume(self):
+        self.fs.upload(self.local_dir, "/ckpt", checksum=True)
+        self.fs.mkdirs("/ckpt/empty")
+        download_dir = os.path.join(self.temp_dir.name, "download")
+        self.fs.download(
+            "/ckpt",
+            download_dir,
+            manifest_path=self.manifest_path,
+            checksum=True,
+        )
+        for name, data in self.files.items():
+            self.assertEqual(self.read(os.path.join(download_dir, name)), data)
+        self.assertTrue(os.path.isdir(os.path.join(download_dir, "empty")))
+
+        num_gets = len(self.calls("get"))
+        os.remove(os.path.join(download_dir, "table_1/part-0"))
+        self.fs.download(
+            "/ckpt", download_dir, manifest_path=self.manifest_path
+        )
+        gets = self.calls("get")[num_gets:]
+        self.assertEqual(len(gets), 1)
+        self.assertIn("table_1/part-0", gets[0])
+
+    def test_download_checksum(self):
+        self.fs.upload(self.local_dir, "/ckpt")
+        download_dir = os.path.join(self.temp_dir.name, "download")
+        self.fs.download(
+            "/ckpt",
+            download_dir,
+            manifest_path=self.manifest_path,
+            checksum=True,
+        )
+
+        # the remote file is changed with the same size
+        os.remove(os.path.join(download_dir, "meta"))
+        with open(os.path.join(self.remote_root, "ckpt", "meta"), "wb") as f:
+            f.write(b"atem")
+        with self.assertRaises(ExecuteError):
+            self.fs.download(
+                "/ckpt",
+                download_dir,
+                manifest_path=self.manifest_path,
+                checksum=True,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+
+from paddle.distributed.fleet.launch_utils import find_free_ports
+from paddle.distributed.launch.utils.kv_client import KVClient
+from paddle.distributed.launch.utils.kv_server import (
+    KVServer,
+    decode_kv,
+    encode_kv,
+)
+
+
+class TestKVServer(unittest.TestCase):
+    def setUp(self):
+        port = list(find_free_ports(1))[0]
+        self.server = KVServer(port)
+        self.server.start()
+        self.client = KVClient(f"127.0.0.1:{port}")
+        self.assertTrue(self.client.wait_server_ready(timeout=10))
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_get_prefix(self):
+        self.assertTrue(self.client.put("/workers/1", "rank1"))
+        self.assertTrue(self.client.put("/workers/0", "rank0"))
+        self.assertTrue(self.client.put("/workers1/0", "other"))
+        self.assertEqual(
+            self.client.get_prefix("/workers/"),
+            {"/workers/0": "rank0", "/workers/1": "rank1"},
+        )
+        self.assertEqual(len(self.client.get_prefix("/workers")), 3)
+        self.assertTrue(self.client.delete("/workers/0"))
+        self.assertEqual(
+            self.client.get_prefix("/workers/"), {"/workers/1": "rank1"}
+        )
+        self.assertEqual(self.client.get("/healthy"), "ok")
+
+    def test_wait_prefix(self):
+        size = 8
+        results = [None] * size
+
+        def sync(rank):
+            self.client.put(f"/job/peers/{rank}", f"rank{rank}")
+            results[rank] = self.client.wait_prefix("/job/peers", size)
+
+        threads = [
+            threading.Thread(target=sync, args=(rank,)) for rank in range(size)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        expected = {f"/job/peers/{rank}": f"rank{rank}" for rank in range(size)}
+        for result in results:
+            self.assertEqual(result, expected)
+
+        start = time.time()
+        self.assertIsNone(self.client.wait_prefix("/job/peers", 9, timeout=1))
+        self.assertGreaterEqual(time.time() - start, 1)
+
+    def test_barrier(self):
+        size = 4
+        results = []
+
+        def barrier():
+            results.append(self.client.barrier("/job/barrier", size))
+
+        threads = [threading.Thread(target=barrier) for _ in range(size - 1)]
+        for t in threads:
+            t.start()
+        time.sleep(0.5)
+        self.assertEqual(results, [])
+        barrier()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [True] * size)
+        self.assertEqual(self.client.add("/job/barrier", 2), size + 2)
+
+    def test_encode_kv(self):
+        kv = {"/a": b"1", "/b/c": "中".encode()}
+        self.assertEqual(decode_kv(encode_kv(kv)), {"/a": "1", "/b/c": "中"})
+
+
+if __name__ == "__main__":
+    unittest.main()
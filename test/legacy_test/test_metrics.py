@@ -354,6 +354,43 @@ class TestAuc(unittest.TestCase):
         m.reset()
         self.assertEqual(m.accumulate(), 0.0)
 
+    def test_auc_pr_and_multi_curve(self):
+        x = np.array(
+            [
+                [0.78, 0.22],
+                [0.62, 0.38],
+                [0.55, 0.45],
+                [0.30, 0.70],
+                [0.14, 0.86],
+                [0.59, 0.41],
+                [0.91, 0.08],
+                [0.16, 0.84],
+            ]
+        )
+        y = np.array([[0], [1], [1], [0], [1], [0], [0], [1]])
+        m = paddle.metric.Auc(curve='PR')
+        m.update(x, y)
+        # (1 + 1 + 3 / 4 + 4 / 6) / 4
+        self.assertAlmostEqual(m.accumulate(), 41 / 48)
+
+        m = paddle.metric.Auc(curve=['ROC', 'PR'])
+        self.assertEqual(m.name(), ['auc_roc', 'auc_pr'])
+        m.update(paddle.to_tensor(x), paddle.to_tensor(y))
+        r = m.accumulate()
+        self.assertAlmostEqual(r[0], 0.8125)
+        self.assertAlmostEqual(r[1], 41 / 48)
+
+    def test_auc_tensor_numpy_consistent(self):
+        m_np = paddle.metric.Auc()
+        m_tensor = paddle.metric.Auc()
+        for _ in range(3):
+            pos = np.random.random([1000, 1]).astype('float32')
+            x = np.concatenate([1 - pos, pos], axis=1)
+            y = np.random.randint(2, size=(1000, 1))
+            m_np.update(x, y)
+            m_tensor.update(paddle.to_tensor(x), paddle.to_tensor(y))
+        np.testing.assert_allclose(m_np.accumulate(), m_tensor.accumulate())
+
 
 if __name__ == '__main__':
     unittest.main()
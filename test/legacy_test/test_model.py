@@ -953,6 +953,69 @@ class TestModelFunction(unittest.TestCase):
             np.testing.assert_almost_equal(losses[0], losses[1], decimal=4)
             np.testing.assert_almost_equal(losses[0], losses[2], decimal=4)
 
+    def test_fit_lazy_logs(self):
+        class RecordLogs(paddle.callbacks.Callback):
+            def __init__(self):
+                self.batch_logs = []
+                self.epoch_logs = []
+                self.eval_batch_logs = []
+
+            def on_train_batch_end(self, step, logs=None):
+                self.batch_logs.append(dict(logs))
+
+            def on_epoch_end(self, epoch, logs=None):
+                self.epoch_logs.append(dict(logs))
+
+            def on_eval_batch_end(self, step, logs=None):
+                self.eval_batch_logs.append(dict(logs))
+
+        paddle.disable_static()
+        net = MyModel()
+        optim = paddle.optimizer.SGD(
+            learning_rate=0.001, parameters=net.parameters()
+        )
+        model = Model(net)
+        model.prepare(
+            optim,
+            loss=CrossEntropyLoss(reduction="sum"),
+            metrics=Accuracy(),
+        )
+        record = RecordLogs()
+        model.fit(
+            MyDataset(),
+            batch_size=4,
+            log_freq=3,
+            callbacks=[record],
+            verbose=0,
+            lazy_logs=True,
+        )
+        self.assertEqual(len(record.batch_logs), 10)
+        # logs are updated at the 3rd, 6th, 9th and last step
+        for step in [3, 4, 6, 7]:
+            self.assertEqual(
+                record.batch_logs[step]['loss'],
+                record.batch_logs[step - 1]['loss'],
+            )
+        self.assertIsInstance(record.batch_logs[9]['loss'][0], float)
+        self.assertEqual(
+            record.epoch_logs[0]['acc'], record.batch_logs[9]['acc']
+        )
+        self.assertFalse(model._lazy_logs)
+
+        result = model.evaluate(
+            MyDataset(),
+            batch_size=4,
+            log_freq=3,
+            callbacks=[record],
+            verbose=0,
+            lazy_logs=True,
+        )
+        # no stale values of training before the first logging step
+        self.assertNotIn('loss', record.eval_batch_logs[0])
+        self.assertNotIn('acc', record.eval_batch_logs[0])
+        self.assertIsInstance(result['loss'][0], float)
+        self.assertIsInstance(result['acc'], float)
+
 
 class TestModelWithLRScheduler(unittest.TestCase):
     def test_fit_by_step(self):
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import unittest
 
 import numpy as np
@@ -25,8 +26,10 @@ from paddle.io import (
     DataLoader,
     Dataset,
     IterableDataset,
+    Subset,
     TensorDataset,
 )
+from paddle.io.dataloader.collate import BufferedCollateFn, default_collate_fn
 
 IMAGE_SIZE = 32
 
@@ -480,5 +483,122 @@ class TestConcatDataset(unittest.TestCase):
             ConcatDataset([it1, d1])
 
 
+class BatchReadDataset(Dataset):
+    def __init__(self, sample_num):
+        self.data = np.arange(sample_num).astype('int64')
+        self.getitems_calls = 0
+
+    def __getitem__(self, idx):
+        raise RuntimeError("__getitem__ should not be called")
+
+    def __getitems__(self, indices):
+        self.getitems_calls += 1
+        return list(self.data[indices])
+
+    def __len__(self):
+        return len(self.data)
+
+
+class TestDatasetGetitems(unittest.TestCase):
+    def check_getitems(self, dataset, indices):
+        samples = dataset.__getitems__(indices)
+        self.assertEqual(len(samples), len(indices))
+        for sample, idx in zip(samples, indices):
+            expected = dataset[idx]
+            if isinstance(expected, tuple):
+                self.assertEqual(len(sample), len(expected))
+                for field, expected_field in zip(sample, expected):
+                    np.testing.assert_allclose(
+                        np.array(field), np.array(expected_field)
+                    )
+            else:
+                np.testing.assert_allclose(sample, expected)
+
+    def test_builtin_datasets(self):
+        paddle.disable_static()
+        indices = [3, 0, 7, 7, 5]
+        tensor_dataset = TensorDataset(
+            [paddle.rand([10, 3]), paddle.arange(10).reshape([10, 1])]
+        )
+        self.check_getitems(tensor_dataset, indices)
+        self.check_getitems(tensor_dataset, [])
+        self.check_getitems(
+            Subset(tensor_dataset, list(range(9, -1, -1))), indices
+        )
+        self.check_getitems(
+            ConcatDataset([list(range(4)), [], list(range(10, 16))]),
+            [9, 0, 4, 3, -1],
+        )
+        self.check_getitems(
+            ComposeDataset([RandomDataset(10), tensor_dataset]), indices
+        )
+
+    def test_dataloader(self):
+        paddle.disable_static()
+        dataset = BatchReadDataset(20)
+        loader = DataLoader(dataset, batch_size=4, num_workers=0)
+        labels = [data.numpy().tolist() for data in loader]
+        self.assertEqual(sum(labels, []), list(range(20)))
+        self.assertEqual(dataset.getitems_calls, 5)
+
+        loader = DataLoader(
+            Subset(dataset, list(range(10))), batch_size=4, num_workers=2
+        )
+        labels = [data.numpy().tolist() for data in loader]
+        self.assertEqual(sum(labels, []), list(range(10)))
+
+
+class TestComplexDatasetBufferedCollate(TestComplexDataset):
+    def setUp(self):
+        os.environ['FLAGS_use_buffered_collate'] = '1'
+
+    def tearDown(self):
+        os.environ.pop('FLAGS_use_buffered_collate', None)
+
+
+class TestBufferedCollateFn(unittest.TestCase):
+    def test_same_as_default(self):
+        batch = [
+            (
+                np.random.random([3, 4]).astype('float32'),
+                i,
+                2.5,
+                'abc',
+                {'a': np.array([i, i + 1]), 'b': [1, 2]},
+            )
+            for i in range(4)
+        ]
+        expected = default_collate_fn(batch)
+        for reuse_buffers in [False, True]:
+            collate_fn = BufferedCollateFn(reuse_buffers=reuse_buffers)
+            for _ in range(2):
+                out = collate_fn(batch)
+                np.testing.assert_array_equal(out[0], expected[0])
+                self.assertEqual(out[0].dtype, expected[0].dtype)
+                np.testing.assert_array_equal(out[1], expected[1])
+                np.testing.assert_array_equal(out[2], expected[2])
+                self.assertEqual(out[3], expected[3])
+                np.testing.assert_array_equal(out[4]['a'], expected[4]['a'])
+                np.testing.assert_array_equal(
+                    out[4]['b'][0], expected[4]['b'][0]
+                )
+
+    def test_pad(self):
+        collate_fn = BufferedCollateFn(pad_value=-1)
+        out = collate_fn([np.array([1, 2, 3]), np.array([4])])
+        np.testing.assert_array_equal(out, [[1, 2, 3], [4, -1, -1]])
+
+        with self.assertRaises(ValueError):
+            BufferedCollateFn()([np.array([1, 2, 3]), np.array([4])])
+
+    def test_reuse_buffers(self):
+        collate_fn = BufferedCollateFn(reuse_buffers=True)
+        out1 = collate_fn([np.ones([2]), np.ones([2])])
+        out2 = collate_fn([np.zeros([2])])
+        self.assertEqual(out2.shape, (1, 2))
+        # the last smaller batch reuses the buffer
+        self.assertTrue(np.shares_memory(out1, out2))
+
+
 if __name__ == '__main__':
     unittest.main()
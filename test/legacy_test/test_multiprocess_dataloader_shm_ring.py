@@ -0,0 +1,109 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+from paddle.io.dataloader.shm_ring import _SharedMemoryRing
+
+
+class RandomDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        image = np.random.random([8]).astype('float32')
+        label = np.array([idx]).astype('int64')
+        return image, label
+
+    def __len__(self):
+        return self.sample_num
+
+
+class TestSharedMemoryRing(unittest.TestCase):
+    def test_write_read_release(self):
+        ring = _SharedMemoryRing(2, 1024)
+        arrays = [
+            np.arange(10, dtype='float32').reshape([2, 5]),
+            np.ones([3], dtype='int64'),
+        ]
+        self.assertTrue(ring.fits(arrays))
+        self.assertFalse(ring.fits([np.zeros([1024], dtype='float64')]))
+        self.assertFalse(ring.fits([np.array(['a', None], dtype=object)]))
+
+        slot = ring.acquire(1)
+        desc = pickle.loads(pickle.dumps(ring.write(0, slot, arrays)))
+        for out, arr in zip(ring.read(desc), arrays):
+            np.testing.assert_array_equal(out, arr)
+
+        ring.acquire(1)
+        # all slots are busy before releasing
+        self.assertIsNone(ring.acquire(0.1))
+        ring.release(desc.slot)
+        self.assertEqual(ring.acquire(1), desc.slot)
+
+        name = ring.name
+        ring.close()
+        self.assertFalse(os.path.exists(os.path.join('/dev/shm', name)))
+
+
+class TestDataLoaderShmRing(unittest.TestCase):
+    def setUp(self):
+        os.environ['FLAGS_use_shm_ring'] = '1'
+
+    def tearDown(self):
+        os.environ.pop('FLAGS_use_shm_ring', None)
+
+    def run_loader(self, persistent_workers=False):
+        paddle.disable_static()
+        dataset = RandomDataset(40)
+        loader = DataLoader(
+            dataset,
+            batch_size=4,
+            num_workers=2,
+            persistent_workers=persistent_workers,
+        )
+        for _ in range(2):
+            labels = []
+            for image, label in loader:
+                self.assertEqual(image.shape, [4, 8])
+                labels.extend(label.numpy().flatten().tolist())
+            self.assertEqual(labels, list(range(40)))
+
+    def test_main(self):
+        self.run_loader()
+
+    def test_persistent_workers(self):
+        self.run_loader(persistent_workers=True)
+
+
+class TestDataLoaderShmRingSmallSlot(TestDataLoaderShmRing):
+    def setUp(self):
+        # batches can not fit in slot fall back to queue transport
+        os.environ['FLAGS_use_shm_ring'] = '1'
+        os.environ['FLAGS_shm_ring_slot_size'] = '64'
+
+    def tearDown(self):
+        os.environ.pop('FLAGS_use_shm_ring', None)
+        os.environ.pop('FLAGS_shm_ring_slot_size', None)
+
+
+if __name__ == '__main__':
+    unittest.main()
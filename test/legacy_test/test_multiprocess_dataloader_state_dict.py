@@ -0,0 +1,124 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset, IterableDataset
+
+
+class IndexDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+        self.read_indices = []
+
+    def __getitem__(self, idx):
+        self.read_indices.append(idx)
+        return np.array([idx]).astype('int64')
+
+    def __len__(self):
+        return self.sample_num
+
+
+class InfiniteDataset(IterableDataset):
+    def __iter__(self):
+        while True:
+            yield np.array([0]).astype('int64')
+
+
+def to_list(batch):
+    return batch.numpy().flatten().tolist()
+
+
+class TestDataLoaderStateDict(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.num_workers = 0
+        self.persistent_workers = False
+
+    def build_loader(self, dataset, **kwargs):
+        return DataLoader(
+            dataset,
+            batch_size=4,
+            shuffle=True,
+            num_workers=self.num_workers,
+            persistent_workers=self.persistent_workers,
+            **kwargs,
+        )
+
+    def test_resume(self):
+        loader = self.build_loader(IndexDataset(50))
+        batches = []
+        for i, batch in enumerate(loader):
+            batches.append(to_list(batch))
+            if i == 4:
+                state = loader.state_dict()
+        self.assertEqual(state['num_yielded'], 5)
+
+        dataset = IndexDataset(50)
+        resumed = self.build_loader(dataset)
+        resumed.load_state_dict(state)
+        resumed_iter = iter(resumed)
+        if self.num_workers > 0:
+            # workers are seeded as the saved iteration
+            self.assertEqual(
+                resumed_iter.state_dict()['base_seed'], state['base_seed']
+            )
+        self.assertEqual([to_list(b) for b in resumed_iter], batches[5:])
+        if self.num_workers == 0:
+            # consumed batches are skipped without reading
+            self.assertEqual(
+                sorted(dataset.read_indices), sorted(sum(batches[5:], []))
+            )
+
+        # following epoch starts from the first batch
+        self.assertEqual(len([to_list(b) for b in resumed]), len(batches))
+
+    def test_resume_iterator(self):
+        loader = self.build_loader(IndexDataset(50))
+        loader_iter = iter(loader)
+        consumed = [to_list(next(loader_iter)) for _ in range(3)]
+        state = loader_iter.state_dict()
+        rest = [to_list(b) for b in loader_iter]
+
+        loader.load_state_dict(state)
+        self.assertEqual([to_list(b) for b in loader], rest)
+        self.assertEqual(len(consumed + rest), len(loader))
+
+    def test_iterable_dataset(self):
+        loader = DataLoader(
+            InfiniteDataset(), batch_size=2, num_workers=self.num_workers
+        )
+        with self.assertRaises(RuntimeError):
+            loader.load_state_dict({'num_yielded': 1})
+
+
+class TestDataLoaderStateDictMultiProcess(TestDataLoaderStateDict):
+    def setUp(self):
+        paddle.disable_static()
+        self.num_workers = 2
+        self.persistent_workers = False
+
+
+class TestDataLoaderStateDictPersistentWorkers(TestDataLoaderStateDict):
+    def setUp(self):
+        paddle.disable_static()
+        self.num_workers = 2
+        self.persistent_workers = True
+
+
+if __name__ == '__main__':
+    unittest.main()
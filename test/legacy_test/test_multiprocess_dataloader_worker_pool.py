@@ -0,0 +1,159 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset, IterableDataset
+from paddle.io.dataloader import worker_pool
+
+
+class PidDataset(Dataset):
+    def __init__(self, sample_num, offset=0):
+        self.sample_num = sample_num
+        self.offset = offset
+
+    def __getitem__(self, idx):
+        return (
+            np.array([idx + self.offset]).astype('int64'),
+            np.array([os.getpid()]).astype('int64'),
+        )
+
+    def __len__(self):
+        return self.sample_num
+
+
+class InfiniteDataset(IterableDataset):
+    def __iter__(self):
+        while True:
+            yield np.array([0]).astype('int64')
+
+
+def read_all(loader):
+    values, pids = [], set()
+    for value, pid in loader:
+        values.extend(value.numpy().flatten().tolist())
+        pids.update(pid.numpy().flatten().tolist())
+    return values, pids
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def test_share_workers(self):
+        train_loader = DataLoader(
+            PidDataset(40), batch_size=4, num_workers=2, worker_pool='test'
+        )
+        eval_loader = DataLoader(
+            PidDataset(20, offset=100),
+            batch_size=2,
+            num_workers=2,
+            worker_pool='test',
+        )
+        pool = worker_pool._worker_pools['test']
+        self.assertEqual(pool._ref_count, 2)
+
+        all_pids = set()
+        for _ in range(2):
+            values, pids = read_all(train_loader)
+            self.assertEqual(values, list(range(40)))
+            all_pids |= pids
+            values, pids = read_all(eval_loader)
+            self.assertEqual(values, list(range(100, 120)))
+            all_pids |= pids
+        # all batches are loaded by the same 2 workers
+        self.assertEqual(all_pids, {w.pid for w in pool.workers})
+
+        del train_loader
+        self.assertEqual(pool._ref_count, 1)
+        del eval_loader
+        self.assertNotIn('test', worker_pool._worker_pools)
+        for w in pool.workers:
+            self.assertFalse(w.is_alive())
+
+    def test_interleaved_iteration(self):
+        train_loader = DataLoader(
+            PidDataset(40), batch_size=4, num_workers=2, worker_pool='test'
+        )
+        eval_loader = DataLoader(
+            PidDataset(8, offset=100),
+            batch_size=2,
+            num_workers=2,
+            worker_pool='test',
+        )
+        values = []
+        for i, (value, _) in enumerate(train_loader):
+            values.extend(value.numpy().flatten().tolist())
+            # evaluate in the middle of training epoch
+            if i % 3 == 0:
+                eval_values, _ = read_all(eval_loader)
+                self.assertEqual(eval_values, list(range(100, 108)))
+            # break training epoch early
+            if i == 5:
+                break
+        self.assertEqual(values, list(range(24)))
+        self.assertEqual(read_all(train_loader)[0], list(range(40)))
+
+    def test_iterator_outlives_loader(self):
+        loader = DataLoader(
+            PidDataset(40), batch_size=4, num_workers=2, worker_pool='test'
+        )
+        pool = worker_pool._worker_pools['test']
+        iterator = iter(loader)
+        self.assertEqual(pool._ref_count, 2)
+        del loader
+        # the pool is kept by the alive iterator
+        self.assertIn('test', worker_pool._worker_pools)
+        values = []
+        for value, _ in iterator:
+            values.extend(value.numpy().flatten().tolist())
+        self.assertEqual(values, list(range(40)))
+        del iterator
+        self.assertNotIn('test', worker_pool._worker_pools)
+        for w in pool.workers:
+            self.assertFalse(w.is_alive())
+
+    def test_mismatched_settings(self):
+        loader = DataLoader(
+            PidDataset(40), batch_size=4, num_workers=2, worker_pool='test'
+        )
+        for kwargs in [
+            {'num_workers': 3},
+            {'num_workers': 2, 'prefetch_factor': 4},
+            {'num_workers': 2, 'use_shared_memory': False},
+        ]:
+            with self.assertRaises(ValueError):
+                DataLoader(
+                    PidDataset(20), batch_size=2, worker_pool='test', **kwargs
+                )
+        self.assertEqual(worker_pool._worker_pools['test']._ref_count, 1)
+        del loader
+        self.assertNotIn('test', worker_pool._worker_pools)
+
+    def test_iterable_dataset(self):
+        with self.assertRaises(ValueError):
+            DataLoader(
+                InfiniteDataset(),
+                batch_size=2,
+                num_workers=2,
+                worker_pool='test',
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -414,5 +414,61 @@ class TestTimerOnly(unittest.TestCase):
         p.stop()
 
 
+class TestStepTelemetry(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        profiler.timer.benchmark().disable_telemetry()
+        self.temp_dir.cleanup()
+
+    def test_telemetry(self):
+        export_path = os.path.join(self.temp_dir.name, 'telemetry.prom')
+        benchmark = profiler.timer.benchmark()
+        hook = benchmark.enable_telemetry(
+            capacity=8, export_path=export_path, export_interval=5
+        )
+        simple_net = SimpleNet()
+        opt = paddle.optimizer.SGD(
+            learning_rate=1e-3, parameters=simple_net.parameters()
+        )
+        loader = DataLoader(RandomDataset(20 * 4), batch_size=4)
+        p = profiler.Profiler(timer_only=True)
+        p.start()
+        for image, label in loader():
+            out = simple_net(image)
+            loss = paddle.mean(F.cross_entropy(out, label))
+            loss.backward()
+            opt.step()
+            opt.clear_grad()
+            p.step()
+        p.stop()
+
+        self.assertEqual(hook.total_steps, 20)
+        # only the recent steps are kept
+        self.assertEqual(len(hook.buffers['batch']), 8)
+        summary = benchmark.telemetry_summary()
+        for phase in ['reader', 'forward', 'backward', 'optimizer', 'batch']:
+            self.assertGreater(summary[phase]['p99'], 0)
+            self.assertLessEqual(summary[phase]['p50'], summary[phase]['p99'])
+        self.assertEqual(summary['communication']['max'], 0)
+        with open(export_path) as f:
+            content = f.read()
+        self.assertIn(
+            'paddle_step_phase_seconds_count{rank="0",phase="batch"} 20',
+            content,
+        )
+        self.assertIn('phase="backward",quantile="0.99"', content)
+
+    def test_ring_buffer(self):
+        buffer = profiler.timer.RingBuffer(3)
+        self.assertIsNone(buffer.last())
+        for value in range(5):
+            buffer.append(value)
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.values().tolist(), [2, 3, 4])
+        self.assertEqual(buffer.last(), 4)
+
+
 if __name__ == '__main__':
     unittest.main()
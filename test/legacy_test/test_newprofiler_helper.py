@@ -130,6 +130,23 @@ class TestStatisticHelper(unittest.TestCase):
         dst = statistic_helper.subtract_ranges(src1, src2)
         self.assertEqual(dst, [(10, 11)])
 
+    def test_ranges_array(self):
+        src = statistic_helper.to_range_array([(4, 9), (14, 19), (1, 5)])
+        self.assertEqual(src.shape, (3, 2))
+        dst = statistic_helper.merge_self_ranges_array(src)
+        self.assertEqual(dst.tolist(), [[1, 9], [14, 19]])
+        self.assertEqual(statistic_helper.sum_ranges_array(dst), 13)
+        self.assertEqual(
+            statistic_helper.merge_self_ranges_array([]).shape, (0, 2)
+        )
+        src2 = statistic_helper.to_range_array([(3, 7), (9, 11), (18, 25)])
+        dst = statistic_helper.merge_ranges_array(src, src2)
+        self.assertEqual(dst.tolist(), [[1, 11], [14, 25]])
+        dst = statistic_helper.intersection_ranges_array(src, src2)
+        self.assertEqual(dst.tolist(), [[3, 7], [18, 19]])
+        dst = statistic_helper.subtract_ranges_array(src, src2)
+        self.assertEqual(dst.tolist(), [[1, 3], [7, 9], [14, 18]])
+
 
 if __name__ == '__main__':
     unittest.main()
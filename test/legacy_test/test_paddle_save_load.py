@@ -1111,6 +1111,31 @@ class TestAsyncSaveLoad(unittest.TestCase):
         self.check_load_state_dict(layer_state_dict, load_layer_state_dict)
         self.check_load_state_dict(opt_state_dict, load_opt_state_dict)
 
+        # save tasks are futures, and saving overlapped with updating
+        # parameters saves the values at calling time
+        tensor = paddle.to_tensor(np.random.random([4, 4]).astype('float32'))
+        expected = tensor.numpy()
+        tensor_save_path = os.path.join(
+            self.temp_dir.name, "test_paddle_async_save_load.tensor.pdtensor"
+        )
+        task = paddle.async_save(tensor, tensor_save_path)
+        tensor.set_value(np.zeros([4, 4]).astype('float32'))
+        task.result()
+        self.assertTrue(task.done())
+        np.testing.assert_array_equal(
+            paddle.load(tensor_save_path).numpy(), expected
+        )
+        self.assertFalse(
+            os.path.exists(f"{tensor_save_path}.tmp.{os.getpid()}")
+        )
+
+        # saved state dict is not modified
+        layer_state_dict = layer.state_dict()
+        values = dict(layer_state_dict)
+        paddle.async_save(layer_state_dict, layer_save_path).result()
+        for key, value in values.items():
+            self.assertIs(layer_state_dict[key], value)
+
         # test assertion on illegal object
         some_tuple_obj = (1, 2, 3)
         tuple_save_path = os.path.join(
@@ -1044,6 +1044,187 @@ class TestProfilerStatistic(unittest.TestCase):
                 )
             )
 
+    def test_statistic_accumulate(self):
+        def build_tree(offset):
+            root_node = HostPythonNode(
+                'Root Node',
+                profiler.TracerEventType.UserDefined,
+                0,
+                float('inf'),
+                1000,
+                1001,
+            )
+            profilerstep_node = HostPythonNode(
+                'ProfileStep#1',
+                profiler.TracerEventType.ProfileStep,
+                offset,
+                offset + 100,
+                1000,
+                1001,
+            )
+            allreduce_node = HostPythonNode(
+                'allreduce',
+                profiler.TracerEventType.Operator,
+                offset + 10,
+                offset + 30,
+                1000,
+                1001,
+            )
+            launchkernel_node = HostPythonNode(
+                'cudalaunchkernel',
+                profiler.TracerEventType.CudaRuntime,
+                offset + 15,
+                offset + 20,
+                1000,
+                1001,
+            )
+            nccl_kernel = DevicePythonNode(
+                'nccl_all_reduce_kernel',
+                profiler.TracerEventType.Kernel,
+                offset + 20,
+                offset + 50,
+                0,
+                0,
+                0,
+            )
+            root_node.children_node.append(profilerstep_node)
+            profilerstep_node.children_node.append(allreduce_node)
+            allreduce_node.runtime_node.append(launchkernel_node)
+            launchkernel_node.device_node.append(nccl_kernel)
+            return {'thread1001': root_node}
+
+        extra_info = {
+            'Process Cpu Utilization': '1.02',
+            'System Cpu Utilization': '0.68',
+        }
+        statistic_data = profiler.profiler_statistic.StatisticData(
+            build_tree(0), extra_info
+        )
+        statistic_data.add(build_tree(1000), extra_info)
+        self.assertIsNone(statistic_data.node_trees)
+        time_range_summary = statistic_data.time_range_summary
+        distributed_summary = statistic_data.distributed_summary
+        event_summary = statistic_data.event_summary
+        self.assertEqual(
+            time_range_summary.get_cpu_range_sum(
+                profiler.TracerEventType.ProfileStep
+            ),
+            200,
+        )
+        self.assertEqual(
+            time_range_summary.get_gpu_range_sum(
+                0, profiler.TracerEventType.Kernel
+            ),
+            60,
+        )
+        self.assertEqual(
+            time_range_summary.call_times[profiler.TracerEventType.Kernel], 2
+        )
+        self.assertEqual(distributed_summary.cpu_calls, 2)
+        self.assertEqual(distributed_summary.gpu_calls, 2)
+        self.assertEqual(distributed_summary.cpu_communication_time, 40)
+        self.assertEqual(distributed_summary.gpu_communication_time, 60)
+        self.assertEqual(distributed_summary.communication_time, 80)
+        # time ranges of the last parsed result are kept
+        self.assertEqual(
+            distributed_summary.communication_range, [(1010, 1050)]
+        )
+        self.assertEqual(
+            time_range_summary.GPUTimeRange[0][profiler.TracerEventType.Kernel],
+            [(1020, 1050)],
+        )
+        self.assertEqual(event_summary.items['allreduce'].call, 2)
+        print(
+            profiler.profiler_statistic._build_table(
+                statistic_data,
+                sorted_by=profiler.SortedKeys.CPUTotal,
+                op_detail=True,
+                thread_sep=False,
+                time_unit='ms',
+            )
+        )
+
+
+class TestCrossRankStatistic(unittest.TestCase):
+    def build_tree(self, offset, op_range, kernel_range):
+        root_node = HostPythonNode(
+            'Root Node',
+            profiler.TracerEventType.UserDefined,
+            0,
+            float('inf'),
+            1000,
+            1001,
+        )
+        profilerstep_node = HostPythonNode(
+            'ProfileStep#1',
+            profiler.TracerEventType.ProfileStep,
+            offset,
+            offset + 100,
+            1000,
+            1001,
+        )
+        allreduce_node = HostPythonNode(
+            'allreduce',
+            profiler.TracerEventType.Operator,
+            offset + op_range[0],
+            offset + op_range[1],
+            1000,
+            1001,
+        )
+        launchkernel_node = HostPythonNode(
+            'cudalaunchkernel',
+            profiler.TracerEventType.CudaRuntime,
+            offset + op_range[0],
+            offset + op_range[1],
+            1000,
+            1001,
+        )
+        nccl_kernel = DevicePythonNode(
+            'nccl_all_reduce_kernel',
+            profiler.TracerEventType.Kernel,
+            offset + kernel_range[0],
+            offset + kernel_range[1],
+            0,
+            0,
+            0,
+        )
+        root_node.children_node.append(profilerstep_node)
+        profilerstep_node.children_node.append(allreduce_node)
+        allreduce_node.runtime_node.append(launchkernel_node)
+        launchkernel_node.device_node.append(nccl_kernel)
+        return {'thread1001': root_node}
+
+    def test_cross_rank_statistic(self):
+        from paddle.profiler import cross_rank_statistic
+
+        rank_profiles = [
+            cross_rank_statistic.RankProfile(
+                0, self.build_tree(0, (10, 20), (20, 50))
+            ),
+            # rank 1 is slow and its clock is 1000ns ahead
+            cross_rank_statistic.RankProfile(
+                1, self.build_tree(1000, (40, 45), (45, 50))
+            ),
+        ]
+        summary = cross_rank_statistic.CrossRankSummary(
+            pipeline_stages=[[0], [1]]
+        )
+        summary.parse(rank_profiles)
+        self.assertEqual(summary.clock_offsets, {0: 0, 1: 1000})
+        self.assertEqual(len(summary.collective_items), 1)
+        collective_item = summary.collective_items[0]
+        self.assertEqual(collective_item.skew, 25)
+        self.assertEqual(collective_item.late_rank, 1)
+        self.assertEqual(
+            summary.get_collective_stats(), {'allreduce': (1, 25, 25, 1)}
+        )
+        step_item = summary.step_items[0]
+        self.assertEqual(step_item.busy_times, {0: 60, 1: 90})
+        self.assertEqual(step_item.slowest_rank, 1)
+        self.assertEqual(step_item.critical_path, [(0, 0, 60), (1, 1, 90)])
+        self.assertEqual(step_item.critical_stage, 1)
+        print(cross_rank_statistic._build_cross_rank_table(summary))
+
 
 if __name__ == '__main__':
     unittest.main()
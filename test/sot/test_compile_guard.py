@@ -0,0 +1,104 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import types
+import unittest
+
+from test_case_base import (
+    TestCaseBase,
+    test_instruction_translator_cache_context,
+)
+
+import paddle
+from paddle.jit.sot.opcode_translator.executor.guard import (
+    compile_guard_source,
+)
+from paddle.jit.sot.utils import ENV_SOT_COMPILE_GUARD
+from paddle.utils.environments import EnvironmentVariableGuard
+
+
+class TestCompileGuardSource(unittest.TestCase):
+    def setUp(self):
+        self.func_string = "\n".join(
+            [
+                "def built_guard_fn(frame):",
+                "    _sot_tmp_0 = frame.f_locals['x']",
+                "    _sot_tmp_1 = frame.f_locals['y']",
+                "    return len(_sot_tmp_0) == 2 and _sot_tmp_0[0] == 1"
+                " and len(_sot_tmp_0) == 2 and _sot_tmp_1.a == 1"
+                " and _sot_tmp_1.a + 1 == 2",
+            ]
+        )
+
+    def build(self):
+        func_string, code = compile_guard_source(self.func_string)
+        free_vars = {}
+        exec(code, free_vars)
+        return func_string, free_vars['built_guard_fn']
+
+    def test_compiled_source(self):
+        func_string, _ = self.build()
+        # frame.f_locals is read once
+        self.assertEqual(func_string.count("frame.f_locals"), 1)
+        # the duplicated term is removed
+        self.assertEqual(func_string.count("len(_sot_tmp_0)"), 1)
+        # the repeated attribute is evaluated once
+        self.assertEqual(func_string.count("_sot_tmp_1.a"), 1)
+
+    def test_compiled_result(self):
+        _, guard_fn = self.build()
+        obj = types.SimpleNamespace(a=1)
+        frame = types.SimpleNamespace(f_locals={'x': [1, 2], 'y': obj})
+        self.assertTrue(guard_fn(frame))
+        frame = types.SimpleNamespace(f_locals={'x': [2, 2], 'y': obj})
+        self.assertFalse(guard_fn(frame))
+        frame = types.SimpleNamespace(
+            f_locals={'x': [1, 2], 'y': types.SimpleNamespace(a=2)}
+        )
+        self.assertFalse(guard_fn(frame))
+
+
+def foo(x: paddle.Tensor, y: paddle.Tensor, z: list):
+    return x + y + z[0]
+
+
+class TestCompiledGuard(TestCaseBase):
+    def run_cases(self):
+        x = paddle.rand([2, 3])
+        y = paddle.rand([2, 3])
+        with test_instruction_translator_cache_context() as ctx:
+            self.assert_results(foo, x, y, [1])
+            self.assertEqual(ctx.translate_count, 1)
+            self.assert_results(foo, y, x, [1])
+            self.assertEqual(ctx.translate_count, 1)
+            self.assert_results(foo, x, y.astype("float64"), [1])
+            self.assertEqual(ctx.translate_count, 2)
+            self.assert_results(foo, x, paddle.rand([3, 3]), [1])
+            self.assertEqual(ctx.translate_count, 3)
+            self.assert_results(foo, x, y, [2])
+            self.assertEqual(ctx.translate_count, 4)
+
+    def test_compiled_guard(self):
+        with EnvironmentVariableGuard(ENV_SOT_COMPILE_GUARD, True):
+            self.run_cases()
+
+    def test_uncompiled_guard(self):
+        with EnvironmentVariableGuard(ENV_SOT_COMPILE_GUARD, False):
+            self.run_cases()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,6 +27,7 @@ from test_case_base import (
 
 from paddle.jit.sot.opcode_translator.custom_code import CustomCode
 from paddle.jit.sot.opcode_translator.executor.executor_cache import (
+    GuardedFunctionsDispatcher,
     OpcodeExecutorCache,
 )
 
@@ -150,6 +151,50 @@ class TestOpcodeExecutorCache(unittest.TestCase):
             self.assertEqual(ctx.translate_count, 2)
 
 
+def make_key_guard(value):
+    guard = lambda frame: frame.f_locals["x"] == value
+    guard.key_fn = lambda frame: (frame.f_locals["x"],)
+    guard.key_exprs = ("frame.f_locals['x']",)
+    guard.key_values = (value,)
+    return guard
+
+
+class TestGuardedFunctionsDispatcher(unittest.TestCase):
+    def lookup(self, dispatcher, frame):
+        for entry_id in dispatcher.candidates(frame):
+            custom_code, guard_fn, _, _ = dispatcher.entries[entry_id]
+            if guard_fn(frame):
+                return dispatcher.hit(entry_id)
+        return None
+
+    def test_dispatch_by_key(self):
+        dispatcher = GuardedFunctionsDispatcher(max_size=0)
+        for value in range(100):
+            dispatcher.add(value, make_key_guard(value))
+        dispatcher.add("no_key", lambda frame: True)
+        frame = types.SimpleNamespace(f_locals={"x": 42})
+        # only the guard in the bucket of key and the guard without key
+        self.assertEqual(len(list(dispatcher.candidates(frame))), 2)
+        self.assertEqual(self.lookup(dispatcher, frame), 42)
+        frame = types.SimpleNamespace(f_locals={"x": -1})
+        self.assertEqual(self.lookup(dispatcher, frame), "no_key")
+        # all guards are checked if key is unhashable
+        frame = types.SimpleNamespace(f_locals={"x": [1]})
+        self.assertEqual(len(list(dispatcher.candidates(frame))), 101)
+
+    def test_lru_eviction(self):
+        dispatcher = GuardedFunctionsDispatcher(max_size=2)
+        dispatcher.add(0, make_key_guard(0))
+        dispatcher.add(1, make_key_guard(1))
+        frame = types.SimpleNamespace(f_locals={"x": 0})
+        self.assertEqual(self.lookup(dispatcher, frame), 0)
+        dispatcher.add(2, make_key_guard(2))
+        self.assertEqual(len(dispatcher), 2)
+        self.assertEqual([code for code, _ in dispatcher], [0, 2])
+        frame = types.SimpleNamespace(f_locals={"x": 1})
+        self.assertIsNone(self.lookup(dispatcher, frame))
+
+
 def foo(x):
     return x + 1
 